@@ -0,0 +1,428 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Vectorised space debris index computation, to score many objects (fleets, debris catalogues) at once
+
+# import class
+from ACT_Space_Debris_Index.sdi_space_debris_index import *
+
+# imports
+import os
+import threading
+
+import numpy as np
+from astropy import units as u
+from poliastro.bodies import Earth
+
+# Engines loaded in the process, by pair of table paths
+SDI_ENGINES = dict()
+SDI_ENGINES_LOCK = threading.Lock()
+
+# Lower bounds of the eccentricity rows of the reduced lifetime table (see natural_decay)
+DECAY_ECCENTRICITY_BOUNDS = np.array([0.005, 0.015, 0.035, 0.075, 0.15, 0.3, 0.6])
+
+# Keys of the results, same as SDI_compute, and error message of each object (None if the object was computed)
+SDI_RESULTS_KEYS = ["Space_Debris_Index", "Operational_percentage", "Disposal_manoeuvre_percentage",
+                    "Natural_decay_percentage", "Transfer_duration", "Mass_burnt"]
+
+
+def get_sdi_engine(CF_file_path='sdi_space_debris_CF_for_code.csv', reduced_lifetime_file_path='sdi_reduced_lifetime.csv'):
+    """ Returns the engine of a pair of tables, loaded once per process.
+
+    Args:
+        CF_file_path: .csv file with the characterization factors of each orbital cell
+        reduced_lifetime_file_path: .csv file with the reduced lifetime used for natural decay
+
+    Returns:
+        SDIEngine: engine of the tables
+    """
+    key = (os.path.abspath(CF_file_path), os.path.abspath(reduced_lifetime_file_path))
+    with SDI_ENGINES_LOCK:
+        if key not in SDI_ENGINES:
+            SDI_ENGINES[key] = SDIEngine(CF_file_path, reduced_lifetime_file_path)
+        return SDI_ENGINES[key]
+
+
+class SDIEngine:
+    """ Computes the space debris index of arrays of objects with the model of SDI_compute.
+
+    The characterization factor and reduced lifetime tables are loaded once. Objects are processed together: the
+    orbital cells crossed by the trajectories (see decomposition_cells) and the natural decay steps are computed for
+    all objects at once.
+
+    Args:
+        CF_file_path: .csv file with the characterization factors of each orbital cell
+        reduced_lifetime_file_path: .csv file with the reduced lifetime used for natural decay
+
+    Attributes:
+        CF_file (np.ndarray): characterization factors, first column is the inclination (read-only)
+        reduced_lifetime_file (np.ndarray): reduced lifetime, first column is the eccentricity (read-only)
+    """
+    def __init__(self, CF_file_path='sdi_space_debris_CF_for_code.csv', reduced_lifetime_file_path='sdi_reduced_lifetime.csv'):
+        self.CF_file = np.genfromtxt(CF_file_path, delimiter=",", skip_header=1)
+        self.reduced_lifetime_file = np.genfromtxt(reduced_lifetime_file_path, delimiter=",", skip_header=2)
+        self.CF_file.flags.writeable = False
+        self.reduced_lifetime_file.flags.writeable = False
+
+    def get_characterization_factor(self, altitude, inclination):
+        """ Vectorised get_characterization_factor. Cells outside of the table give nan.
+
+        Args:
+            altitude (np.ndarray): altitude in km
+            inclination (np.ndarray): inclination in deg
+
+        Returns:
+            (np.ndarray): characterization factor in potential fragments per m^2
+        """
+        return get_characterization_factor_si(self.CF_file, altitude, inclination)
+
+    def elliptical_orbit_decomposition(self, a, ecc, inc, mass, table=None):
+        """ Vectorised elliptical_orbit_decomposition: impact from apogee (or LEO limit) down to perigee (or
+        atmosphere limit).
+
+        Args:
+            a (np.ndarray): semi-major axis in km
+            ecc (np.ndarray): eccentricity
+            inc (np.ndarray): inclination in deg
+            mass (np.ndarray): mass in kg
+            table (DecompositionTable): precomputed decompositions
+
+        Returns:
+            (np.ndarray): intermediate impact score in yr*potential_fragments/m**2/kg
+        """
+        return elliptical_orbit_decomposition_si(self.CF_file, a, ecc, inc, mass, False, table)
+
+    def elliptical_orbit_decomposition_up(self, a, ecc, inc, mass):
+        """ Vectorised elliptical_orbit_decomposition_up: impact from perigee up to apogee (or LEO limit).
+
+        Args:
+            a (np.ndarray): semi-major axis in km
+            ecc (np.ndarray): eccentricity
+            inc (np.ndarray): inclination in deg
+            mass (np.ndarray): mass in kg
+
+        Returns:
+            (np.ndarray): intermediate impact score in yr*potential_fragments/m**2/kg
+        """
+        return elliptical_orbit_decomposition_si(self.CF_file, a, ecc, inc, mass, True)
+
+    def natural_decay(self, perigee, ecc, inc, cross_section, mass, disposal_time, op_time, table=None):
+        """ Vectorised natural_decay: impact of the decay from an orbit down to the atmosphere limit. All the decay
+        steps of all the objects are computed at once, then cut at the time interval limit.
+
+        Args:
+            perigee (np.ndarray): perigee altitude of the initial orbit in km
+            ecc (np.ndarray): eccentricity of the initial orbit
+            inc (np.ndarray): inclination in deg
+            cross_section (np.ndarray): randomly tumbling cross section in m^2
+            mass (np.ndarray): mass in kg
+            disposal_time (np.ndarray): transfer time of the disposal manoeuvre in years
+            op_time (np.ndarray): duration of the operational phase in years
+            table (DecompositionTable): precomputed decompositions of the elliptical decay orbits
+
+        Returns:
+            (np.ndarray): cumulated time in years
+            (np.ndarray): cumulated natural decay impact in potential fragments*years
+        """
+        lifetime = self.reduced_lifetime_file
+        rows, columns = lifetime.shape
+        perigee = np.asarray(perigee, dtype=float)
+        ecc = np.asarray(ecc, dtype=float)
+        A_over_m = cross_section / mass
+        mass_factor = alpha_param_si(mass) * cross_section * mass
+        cumulated_time = op_time + disposal_time
+        decay_orbit_impact = np.zeros(np.shape(perigee))
+
+        # perigee and eccentricity indices, objects below the first perigee cell reenter directly
+        index_peri = np.trunc((np.round(perigee * 2) / 2 - ATMOSPHERE_LIMIT_KM) / ALTITUDE_INCREMENT_KM).astype(int)
+        index_ecc = np.searchsorted(DECAY_ECCENTRICITY_BOUNDS, ecc, side="right")
+        elliptical = index_ecc > 0
+
+        # perigees above the table cannot be decayed
+        outside = index_peri >= columns
+        decaying = (index_peri >= 0) & ~outside
+        decay_orbit_impact[outside] = np.nan
+
+        # elliptical orbits: only the eccentricity decreases, one row of the table per step
+        index = np.flatnonzero(decaying & elliptical)
+        column = index_peri[index, None]
+        row = index_ecc[index, None] - np.arange(index_ecc[index].max(initial=1))
+        steps = row > 0
+        row = np.maximum(row, 1)
+        cell_time = np.where(steps, (lifetime[row, column] - lifetime[row - 1, column]) / A_over_m[index, None], 0.)
+        cumulated_time[index], cumulated_steps, steps, limit_step = self.cap_decay_steps(cumulated_time[index], cell_time, steps)
+
+        # orbit of each step, decomposed for the steps before the time interval limit only
+        step_ecc = np.column_stack([ecc[index], lifetime[row[:, 1:], 0]])[steps]
+        step_index = np.repeat(index, steps.sum(axis=1))
+        periapsis = perigee[step_index] + EARTH_RADIUS_KM
+        apoapsis = periapsis * (1 + step_ecc) / (1 - step_ecc)
+        a = (periapsis + apoapsis) / 2
+        orbit_impact = np.zeros(cell_time.shape)
+        orbit_impact[steps] = (self.elliptical_orbit_decomposition(a, step_ecc, inc[step_index], mass[step_index], table)
+                               * cross_section[step_index] * mass[step_index] * 2 / period_year_si(a))
+        remaining_time = TIME_INTERVAL_LIMIT_YEAR - (cumulated_steps - cell_time)
+        decay_orbit_impact[index] += np.sum(orbit_impact * np.where(steps, np.where(limit_step, remaining_time, cell_time), 0.), axis=1)
+        decaying[index] &= ~limit_step.any(axis=1)
+
+        # circular orbits, or once orbits are circular: decay of the perigee, one column of the table per step
+        index = np.flatnonzero(decaying & (index_peri > 0))
+        column = index_peri[index, None] - np.arange(index_peri[index].max(initial=1))
+        steps = column > 0
+        column = np.maximum(column, 1)
+        cell_time = np.where(steps, (lifetime[0, column] - lifetime[0, column - 1]) / A_over_m[index, None], 0.)
+        step_perigee = [perigee[index]]
+        for _ in range(column.shape[1] - 1):
+            step_perigee.append(step_perigee[-1] - ALTITUDE_INCREMENT_KM)
+        step_perigee = np.stack(step_perigee, axis=1)
+        cumulated_time[index], cumulated_steps, steps, limit_step = self.cap_decay_steps(cumulated_time[index], cell_time, steps)
+        characterization_factor = np.zeros(cell_time.shape)
+        characterization_factor[steps] = self.get_characterization_factor(step_perigee[steps], np.repeat(inc[index], steps.sum(axis=1)))
+        # same time limit expression as natural_decay, for orbits that started elliptical
+        remaining_time = np.where(elliptical[index, None], TIME_INTERVAL_LIMIT_YEAR - cumulated_steps - cell_time,
+                                  TIME_INTERVAL_LIMIT_YEAR - (cumulated_steps - cell_time))
+        decay_orbit_impact[index] += (np.sum(characterization_factor * np.where(steps, np.where(limit_step, remaining_time, cell_time), 0.), axis=1)
+                                      * mass_factor[index])
+
+        return cumulated_time, decay_orbit_impact
+
+    @staticmethod
+    def cap_decay_steps(cumulated_time, cell_time, steps):
+        """ Cumulate the time of decay steps and stop each object at the step where the cumulated time goes over
+        TIME_INTERVAL_LIMIT, as the characterization factors.
+
+        Args:
+            cumulated_time (np.ndarray): cumulated time before the steps in years
+            cell_time (np.ndarray): time of each step in years, one row per object
+            steps (np.ndarray): True for the steps of each object (first steps of the rows)
+
+        Returns:
+            (np.ndarray): cumulated time after the last step in years
+            (np.ndarray): cumulated time after each step in years
+            (np.ndarray): True for the steps of each object, until the time interval limit
+            (np.ndarray): True for the step reaching the time interval limit
+        """
+        cumulated_steps = np.cumsum(np.column_stack([cumulated_time, cell_time]), axis=1)[:, 1:]
+        over_limit = steps & (cumulated_steps > TIME_INTERVAL_LIMIT_YEAR)
+        limit_reached = over_limit.any(axis=1)
+        last_step = np.where(limit_reached, over_limit.argmax(axis=1), steps.sum(axis=1) - 1)
+        steps = steps & (np.arange(steps.shape[1]) <= last_step[:, None])
+        limit_step = steps & limit_reached[:, None] & (np.arange(steps.shape[1]) == last_step[:, None])
+        cumulated_time = np.where(last_step >= 0, cumulated_steps[np.arange(last_step.size), np.maximum(last_step, 0)], cumulated_time)
+        return cumulated_time, cumulated_steps, steps, limit_step
+
+    @staticmethod
+    def high_thrust_transfer(a_initial, ecc_initial, inc_initial, a_final, ecc_final, inc_final, mass, isp, no_2nd_burn):
+        """ Vectorised high_thrust_delta_v between orbits with aligned arguments of periapsis: first burn at the
+        initial apoapsis, second burn at the final periapsis.
+
+        Args:
+            a_initial (np.ndarray): initial semi-major axis in km
+            ecc_initial (np.ndarray): initial eccentricity
+            inc_initial (np.ndarray): initial inclination in deg
+            a_final (np.ndarray): final semi-major axis in km
+            ecc_final (np.ndarray): final eccentricity
+            inc_final (np.ndarray): final inclination in deg
+            mass (np.ndarray): mass at the start of the manoeuvre in kg
+            isp (np.ndarray): specific impulse in s
+            no_2nd_burn (np.ndarray): True if the object reenters before the second burn
+
+        Returns:
+            (np.ndarray): transfer orbit semi-major axis in km
+            (np.ndarray): transfer orbit eccentricity
+            (np.ndarray): transfer duration in years
+            (np.ndarray): burned mass in kg
+        """
+        first_burn_radius = a_initial * (1 + ecc_initial)
+        second_burn_radius = a_final * (1 - ecc_final)
+        a_transfer = (first_burn_radius + second_burn_radius) / 2.
+        ecc_transfer = abs(first_burn_radius - second_burn_radius) / (first_burn_radius + second_burn_radius)
+
+        # inclination change, performed during the first impulse when lowering the orbit
+        a_max = np.maximum(a_initial, a_final) * 1000.
+        argp = np.pi / 2
+        inc_delta_v = abs(2 * np.sin(np.deg2rad(inc_final - inc_initial) / 2.) * np.sqrt(1 - ecc_initial ** 2)
+                          * np.cos(argp - argp) * np.sqrt(EARTH_K_M3_S2 / a_max ** 3) * a_max
+                          / (1 + ecc_initial * np.cos(-argp)))
+        first_inc_delta_v = np.where(a_initial > a_final, inc_delta_v, 0.)
+        second_inc_delta_v = np.where(a_initial > a_final, 0., inc_delta_v)
+
+        delta_v_1 = np.sqrt((orbital_velocity_si(EARTH_K_M3_S2, a_transfer * 1000., first_burn_radius * 1000.)
+                             - orbital_velocity_si(EARTH_K_M3_S2, a_initial * 1000., first_burn_radius * 1000.)) ** 2
+                            + first_inc_delta_v ** 2)
+        delta_v_2 = np.sqrt((orbital_velocity_si(EARTH_K_M3_S2, a_final * 1000., second_burn_radius * 1000.)
+                             - orbital_velocity_si(EARTH_K_M3_S2, a_transfer * 1000., second_burn_radius * 1000.)) ** 2
+                            + second_inc_delta_v ** 2)
+        burned_mass = (propellant_mass_si(mass, delta_v_1, isp)
+                       + np.where(no_2nd_burn, 0., propellant_mass_si(mass, delta_v_2, isp)))
+
+        transfer_duration = period_year_si(a_transfer) / 2
+        return a_transfer, ecc_transfer, transfer_duration, burned_mass
+
+    def compute(self, mass, cross_section, op_duration, mean_thrust, Isp, EOL_manoeuvre, PMD_success, a_op, ecc_op,
+                inc_object_op, a_disp, ecc_disp, inc_object_disp, table=None):
+        """ Vectorised SDI_compute. Inputs are broadcast together, they are expected to be validated (see sdi_main).
+
+        Objects that cannot be computed (insufficient propellant, disposal orbit with the operational semi-major axis,
+        orbital cell outside of the tables) get nan results and an error message, the other objects are not affected.
+
+        Args:
+            mass (u.kg): mass of the objects
+            cross_section (u.m**2): cross section of the objects
+            op_duration (u.year): operation duration
+            mean_thrust (u.N): mean thrust (not used by the impulsive manoeuvres model)
+            Isp (u.s): specific impulse
+            EOL_manoeuvre (bool): True if an end-of-life manoeuvre is performed
+            PMD_success (float): success rate of the post mission disposal (0 to 1)
+            a_op (u.km): semi-major axis of the operational orbit
+            ecc_op (u.one): eccentricity of the operational orbit
+            inc_object_op (u.deg): inclination of the operational orbit
+            a_disp (u.km): semi-major axis of the disposal orbit
+            ecc_disp (u.one): eccentricity of the disposal orbit
+            inc_object_disp (u.deg): inclination of the disposal orbit
+            table (DecompositionTable): precomputed decompositions of the elliptical natural decay orbits, reused
+                                        between calls
+
+        Returns:
+            dict: results with the keys of SDI_compute, as arrays with the broadcast shape of the inputs, and "Error"
+                  (np.ndarray of str or None)
+        """
+        # Inputs as flat arrays of floats in kg, m^2, years, s, km and deg
+        inputs = np.broadcast_arrays(u.Quantity(mass, u.kg).value, u.Quantity(cross_section, u.m ** 2).value,
+                                     u.Quantity(op_duration, u.year).value, u.Quantity(Isp, u.s).value,
+                                     np.asarray(EOL_manoeuvre, dtype=bool), np.asarray(PMD_success, dtype=float),
+                                     u.Quantity(a_op, u.km).value, u.Quantity(ecc_op, u.one).value,
+                                     u.Quantity(inc_object_op, u.deg).value, u.Quantity(a_disp, u.km).value,
+                                     u.Quantity(ecc_disp, u.one).value, u.Quantity(inc_object_disp, u.deg).value)
+        shape = inputs[0].shape
+        (mass, cross_section, op_duration, isp, eol, pmd, a_op, ecc_op, inc_op, a_disp, ecc_disp,
+         inc_disp) = [np.array(value, dtype=value.dtype).ravel() for value in inputs]
+
+        size = mass.size
+        impact_score = np.zeros(size)
+        op_percentage = np.zeros(size)
+        disposal_percentage = np.zeros(size)
+        natural_percentage = np.zeros(size)
+        transfer_duration = np.zeros(size)
+        burned_mass = np.zeros(size)
+        errors = np.full(size, None, dtype=object)
+
+        perigee_op = a_op * (1 - ecc_op) - EARTH_RADIUS_KM
+        apogee_op = a_op * (1 + ecc_op) - EARTH_RADIUS_KM
+        perigee_disp = a_disp * (1 - ecc_disp) - EARTH_RADIUS_KM
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # #1 Case if operational perigee is lower than the atmosphere limit, object in the atmosphere has no impact
+            reentry = np.flatnonzero((perigee_op < ATMOSPHERE_LIMIT_KM) & (apogee_op >= ATMOSPHERE_LIMIT_KM))
+            impact_score[reentry] = (self.elliptical_orbit_decomposition(a_op[reentry], ecc_op[reentry], inc_op[reentry], mass[reentry])
+                                     * mass[reentry] * cross_section[reentry])
+            disposal_percentage[reentry] = 1
+            transfer_duration[reentry] = (np.pi * np.sqrt((a_op[reentry] * u.km) ** 3 / Earth.k)).value # half ellipse period
+
+            # #2 Case if object's perigee is higher than LEO, no impact for the operational phase
+            above_leo = perigee_op > LEO_LIMIT_KM
+            graveyard = np.flatnonzero(above_leo & (perigee_disp > LEO_LIMIT_KM))
+            _, _, transfer_duration[graveyard], burned_mass[graveyard] = self.high_thrust_transfer(
+                a_op[graveyard], ecc_op[graveyard], inc_op[graveyard], a_disp[graveyard], ecc_disp[graveyard],
+                inc_disp[graveyard], mass[graveyard], isp[graveyard], False)
+
+            index = np.flatnonzero(above_leo & (perigee_disp <= LEO_LIMIT_KM))
+            a_transfer, ecc_transfer, transfer_duration[index], burned_mass[index] = self.high_thrust_transfer(
+                a_op[index], ecc_op[index], inc_op[index], a_disp[index], ecc_disp[index], inc_disp[index],
+                mass[index], isp[index], perigee_disp[index] < ATMOSPHERE_LIMIT_KM)
+            disposal_mass = mass[index] - burned_mass[index]
+            disposal_impact = (self.elliptical_orbit_decomposition(a_transfer, ecc_transfer, inc_disp[index], disposal_mass)
+                               * disposal_mass * cross_section[index])
+            natural_decay_impact = self.get_natural_decay_impact(index, perigee_disp >= ATMOSPHERE_LIMIT_KM, perigee_disp,
+                                                                 ecc_disp, inc_disp, cross_section, mass - burned_mass,
+                                                                 transfer_duration, op_duration, table)
+            # impact of unsuccessful manoeuvre would be 0 since spacecraft would stay above LEO region
+            impact_score[index] = (disposal_impact + natural_decay_impact) * pmd[index]
+            natural_percentage[index] = natural_decay_impact * pmd[index] / impact_score[index]
+            disposal_percentage[index] = 1 - natural_percentage[index]
+
+            # #3 Cases if object has perigee in LEO, circular or elliptical operational orbit
+            in_leo = (perigee_op >= ATMOSPHERE_LIMIT_KM) & ~above_leo
+            operational_impact = np.zeros(size)
+            circular = np.flatnonzero(in_leo & (ecc_op == 0))
+            operational_impact[circular] = (cross_section[circular] * mass[circular]
+                                            * self.get_characterization_factor(perigee_op[circular], inc_op[circular])
+                                            * alpha_param_si(mass[circular]) * op_duration[circular])
+            elliptical = np.flatnonzero(in_leo & (ecc_op != 0))
+            # half elliptical operational orbit, times two for one pass in LEO, times the number of orbits
+            operational_impact[elliptical] = (cross_section[elliptical] * mass[elliptical] * 2
+                                              * self.elliptical_orbit_decomposition(a_op[elliptical], ecc_op[elliptical], inc_op[elliptical], mass[elliptical])
+                                              * op_duration[elliptical] / period_year_si(a_op[elliptical]))
+
+            # disposal manoeuvre
+            disposal_impact = np.zeros(size)
+            natural_decay_impact = np.zeros(size)
+            unsuccessful_decay_impact = np.zeros(size)
+            index = np.flatnonzero(in_leo & eol)
+            a_transfer, ecc_transfer, transfer_duration[index], burned_mass[index] = self.high_thrust_transfer(
+                a_op[index], ecc_op[index], inc_op[index], a_disp[index], ecc_disp[index], inc_disp[index],
+                mass[index], isp[index], perigee_disp[index] < ATMOSPHERE_LIMIT_KM)
+            disposal_mass = mass - burned_mass
+
+            # Case from LEO into deorbitation
+            down = a_disp[index] < a_op[index]
+            disposal_impact[index[down]] = self.elliptical_orbit_decomposition(a_transfer[down], ecc_transfer[down], inc_disp[index[down]], disposal_mass[index[down]])
+            natural_decay_impact[index[down]] = self.get_natural_decay_impact(index[down], perigee_disp >= ATMOSPHERE_LIMIT_KM,
+                                                                              perigee_disp, ecc_disp, inc_disp, cross_section,
+                                                                              disposal_mass, transfer_duration, op_duration, table)
+            # case going from LEO to above LEO in graveyard
+            up = a_disp[index] > a_op[index]
+            disposal_impact[index[up]] = self.elliptical_orbit_decomposition_up(a_transfer[up], ecc_transfer[up], inc_disp[index[up]], disposal_mass[index[up]])
+            natural_decay_impact[index[up]] = self.get_natural_decay_impact(index[up], perigee_disp < LEO_LIMIT_KM,
+                                                                            perigee_disp, ecc_disp, inc_disp, cross_section,
+                                                                            disposal_mass, transfer_duration, op_duration, table)
+            errors[index[~down & ~up]] = "Disposal orbit must have a different semi-major axis than the operational orbit."
+
+            # natural decay in the case of an unsuccessful end-of-life manoeuvre (EOLM)
+            _, unsuccessful_decay_impact[index] = self.natural_decay(perigee_op[index], ecc_op[index], inc_op[index], cross_section[index],
+                                                                     mass[index], np.zeros(index.size), op_duration[index], table)
+
+            # no end-of-life manoeuvre
+            index = np.flatnonzero(in_leo & ~eol)
+            _, natural_decay_impact[index] = self.natural_decay(perigee_disp[index], ecc_disp[index], inc_disp[index], cross_section[index],
+                                                                mass[index], np.zeros(index.size), op_duration[index], table)
+
+            index = np.flatnonzero(in_leo)
+            impact_score[index] = (operational_impact[index]
+                                   + (cross_section[index] * disposal_mass[index] * disposal_impact[index] + natural_decay_impact[index]) * pmd[index]
+                                   + (1 - pmd[index]) * unsuccessful_decay_impact[index])
+            natural_percentage[index] = (natural_decay_impact[index] * pmd[index] + (1 - pmd[index]) * unsuccessful_decay_impact[index]) / impact_score[index]
+            op_percentage[index] = operational_impact[index] / impact_score[index]
+            disposal_percentage[index] = 1 - natural_percentage[index] - op_percentage[index]
+
+        errors[(burned_mass > mass) & (errors == None)] = "Propellant mass is not sufficient to perform manoeuvre."
+        errors[np.isnan(impact_score) & (errors == None)] = "Orbital cell outside of the characterization factors or reduced lifetime tables."
+        failed = errors != None
+
+        results = dict()
+        for key, values, unit in zip(SDI_RESULTS_KEYS,
+                                     [impact_score, op_percentage, disposal_percentage, natural_percentage, transfer_duration, burned_mass],
+                                     [u.year * u.pot_fragments, u.one, u.one, u.one, u.year, u.kg]):
+            values[failed] = np.nan
+            results[key] = values.reshape(shape) * unit if unit is not u.one else values.reshape(shape)
+        results["Error"] = errors.reshape(shape)
+        return results
+
+    def get_natural_decay_impact(self, index, decaying, perigee, ecc, inc, cross_section, mass, disposal_time, op_time,
+                                 table=None):
+        """ Natural decay impact of a subset of objects, 0 for the objects of the subset that do not decay.
+
+        Args:
+            index (np.ndarray): indices of the subset
+            decaying (np.ndarray): True for the objects that decay (all objects)
+            perigee, ecc, inc, cross_section, mass, disposal_time, op_time: see natural_decay (all objects)
+            table (DecompositionTable): see natural_decay
+
+        Returns:
+            (np.ndarray): natural decay impact of the subset in potential fragments*years
+        """
+        impact = np.zeros(index.size)
+        decaying = decaying[index]
+        index = index[decaying]
+        _, impact[decaying] = self.natural_decay(perigee[index], ecc[index], inc[index], cross_section[index], mass[index],
+                                                 disposal_time[index], op_time[index], table)
+        return impact
@@ -6,8 +6,10 @@
 
 # import class
 from ACT_Space_Debris_Index.sdi_space_debris_index import *
+from ACT_Space_Debris_Index.sdi_engine import get_sdi_engine
 
 # imports
+import numpy as np
 from astropy import units as u
 from astropy.time import Time
 from poliastro.bodies import Earth
@@ -71,6 +73,52 @@ def sdi_main(starting_epoch, op_duration, mass, cross_section, mean_thrust, Isp,
     # TODO add other means of manoeuvring else than propulsive (drag sails, tumbling ?)
     # TODO compute time spent in region B (GEO) ? and other sensitive regions (eg. Galileo) ?
 
+    inputs = sdi_inputs(starting_epoch, op_duration, mass, cross_section, mean_thrust, Isp, number_of_launch_es, apogee_object_op, perigee_object_op, inc_object_op, EOL_manoeuvre, PMD_success, apogee_object_disp, 
+                        perigee_object_disp, inc_object_disp, ADR_stage, m_ADR, ADR_cross_section, ADR_mean_thrust, ADR_Isp, ADR_manoeuvre_success, ADR_capture_success, m_debris, debris_cross_section, apogee_debris, 
+                        perigee_debris, inc_debris, apogee_debris_removal, perigee_debris_removal, inc_debris_removal)
+
+    print("\n --- Debris risk from launch vehicle orbital stage. ---")
+    LV_SDI_results = SDI_compute(starting_epoch, inputs["mass"], inputs["cross_section"], inputs["op_duration"], inputs["mean_thrust"], inputs["Isp"], inputs["EOL_manoeuvre"], inputs["PMD_success"], 
+                                inputs["a_op"], inputs["ecc_op"], inputs["inc_object_op"], inputs["a_disp"], inputs["ecc_disp"], inputs["inc_object_disp"], CF_file_path, reduced_lifetime_file_path)
+
+    # For case with ADR stage included
+    if ADR_stage == True:
+        print("\n\n --- Debris risk from active debris removal servicer, from insertion to debris orbit. ---")
+        # Assumes ADR inserted at launcher's operational orbit, the "disposal manoeuvre" here describes the trajectory from insertion to the debris
+        ADR_servicer_SDI = SDI_compute(starting_epoch, inputs["m_ADR"], inputs["ADR_cross_section"], 0 * u.year, inputs["ADR_mean_thrust"], inputs["ADR_Isp"], True, inputs["ADR_manoeuvre_success"], 
+                                inputs["a_op"], inputs["ecc_op"], inputs["inc_object_op"], inputs["a_debris"], inputs["ecc_debris"], inputs["inc_debris"], CF_file_path, reduced_lifetime_file_path)
+
+        # compute risk generated by debris if not removed, debris assumed inert (no propulsion capability)
+        print("\n\n --- Residual debris risk from debris. ---")
+        debris_residual_SDI = SDI_compute(starting_epoch, inputs["m_debris"], inputs["debris_cross_section"], 0 * u.year, 0 * u.N, 0 * u.s, False, 1, inputs["a_debris"], inputs["ecc_debris"], inputs["inc_debris"],
+                                inputs["a_debris"], inputs["ecc_debris"], inputs["inc_debris"], CF_file_path, reduced_lifetime_file_path)
+
+        # assumes the debris is captured directly after ADR servicer manoeuvre from its insertion to the debris' orbit
+        print("\n\n --- Debris risk from removal operations, from debris orbit to target disposal. ---")
+        SDI_debris_removal = SDI_compute(starting_epoch, inputs["m_debris"] + inputs["m_ADR"] - ADR_servicer_SDI["Mass_burnt"], max(inputs["debris_cross_section"], inputs["ADR_cross_section"]), 0 * u.year, 
+                                        inputs["ADR_mean_thrust"], inputs["ADR_Isp"], True, inputs["ADR_manoeuvre_success"]*inputs["ADR_capture_success"], inputs["a_debris"], inputs["ecc_debris"], inputs["inc_debris"], 
+                                        inputs["a_debris_removal"], inputs["ecc_debris_removal"], inputs["inc_debris_removal"], CF_file_path, reduced_lifetime_file_path)
+
+        print("\n\n Final impact with ADR risk reduction:", "{:.3f}".format(number_of_launch_es*(LV_SDI_results["Space_Debris_Index"] + ADR_servicer_SDI["Disposal_manoeuvre_percentage"]*ADR_servicer_SDI["Space_Debris_Index"]
+                + SDI_debris_removal["Space_Debris_Index"] - debris_residual_SDI["Space_Debris_Index"])))
+
+        return sdi_indicators(number_of_launch_es, LV_SDI_results, ADR_servicer_SDI, debris_residual_SDI, SDI_debris_removal)
+    else:
+        print("\n\n Final impact:", "{:.3f}".format(number_of_launch_es*LV_SDI_results["Space_Debris_Index"]))
+
+        return sdi_indicators(number_of_launch_es, LV_SDI_results)
+
+
+def sdi_inputs(starting_epoch, op_duration, mass, cross_section, mean_thrust, Isp, number_of_launch_es, apogee_object_op, perigee_object_op, inc_object_op, EOL_manoeuvre, PMD_success, apogee_object_disp, perigee_object_disp, 
+            inc_object_disp, ADR_stage, m_ADR, ADR_cross_section, ADR_mean_thrust, ADR_Isp, ADR_manoeuvre_success, ADR_capture_success, m_debris, debris_cross_section, apogee_debris, perigee_debris, inc_debris, 
+            apogee_debris_removal, perigee_debris_removal, inc_debris_removal):
+    """ Verifies the inputs of sdi_main and converts them to the inputs of SDI_compute (orbital elements, success rates between 0 and 1, thrusts in N)
+
+    Raises ValueError if an input is not valid.
+
+    Return:
+        (dict): inputs of the SDI_compute calls, the ADR stage, debris and debris removal entries are only given if ADR_stage is True
+    """
     if op_duration.value < 0:
         raise ValueError("Operation duration must not be negative [years].")
 
@@ -129,9 +177,9 @@ def sdi_main(starting_epoch, op_duration, mass, cross_section, mean_thrust, Isp,
         ecc_disp = ecc_op
         inc_object_disp = inc_object_op
 
-    print("\n --- Debris risk from launch vehicle orbital stage. ---")
-    LV_SDI_results = SDI_compute(starting_epoch, mass, cross_section, op_duration, mean_thrust, Isp, EOL_manoeuvre, PMD_success, a_op, ecc_op, inc_object_op,
-                                a_disp, ecc_disp, inc_object_disp, CF_file_path, reduced_lifetime_file_path)
+    inputs = {"starting_epoch": starting_epoch, "op_duration": op_duration, "mass": mass, "cross_section": cross_section, "mean_thrust": mean_thrust, "Isp": Isp, "number_of_launch_es": number_of_launch_es, 
+              "EOL_manoeuvre": EOL_manoeuvre, "PMD_success": PMD_success, "a_op": a_op, "ecc_op": ecc_op, "inc_object_op": inc_object_op, "a_disp": a_disp, "ecc_disp": ecc_disp, "inc_object_disp": inc_object_disp, 
+              "ADR_stage": ADR_stage == True}
 
     # For case with ADR stage included
     if ADR_stage == True:        
@@ -192,47 +240,110 @@ def sdi_main(starting_epoch, op_duration, mass, cross_section, mean_thrust, Isp,
         elif inc_debris_removal < 0 * u.deg:
             raise ValueError("Debris removal inclination not in the range 0 <= inc < 180.")
 
-        print("\n\n --- Debris risk from active debris removal servicer, from insertion to debris orbit. ---")
-        # Assumes ADR inserted at launcher's operational orbit, the "disposal manoeuvre" here describes the trajectory from insertion to the debris
-        ADR_servicer_SDI = SDI_compute(starting_epoch, m_ADR, ADR_cross_section, 0 * u.year, ADR_mean_thrust, ADR_Isp, True, ADR_manoeuvre_success, a_op, ecc_op, inc_object_op,
-                                a_debris, ecc_debris, inc_debris, CF_file_path, reduced_lifetime_file_path)
+        inputs.update({"m_ADR": m_ADR, "ADR_cross_section": ADR_cross_section, "ADR_mean_thrust": ADR_mean_thrust, "ADR_Isp": ADR_Isp, "ADR_manoeuvre_success": ADR_manoeuvre_success, 
+                       "ADR_capture_success": ADR_capture_success, "m_debris": m_debris, "debris_cross_section": debris_cross_section, "a_debris": a_debris, "ecc_debris": ecc_debris, "inc_debris": inc_debris, 
+                       "a_debris_removal": a_debris_removal, "ecc_debris_removal": ecc_debris_removal, "inc_debris_removal": inc_debris_removal})
 
-        # compute risk generated by debris if not removed, debris assumed inert (no propulsion capability)
-        print("\n\n --- Residual debris risk from debris. ---")
-        debris_residual_SDI = SDI_compute(starting_epoch, m_debris, debris_cross_section, 0 * u.year, 0 * u.N, 0 * u.s, False, 1, a_debris, ecc_debris, inc_debris,
-                                a_debris, ecc_debris, inc_debris, CF_file_path, reduced_lifetime_file_path)
+    return inputs
 
-        # assumes the debris is captured directly after ADR servicer manoeuvre from its insertion to the debris' orbit
-        print("\n\n --- Debris risk from removal operations, from debris orbit to target disposal. ---")
-        SDI_debris_removal = SDI_compute(starting_epoch, m_debris + m_ADR - ADR_servicer_SDI["Mass_burnt"], max(debris_cross_section, ADR_cross_section), 0 * u.year, ADR_mean_thrust, ADR_Isp, True, 
-                                        ADR_manoeuvre_success*ADR_capture_success, a_debris, ecc_debris, inc_debris, a_debris_removal , ecc_debris_removal, inc_debris_removal, CF_file_path, reduced_lifetime_file_path)
 
-        print("\n\n Final impact with ADR risk reduction:", "{:.3f}".format(number_of_launch_es*(LV_SDI_results["Space_Debris_Index"] + ADR_servicer_SDI["Disposal_manoeuvre_percentage"]*ADR_servicer_SDI["Space_Debris_Index"]
-                + SDI_debris_removal["Space_Debris_Index"] - debris_residual_SDI["Space_Debris_Index"])))
+def sdi_indicators(number_of_launch_es, LV_SDI_results, ADR_servicer_SDI=None, debris_residual_SDI=None, SDI_debris_removal=None):
+    """ Combines the SDI_compute results of the orbital stage and, for the case with ADR stage, of the ADR servicer, the residual debris and the debris removal into the indicators of sdi_main
+    The results can be scalars or arrays (see SDIEngine.compute)
 
+    Return:
+        (dict): indicators LCS3, LCS4, BB_orbital_stage, BB_ADR_stage and BB_ADR_strategy (u.year*u.pot_fragments)
+    """
+    if ADR_servicer_SDI is not None:
         sdi_results = {"LCS3": number_of_launch_es*(LV_SDI_results["Space_Debris_Index"]*LV_SDI_results["Operational_percentage"] + ADR_servicer_SDI["Disposal_manoeuvre_percentage"]*ADR_servicer_SDI["Space_Debris_Index"]
                 + SDI_debris_removal["Space_Debris_Index"]*SDI_debris_removal["Disposal_manoeuvre_percentage"] - debris_residual_SDI["Space_Debris_Index"]), 
                 "LCS4": number_of_launch_es*(LV_SDI_results["Space_Debris_Index"]*(1-LV_SDI_results["Operational_percentage"]) + 
                 SDI_debris_removal["Space_Debris_Index"]*SDI_debris_removal["Natural_decay_percentage"]), "BB_orbital_stage": number_of_launch_es*LV_SDI_results["Space_Debris_Index"], 
                 "BB_ADR_stage": number_of_launch_es*(ADR_servicer_SDI["Disposal_manoeuvre_percentage"]*ADR_servicer_SDI["Space_Debris_Index"] + SDI_debris_removal["Space_Debris_Index"]), "BB_ADR_strategy": - number_of_launch_es*debris_residual_SDI["Space_Debris_Index"]}
-
-        return sdi_results
     else:
-        print("\n\n Final impact:", "{:.3f}".format(number_of_launch_es*LV_SDI_results["Space_Debris_Index"]))
-
         sdi_results = {"LCS3": number_of_launch_es*LV_SDI_results["Space_Debris_Index"]*LV_SDI_results["Operational_percentage"], "LCS4": number_of_launch_es*LV_SDI_results["Space_Debris_Index"]*(1 - LV_SDI_results["Operational_percentage"]), 
-        "BB_orbital_stage": number_of_launch_es*LV_SDI_results["Space_Debris_Index"], "BB_ADR_stage": 0 * u.year *u.pot_fragments, "BB_ADR_strategy": 0 * u.year *u.pot_fragments}
+        "BB_orbital_stage": number_of_launch_es*LV_SDI_results["Space_Debris_Index"], "BB_ADR_stage": np.zeros(np.shape(number_of_launch_es)) * u.year *u.pot_fragments, "BB_ADR_strategy": np.zeros(np.shape(number_of_launch_es)) * u.year *u.pot_fragments}
+
+    return sdi_results
+
+
+def sdi_main_batch(inputs, CF_file_path = 'sdi_space_debris_CF_for_code.csv', reduced_lifetime_file_path = 'sdi_reduced_lifetime.csv'):
+    """ sdi_main for a list of inputs, computed in one pass with the vectorised engine and the tables loaded once per process (see sdi_engine.py)
+    An input that is not valid or cannot be computed gets an error message, the other inputs are not affected.
+
+    Args:
+        inputs (list(dict)): arguments of sdi_main for each computation, without the .csv file paths
+        CF_file_path: .csv file with the characterization factors of each orbital cell
+        reduced_lifetime_file_path: .csv file with the reduced lifetime used for natural decay
+
+    Return:
+        (list(dict)): indicators of sdi_main for each input, in the same order (None if the input failed)
+        (list(str)): error message for each input, in the same order (None if the input was computed)
+    """
+    sdi_engine = get_sdi_engine(CF_file_path, reduced_lifetime_file_path)
+    results = [None] * len(inputs)
+    errors = [None] * len(inputs)
+
+    # verify the inputs one by one
+    checked_inputs = dict()
+    for index, arguments in enumerate(inputs):
+        try:
+            checked_inputs[index] = sdi_inputs(**arguments)
+        except (ValueError, TypeError, AttributeError) as error:
+            errors[index] = str(error)
+
+    def stack(items, key):
+        unit = items[0][key].unit
+        return np.array([item[key].to_value(unit) for item in items]) * unit
+
+    def flags(items, key):
+        return np.array([item[key] for item in items], dtype=float)
+
+    # computations with and without ADR stage are done in two batches, as they do not give the same indicators
+    for ADR_stage in [False, True]:
+        indices = [index for index, item in checked_inputs.items() if item["ADR_stage"] == ADR_stage]
+        if not indices:
+            continue
+        items = [checked_inputs[index] for index in indices]
+        number_of_launch_es = flags(items, "number_of_launch_es")
+
+        LV_SDI_results = sdi_engine.compute(stack(items, "mass"), stack(items, "cross_section"), stack(items, "op_duration"), stack(items, "mean_thrust"), stack(items, "Isp"), 
+                                            flags(items, "EOL_manoeuvre").astype(bool), flags(items, "PMD_success"), stack(items, "a_op"), stack(items, "ecc_op"), stack(items, "inc_object_op"), 
+                                            stack(items, "a_disp"), stack(items, "ecc_disp"), stack(items, "inc_object_disp"))
+        batch_errors = [LV_SDI_results["Error"]]
+
+        if ADR_stage:
+            ADR_servicer_SDI = sdi_engine.compute(stack(items, "m_ADR"), stack(items, "ADR_cross_section"), 0 * u.year, stack(items, "ADR_mean_thrust"), stack(items, "ADR_Isp"), True, 
+                                                  flags(items, "ADR_manoeuvre_success"), stack(items, "a_op"), stack(items, "ecc_op"), stack(items, "inc_object_op"), stack(items, "a_debris"), 
+                                                  stack(items, "ecc_debris"), stack(items, "inc_debris"))
+            debris_residual_SDI = sdi_engine.compute(stack(items, "m_debris"), stack(items, "debris_cross_section"), 0 * u.year, 0 * u.N, 0 * u.s, False, 1, stack(items, "a_debris"), 
+                                                     stack(items, "ecc_debris"), stack(items, "inc_debris"), stack(items, "a_debris"), stack(items, "ecc_debris"), stack(items, "inc_debris"))
+            SDI_debris_removal = sdi_engine.compute(stack(items, "m_debris") + stack(items, "m_ADR") - ADR_servicer_SDI["Mass_burnt"], 
+                                                    np.maximum(stack(items, "debris_cross_section"), stack(items, "ADR_cross_section")), 0 * u.year, stack(items, "ADR_mean_thrust"), stack(items, "ADR_Isp"), 
+                                                    True, flags(items, "ADR_manoeuvre_success")*flags(items, "ADR_capture_success"), stack(items, "a_debris"), stack(items, "ecc_debris"), 
+                                                    stack(items, "inc_debris"), stack(items, "a_debris_removal"), stack(items, "ecc_debris_removal"), stack(items, "inc_debris_removal"))
+            batch_errors += [ADR_servicer_SDI["Error"], debris_residual_SDI["Error"], SDI_debris_removal["Error"]]
+            sdi_results = sdi_indicators(number_of_launch_es, LV_SDI_results, ADR_servicer_SDI, debris_residual_SDI, SDI_debris_removal)
+        else:
+            sdi_results = sdi_indicators(number_of_launch_es, LV_SDI_results)
+
+        for position, index in enumerate(indices):
+            error = next((batch_error[position] for batch_error in batch_errors if batch_error[position] is not None), None)
+            if error is not None:
+                errors[index] = error
+            else:
+                results[index] = {key: value[position] for key, value in sdi_results.items()}
 
-        return sdi_results
+    return results, errors
 
 
 def SDI_compute(starting_epoch, mass, cross_section, op_duration, mean_thrust, Isp, EOL_manoeuvre, PMD_success, a_op, ecc_op, inc_object_op,
                 a_disp, ecc_disp, inc_object_disp, CF_file_path = 'sdi_space_debris_CF_for_code.csv', reduced_lifetime_file_path = 'sdi_reduced_lifetime.csv'):
     
-    # input .csv file for characterization factor
-    CF_file = np.genfromtxt(CF_file_path, delimiter=",", skip_header=1)
-    # input .csv file for natural decay
-    reduced_lifetime_file = np.genfromtxt(reduced_lifetime_file_path, delimiter=",", skip_header=2)
+    # input .csv files for characterization factor and natural decay, loaded once per process
+    sdi_engine = get_sdi_engine(CF_file_path, reduced_lifetime_file_path)
+    CF_file = sdi_engine.CF_file
+    reduced_lifetime_file = sdi_engine.reduced_lifetime_file
 
     operational_orbit = Orbit.from_classical(Earth, 
                                             a_op, 
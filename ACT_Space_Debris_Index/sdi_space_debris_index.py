@@ -204,105 +204,44 @@ def elliptical_orbit_decomposition(CF_file, transfer_orbit, mass):
     """ To decompose the trajectory in time spent in different orbital cell (altitude and inclination)
 
     Depends on global parameters defined by the characterization factors available
+    The time spent in each cell is computed in closed form, see decomposition_cells
 
     return
         (yr*potential_fragments/m**2 /kg) intermediate impact score
     """
-
-    apogee_transfer = (transfer_orbit.r_a - Earth.R)
-    perigee_transfer = (transfer_orbit.r_p - Earth.R)
-
-    if apogee_transfer > ALTITUDE_LEO_LIMIT + ALTITUDE_INCREMENT:
-        altitude_temp = ALTITUDE_LEO_LIMIT 
-        nu_1 = get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp + Earth.R)
-    else:
-        altitude_temp = apogee_transfer
-        nu_1 = 179.99*np.pi/180 * u.rad # to avoid being exactly at pi rad which generates 0 s of time_to_anomaly
-
-    nu_temp = nu_1
-
-    t_temp = Orbit.time_to_anomaly(transfer_orbit, nu_temp) # time_to_anomaly based on time since periapsis
-    impact_score_temp = 0 * u.year* u.m **(-2)*u.pot_fragments
-
-    # integrates impact from apogee to atmospheric limit or perigee (so during maximum half an ellipse)
-    while altitude_temp - ALTITUDE_INCREMENT >= max(ALTITUDE_ATMOSPHERE_LIMIT, perigee_transfer):
-        nu_next = get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp - ALTITUDE_INCREMENT + Earth.R)
-        t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
-        Delta_t = t_temp - t_next
-        Delta_t = Delta_t.to(u.year)
-        impact_score_temp = impact_score_temp + Delta_t*get_characterization_factor(CF_file, altitude_temp, transfer_orbit.inc)
-
-        if print_bool:
-            print("DOWN: altitude", altitude_temp, ", anomaly nu", nu_temp, ", altitude_next", altitude_temp - ALTITUDE_INCREMENT, ", nu next", nu_next, ", Delta t", Delta_t.to(u.s))
-
-        nu_temp = nu_next
-        t_temp = t_next
-        altitude_temp = altitude_temp - ALTITUDE_INCREMENT
-
-    # Last cell, Delta_t time might be smaller
-    nu_next = get_nu(transfer_orbit.a, transfer_orbit.ecc, max(ALTITUDE_ATMOSPHERE_LIMIT, perigee_transfer) + Earth.R)
-    t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
-    Delta_t = t_temp - t_next
-    Delta_t = Delta_t.to(u.year)
-
-    impact_score_temp = impact_score_temp + Delta_t*get_characterization_factor(CF_file, altitude_temp, transfer_orbit.inc)
-    
-    if print_bool:
-        print("before last altitude", altitude_temp, ", anomaly nu", nu_temp, ", final altitude", max(ALTITUDE_ATMOSPHERE_LIMIT, perigee_transfer), ", nu next", nu_next, ", Delta t", Delta_t.to(u.s))
-
-    # mass assumed not to change so same alpha parameter applies to all contributions
-    return impact_score_temp*alpha_param(mass)
+    return orbit_decomposition(CF_file, transfer_orbit, mass, False)
 
 def elliptical_orbit_decomposition_up(CF_file, transfer_orbit, mass):
     """ To decompose the trajectory in time spent in different orbital cell (altitude and inclination), when increasing semi-major axis (disposal orbit higher than operational one)
 
     Depends on global parameters defined by the characterization factors available
+    The time spent in each cell is computed in closed form, see decomposition_cells
 
     return
         (yr*potential_fragments/m**2 /kg) intermediate impact score
     """
+    return orbit_decomposition(CF_file, transfer_orbit, mass, True)
 
-    apogee_transfer = (transfer_orbit.r_a - Earth.R)
-    perigee_transfer = (transfer_orbit.r_p - Earth.R)
-
-    altitude_temp = perigee_transfer 
-    nu_temp = 0  * u.rad
-
-    t_temp = Orbit.time_to_anomaly(transfer_orbit, nu_temp) # time_to_anomaly based on time since periapsis
-    impact_score_temp = 0 * u.year* u.m **(-2)*u.pot_fragments
-
-    # integrates impact from perigee to LEO limit or apogee (so during maximum half an ellipse)
-    #while round((altitude_temp + ALTITUDE_INCREMENT).value) * u.km < min(ALTITUDE_LEO_LIMIT, apogee_transfer):
-    while altitude_temp + ALTITUDE_INCREMENT < min(ALTITUDE_LEO_LIMIT, apogee_transfer):
-        nu_next = get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp + ALTITUDE_INCREMENT + Earth.R)
-        t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
-        Delta_t = t_next - t_temp
-        Delta_t = Delta_t.to(u.year)
-        impact_score_temp = impact_score_temp + Delta_t*get_characterization_factor(CF_file, altitude_temp, transfer_orbit.inc)
-
-        if print_bool:
-            print("UP: altitude", altitude_temp, ", anomaly nu", nu_temp, ", altitude_next", altitude_temp + ALTITUDE_INCREMENT, ", nu next", nu_next, ", Delta t", Delta_t.to(u.s))
+def orbit_decomposition(CF_file, transfer_orbit, mass, up):
+    """ Intermediate impact score of half an elliptical orbit, going down (from apogee or LEO limit to perigee or atmospheric limit) or up (from perigee to apogee or LEO limit)
 
-        nu_temp = nu_next
-        t_temp = t_next
-        altitude_temp = altitude_temp + ALTITUDE_INCREMENT
+    return
+        (yr*potential_fragments/m**2 /kg) intermediate impact score
+    """
+    cell_times, cell_altitudes = decomposition_cells(transfer_orbit.a.to_value(u.km), transfer_orbit.ecc.to_value(u.one), up)
+    inside = ~np.isnan(cell_altitudes[0])
+    cell_times = cell_times[0, inside] * u.year
+    cell_altitudes = cell_altitudes[0, inside]
+    characterization_factor = get_characterization_factor_si(CF_file, cell_altitudes, np.full(cell_altitudes.shape, transfer_orbit.inc.to_value(u.deg)))
+    if np.isnan(characterization_factor).any():
+        raise IndexError("Orbital cell outside of the characterization factors table.")
 
-    # Last cell, Delta_t time might be smaller
-    if apogee_transfer > ALTITUDE_LEO_LIMIT:
-        nu_next = get_nu(transfer_orbit.a, transfer_orbit.ecc, ALTITUDE_LEO_LIMIT + Earth.R)
-    else:
-        nu_next = 179.99*np.pi/180 * u.rad # to avoid being exactly at pi rad which generates 0 s of time_to_anomaly
-    t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
-    Delta_t = t_next - t_temp
-    Delta_t = Delta_t.to(u.year)
-    
-    impact_score_temp = impact_score_temp + Delta_t*get_characterization_factor(CF_file, altitude_temp, transfer_orbit.inc)
-    
     if print_bool:
-        print("before last altitude", altitude_temp, ", anomaly nu", nu_temp, ", final altitude", min(ALTITUDE_LEO_LIMIT, apogee_transfer), ", nu next", nu_next, ", Delta t", Delta_t.to(u.s))
+        for cell_time, cell_altitude in zip(cell_times, cell_altitudes):
+            print("UP:" if up else "DOWN:", "altitude", cell_altitude * u.km, ", Delta t", cell_time.to(u.s))
 
     # mass assumed not to change so same alpha parameter applies to all contributions
-    return impact_score_temp*alpha_param(mass)
+    return np.sum(cell_times * characterization_factor) * u.m **(-2) * u.pot_fragments * alpha_param(mass)
 
 def get_nu(a, ecc, r):
     """ Compute the true anomaly value for a given position on the orbit
@@ -336,7 +275,8 @@ def get_characterization_factor(CF_file, altitude, inclination):
     """
 
     # find inclination index (in this case between 1 (0 deg) and 90 (178 deg), with increment of 2deg)
-    index_inc = int(np.floor(inclination.value/INCLINATION_INCREMENT.value))
+    # rounded so that inclinations converted between deg and rad (e.g. 119.99999999999999 deg) stay in their cell
+    index_inc = int(np.floor(round(inclination.to_value(u.deg), 8)/INCLINATION_INCREMENT.value))
     # find altitude index (in this case between 1 (200 km) and 37 (2000km), with increment of 50km)
     index_alt = int((round(altitude.value*2)/2 - ALTITUDE_ATMOSPHERE_LIMIT.value)/ALTITUDE_INCREMENT.value)
 
@@ -347,3 +287,264 @@ def get_characterization_factor(CF_file, altitude, inclination):
         print("CF:", characterization_factor)
 
     return characterization_factor
+
+""" Vectorised computation
+
+Same model on arrays of floats in km, deg, kg and years, used by the scalar decompositions above and by sdi_engine.py
+The time spent in each orbital cell is given in closed form by Kepler's equation, all the cell boundaries of all the orbits being computed at once
+"""
+
+# Constants of the computation, in km, deg and years
+EARTH_RADIUS_KM = Earth.R.to_value(u.km)
+EARTH_K_KM3_S2 = Earth.k.to_value(u.km ** 3 / u.s ** 2)
+EARTH_K_M3_S2 = Earth.k.to_value(u.m ** 3 / u.s ** 2)
+YEAR_S = (1 * u.year).to_value(u.s)
+ATMOSPHERE_LIMIT_KM = ALTITUDE_ATMOSPHERE_LIMIT.to_value(u.km)
+LEO_LIMIT_KM = ALTITUDE_LEO_LIMIT.to_value(u.km)
+ALTITUDE_INCREMENT_KM = ALTITUDE_INCREMENT.to_value(u.km)
+INCLINATION_INCREMENT_DEG = INCLINATION_INCREMENT.to_value(u.deg)
+TIME_INTERVAL_LIMIT_YEAR = TIME_INTERVAL_LIMIT.to_value(u.year)
+APOGEE_NU = 179.99 * np.pi / 180 # to avoid being exactly at pi rad which generates 0 s of time of flight
+
+def alpha_param_si(mass):
+    """ Vectorised alpha_param.
+
+    Args:
+        mass (np.ndarray): mass of the objects in kg
+
+    Returns:
+        (np.ndarray): alpha coefficient in 1/kg
+    """
+    return np.select([mass <= 500, mass <= 1000, mass <= 1500, mass <= 2000], [1.3, 1., 0.86, 0.8], 0.77)
+
+def get_nu_si(a, ecc, r):
+    """ Vectorised get_nu.
+
+    Args:
+        a (np.ndarray): semi-major axis in km
+        ecc (np.ndarray): eccentricity
+        r (np.ndarray): distance to the center of the Earth in km
+
+    Returns:
+        (np.ndarray): true anomaly in rad (0 <= nu <= pi)
+    """
+    return np.arccos(np.round((1 / ecc) * ((a * (1 - ecc ** 2) / r) - 1), 8))
+
+def time_since_periapsis_si(a, ecc, nu):
+    """ Time of flight from periapsis to a true anomaly on elliptical orbits (Kepler's equation), as used by
+    poliastro.twobody.Orbit.time_to_anomaly.
+
+    Args:
+        a (np.ndarray): semi-major axis in km
+        ecc (np.ndarray): eccentricity (0 <= ecc < 1)
+        nu (np.ndarray): true anomaly in rad, wrapped into [-pi, pi[
+
+    Returns:
+        (np.ndarray): time of flight in s, negative before periapsis
+    """
+    nu = (nu + np.pi) % (2 * np.pi) - np.pi
+    eccentric_anomaly = 2 * np.arctan(np.sqrt((1 - ecc) / (1 + ecc)) * np.tan(nu / 2))
+    mean_anomaly = eccentric_anomaly - ecc * np.sin(eccentric_anomaly)
+    return mean_anomaly / np.sqrt(EARTH_K_KM3_S2 * (1 - ecc) ** 3 / (a * (1 - ecc)) ** 3)
+
+def period_year_si(a):
+    """ Orbital period in years of orbits around the Earth.
+
+    Args:
+        a (np.ndarray): semi-major axis in km
+
+    Returns:
+        (np.ndarray): period in years
+    """
+    return 2 * np.pi * np.sqrt(a ** 3 / EARTH_K_KM3_S2) / YEAR_S
+
+def get_characterization_factor_si(CF_file, altitude, inclination):
+    """ Vectorised get_characterization_factor. Cells outside of the table give nan.
+
+    Args:
+        CF_file: .csv file imported with the characterization factors for each orbital cell
+        altitude (np.ndarray): altitude in km
+        inclination (np.ndarray): inclination in deg
+
+    Returns:
+        (np.ndarray): characterization factor in potential fragments per m^2
+    """
+    index_inc = np.floor(np.round(inclination, 8) / INCLINATION_INCREMENT_DEG)
+    index_alt = np.trunc((np.round(altitude * 2) / 2 - ATMOSPHERE_LIMIT_KM) / ALTITUDE_INCREMENT_KM) + 1
+    rows, columns = CF_file.shape
+    valid = (index_inc >= -rows) & (index_inc < rows) & (index_alt >= -columns) & (index_alt < columns)
+    characterization_factor = np.full(np.shape(valid), np.nan)
+    characterization_factor[valid] = CF_file[index_inc[valid].astype(int), index_alt[valid].astype(int)]
+    return characterization_factor
+
+def decomposition_cells(a, ecc, up=False):
+    """ Decompose half elliptical orbits in the orbital cells they cross, as elliptical_orbit_decomposition (down, from
+    apogee or LEO limit to perigee or atmospheric limit) and elliptical_orbit_decomposition_up (up, from perigee to
+    apogee or LEO limit). The true anomalies of all the cell boundaries are found at once and the time spent in each
+    cell is the difference of the times since periapsis of its boundaries.
+
+    Args:
+        a (np.ndarray): semi-major axis in km, one orbit per element
+        ecc (np.ndarray): eccentricity (0 < ecc < 1)
+        up (bool): True to decompose from perigee up, False to decompose from apogee down
+
+    Returns:
+        (np.ndarray): time spent in each cell in years, one row per orbit, 0 after the last cell of the orbit
+        (np.ndarray): altitude defining each cell in km, nan after the last cell of the orbit
+    """
+    a, ecc = np.broadcast_arrays(np.ravel(np.asarray(a, dtype=float)), np.ravel(np.asarray(ecc, dtype=float)))
+    apogee = a * (1 + ecc) - EARTH_RADIUS_KM
+    perigee = a * (1 - ecc) - EARTH_RADIUS_KM
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if up:
+            step = ALTITUDE_INCREMENT_KM
+            altitude = perigee
+            first_nu = np.zeros(a.shape)
+            limit = np.minimum(LEO_LIMIT_KM, apogee)
+            last_nu = np.where(apogee > LEO_LIMIT_KM, get_nu_si(a, ecc, LEO_LIMIT_KM + EARTH_RADIUS_KM), APOGEE_NU)
+        else:
+            step = -ALTITUDE_INCREMENT_KM
+            above_leo = apogee > LEO_LIMIT_KM + ALTITUDE_INCREMENT_KM
+            altitude = np.where(above_leo, LEO_LIMIT_KM, apogee)
+            first_nu = np.where(above_leo, get_nu_si(a, ecc, LEO_LIMIT_KM + EARTH_RADIUS_KM), APOGEE_NU)
+            limit = np.maximum(ATMOSPHERE_LIMIT_KM, perigee)
+            last_nu = get_nu_si(a, ecc, limit + EARTH_RADIUS_KM)
+
+        # altitudes of the cells, incremented as the cell by cell integration so that cells are identical
+        altitudes = [altitude]
+        number_cells = np.ones(a.size, dtype=int)
+        while True:
+            altitude = altitude + step
+            inside = altitude < limit if up else altitude >= limit
+            if not inside.any():
+                break
+            number_cells += inside
+            altitudes.append(altitude)
+        altitudes = np.stack(altitudes, axis=-1)
+
+        # cells of all the orbits in a flat array, the cells of an orbit being the first ones of its row
+        first_cell = np.cumsum(number_cells) - number_cells
+        last_cell = first_cell + number_cells - 1
+        orbit = np.repeat(np.arange(a.size), number_cells)
+        position = orbit * altitudes.shape[1] + np.arange(orbit.size) - np.repeat(first_cell, number_cells)
+        a_cell = a[orbit]
+        ecc_cell = ecc[orbit]
+
+        # true anomaly and time since periapsis at the start of each cell, the end of a cell being the start of the next one
+        start_nu = get_nu_si(a_cell, ecc_cell, altitudes.ravel()[position] + EARTH_RADIUS_KM)
+        start_nu[first_cell] = first_nu
+        start_time = time_since_periapsis_si(a_cell, ecc_cell, start_nu) / YEAR_S
+        end_time = np.empty(start_time.shape)
+        end_time[:-1] = start_time[1:]
+        end_time[last_cell] = time_since_periapsis_si(a, ecc, last_nu) / YEAR_S
+
+    cell_times = np.zeros(altitudes.shape)
+    cell_times.ravel()[position] = end_time - start_time if up else start_time - end_time
+    cell_altitudes = np.full(altitudes.shape, np.nan)
+    cell_altitudes.ravel()[position] = altitudes.ravel()[position]
+    return cell_times, cell_altitudes
+
+def elliptical_orbit_decomposition_si(CF_file, a, ecc, inc, mass, up=False, table=None):
+    """ Vectorised elliptical_orbit_decomposition and elliptical_orbit_decomposition_up.
+
+    Args:
+        CF_file: .csv file imported with the characterization factors for each orbital cell
+        a (np.ndarray): semi-major axis in km
+        ecc (np.ndarray): eccentricity
+        inc (np.ndarray): inclination in deg
+        mass (np.ndarray): mass in kg
+        up (bool): True to decompose from perigee up, False to decompose from apogee down
+        table (DecompositionTable): precomputed decompositions, used if it has the same direction
+
+    Returns:
+        (np.ndarray): intermediate impact score in yr*potential_fragments/m**2/kg
+    """
+    if table is not None and table.up == up:
+        cell_times, cell_altitudes = table.get(a, ecc)
+    else:
+        cell_times, cell_altitudes = decomposition_cells(a, ecc, up)
+    inside = ~np.isnan(cell_altitudes)
+    characterization_factor = np.zeros(cell_times.shape)
+    characterization_factor[inside] = get_characterization_factor_si(CF_file, cell_altitudes[inside],
+                                                                     np.repeat(np.ravel(inc), inside.sum(axis=1)))
+
+    # mass assumed not to change so same alpha parameter applies to all contributions
+    return np.sum(cell_times * characterization_factor, axis=1) * alpha_param_si(np.ravel(mass))
+
+class DecompositionTable:
+    """ Decompositions of half elliptical orbits (see decomposition_cells) precomputed over pairs of semi-major axis and
+    eccentricity, so that orbits decomposed again and again (e.g. the eccentricity steps of the natural decay) are
+    looked up. Pairs missing from the table are decomposed and added when they are looked up.
+
+    Args:
+        a (np.ndarray): semi-major axes of the precomputed pairs in km
+        ecc (np.ndarray): eccentricities of the precomputed pairs
+        up (bool): True to decompose from perigee up, False to decompose from apogee down
+
+    Attributes:
+        up (bool): True to decompose from perigee up, False to decompose from apogee down
+        rows (dict): row of each (a, ecc) pair in the table
+        cell_times (np.ndarray): time spent in each cell in years, one row per pair
+        cell_altitudes (np.ndarray): altitude defining each cell in km, one row per pair
+    """
+    def __init__(self, a=(), ecc=(), up=False):
+        self.up = up
+        self.rows = dict()
+        self.cell_times = np.zeros((0, 1))
+        self.cell_altitudes = np.full((0, 1), np.nan)
+        self.add(a, ecc)
+
+    @classmethod
+    def from_grid(cls, a, ecc, up=False):
+        """ Table over all the combinations of semi-major axes and eccentricities.
+
+        Args:
+            a (np.ndarray): semi-major axes in km
+            ecc (np.ndarray): eccentricities
+            up (bool): True to decompose from perigee up, False to decompose from apogee down
+
+        Returns:
+            DecompositionTable: table of the grid
+        """
+        a, ecc = np.meshgrid(a, ecc, indexing="ij")
+        return cls(a.ravel(), ecc.ravel(), up)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, a, ecc):
+        """ Decompose the pairs not in the table yet and add them.
+
+        Args:
+            a (np.ndarray): semi-major axes in km
+            ecc (np.ndarray): eccentricities
+        """
+        a, ecc = np.broadcast_arrays(np.ravel(np.asarray(a, dtype=float)), np.ravel(np.asarray(ecc, dtype=float)))
+        missing = [pair for pair in dict.fromkeys(zip(a.tolist(), ecc.tolist())) if pair not in self.rows]
+        if not missing:
+            return
+        cell_times, cell_altitudes = decomposition_cells(*np.array(missing).T, self.up)
+        width = max(self.cell_times.shape[1], cell_times.shape[1])
+        self.cell_times = np.concatenate([np.pad(self.cell_times, ((0, 0), (0, width - self.cell_times.shape[1]))),
+                                          np.pad(cell_times, ((0, 0), (0, width - cell_times.shape[1])))])
+        self.cell_altitudes = np.concatenate([
+            np.pad(self.cell_altitudes, ((0, 0), (0, width - self.cell_altitudes.shape[1])), constant_values=np.nan),
+            np.pad(cell_altitudes, ((0, 0), (0, width - cell_altitudes.shape[1])), constant_values=np.nan)])
+        self.rows.update(zip(missing, range(len(self.rows), len(self.rows) + len(missing))))
+
+    def get(self, a, ecc):
+        """ Decompositions of pairs of semi-major axis and eccentricity, added to the table if missing.
+
+        Args:
+            a (np.ndarray): semi-major axes in km
+            ecc (np.ndarray): eccentricities
+
+        Returns:
+            (np.ndarray): time spent in each cell in years, one row per pair
+            (np.ndarray): altitude defining each cell in km, nan after the last cell of the orbit
+        """
+        a, ecc = np.broadcast_arrays(np.ravel(np.asarray(a, dtype=float)), np.ravel(np.asarray(ecc, dtype=float)))
+        self.add(a, ecc)
+        rows = [self.rows[pair] for pair in zip(a.tolist(), ecc.tolist())]
+        return self.cell_times[rows], self.cell_altitudes[rows]
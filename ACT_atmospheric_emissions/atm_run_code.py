@@ -4,10 +4,12 @@
 # Emails:           mathieu.udriot@epfl.ch
 # Description:      Script to read input .csv file describing the trajectory and thrust curve needed to compute the atmoshperic impacts of a launch vehicle, to be used in ACT
 import os
-from io import StringIO
+
+# import tables
+from ACT_atmospheric_emissions.atm_tables import get_atm_tables, parse_trajectory, parse_thrust_curve, INTERPOLATION_PLOT_STEP
 
 # imports
-from scipy import interpolate, integrate
+from scipy import interpolate
 import numpy as np
 import astropy.units as u
 import csv
@@ -32,8 +34,6 @@ PATH_CSV_THRUST_CURVES = "ACT_atmospheric_emissions/atm_thrust_curves/"
 PATH_CSV_TRAJECTORIES = "ACT_atmospheric_emissions/atm_trajectories/"
 PATH_ATM_RESULTS = "ACT_atmospheric_emissions/atm_results/"
 
-INTERPOLATION_PLOT_STEP = 0.1
-
 plotting = False
 
 # local inputs to define launcher and engine
@@ -80,17 +80,32 @@ cutoff_timestamp = 325 *u.s # [325 *u.s, 372.8 *u.s]
 #raw_thrust_curve = np.genfromtxt(f'{PATH_CSV_THRUST_CURVES}thrust_curve_{engine}.csv', delimiter=",", skip_header=2)
 
 def atm_main(TCAT_DIR, launcher, engine, number_of_engine_s, prop_type, Isp, ignition_timestamp, cutoff_timestamp, number_of_launch_es, raw_trajectory, raw_thrust_curve, plotting = False):
+    """
+    Compute the emissions of a launcher in each layer of the atmosphere
+
+    The engine inputs (engine, number_of_engine_s, prop_type, Isp, ignition_timestamp, cutoff_timestamp, raw_thrust_curve) can be lists with one entry per engine
+    of the launcher (e.g. [1, 1, 1] engines for Vega C), the emissions of the engines are then summed in each layer
+
+    output: dict with key = name of the layer, and value is a list of the stored emissions
+    """
+
+    # tables under ACT_atmospheric_emissions, loaded once per process
+    atm_tables = get_atm_tables(TCAT_DIR)
 
+    # parsed and interpolated trajectory (once per content), Themis S1 reusable by default
     if raw_trajectory is None:
-        raw_trajectory = np.genfromtxt(f'{os.path.join(TCAT_DIR, PATH_CSV_TRAJECTORIES)}input_traj_Themis_S1_reuse.csv', delimiter=",", skip_header=2)
+        trajectory = atm_tables.trajectories["Themis_S1_reuse"]
     else:
-        raw_trajectory = np.genfromtxt(StringIO(raw_trajectory), delimiter=",", skip_header=1)
+        trajectory = parse_trajectory(raw_trajectory)
+    raw_trajectory, x_trajectory, y_trajectory = trajectory.raw, trajectory.x, trajectory.y
 
-    if raw_thrust_curve is None:
-        raw_thrust_curve = np.genfromtxt(f'{os.path.join(TCAT_DIR, PATH_CSV_THRUST_CURVES)}thrust_curve_T3_S1.csv', delimiter=",",
-                                         skip_header=2)
-    else:
-        raw_thrust_curve = np.genfromtxt(StringIO(raw_thrust_curve), delimiter=",", skip_header=1)
+    # engine inputs, one entry per engine of the launcher
+    engine_inputs = [engine, number_of_engine_s, prop_type, Isp, ignition_timestamp, cutoff_timestamp, raw_thrust_curve]
+    engine_input_lengths = {len(value) for value in engine_inputs if isinstance(value, list)}
+    if len(engine_input_lengths) > 1:
+        raise ValueError("Engine inputs must all have one entry per engine.")
+    number_of_engines = engine_input_lengths.pop() if engine_input_lengths else 1
+    engines = zip(*[value if isinstance(value, list) else [value] * number_of_engines for value in engine_inputs])
 
     # creating a list of layer classes for the global atmosphere (cumulating the emissions of every engine)
     global_low_troposphere = layer("Low_troposphere", ATM_EARTH_SURFACE, ATM_LIM_LOW_TROPOSPHERE)
@@ -110,11 +125,7 @@ def atm_main(TCAT_DIR, launcher, engine, number_of_engine_s, prop_type, Isp, ign
 
     max_kg_emission = 0
 
-    # trajectory interpolation
-    trajectory = interpolate.interp1d(raw_trajectory[:, 0], raw_trajectory[:, 1])
-    x_trajectory = np.arange(min(raw_trajectory[:, 0]), max(raw_trajectory[:, 0]) + INTERPOLATION_PLOT_STEP, INTERPOLATION_PLOT_STEP)
-    y_trajectory = trajectory(x_trajectory)
-    # plot
+    # trajectory interpolation plot
     if plotting:
         fig, ax = pyplot.subplots(figsize=(5, 2.7), layout='constrained')
         ax.plot(raw_trajectory[:, 0], raw_trajectory[:, 1], 'ro', label = "raw")
@@ -125,126 +136,99 @@ def atm_main(TCAT_DIR, launcher, engine, number_of_engine_s, prop_type, Isp, ign
         ax.legend()
         fig.savefig(PATH_ATM_RESULTS + 'atm_' + launcher+ '_trajectory.png', bbox_inches='tight', dpi=100)
 
-    # from thrust curve to prop mass flow (with Isp and g0)
-    raw_m_dot_over_time = find_propellant_mass_flow(raw_thrust_curve, Isp)
-
-    # prop mass flow interpolation
-    m_dot_over_time = interpolate.interp1d(raw_thrust_curve[:, 0], raw_m_dot_over_time)
-    x_mass_flow = np.arange(min(raw_thrust_curve[:, 0]), max(raw_thrust_curve[:, 0]) + INTERPOLATION_PLOT_STEP, INTERPOLATION_PLOT_STEP)
-    y_mass_flow = m_dot_over_time(x_mass_flow)
-    # plot
-    if plotting:
-        fig, ax = pyplot.subplots(figsize=(5, 2.7), layout='constrained')
-        ax.plot(raw_thrust_curve[:, 0], raw_m_dot_over_time, 'ro', label = "raw")
-        ax.plot(x_mass_flow, y_mass_flow, 'b--', label = "Interpolation")
-        ax.set_ylabel("propellant mass flow [kg / s]")
-        ax.set_xlabel("t [s]")
-        ax.set_title("Propellant mass flow from thrust curve")
-        ax.legend()
-        fig.savefig(PATH_ATM_RESULTS + 'atm_' + engine + '_mass_flow.png', bbox_inches='tight', dpi=100)
-
-    if x_mass_flow[-1] - x_mass_flow[0] != (cutoff_timestamp - ignition_timestamp).value:
-        raise ValueError("Burn duration inconsistant between ignition and cutoff timestamps, and thrust curve duration.")
+    # from trajectory to time spent in layers (with limits), the same for every engine
+    segment_layers, segment_starts, segment_ends = layer_segments(x_trajectory, y_trajectory, global_atmosphere)
 
     # table of emissions per type of propellant [kg per kg of prop combusted]
-    emissions_table = np.genfromtxt(os.path.join(TCAT_DIR, 'ACT_atmospheric_emissions/atm_emissions_per_propellant.csv'), delimiter=",", skip_header=2)[:,1:]
-    
-    propulsion_type_entries = np.genfromtxt(os.path.join(TCAT_DIR, 'ACT_atmospheric_emissions/atm_emissions_per_propellant.csv'), delimiter=",", skip_header=2, usecols=0, dtype=str)
-
-    # creating list of layer classes for the atmosphere (reset to 0  for each engine)
-    low_troposphere = layer("Low_troposphere", ATM_EARTH_SURFACE, ATM_LIM_LOW_TROPOSPHERE)
-    high_troposphere = layer("High_troposphere", ATM_LIM_LOW_TROPOSPHERE, ATM_LIM_OZONE_LOW)
-    ozone_layer = layer("Ozone_layer", ATM_LIM_OZONE_LOW, ATM_LIM_OZONE_HIGH)
-    stratosphere = layer("Stratosphere", ATM_LIM_OZONE_HIGH, ATM_LIM_STRATOSPHERE)
-    mesosphere = layer("Mesosphere", ATM_LIM_STRATOSPHERE, ATM_LIM_MESOSPHERE)
-    thermosphere = layer("Thermosphere", ATM_LIM_MESOSPHERE, ALTITUDE_ATMOSPHERE_LIMIT)
-    outer_space = layer("Outer_space", ALTITUDE_ATMOSPHERE_LIMIT, np.inf * u.km)
-    atmosphere = [low_troposphere, high_troposphere, ozone_layer, stratosphere, mesosphere, thermosphere, outer_space]
-
-    ### To use for finer atmospheric decomposition (also above for "global_atmosphere")
-    # atmosphere = list()
-    # for i in range(int(ALTITUDE_ATMOSPHERE_LIMIT.value/ATM_INCREMENT.value)):
-    #     atmosphere.append(layer(f"{i}", i*ATM_INCREMENT, (i+1)*ATM_INCREMENT))
-    # atmosphere.append(layer("Outer_space", ALTITUDE_ATMOSPHERE_LIMIT, np.inf * u.km))
+    emission_factors = atm_tables.emission_factors
 
-    # from trajectory to time spent in layers (with limits)
-    current_layer_index = 0
-    ascending = True
-    altitude_temp = ATM_EARTH_SURFACE
-    time_temp = 0 * u.s
-    i = 0
-    current_layer = atmosphere[current_layer_index]
-    print("Take-off !")
+    for engine, number_of_engine_s, prop_type, Isp, ignition_timestamp, cutoff_timestamp, raw_thrust_curve in engines:
 
-    while i < len(x_trajectory) - 2:
-        if ascending:
-            while y_trajectory[i] < current_layer.get_upper_bound().value and i < len(x_trajectory) - 2:
-                i += 1
-                if y_trajectory[i] > y_trajectory[i+1]:
-                    ascending = False
-                    altitude_temp = y_trajectory[i] * u.km
-                    # print(i, "Altitude", altitude_temp, ", ascending", ascending)
-                    break
-            if i == len(x_trajectory) - 2:
-                time_final = x_trajectory[i] * u.s
-                integrate_mass_flow(m_dot_over_time, ignition_timestamp, cutoff_timestamp, time_temp, time_final, current_layer, propulsion_type_entries, emissions_table, prop_type, number_of_engine_s)
-                pass
-            elif ascending: # meaning we are moving one layer above
-                altitude_temp = y_trajectory[i] * u.km
-                # print(i, "Altitude", altitude_temp, ", ascending", ascending)
-                time_final = x_trajectory[i] * u.s
-                integrate_mass_flow(m_dot_over_time, ignition_timestamp, cutoff_timestamp, time_temp, time_final, current_layer, propulsion_type_entries, emissions_table, prop_type, number_of_engine_s)
-                time_temp = time_final
-                current_layer_index += 1
-                current_layer = atmosphere[current_layer_index]
-                if current_layer_index == len(atmosphere) - 1:
-                    print("Going out of atmosphere")
+        # parsed thrust curve (once per content), Themis T3 first stage by default
+        if raw_thrust_curve is None:
+            thrust_curve = atm_tables.thrust_curves["T3_S1"]
         else:
-            while y_trajectory[i] > current_layer.get_lower_bound().value and i < len(x_trajectory) - 2:
-                i += 1
-                if y_trajectory[i] < y_trajectory[i+1]:
-                    ascending = True
-                    altitude_temp = y_trajectory[i] * u.km
-                    # print(i, "Altitude", altitude_temp, ", ascending", ascending)
-                    break
-            if i == len(x_trajectory) - 2:
-                time_final = x_trajectory[i] * u.s
-                integrate_mass_flow(m_dot_over_time, ignition_timestamp, cutoff_timestamp, time_temp, time_final, current_layer, propulsion_type_entries, emissions_table, prop_type, number_of_engine_s)
-                if y_trajectory[-1] == 0:
-                    print("Landed back.")
-                pass
-            elif not ascending: # meaning we are moving one layer below
-                altitude_temp = y_trajectory[i] * u.km
-                # print(i, "Altitude", altitude_temp, ", ascending", ascending)
-                time_final = x_trajectory[i] * u.s
-                integrate_mass_flow(m_dot_over_time, ignition_timestamp, cutoff_timestamp, time_temp, time_final, current_layer, propulsion_type_entries, emissions_table, prop_type, number_of_engine_s)
-                time_temp = time_final
-                current_layer_index -= 1
-                current_layer = atmosphere[current_layer_index]
+            thrust_curve = parse_thrust_curve(raw_thrust_curve)
+        raw_thrust_curve = thrust_curve.raw
+
+        # from thrust curve to prop mass flow (with Isp and g0)
+        raw_m_dot_over_time = find_propellant_mass_flow(raw_thrust_curve, Isp)
+
+        # prop mass flow interpolation plot
+        if plotting:
+            m_dot_over_time = interpolate.interp1d(raw_thrust_curve[:, 0], raw_m_dot_over_time)
+            x_mass_flow = thrust_curve.x
+            y_mass_flow = m_dot_over_time(x_mass_flow)
+            fig, ax = pyplot.subplots(figsize=(5, 2.7), layout='constrained')
+            ax.plot(raw_thrust_curve[:, 0], raw_m_dot_over_time, 'ro', label = "raw")
+            ax.plot(x_mass_flow, y_mass_flow, 'b--', label = "Interpolation")
+            ax.set_ylabel("propellant mass flow [kg / s]")
+            ax.set_xlabel("t [s]")
+            ax.set_title("Propellant mass flow from thrust curve")
+            ax.legend()
+            fig.savefig(PATH_ATM_RESULTS + 'atm_' + engine + '_mass_flow.png', bbox_inches='tight', dpi=100)
+
+        if thrust_curve.duration != (cutoff_timestamp - ignition_timestamp).value:
+            raise ValueError("Burn duration inconsistant between ignition and cutoff timestamps, and thrust curve duration.")
+
+        if not prop_type in emission_factors:
+            raise ValueError("Emissions from this propulsion type are not known.")
 
-    # Prepare printing results in a csv output file and results in a dictionary
-    results_file_path = os.path.join(TCAT_DIR, PATH_ATM_RESULTS + "atm_" + launcher + "_" + engine + "_emissions.csv")
-    header = ["Layer", "CO", "CO2", "H2O", "H", "O", "OH", "N2", "NO", "Al", "HCl", "Cl", "soot (BC)"]
+        # creating list of layer classes for the atmosphere (reset to 0  for each engine)
+        low_troposphere = layer("Low_troposphere", ATM_EARTH_SURFACE, ATM_LIM_LOW_TROPOSPHERE)
+        high_troposphere = layer("High_troposphere", ATM_LIM_LOW_TROPOSPHERE, ATM_LIM_OZONE_LOW)
+        ozone_layer = layer("Ozone_layer", ATM_LIM_OZONE_LOW, ATM_LIM_OZONE_HIGH)
+        stratosphere = layer("Stratosphere", ATM_LIM_OZONE_HIGH, ATM_LIM_STRATOSPHERE)
+        mesosphere = layer("Mesosphere", ATM_LIM_STRATOSPHERE, ATM_LIM_MESOSPHERE)
+        thermosphere = layer("Thermosphere", ATM_LIM_MESOSPHERE, ALTITUDE_ATMOSPHERE_LIMIT)
+        outer_space = layer("Outer_space", ALTITUDE_ATMOSPHERE_LIMIT, np.inf * u.km)
+        atmosphere = [low_troposphere, high_troposphere, ozone_layer, stratosphere, mesosphere, thermosphere, outer_space]
+
+        ### To use for finer atmospheric decomposition (also above for "global_atmosphere")
+        # atmosphere = list()
+        # for i in range(int(ALTITUDE_ATMOSPHERE_LIMIT.value/ATM_INCREMENT.value)):
+        #     atmosphere.append(layer(f"{i}", i*ATM_INCREMENT, (i+1)*ATM_INCREMENT))
+        # atmosphere.append(layer("Outer_space", ALTITUDE_ATMOSPHERE_LIMIT, np.inf * u.km))
+
+        # test if engine is ignited in each segment, and find applicable integral boundaries
+        ignited = (ignition_timestamp.to_value(u.s) <= segment_ends) & (cutoff_timestamp.to_value(u.s) >= segment_starts)
+        for i in segment_layers[~ignited]:
+            print(f"Engine not ignited in this layer ({atmosphere[i].name}).")
+        t_0 = np.maximum(segment_starts[ignited], ignition_timestamp.to_value(u.s)) - ignition_timestamp.to_value(u.s)
+        t_f = np.minimum(segment_ends[ignited], cutoff_timestamp.to_value(u.s)) - ignition_timestamp.to_value(u.s)
+        mass_propellant_burnt = integrate_mass_flow(raw_thrust_curve[:, 0], raw_m_dot_over_time, t_0, t_f)
+
+        for i in range(len(atmosphere)):
+            in_layer = segment_layers == i
+            atmosphere[i].add_to_duration(np.sum(segment_ends[in_layer] - segment_starts[in_layer]) * u.s)
+            if np.any(ignited[in_layer]):
+                atmosphere[i].change_affected_state()
+                atmosphere[i].add_emissions(emission_factors[prop_type], np.sum(mass_propellant_burnt[in_layer[ignited]]), number_of_engine_s)
+
+        # Prepare printing results in a csv output file and results in a dictionary
+        results_file_path = os.path.join(TCAT_DIR, PATH_ATM_RESULTS + "atm_" + launcher + "_" + engine + "_emissions.csv")
+        header = ["Layer", "CO", "CO2", "H2O", "H", "O", "OH", "N2", "NO", "Al", "HCl", "Cl", "soot (BC)"]
+
+        #with open(results_file_path, 'w') as w_file:
+        #    writer = csv.writer(w_file)
+        #    writer.writerow(header)
+
+        for i in range(len(atmosphere)):
+            atm_layer = atmosphere[i]
+            atm_layer.scale_by_launch_es(number_of_launch_es)
+            # add total emissions in global layer to sum the contribution of different engines
+            for j in range(len(atm_layer.stored_emissions)):
+                global_atmosphere[i].stored_emissions[j] = global_atmosphere[i].stored_emissions[j] + atm_layer.stored_emissions[j]
+            if max(global_atmosphere[i].stored_emissions) > max_kg_emission:
+                max_kg_emission = max(global_atmosphere[i].stored_emissions)
+
+            #atm_layer.write_results(results_file_path)
+            #if plotting:
+            #    atm_layer.plot_emissions_bar_chart(header, engine, launcher, number_of_launch_es)
 
-    #with open(results_file_path, 'w') as w_file:
-    #    writer = csv.writer(w_file)
-    #    writer.writerow(header)
-    
     atm_results_dict = {}
-
-    for i in range(len(atmosphere)):
-        atm_layer = atmosphere[i]
-        atm_results_dict[atm_layer.name] = atm_layer.stored_emissions
-        atm_layer.scale_by_launch_es(number_of_launch_es)
-        # add total emissions in global layer to sum the contribution of different engines
-        for j in range(len(atm_layer.stored_emissions)):
-            global_atmosphere[i].stored_emissions[j] = global_atmosphere[i].stored_emissions[j] + atm_layer.stored_emissions[j]
-        if max(global_atmosphere[i].stored_emissions) > max_kg_emission:
-            max_kg_emission = max(global_atmosphere[i].stored_emissions)
-
-        #atm_layer.write_results(results_file_path)
-        #if plotting:
-        #    atm_layer.plot_emissions_bar_chart(header, engine, launcher, number_of_launch_es)
+    for global_layer in global_atmosphere:
+        atm_results_dict[global_layer.name] = global_layer.stored_emissions
 
     # Global plot of all contributions when there is a loop inside the function (input several engines of the same launcher)
     # y_pos = list(np.arange(len(header)-1))
@@ -259,40 +243,128 @@ def atm_main(TCAT_DIR, launcher, engine, number_of_engine_s, prop_type, Isp, ign
 
     # return json from dict() with key = name of the layer, and value is a list of the stored emissions (following the order "CO", "CO2", "H2O", "H", "O", "OH", "N2", "NO", "Al", "HCl", "Cl", "soot (BC)")
     return atm_results_dict
+
+def atm_main_batch(TCAT_DIR, inputs):
+    """
+    atm_main for a list of launchers, the emissions table being loaded once
+    An input that is not valid gets an error message, without affecting the other inputs
+
+    inputs: list of dict with the arguments of atm_main (without TCAT_DIR)
+    output: list of results of atm_main (None if the input failed) and list of error messages (None if the input was computed), in the same order
+    """
+    results = [None] * len(inputs)
+    errors = [None] * len(inputs)
+    for index, arguments in enumerate(inputs):
+        try:
+            results[index] = atm_main(TCAT_DIR, **arguments)
+        except (ValueError, TypeError, KeyError) as error:
+            errors[index] = str(error)
+    return results, errors
+
+def layer_segments(x_trajectory, y_trajectory, atmosphere):
+    """
+    Find the timestamps at which the trajectory crosses the limit between two layers
+
+    The layer is left when the altitude reaches its upper bound (ascending) or its lower bound (descending), the trajectory
+    going up or down again is found from the altitude differences (np.diff). Between two events the altitude is monotonic,
+    so the next crossing is found with np.searchsorted
+
+    output: arrays of layer index (in atmosphere), start and end timestamps [s] of each segment
+    """
+    lower_bounds = [atm_layer.get_lower_bound().to_value(u.km) for atm_layer in atmosphere]
+    upper_bounds = [atm_layer.get_upper_bound().to_value(u.km) for atm_layer in atmosphere]
+    altitude_differences = np.diff(y_trajectory)
+    going_down = np.flatnonzero(altitude_differences < 0)
+    going_up = np.flatnonzero(altitude_differences > 0)
+    last = len(x_trajectory) - 2
+
+    segment_layers = list()
+    segment_starts = list()
+    segment_ends = list()
+    current_layer_index = 0
+    ascending = True
+    time_temp = 0
+    i = 0
+    print("Take-off !")
+
+    while i < last:
+        # next point where the direction changes (or end of the trajectory), the trajectory is monotonic up to there
+        turns = going_down if ascending else going_up
+        next_turn = np.searchsorted(turns, i + 1)
+        turn = min(turns[next_turn], last) if next_turn < len(turns) else last
+        # first point reaching the limit of the current layer
+        if ascending:
+            limit = upper_bounds[current_layer_index]
+            if y_trajectory[i] >= limit:
+                crossing = i
+            else:
+                crossing = i + 1 + np.searchsorted(y_trajectory[i + 1:turn + 1], limit, side='left')
+        else:
+            limit = lower_bounds[current_layer_index]
+            if y_trajectory[i] <= limit:
+                crossing = i
+            else:
+                crossing = i + 1 + np.searchsorted(-y_trajectory[i + 1:turn + 1], -limit, side='left')
+
+        if crossing < turn: # meaning we are moving one layer above (or below)
+            segment_layers.append(current_layer_index % len(atmosphere))
+            segment_starts.append(time_temp)
+            segment_ends.append(x_trajectory[crossing])
+            time_temp = x_trajectory[crossing]
+            i = crossing
+            if ascending:
+                current_layer_index += 1
+                if current_layer_index == len(atmosphere) - 1:
+                    print("Going out of atmosphere")
+            else:
+                current_layer_index -= 1
+        elif turn < last:
+            ascending = not ascending
+            i = turn
+        else:
+            segment_layers.append(current_layer_index % len(atmosphere))
+            segment_starts.append(time_temp)
+            segment_ends.append(x_trajectory[last])
+            if not ascending and y_trajectory[-1] == 0:
+                print("Landed back.")
+            i = last
+
+    return np.array(segment_layers, dtype=int), np.array(segment_starts, dtype=float), np.array(segment_ends, dtype=float)
       
 def find_propellant_mass_flow(thrust_curve, Isp):
     """
     Translate thust datapoints into propellant mass flow using the specific impulse [s] and the g0 constant
 
-    output: list of propellant mass flow datapoints
+    output: array of propellant mass flow datapoints
     """
-    m_dot_over_time = list()
-    for i in range(len(thrust_curve[:, 0])):
-        m_dot_over_time.append(thrust_curve[i, 1] * 1000 / Isp.value / g0.value) # convert to N from kN
-    return m_dot_over_time
+    return thrust_curve[:, 1] * 1000 / Isp.value / g0.value # convert to N from kN
 
-def integrate_mass_flow(m_dot_over_time, ignition_timestamp, cutoff_timestamp,  t_0, t_f, current_layer, propulsion_type_entries, emissions_table, prop_type, number_of_engine_s):
+def integrate_mass_flow(thrust_curve_time, m_dot_over_time, t_0, t_f):
     """
-    Integrate mass flow interpolation function between two timestamps
+    Integrate the mass flow interpolation function (linear between datapoints) between arrays of timestamps
 
-    Call layer class method to add the emissions associated with the burnt propellant
+    Uses the cumulative trapezoid over the datapoints, exact for the linear interpolation: the mass burnt between t_0 and t_f is the mass
+    from t_0 to the next datapoint, plus the cumulated mass between the datapoints, plus the mass from the last datapoint to t_f
+
+    output: array of propellant mass burnt between each pair of timestamps [kg]
     """
-    current_layer.add_to_duration(t_f-t_0)
-    # test if engine is ignited between integral boundaries
-    if ignition_timestamp > t_f or cutoff_timestamp < t_0:
-        print(f"Engine not ignited in this layer ({current_layer.name}).")
-        pass
-    else:
-        current_layer.change_affected_state()
-        # find applicable integral boundaries
-        if ignition_timestamp > t_0:
-            t_0 = ignition_timestamp
-        if cutoff_timestamp < t_f:
-            t_f = cutoff_timestamp
-        
-        mass_propellant_burnt = integrate.quad(m_dot_over_time, (t_0 - ignition_timestamp).value, (t_f - ignition_timestamp).value)
+    if np.any(t_0 < thrust_curve_time[0]) or np.any(t_f > thrust_curve_time[-1]):
+        raise ValueError("Burn timestamps outside of the thrust curve.")
+    cumulated_mass = np.concatenate(([0], np.cumsum(np.diff(thrust_curve_time) * (m_dot_over_time[1:] + m_dot_over_time[:-1]) / 2)))
 
-        current_layer.add_emissions(prop_type, propulsion_type_entries, emissions_table, mass_propellant_burnt, number_of_engine_s)
+    def interpolate_mass_flow(t):
+        # index of the datapoint before t, and mass flow at t
+        i = np.clip(np.searchsorted(thrust_curve_time, t, side='right') - 1, 0, len(thrust_curve_time) - 2)
+        step = thrust_curve_time[i + 1] - thrust_curve_time[i]
+        fraction = np.divide(t - thrust_curve_time[i], step, out=np.zeros(np.shape(t)), where=step > 0)
+        return i, m_dot_over_time[i] + fraction * (m_dot_over_time[i + 1] - m_dot_over_time[i])
+
+    i_0, m_dot_0 = interpolate_mass_flow(t_0)
+    i_f, m_dot_f = interpolate_mass_flow(t_f)
+    mass_propellant_burnt = ((thrust_curve_time[i_0 + 1] - t_0) * (m_dot_0 + m_dot_over_time[i_0 + 1]) / 2 + cumulated_mass[i_f] - cumulated_mass[i_0 + 1]
+                             + (t_f - thrust_curve_time[i_f]) * (m_dot_over_time[i_f] + m_dot_f) / 2)
+    # both timestamps between the same datapoints
+    return np.where(i_0 == i_f, (t_f - t_0) * (m_dot_0 + m_dot_f) / 2, mass_propellant_burnt)
 
 
 class layer:
@@ -322,15 +394,9 @@ class layer:
     def get_duration(self):
         return self.duration 
 
-    def add_emissions(self, prop_type, propulsion_type_entries, emissions_table, mass_propellant_burnt, number_of_engine_s):
-        if not prop_type in propulsion_type_entries:
-            raise ValueError("Emissions from this propulsion type are not known.")
-        else:
-            i = 0
-            while propulsion_type_entries[i] != prop_type:
-                i += 1
-            for j in range(len(emissions_table[i, :])):
-                self.stored_emissions[j] = self.stored_emissions[j] + number_of_engine_s*mass_propellant_burnt[0]*emissions_table[i, j]
+    def add_emissions(self, emission_factors, mass_propellant_burnt, number_of_engine_s):
+        for j in range(len(emission_factors)):
+            self.stored_emissions[j] = self.stored_emissions[j] + number_of_engine_s*mass_propellant_burnt*emission_factors[j]
             
     def scale_by_launch_es(self, number_of_launch_es):
         for i in range(len(self.stored_emissions)):
@@ -0,0 +1,165 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Tables of the atmospheric emissions code (emissions per propellant, reference trajectories and thrust curves) loaded once per process,
+#                   and curves submitted to the API parsed once per content
+
+# imports
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import StringIO
+
+import numpy as np
+from scipy import interpolate
+
+PATH_ATM_EMISSIONS_TABLE = "ACT_atmospheric_emissions/atm_emissions_per_propellant.csv"
+PATH_ATM_THRUST_CURVES = "ACT_atmospheric_emissions/atm_thrust_curves/"
+PATH_ATM_TRAJECTORIES = "ACT_atmospheric_emissions/atm_trajectories/"
+
+# species of the emissions table, in the order of the columns
+EMISSION_SPECIES = ["CO", "CO2", "H2O", "H", "O", "OH", "N2", "NO", "Al", "HCl", "Cl", "soot (BC)"]
+
+INTERPOLATION_PLOT_STEP = 0.1
+
+# Registries loaded in the process, by TCAT directory
+ATM_TABLES = dict()
+ATM_TABLES_LOCK = threading.Lock()
+
+# Curves submitted as .csv text, by content hash (least recently used are dropped first)
+PARSED_CURVES = OrderedDict()
+PARSED_CURVES_LOCK = threading.Lock()
+PARSED_CURVES_MAX_SIZE = 256
+
+
+def get_atm_tables(TCAT_DIR):
+    """ Returns the registry of the tables under ACT_atmospheric_emissions, loaded and validated at first use.
+
+    Args:
+        TCAT_DIR: directory of TCAT
+
+    Returns:
+        ATMTables: registry of the tables
+    """
+    key = os.path.abspath(TCAT_DIR)
+    with ATM_TABLES_LOCK:
+        if key not in ATM_TABLES:
+            ATM_TABLES[key] = ATMTables(TCAT_DIR)
+        return ATM_TABLES[key]
+
+
+def parse_trajectory(raw_trajectory):
+    """ Parses the .csv text of a trajectory (timestamp [s], altitude [km], with one header line), once per content.
+
+    Returns:
+        Trajectory: parsed and interpolated trajectory
+    """
+    return parsed_curve("trajectory", raw_trajectory, Trajectory)
+
+
+def parse_thrust_curve(raw_thrust_curve):
+    """ Parses the .csv text of a thrust curve (timestamp [s], thrust [kN], with one header line), once per content.
+
+    Returns:
+        ThrustCurve: parsed thrust curve
+    """
+    return parsed_curve("thrust curve", raw_thrust_curve, ThrustCurve)
+
+
+def parsed_curve(kind, raw_curve, curve_class):
+    key = (kind, hashlib.sha256(raw_curve.encode()).hexdigest())
+    with PARSED_CURVES_LOCK:
+        if key in PARSED_CURVES:
+            PARSED_CURVES.move_to_end(key)
+            return PARSED_CURVES[key]
+
+    curve = curve_class(read_curve(StringIO(raw_curve), 1, kind))
+
+    with PARSED_CURVES_LOCK:
+        PARSED_CURVES[key] = curve
+        while len(PARSED_CURVES) > PARSED_CURVES_MAX_SIZE:
+            PARSED_CURVES.popitem(last=False)
+    return curve
+
+
+def read_curve(source, skip_header, name):
+    """ Reads a curve from a .csv file or text and verifies it: at least two datapoints, with finite timestamps and values in the first two columns.
+
+    Raises ValueError if the curve is not valid.
+
+    Returns:
+        (np.ndarray): datapoints of the curve (read-only)
+    """
+    curve = np.genfromtxt(source, delimiter=",", skip_header=skip_header)
+    if curve.ndim != 2 or curve.shape[0] < 2 or curve.shape[1] < 2:
+        raise ValueError(f"The {name} must have at least two datapoints with a timestamp and a value.")
+    if not np.all(np.isfinite(curve[:, :2])):
+        raise ValueError(f"The {name} has missing or non numeric timestamps or values.")
+    curve.flags.writeable = False
+    return curve
+
+
+class Trajectory:
+    """ Trajectory of a launcher, interpolated every INTERPOLATION_PLOT_STEP seconds (see atm_main). """
+
+    def __init__(self, raw_trajectory):
+        self.raw = raw_trajectory
+        self.interpolation = interpolate.interp1d(raw_trajectory[:, 0], raw_trajectory[:, 1])
+        self.x = np.arange(min(raw_trajectory[:, 0]), max(raw_trajectory[:, 0]) + INTERPOLATION_PLOT_STEP, INTERPOLATION_PLOT_STEP)
+        self.y = self.interpolation(self.x)
+        self.x.flags.writeable = False
+        self.y.flags.writeable = False
+
+
+class ThrustCurve:
+    """ Thrust curve of an engine, with its duration on the interpolation grid (see atm_main). """
+
+    def __init__(self, raw_thrust_curve):
+        self.raw = raw_thrust_curve
+        self.x = np.arange(min(raw_thrust_curve[:, 0]), max(raw_thrust_curve[:, 0]) + INTERPOLATION_PLOT_STEP, INTERPOLATION_PLOT_STEP)
+        self.x.flags.writeable = False
+        self.duration = self.x[-1] - self.x[0]
+
+
+class ATMTables:
+    """ Tables under ACT_atmospheric_emissions, loaded and validated once.
+
+    Args:
+        TCAT_DIR: directory of TCAT
+
+    Attributes:
+        emission_factors (dict): emissions [kg per kg of prop combusted] of each propellant type, following the order of EMISSION_SPECIES
+        trajectories (dict): reference Trajectory of each launcher (atm_trajectories/input_traj_<launcher>.csv)
+        thrust_curves (dict): reference ThrustCurve of each engine (atm_thrust_curves/thrust_curve_<engine>.csv)
+    """
+
+    def __init__(self, TCAT_DIR):
+        self.emission_factors = self.read_emission_factors(os.path.join(TCAT_DIR, PATH_ATM_EMISSIONS_TABLE))
+
+        self.trajectories = dict()
+        for file_name, name in self.list_tables(os.path.join(TCAT_DIR, PATH_ATM_TRAJECTORIES), "input_traj_"):
+            self.trajectories[name] = Trajectory(read_curve(os.path.join(TCAT_DIR, PATH_ATM_TRAJECTORIES, file_name), 2, f"trajectory {file_name}"))
+
+        self.thrust_curves = dict()
+        for file_name, name in self.list_tables(os.path.join(TCAT_DIR, PATH_ATM_THRUST_CURVES), "thrust_curve_"):
+            self.thrust_curves[name] = ThrustCurve(read_curve(os.path.join(TCAT_DIR, PATH_ATM_THRUST_CURVES, file_name), 2, f"thrust curve {file_name}"))
+
+    @staticmethod
+    def list_tables(directory, prefix):
+        return [(file_name, file_name[len(prefix):-len(".csv")]) for file_name in sorted(os.listdir(directory)) if file_name.startswith(prefix) and file_name.endswith(".csv")]
+
+    @staticmethod
+    def read_emission_factors(emissions_file_path):
+        emissions_table = np.genfromtxt(emissions_file_path, delimiter=",", skip_header=2)[:, 1:]
+        propulsion_type_entries = np.genfromtxt(emissions_file_path, delimiter=",", skip_header=2, usecols=0, dtype=str)
+        if emissions_table.shape[1] != len(EMISSION_SPECIES):
+            raise ValueError(f"The emissions table must give the emissions of {len(EMISSION_SPECIES)} species.")
+        if not np.all(np.isfinite(emissions_table)) or np.any(emissions_table < 0):
+            raise ValueError("The emissions table must only hold positive numbers.")
+
+        emission_factors = dict()
+        for i in range(len(propulsion_type_entries)):
+            emissions = emissions_table[i, :]
+            emissions.flags.writeable = False
+            emission_factors.setdefault(str(propulsion_type_entries[i]), emissions)
+        return emission_factors
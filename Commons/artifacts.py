@@ -0,0 +1,317 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Deferred artifacts (plots and animations) of a scenario. The simulation records what should be
+#                   plotted in .artifact.npz files, the figures are rendered afterwards or in parallel. Pending
+#                   artifacts of a results folder can be rendered later with:
+#                   python -m Commons.artifacts PATH_TO_RESULTS_FOLDER
+
+# Import libraries
+import concurrent.futures
+import glob
+import logging
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+from scipy import interpolate
+from matplotlib import pyplot, animation
+from PIL import Image
+
+# Rendering modes
+RENDERING_PARALLEL = "parallel"  # artifacts are rendered by a worker process while the simulation goes on
+RENDERING_AFTER = "after"  # artifacts are rendered once the simulation is over
+RENDERING_NONE = "none"  # artifacts are only recorded, they can be rendered later (see render_folder_artifacts)
+RENDERING_MODES = [RENDERING_PARALLEL, RENDERING_AFTER, RENDERING_NONE]
+
+# Extension of the recorded artifacts, the rendered files share the same name with their own extension
+ARTIFACT_EXTENSION = ".artifact.npz"
+
+# Thumbnails of the published files (first frame of animations), as <folder>/thumbnails/<file name>.png
+THUMBNAIL_FOLDER = "thumbnails"
+THUMBNAIL_SIZE = 480
+
+
+class ArtifactPipeline:
+    """ Collects the artifacts recorded during a scenario and renders them according to the rendering mode.
+
+    Args:
+        folder (str): folder of the recorded and rendered artifacts
+        rendering (str): rendering mode, one of RENDERING_MODES
+
+    Attributes:
+        folder (str): folder of the recorded and rendered artifacts
+        rendering (str): rendering mode, one of RENDERING_MODES
+        recorded (list(str)): paths of the artifacts recorded so far
+        executor (concurrent.futures.ProcessPoolExecutor): worker rendering the artifacts in parallel mode
+        futures (list(concurrent.futures.Future)): artifacts submitted to the worker
+    """
+    def __init__(self, folder, rendering=RENDERING_PARALLEL):
+        if rendering not in RENDERING_MODES:
+            raise ValueError(f"Unknown artifacts rendering mode {rendering}, use one of {RENDERING_MODES}.")
+        # Daemonic processes (e.g. sweep workers) cannot start a worker of their own
+        if rendering == RENDERING_PARALLEL and multiprocessing.current_process().daemon:
+            rendering = RENDERING_AFTER
+        self.folder = folder
+        self.rendering = rendering
+        self.recorded = []
+        self.executor = None
+        self.futures = []
+
+    def record(self, name, kind, **data):
+        """ Record an artifact and, in parallel mode, submit it to the rendering worker.
+
+        Args:
+            name (str): artifact name, used for the recorded and rendered files
+            kind (str): artifact kind, key of ARTIFACT_RENDERERS
+            data: arrays and values needed to render the artifact
+
+        Return:
+            (str): path to the recorded artifact
+        """
+        path = record_artifact(os.path.join(self.folder, name), kind, **data)
+        self.recorded.append(path)
+        if self.rendering == RENDERING_PARALLEL:
+            if self.executor is None:
+                # the worker is spawned, not forked: a fork copies the locks held by the threads of the simulation
+                # (e.g. the kaleido renderer), which can deadlock the worker and the exit of the interpreter
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            self.futures.append(self.executor.submit(render_artifact, path))
+        return path
+
+    def finish(self):
+        """ Render the recorded artifacts not rendered yet, or wait for the rendering worker in parallel mode.
+        Rendering errors are logged, they do not affect the scenario.
+
+        Return:
+            (list(str)): paths to the rendered files
+        """
+        rendered = []
+        if self.rendering == RENDERING_AFTER:
+            for path in self.recorded:
+                try:
+                    rendered.extend(render_artifact(path))
+                except Exception:
+                    logging.exception(f"Rendering of {path} failed")
+        elif self.rendering == RENDERING_PARALLEL:
+            for future in self.futures:
+                try:
+                    rendered.extend(future.result())
+                except Exception:
+                    logging.exception("Rendering of an artifact failed")
+            if self.executor is not None:
+                self.executor.shutdown()
+            self.executor = None
+            self.futures = []
+        return rendered
+
+
+def record_artifact(path, kind, **data):
+    """ Save the data of an artifact, the file is replaced atomically so that a renderer never reads a partial file.
+
+    Args:
+        path (str): path of the artifact without extension
+        kind (str): artifact kind, key of ARTIFACT_RENDERERS
+        data: arrays and values needed to render the artifact
+
+    Return:
+        (str): path to the recorded artifact
+    """
+    if kind not in ARTIFACT_RENDERERS:
+        raise ValueError(f"Unknown artifact kind {kind}, use one of {list(ARTIFACT_RENDERERS)}.")
+    artifact_path = path + ARTIFACT_EXTENSION
+    temporary_path = artifact_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        np.savez(file, kind=kind, **data)
+    os.replace(temporary_path, artifact_path)
+    return artifact_path
+
+
+def get_thumbnail_path(path):
+    """ Path of the thumbnail of a published file.
+
+    Args:
+        path (str): path of the published file
+
+    Return:
+        (str): path of its thumbnail
+    """
+    return os.path.join(os.path.dirname(path), THUMBNAIL_FOLDER, os.path.basename(path) + ".png")
+
+
+def publish_file(path, save):
+    """ Write a rendered file (plot, animation) atomically with its thumbnail, so that a reader (e.g. the app serving
+    the plots of a run) never reads a partial file, and finds the thumbnail once the file is there.
+
+    Args:
+        path (str): path of the published file
+        save (function): writes the file to the path it is given, which has the same extension as path
+
+    Return:
+        (str): path of the published file
+    """
+    root, extension = os.path.splitext(path)
+    temporary_path = f"{root}.{os.getpid()}.tmp{extension}"
+    try:
+        save(temporary_path)
+        try:
+            write_thumbnail(temporary_path, get_thumbnail_path(path))
+        except Exception:
+            logging.exception(f"Thumbnail of {path} failed")
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return path
+
+
+def write_thumbnail(image_path, thumbnail_path):
+    """ Write the thumbnail of an image (first frame of an animation) atomically.
+
+    Args:
+        image_path (str): path of the image
+        thumbnail_path (str): path of the thumbnail
+    """
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    temporary_path = f"{thumbnail_path}.{os.getpid()}.tmp"
+    with Image.open(image_path) as image:
+        image.seek(0)
+        thumbnail = image.convert("RGBA")
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    thumbnail.save(temporary_path, format="PNG", optimize=True)
+    os.replace(temporary_path, thumbnail_path)
+
+
+def load_artifact(artifact_path):
+    """ Load the data of a recorded artifact.
+
+    Args:
+        artifact_path (str): path to the recorded artifact
+
+    Return:
+        (str, dict): artifact kind and data, 0-d arrays being converted to scalars
+    """
+    with np.load(artifact_path, allow_pickle=False) as file:
+        data = {key: file[key][()] if file[key].ndim == 0 else file[key] for key in file.files}
+    return str(data.pop("kind")), data
+
+
+def render_artifact(artifact_path):
+    """ Render a recorded artifact next to it.
+
+    Args:
+        artifact_path (str): path to the recorded artifact
+
+    Return:
+        (list(str)): paths to the rendered files
+    """
+    kind, data = load_artifact(artifact_path)
+    return ARTIFACT_RENDERERS[kind](artifact_path[:-len(ARTIFACT_EXTENSION)], **data)
+
+
+def render_folder_artifacts(folder, processes=None):
+    """ Render all the artifacts recorded in a folder, over a process pool.
+
+    Args:
+        folder (str): folder containing recorded artifacts
+        processes (int): number of processes, defaults to the number of cpus
+
+    Return:
+        (list(str)): paths to the rendered files
+    """
+    artifact_paths = sorted(glob.glob(os.path.join(folder, "*" + ARTIFACT_EXTENSION)))
+    if not artifact_paths:
+        return []
+    with multiprocessing.Pool(processes=min(processes or os.cpu_count(), len(artifact_paths))) as pool:
+        return [rendered_path for rendered_paths in pool.map(render_artifact, artifact_paths)
+                for rendered_path in rendered_paths]
+
+
+def build_performance_map_figure(launcher_data, interpolation_method, x_label, y_label):
+    """ Build the figure of a launcher performance map: interpolated surface and database points, or interpolated
+    curve if the database cannot be triangulated.
+
+    Args:
+        launcher_data (np.ndarray): launcher database, columns are the two parameters and the performance
+        interpolation_method (str): interpolation method
+        x_label (str): label of the first parameter
+        y_label (str): label of the second parameter
+
+    Return:
+        (matplotlib.figure.Figure, matplotlib.axes.Axes, bool): figure, axes and True if the figure is 3D
+    """
+    try:
+        xx = launcher_data[:, 0]
+        yy = launcher_data[:, 1]
+        xx, yy = np.meshgrid(xx, yy)
+        z = interpolate.griddata(launcher_data[:, 0:2], launcher_data[:, 2], (xx.ravel(), yy.ravel()),
+                                 method=interpolation_method)
+        fig = pyplot.figure("Performance map")
+        ax = fig.add_subplot(111, projection='3d')
+        ax.set_title("Performance map")
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.set_zlabel("Performance [kg]")
+        ax.plot_trisurf(xx.ravel(), yy.ravel(), z)
+        ax.scatter(launcher_data[:, 0], launcher_data[:, 1], launcher_data[:, 2], s=20, c="red")
+        return fig, ax, True
+
+    except RuntimeError:
+        z = interpolate.interp1d(launcher_data[:, 1], launcher_data[:, 2], kind=interpolation_method,
+                                 fill_value="extrapolate")
+        fig = pyplot.figure("Performance map")
+        xnew = np.linspace(np.min(launcher_data[:, 1]) * 0.8, np.max(launcher_data[:, 1]) * 1.1, num=27)
+        ynew = z(xnew)  # use interpolation function returned by `interp1d`
+        ax = fig.add_subplot(111)
+        ax.set_title("Performance map")
+        ax.plot(launcher_data[:, 1], launcher_data[:, 2], "o", xnew, ynew, '-')
+        ax.set_xlabel("Apogee [km]")
+        ax.set_ylabel("Performance [kg]")
+        return fig, ax, False
+
+
+def render_performance_map(path, launcher_data, interpolation_method, x_label, y_label, create_gif=True):
+    """ Render a launcher performance map as .png and, for 3D maps, as a rotating .gif.
+
+    Args:
+        path (str): path of the rendered files without extension
+        launcher_data (np.ndarray): launcher database, columns are the two parameters and the performance
+        interpolation_method (str): interpolation method
+        x_label (str): label of the first parameter
+        y_label (str): label of the second parameter
+        create_gif (bool): if True, render the rotating animation
+
+    Return:
+        (list(str)): paths to the rendered files
+    """
+    fig, ax, is_3d = build_performance_map_figure(launcher_data, str(interpolation_method), str(x_label), str(y_label))
+    rendered = [path + '.png']
+    publish_file(rendered[0], lambda file_path: fig.savefig(file_path, bbox_inches='tight', dpi=100))
+
+    if create_gif and is_3d:
+        def rotate(angle):
+            ax.view_init(azim=angle)
+
+        rot_animation = animation.FuncAnimation(fig, rotate, frames=np.arange(0, 359, 5), interval=150)
+        rendered.append(path + '.gif')
+        publish_file(rendered[1], lambda file_path: rot_animation.save(file_path, dpi=100, bitrate=1))
+    pyplot.close(fig)
+    return rendered
+
+
+# Renderer of each artifact kind, called with the path of the rendered files without extension and the recorded data
+ARTIFACT_RENDERERS = {"performance_map": render_performance_map}
+
+"""
+Main script
+"""
+
+if __name__ == "__main__":
+    try:
+        results_folder = sys.argv[1]
+    except IndexError:
+        print("Please specify a results folder in the argv: PATH_TO_RESULTS_FOLDER")
+        sys.exit()
+    for rendered_file in render_folder_artifacts(results_folder):
+        print(rendered_file)
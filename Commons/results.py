@@ -0,0 +1,104 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Structured results of a scenario, written as JSON Lines next to result.txt. Each line is a record:
+#                   the scenario KPI, then each spacecraft report followed by its phases. Quantities are written as
+#                   numbers in fixed units, given by the suffix of their key (e.g. "mass_kg", "duration_s").
+#                   The results of a run are loaded with:
+#                   records = load_results(PATH_TO_RESULTS_FOLDER/results.jsonl)
+
+# Import libraries
+import json
+import os
+
+import numpy as np
+from astropy import units as u
+from astropy.time import Time, TimeDelta
+
+# File of the structured results, in the results folder
+RESULTS_FILENAME = "results.jsonl"
+
+# Record types
+SCENARIO_RECORD = "scenario"
+SPACECRAFT_RECORD = "spacecraft"
+PHASE_RECORD = "phase"
+
+# Units of the written quantities, by physical type, and suffix of their keys
+JSON_UNITS = [(u.kg, "kg"), (u.km, "km"), (u.deg, "deg"), (u.s, "s"), (u.m / u.s, "m_s"), (u.W, "W"),
+              (u.m ** 3, "m3")]
+
+
+def to_json_item(key, value):
+    """ Converts an item of a record into its JSON key and value.
+
+    Args:
+        key (str): key of the item
+        value: value of the item (quantity, time, record, list or plain value)
+
+    Return:
+        (str, any): key, with the unit suffix of quantities, and JSON value
+    """
+    if isinstance(value, TimeDelta):
+        value = value.to(u.s)
+    if isinstance(value, u.Quantity):
+        if value.unit.is_equivalent(u.one):
+            return key, float(value.to_value(u.one))
+        for unit, suffix in JSON_UNITS:
+            if value.unit.is_equivalent(unit):
+                return f"{key}_{suffix}", float(value.to_value(unit))
+        return f"{key}_{value.unit.to_string().replace(' ', '')}", float(value.value)
+    return key, to_json_value(value)
+
+
+def to_json_value(value):
+    """ Converts a value of a record into a JSON value (see to_json_item).
+
+    Args:
+        value: value (time, record, list or plain value)
+
+    Return:
+        (any): JSON value
+    """
+    if isinstance(value, dict):
+        return dict(to_json_item(key, item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, Time):
+        return value.isot
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_results(path, records):
+    """ Writes the records of a scenario as JSON Lines, atomically (a reader never sees a partial file).
+
+    Args:
+        path (str): path of the results file
+        records (list): records, dictionaries with a "record" type
+    """
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(to_json_value(record), separators=(",", ":"), ensure_ascii=False) + "\n")
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def load_results(path, record_type=None):
+    """ Loads the records of a results file.
+
+    Args:
+        path (str): path of the results file
+        record_type (str): if given, only the records of this type are returned
+
+    Return:
+        (list): records
+    """
+    with open(path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    if record_type is not None:
+        records = [record for record in records if record["record"] == record_type]
+    return records
@@ -5,16 +5,17 @@ Author:         ?,Emilien Mingard
 Description:    Constellation,Satellite Classes definitions
 """
 # Import Classes
-from Phases.Common_functions import nodal_precession
+from Phases.Common_functions import orbit_nodal_precession_speed_si
+from Phases.OrbitElements import OrbitElements, OrbitElementsBatch
+from Commons.artifacts import publish_file
 
 # Import libraries
-import copy
 import matplotlib.pyplot as plt
 import numpy as np
 import random
+from types import MappingProxyType
 from astropy import units as u
 from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
 from poliastro.plotting import OrbitPlotter3D
 import warnings
 warnings.filterwarnings("error")
@@ -40,14 +41,22 @@ class Constellation:
         self.initial_satellites = dict()
         self.optimized_ordered_satellites = []
 
+        # Indexes maintained on satellite addition, removal and state or default orbit change
+        self.planes = dict()
+        self.satellite_planes = dict()
+        self.standby_satellites = dict()
+        self.precession_directions = dict()
+        self.standby_precession_rotation = 0
+
     """
     Methods
     """
-    def add_satellite(self, satellite):
+    def add_satellite(self, satellite, plane_id=None):
         """ Adds a satellite to the Constellation class.
 
         Args:
             Satellite: to be added
+            plane_id (str): (optional) id of the plane the satellite belongs to
         """
         
         # Check if satellite already in dict
@@ -58,6 +67,66 @@ class Constellation:
             self.satellites[satellite.get_id()] = satellite
             self.initial_satellites[satellite.get_id()] = satellite
 
+            # Link the satellite to the constellation so that state changes update the indexes
+            satellite.set_constellation(self)
+            if plane_id is not None:
+                self.planes.setdefault(plane_id, dict())[satellite.get_id()] = satellite
+                self.satellite_planes[satellite.get_id()] = plane_id
+            self.update_satellite_index(satellite)
+
+    def remove_satellite(self, satellite_id):
+        """ Removes a satellite from the constellation satellites. It is kept in the initial satellites.
+
+        Args:
+            satellite_id (str): id of the satellite to be removed
+        """
+        satellite = self.satellites.pop(satellite_id)
+        plane_id = self.satellite_planes.pop(satellite_id, None)
+        if plane_id is not None:
+            del self.planes[plane_id][satellite_id]
+        self.remove_from_standby_index(satellite)
+
+    def update_satellite_index(self, satellite, default_orbit_changed=False):
+        """ Updates the standby index and the global precession rotation after a change of a satellite.
+        Called by the satellite when its state or default orbit changes.
+
+        Args:
+            satellite (Satellite): satellite that changed
+            default_orbit_changed (bool): (optional) True if the precession direction of the satellite must be recomputed
+        """
+        satellite_id = satellite.get_id()
+        if self.satellites.get(satellite_id) is not satellite:
+            return
+        if default_orbit_changed or satellite.state != 'standby':
+            self.remove_from_standby_index(satellite)
+        if satellite.state == 'standby' and satellite_id not in self.standby_satellites:
+            self.standby_satellites[satellite_id] = satellite
+            self.precession_directions[satellite_id] = self.compute_precession_direction(satellite)
+            self.standby_precession_rotation += self.precession_directions[satellite_id]
+
+    def remove_from_standby_index(self, satellite):
+        """ Removes a satellite from the standby index if present.
+
+        Args:
+            satellite (Satellite): satellite to be removed
+        """
+        if self.standby_satellites.pop(satellite.get_id(), None) is not None:
+            self.standby_precession_rotation -= self.precession_directions.pop(satellite.get_id())
+
+    @staticmethod
+    def compute_precession_direction(satellite):
+        """ Returns the nodal precession direction of a satellite default orbit.
+
+        Args:
+            satellite (Satellite): satellite
+
+        Return:
+            (int): 1 if counter clockwise, -1 if clockwise, 0 if there is no default orbit or no precession
+        """
+        if satellite.get_default_orbit() is None:
+            return 0
+        return int(np.sign(orbit_nodal_precession_speed_si(satellite.get_default_orbit())))
+
     def set_sats_reliability(self,sats_reliability):
         """ Reliability is used by self.perform_random_sat_failure() 
 
@@ -95,15 +164,23 @@ class Constellation:
 
     def get_standby_satellites(self):
         """ Return dictionary of satellites that have a standby state.
+        The dictionary is a read-only view of the index maintained by the constellation.
+
+        Return:
+            (MappingProxyType(Satellite)): dictionary containing all standby satellites
+        """
+        return MappingProxyType(self.standby_satellites)
+
+    def get_plane_satellites(self, plane_id):
+        """ Return the satellites of a plane, in the order they were added.
+
+        Args:
+            plane_id (str): plane id
 
         Return:
-            (dict(Satellite)): dictionary containing all standby satellites
+            (list(Satellite)): satellites of the plane
         """
-        standby_satellites = {}
-        for satellite_ID, satellite in self.satellites.items():
-            if satellite.state == 'standby':
-                standby_satellites[satellite_ID] = satellite
-        return standby_satellites
+        return list(self.planes.get(plane_id, dict()).values())
 
     def get_number_satellites(self):
         """ Compute and return number of satellites
@@ -128,10 +205,7 @@ class Constellation:
         Return:
             (int): 1 if counter clockwise, -1 if clockwise (right hand convention)
         """
-        temp_rotation = 0
-        for _, satellite in self.get_standby_satellites().items():
-            temp_rotation = temp_rotation + np.sign(nodal_precession(satellite.get_default_orbit())[1].value)
-        return int(np.sign(temp_rotation))
+        return int(np.sign(self.standby_precession_rotation))
 
     def get_sum_of_sats_mass(self):
         return sum([sat.get_dry_mass() for sat in self.satellites.values()])
@@ -149,8 +223,8 @@ class Constellation:
         """
         random.seed(self.seed_for_random_sats_failure)
         nb_sat_operational = int(np.round(self.get_number_satellites()*(self.sats_reliability)))
-        for key in random.sample(self.satellites.keys(),nb_sat_operational):
-            del self.satellites[key]
+        for key in random.sample(list(self.satellites.keys()),nb_sat_operational):
+            self.remove_satellite(key)
 
     def set_default_orbit_to_operational(self):
         for satellite in self.satellites.values():
@@ -163,6 +237,8 @@ class Constellation:
     def populate_standard_constellation(self, constellation_name, reference_satellite, number_of_planes=2, sat_per_plane=10, plane_distribution_angle=180, altitude_offset = 10*u.km):
         """ Adds satellites to form a complete constellation with equi-phased planes based on inputs.
             The reference satellite is duplicated to fill the planes.
+            The orbits of all planes and satellites are generated at once as arrays, the orbit of each satellite is
+            only built when it is first accessed.
 
         Args:
             plane_distribution_angle (int): Angle over which to distribute the RAAN of the orbital planes. Generally
@@ -181,40 +257,40 @@ class Constellation:
         operational_orbit = reference_satellite.get_operational_orbit()
         disposal_orbit = reference_satellite.get_disposal_orbit()
 
-        temp_insertion_plane_orbit = None 
-        temp_operational_plane_orbit = None
-        temp_disposal_plane_orbit = None       
-        
-        # For each plane, create the reference orbits by raan offset and populate the plane
+        plane_orbits = [None, None, None]
+        planes = np.arange(0, number_of_planes)
+        planes_raan = planes * plane_distribution_angle * u.deg / number_of_planes
+
+        # Create insertion orbits of the planes by raan offset
+        if(insertion_orbit is not None):
+            plane_orbits[0] = OrbitElementsBatch.from_classical(Earth, insertion_orbit.a, insertion_orbit.ecc,
+                                                                insertion_orbit.inc, planes_raan,
+                                                                insertion_orbit.argp, 0. * u.deg,
+                                                                insertion_orbit.epoch)
+
+        # Create operational orbits of the planes
+        if(operational_orbit is not None):
+            plane_orbits[1] = OrbitElementsBatch.from_classical(Earth, operational_orbit.a + altitude_offset * (planes-int((number_of_planes+1)/2)),
+                                                                operational_orbit.ecc,
+                                                                operational_orbit.inc,
+                                                                planes_raan,
+                                                                operational_orbit.argp, 0. * u.deg,
+                                                                operational_orbit.epoch)
+
+        # Create graveyard orbits of the planes
+        if(disposal_orbit is not None):
+            plane_orbits[2] = OrbitElementsBatch.from_classical(Earth, disposal_orbit.a, disposal_orbit.ecc,
+                                                                disposal_orbit.inc, planes_raan,
+                                                                disposal_orbit.argp, 0. * u.deg,
+                                                                disposal_orbit.epoch)
+
+        # Create the orbits of all satellites (planes x satellites) by anomaly offset
+        satellite_orbits = [self.generate_plane_satellites_orbits(orbits, sat_per_plane) for orbits in plane_orbits]
+
+        # Populate each plane with satellites referencing their orbits
         for i in range(0, number_of_planes):
-            # Set plane id
             temp_plane_id = constellation_name + '_plane' + '{:04d}'.format(i)
-            
-            # Create insertion orbit relative to the plane
-            if(insertion_orbit is not None):
-                temp_insertion_plane_orbit = Orbit.from_classical(Earth, insertion_orbit.a, insertion_orbit.ecc,
-                                                                    insertion_orbit.inc, i * plane_distribution_angle * u.deg / number_of_planes,
-                                                                    insertion_orbit.argp, 0. * u.deg,
-                                                                    insertion_orbit.epoch)
-            
-            # Create operational orbit relative to the plane
-            if(operational_orbit is not None):
-                temp_operational_plane_orbit = Orbit.from_classical(Earth, operational_orbit.a + altitude_offset * (i-int((number_of_planes+1)/2)),
-                                                                    operational_orbit.ecc,
-                                                                    operational_orbit.inc,
-                                                                    i * plane_distribution_angle * u.deg / number_of_planes,
-                                                                    operational_orbit.argp, 0. * u.deg,
-                                                                    operational_orbit.epoch)
-            # Create graveyard orbit relative to the plane
-            if(disposal_orbit is not None):
-                temp_disposal_plane_orbit = Orbit.from_classical(Earth, disposal_orbit.a, disposal_orbit.ecc,
-                                                                    disposal_orbit.inc, i * plane_distribution_angle * u.deg / number_of_planes,
-                                                                    disposal_orbit.argp, 0. * u.deg,
-                                                                    disposal_orbit.epoch)
-            
-            # Populate the plane with its own reference satellite
-            self.populate_plane(temp_plane_id, reference_satellite, sat_per_plane, temp_insertion_plane_orbit,
-                                temp_operational_plane_orbit,temp_disposal_plane_orbit)
+            self.add_plane_satellites(temp_plane_id, reference_satellite, sat_per_plane, satellite_orbits, plane_index=(i,))
 
     def populate_plane(self, plane_id, reference_satellite, sat_per_plane, insertion_orbit, operational_orbit, disposal_orbit):
         """ Adds satellites to form a complete plane with equiphased population based on inputs.
@@ -223,49 +299,61 @@ class Constellation:
             plane_id (str): plane id
             reference_satellite (ConstellationSatellites.Satellite): target that is duplicated to create constellation members
             sat_per_plane (int): number of satellites on each plane, equiphased along 360° of anomaly
-            insertion_orbit (poliastro.twobody.Orbit): insertion orbit for the satellites
-            operational_orbit (poliastro.twobody.Orbit): operational orbit for the plane, where the capture will occur
+            insertion_orbit (OrbitElements): insertion orbit for the satellites
+            operational_orbit (OrbitElements): operational orbit for the plane, where the capture will occur
+            disposal_orbit (OrbitElements): disposal orbit for the plane
+        """
+        satellite_orbits = [self.generate_plane_satellites_orbits(orbit, sat_per_plane)
+                            for orbit in (insertion_orbit, operational_orbit, disposal_orbit)]
+        self.add_plane_satellites(plane_id, reference_satellite, sat_per_plane, satellite_orbits)
+
+    @staticmethod
+    def generate_plane_satellites_orbits(plane_orbits, sat_per_plane):
+        """ Generates the orbits of equiphased satellites on one or several planes.
+
+        Args:
+            plane_orbits (OrbitElements or OrbitElementsBatch): orbits of the planes, can be None
+            sat_per_plane (int): number of satellites on each plane, equiphased along 360° of anomaly
+
+        Return:
+            (OrbitElementsBatch): orbits of the satellites, with an additional last dimension over the satellites of each
+                                  plane, None if plane_orbits is None
         """
-        temp_insertion_orbit = None
-        temp_operational_orbit = None
-        temp_disposal_orbit = None
+        if plane_orbits is None:
+            return None
+        return OrbitElementsBatch.from_classical(Earth, np.expand_dims(plane_orbits.a, -1),
+                                                 np.expand_dims(plane_orbits.ecc, -1),
+                                                 np.expand_dims(plane_orbits.inc, -1),
+                                                 np.expand_dims(plane_orbits.raan, -1),
+                                                 np.expand_dims(plane_orbits.argp, -1),
+                                                 np.arange(0, sat_per_plane) * 360 * u.deg / sat_per_plane,
+                                                 plane_orbits.epoch)
+
+    def add_plane_satellites(self, plane_id, reference_satellite, sat_per_plane, satellite_orbits, plane_index=()):
+        """ Adds the satellites of a plane, cloned from the reference satellite.
+        Their orbits reference the generated batches and are only built when first accessed.
 
-        # For each satellite in the plane, create the reference orbit by anomaly offset and add the target to clients
+        Args:
+            plane_id (str): plane id
+            reference_satellite (ConstellationSatellites.Satellite): target that is duplicated to create constellation members
+            sat_per_plane (int): number of satellites on the plane
+            satellite_orbits (list(OrbitElementsBatch)): insertion, operational and disposal orbits of the satellites
+                                                         (see generate_plane_satellites_orbits), can be None
+            plane_index (tuple): (optional) index of the plane in the batches
+        """
+        insertion_orbits, operational_orbits, disposal_orbits = satellite_orbits
         for i in range(0, sat_per_plane):
             # Set target id
             temp_satellite_id = plane_id + '_sat' + '{:04d}'.format(i)
-            
-            # Create insertion orbit relative to the satellite ref
-            if(insertion_orbit is not None):
-                temp_insertion_orbit = Orbit.from_classical(Earth, insertion_orbit.a, insertion_orbit.ecc,
-                                                            insertion_orbit.inc, insertion_orbit.raan,
-                                                            insertion_orbit.argp, i * 360 * u.deg / sat_per_plane,
-                                                            insertion_orbit.epoch)
-            
-            # Create operational orbit relative to the satellite ref
-            if(operational_orbit is not None):
-                temp_operational_orbit = Orbit.from_classical(Earth, operational_orbit.a, operational_orbit.ecc,
-                                                            operational_orbit.inc, operational_orbit.raan,
-                                                            operational_orbit.argp, i * 360 * u.deg / sat_per_plane,
-                                                            operational_orbit.epoch)
-
-            if(disposal_orbit is not None):
-                temp_disposal_orbit = Orbit.from_classical(Earth, disposal_orbit.a, disposal_orbit.ecc,
-                                                            disposal_orbit.inc, disposal_orbit.raan,
-                                                            disposal_orbit.argp, i * 360 * u.deg / sat_per_plane,
-                                                            disposal_orbit.epoch)
-            
-            # Make a copy of reference target to become new target
-            temp_satellite = copy.deepcopy(reference_satellite)
-            
-            # Update new target and add it to clients
-            temp_satellite.id = temp_satellite_id
-            temp_satellite.insertion_orbit = temp_insertion_orbit
-            temp_satellite.operational_orbit = temp_operational_orbit
-            temp_satellite.disposal_orbit = temp_disposal_orbit
-            temp_satellite.current_orbit = None
-            temp_satellite.initial_orbit = None
-            self.add_satellite(temp_satellite)
+
+            # Clone the reference target to become new target, sharing its modules, masses and volumes
+            temp_satellite = reference_satellite.clone(temp_satellite_id,
+                                                       insertion_orbit=insertion_orbits.lazy(plane_index + (i,)) if insertion_orbits is not None else None,
+                                                       operational_orbit=operational_orbits.lazy(plane_index + (i,)) if operational_orbits is not None else None,
+                                                       disposal_orbit=disposal_orbits.lazy(plane_index + (i,)) if disposal_orbits is not None else None)
+
+            # Add new target to clients
+            self.add_satellite(temp_satellite, plane_id=plane_id)
 
     def plot_distribution(self, save=None, save_folder=None):
         """ Plot the distribution of the constellation. If a save location is provided, the plot is directly saved,
@@ -288,7 +376,8 @@ class Constellation:
 
         if save:
             if save_folder:
-                fig.savefig(save_folder + '/' + save + 'RAAN_anomaly.png', bbox_inches='tight', dpi=100, engine="kaleido")
+                publish_file(save_folder + '/' + save + 'RAAN_anomaly.png',
+                             lambda file_path: fig.savefig(file_path, bbox_inches='tight', dpi=100, engine="kaleido"))
             else:
                 fig.savefig(save + '.png', bbox_inches='tight', dpi=100)
         else:
@@ -309,7 +398,8 @@ class Constellation:
 
         if save:
             if save_folder:
-                fig.savefig(save_folder + '/' + save + 'RAAN_altitude.png', bbox_inches='tight', dpi=100, engine="kaleido")
+                publish_file(save_folder + '/' + save + 'RAAN_altitude.png',
+                             lambda file_path: fig.savefig(file_path, bbox_inches='tight', dpi=100, engine="kaleido"))
             else:
                 fig.savefig(save + '.png', bbox_inches='tight', dpi=100)
         else:
@@ -330,12 +420,14 @@ class Constellation:
         for _, target in self.satellites.items():
             i += 1
             if i < len(self.satellites):
-                fig.plot(target.get_default_orbit())
+                fig.plot(target.get_default_orbit().to_orbit())
             else:
                 if save_folder and save:
-                    fig.plot(target.get_default_orbit()).write_image(file=save_folder + "/"+ save+".png", format="png", scale="2", engine="kaleido")
+                    figure = fig.plot(target.get_default_orbit().to_orbit())
+                    publish_file(save_folder + "/" + save + ".png",
+                                 lambda file_path: figure.write_image(file=file_path, format="png", scale="2", engine="kaleido"))
                 else:
-                    fig.plot(target.get_default_orbit()).show(render_mode='webgl')
+                    fig.plot(target.get_default_orbit().to_orbit()).show(render_mode='webgl')
 
     def print_KPI(self):
         """ Print KPI related to the constellation"""
@@ -467,35 +467,63 @@ class Fleet:
                 temp_string = temp_string + '\t' + tgt.ID + '\n'
         print(temp_string)
 
-    def print_report(self):
+    def get_report(self):
+        """ Returns the reports of the active spacecrafts of the fleet (see ActiveSpacecraft.get_report).
+        """
+        return [activecpacecraft.get_report() for _, activecpacecraft in self.activespacecrafts.items()]
+
+    def print_report(self, report=None):
         """ Print a quick summary of fleet information for debugging purposes.
+
+        Args:
+            report (list): reports of the active spacecrafts, defaults to the current reports (see get_report)
         """
-        for _, activecpacecraft in self.activespacecrafts.items():
-            activecpacecraft.print_report()
+        if report is None:
+            report = self.get_report()
+        for activecpacecraft, activespacecraft_report in zip(self.activespacecrafts.values(), report):
+            activecpacecraft.print_report(activespacecraft_report)
+
+    def get_KPI(self):
+        """ Returns KPI related to the fleet: mission epochs and duration, number of spacecrafts, launched and payload masses.
+        """
+        launchers_mass = [self.kickstages[key].get_initial_wet_mass() for key in self.kickstages.keys()]
+        payload_mass = [kickstage.get_initial_payload_mass() for kickstage in self.kickstages.values()]
+        return dict(starting_epoch=self.get_starting_epoch(),
+                    ending_epoch=self.get_ending_epoch(),
+                    mission_duration=self.get_ending_epoch() - self.get_starting_epoch(),
+                    nb_kickstages=len(self.kickstages),
+                    launched_mass=sum(launchers_mass),
+                    payload_mass=sum(payload_mass))
 
-    def print_KPI(self):
-        """ Print KPI related to the fleet"""
+    def print_KPI(self, kpi=None):
+        """ Print KPI related to the fleet
+
+        Args:
+            kpi (dict): KPI of the fleet, defaults to the current KPI (see get_KPI)
+        """
+        if kpi is None:
+            kpi = self.get_KPI()
         # Mission duration
         print("")
-        print(f"Starting epoch: {self.get_starting_epoch()}")
-        print(f"Ending epoch: {self.get_ending_epoch()}")
-        duration = self.get_ending_epoch() - self.get_starting_epoch()
-        print(f"Mission duration: {convert_time_for_print(duration):.2f}")
+        print(f"Starting epoch: {kpi['starting_epoch']}")
+        print(f"Ending epoch: {kpi['ending_epoch']}")
+        print(f"Mission duration: {convert_time_for_print(kpi['mission_duration']):.2f}")
         print("")
 
-        self.print_nb_fleet_spacecraft()
+        self.print_nb_fleet_spacecraft(kpi)
 
         # Print total launcher mass accros the fleet
-        launchers_mass = [self.kickstages[key].get_initial_wet_mass() for key in self.kickstages.keys()]
-        print(F"Total mass launched in space: {sum(launchers_mass):.2f}")
-        payload_mass = [kickstage.get_initial_payload_mass() for kickstage in self.kickstages.values()]
-        print(f"Total payload mass released in space: {sum(payload_mass):.2f}")
+        print(F"Total mass launched in space: {kpi['launched_mass']:.2f}")
+        print(f"Total payload mass released in space: {kpi['payload_mass']:.2f}")
 
-    def print_nb_fleet_spacecraft(self):
+    def print_nb_fleet_spacecraft(self, kpi):
         """ Prints the number of kickstages
+
+        Args:
+            kpi (dict): KPI of the fleet (see get_KPI)
         """
         # Number of launcher
-        Nb_KickStage = len(self.kickstages)
+        Nb_KickStage = kpi['nb_kickstages']
         if Nb_KickStage > 1:
             print(f"Launch Vehicles (=KickStages): {Nb_KickStage}")
         else:
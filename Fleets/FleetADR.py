@@ -145,12 +145,17 @@ class FleetADR(Fleet):
             nb_debris += servicer.get_nb_target_spacecraft()
         return nb_debris
 
-    def print_nb_fleet_spacecraft(self):
+    def get_KPI(self):
         """ Adds the number of servicers and removed debris.
         """
-        super().print_nb_fleet_spacecraft()
-        if self.get_number_servicers() > 1:
-            print(f"Servicers: {self.get_number_servicers()}")
+        return dict(super().get_KPI(), nb_servicers=self.get_number_servicers(), removed_debris=self.get_number_of_assigned_debris())
+
+    def print_nb_fleet_spacecraft(self, kpi):
+        """ Adds the number of servicers and removed debris.
+        """
+        super().print_nb_fleet_spacecraft(kpi)
+        if kpi['nb_servicers'] > 1:
+            print(f"Servicers: {kpi['nb_servicers']}")
         else:
-            print(f"Servicer: {self.get_number_servicers()}")
-        print(f"Removed debris: {self.get_number_of_assigned_debris()}")
\ No newline at end of file
+            print(f"Servicer: {kpi['nb_servicers']}")
+        print(f"Removed debris: {kpi['removed_debris']}")
\ No newline at end of file
@@ -11,6 +11,7 @@ from Scenarios.ScenarioParameters import *
 
 # Import libraries
 import math
+import numpy as np
 
 class FleetConstellation(Fleet):
     """ A Fleet consists of a dictionary of servicers.
@@ -50,52 +51,61 @@ class FleetConstellation(Fleet):
             # Instanciate kickstage execution limit
             kickstage_execution_limit = EXECUTION_LIMIT
             kickstage_execution_count = 0
-            kickstage_converged = False
 
             # Create KickStage
             spacecraft_count += 1
             kickstage = self.create_kickstage(f"KickStage_{spacecraft_count:04d}")
             kickstage_low_sat_allowance = 0
             kickstage_up_sat_allowance = kickstage.compute_allowance(unassigned_satellites)
-
-            # Iterate until kickstage allowance is converged
-            while kickstage_execution_count <= kickstage_execution_limit and not(kickstage_converged):
-                # Check if converged
-                if kickstage_low_sat_allowance == kickstage_up_sat_allowance:
-                    # exit loop flat
-                    kickstage_converged = True
-
-                # Compute new current allowance
-                kickstage_cur_sat_allowance = math.ceil((kickstage_low_sat_allowance+kickstage_up_sat_allowance)/2)
-
+            constellation_precession = clients.get_global_precession_rotation()
+
+            # Bracket the allowance with the remaining fuel estimated for every allowance from one execution at the upper bound
+            kickstage_cur_sat_allowance = kickstage_up_sat_allowance
+            kickstage_executed_sat_allowance = None
+            if kickstage_up_sat_allowance > 0:
+                estimated_remaining_fuel = kickstage.estimate_remaining_propellant(unassigned_satellites[0:kickstage_up_sat_allowance],
+                                                                                   constellation_precession=constellation_precession)
+                kickstage_executed_sat_allowance = kickstage_up_sat_allowance
+                if kickstage.get_main_propulsion_module().get_current_prop_mass() > 0:
+                    # The execution at the upper bound is exact, no other allowance needs to be tried
+                    kickstage_low_sat_allowance = kickstage_up_sat_allowance
+                else:
+                    # Try the largest allowance estimated with fuel plus one first (expected to lack fuel), then the estimated one
+                    kickstage_up_sat_allowance -= 1
+                    kickstage_estimated_sat_allowance = int(np.count_nonzero(np.cumprod(estimated_remaining_fuel[1:] > 0)))
+                    kickstage_cur_sat_allowance = min(kickstage_estimated_sat_allowance + 1, kickstage_up_sat_allowance)
+
+            # Confirm the estimation by executing the kickstage, next to the estimation first, then by dichotomia
+            kickstage_probe_next_to_estimation = True
+            while kickstage_low_sat_allowance < kickstage_up_sat_allowance and kickstage_execution_count <= kickstage_execution_limit:
                 # Execute kickstage
                 assigned_satellites = unassigned_satellites[0:kickstage_cur_sat_allowance]
-                kickstage.execute(assigned_satellites,constellation_precession=clients.get_global_precession_rotation())
-                kickstage_main_propulsion_module = kickstage.get_main_propulsion_module()
-
-                # Check for exit condition
-                if kickstage_up_sat_allowance - kickstage_low_sat_allowance <= 1:
-                    # If fuel mass > 0 and cur == up, then up is the solution
-                    if kickstage_main_propulsion_module.get_current_prop_mass() > 0 and kickstage_cur_sat_allowance == kickstage_up_sat_allowance:
-                        kickstage_low_sat_allowance = kickstage_up_sat_allowance
-                    # If fuel mass < 0 then low is the solution for sure, hoping it is not zero.
-                    else:
-                        kickstage_up_sat_allowance = kickstage_low_sat_allowance
-
-                # Apply dichotomia to remaining values
-                else:
-                    if kickstage_main_propulsion_module.get_current_prop_mass() > 0:
-                        # If extra fuel, increase lower bound
-                        kickstage_low_sat_allowance = kickstage_cur_sat_allowance
+                kickstage.execute(assigned_satellites,constellation_precession=constellation_precession)
+                kickstage_executed_sat_allowance = kickstage_cur_sat_allowance
 
-                    else:
-                        # If lacking fuel, decrease upper bound
-                        kickstage_up_sat_allowance = kickstage_cur_sat_allowance
+                if kickstage.get_main_propulsion_module().get_current_prop_mass() > 0:
+                    # If extra fuel, increase lower bound
+                    kickstage_low_sat_allowance = kickstage_cur_sat_allowance
+                    kickstage_next_sat_allowance = kickstage_cur_sat_allowance + 1
+                else:
+                    # If lacking fuel, decrease upper bound
+                    kickstage_up_sat_allowance = kickstage_cur_sat_allowance - 1
+                    kickstage_next_sat_allowance = kickstage_cur_sat_allowance - 1
 
+                # Compute new current allowance
+                if not kickstage_probe_next_to_estimation:
+                    kickstage_next_sat_allowance = math.ceil((kickstage_low_sat_allowance+kickstage_up_sat_allowance)/2)
+                kickstage_cur_sat_allowance = kickstage_next_sat_allowance
+                kickstage_probe_next_to_estimation = False
                 kickstage_execution_count += 1
 
+            # Execute the kickstage with the converged allowance if it was not the last one executed
+            assigned_satellites = unassigned_satellites[0:kickstage_low_sat_allowance]
+            if kickstage_executed_sat_allowance != kickstage_low_sat_allowance:
+                kickstage.execute(assigned_satellites,constellation_precession=constellation_precession)
+
             # Iterate until kickstage total deployment time is computed (If phasing existing)
-            kickstage.execute_with_fuel_usage_optimisation(assigned_satellites,constellation_precession=clients.get_global_precession_rotation())
+            kickstage.execute_with_fuel_usage_optimisation(assigned_satellites,constellation_precession=constellation_precession)
                          
             # Add converged KickStage and remove newly assigned satellite
             self.add_kickstage(kickstage)
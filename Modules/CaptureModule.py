@@ -86,3 +86,19 @@ class CaptureModule(GenericModule):
         super().reset()
         self.captured_spacecrafts = dict()
         self.history_captured_spacecrafts = dict()
+
+    def get_checkpoint(self):
+        """ Returns the captured spacecrafts of the module (see GenericModule).
+
+        Return:
+            (dict): module state
+        """
+        return dict(captured_spacecrafts=dict(self.captured_spacecrafts))
+
+    def restore_checkpoint(self, checkpoint):
+        """ Restores a state previously returned by get_checkpoint.
+
+        Args:
+            checkpoint (dict): module state
+        """
+        self.captured_spacecrafts = dict(checkpoint["captured_spacecrafts"])
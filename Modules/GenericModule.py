@@ -139,6 +139,23 @@ class GenericModule:
     def reset(self):
         """ Resets the module to a state equivalent to simulation start. Used in simulation and mass_convergence. """
         pass
+
+    def get_checkpoint(self):
+        """ Returns the part of the module state modified by phases, used by the plan to resume a simulation.
+        Static modules are not modified by phases and return an empty dictionary.
+
+        Return:
+            (dict): module state
+        """
+        return dict()
+
+    def restore_checkpoint(self, checkpoint):
+        """ Restores a state previously returned by get_checkpoint.
+
+        Args:
+            checkpoint (dict): module state
+        """
+        pass
     
     def __str__(self):
         return (self.id + "\n\t\tDry mass: " + '{:.01f}'.format(self.get_dry_mass()))
@@ -2,6 +2,7 @@ import numpy as np
 from astropy import constants as const
 from astropy import units as u
 from Modules.GenericModule import GenericModule
+from Phases.Common_functions import propellant_mass_si
 
 
 class PropulsionModule(GenericModule):
@@ -363,9 +364,9 @@ class PropulsionModule(GenericModule):
         """
         # TODO add propellant mass computation for non impulsive maneuvers
         initial_mass = self.spacecraft.get_current_mass()
-        temp = np.exp((delta_v.to(u.meter / u.second)/const.g0/self.isp.to(u.second)).value)
-        consumed_propellant_mass = initial_mass * (temp-1) / temp
-        return consumed_propellant_mass
+        consumed_propellant_mass = propellant_mass_si(initial_mass.to_value(u.kg), delta_v.to_value(u.m / u.s),
+                                                      self.isp.to_value(u.s))
+        return consumed_propellant_mass * u.kg
     
     def consume_propellant(self, propellant_mass, phase):
         """ Reduce the current propellant mass of the module by the argument.
@@ -481,6 +482,30 @@ class PropulsionModule(GenericModule):
         self.nb_burn = 0
         self.delta_mass = 0 * u.kg
 
+    def get_checkpoint(self):
+        """ Returns the propellant state of the module (see GenericModule).
+
+        Return:
+            (dict): module state
+        """
+        return dict(current_propellant_mass=self.current_propellant_mass,
+                    rendezvous_throughput=self.rendezvous_throughput,
+                    phasing_throughput=self.phasing_throughput,
+                    nb_burn=self.nb_burn,
+                    delta_mass=self.delta_mass)
+
+    def restore_checkpoint(self, checkpoint):
+        """ Restores a state previously returned by get_checkpoint.
+
+        Args:
+            checkpoint (dict): module state
+        """
+        self.current_propellant_mass = checkpoint["current_propellant_mass"]
+        self.rendezvous_throughput = checkpoint["rendezvous_throughput"]
+        self.phasing_throughput = checkpoint["phasing_throughput"]
+        self.nb_burn = checkpoint["nb_burn"]
+        self.delta_mass = checkpoint["delta_mass"]
+
     def __str__(self):
         return (super(PropulsionModule, self).__str__()
                 + "\n\t\tPropellant mass: " + '{:01.1f}'.format(self.initial_propellant_mass))
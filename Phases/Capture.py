@@ -47,7 +47,11 @@ class Capture(GenericPhase):
 
         # if not, then simply update the servicer
         self.update_spacecraft()
-        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string()
+        self.take_spacecraft_snapshot()
+
+    def get_checkpoint_key(self):
+        """ Returns a key identifying the captured object and duration (see GenericPhase). """
+        return self.build_checkpoint_key(self.captured_object.get_id(), self.duration.to_value(u.s))
 
     def get_operational_cost(self):
         """ Returns the operational cost of the phase based on assumed FTE and associated costs. 
@@ -61,7 +65,11 @@ class Capture(GenericPhase):
         passes_cost = number_of_additional_gnd_station_passes * 100.  # Euros
         return (fte_operation * cost_fte_operation * self.duration + passes_cost).decompose()
 
-    def build_spacecraft_snapshot_string(self):
-        """ Save current assigned servicer as a snapshot for future references and post-processing. """
-        return ('--- \nCapture: ' + super().build_spacecraft_snapshot_string()
-                + '\n\tCaptured Object: ' + str(self.captured_object))
+    def build_result(self):
+        """ Adds the captured object to the results of the phase (see GenericPhase). """
+        return dict(super().build_result(), captured_object=str(self.captured_object))
+
+    def build_spacecraft_snapshot_string(self, result):
+        """ Renders the results of the phase as the snapshot string of the report (see GenericPhase). """
+        return ('--- \nCapture: ' + super().build_spacecraft_snapshot_string(result)
+                + '\n\tCaptured Object: ' + result["captured_object"])
@@ -1,21 +1,246 @@
+from functools import lru_cache
+
 import numpy as np
 from astropy import units as u
 from astropy.time import Time
 from poliastro.bodies import Earth, Moon
 from poliastro.twobody import Orbit
 from Phases.Manoeuvre import Manoeuvre
-from Scenarios.ScenarioParameters import EP_DUTY_CYCLE, EP_COAST_CYCLE
+from Phases.OrbitElements import OrbitElements, propagate_true_anomaly_si
+from Scenarios.ScenarioParameters import EP_DUTY_CYCLE, EP_COAST_CYCLE, NODAL_PRECESSION_CACHE_SIZE, UPDATE_ORBIT_CACHE_SIZE
+
+# Internal float64 engine.
+# The functions below work on plain floats in SI units (m, s, kg, rad) and are used by the public functions of this
+# module, OrbitChange and PropulsionModule in the inner loops of the fleet convergence. Astropy units are only attached
+# to the values when they are returned through the public API. The results match the former Quantity arithmetic to
+# within 1e-12 relative (differences only come from the order of floating point operations).
+SECONDS_PER_DAY = 86400.
+STANDARD_GRAVITY = 9.80665  # m/s2, same value as astropy.constants.g0
+
+
+# constants of the attractors in SI units, by attractor name (bodies are not hashable)
+BODY_CONSTANTS = dict()
+
+
+def body_constants_si(body):
+    """Returns the constants of an attractor as floats in SI units.
+
+    Args:
+        body (poliastro.bodies.Body): attractor
+
+    Return:
+        (float): gravitational parameter in m3/s2
+        (float): equatorial radius in m
+        (float): J2 coefficient
+    """
+    try:
+        return BODY_CONSTANTS[body.name]
+    except KeyError:
+        constants = body.k.to_value(u.m ** 3 / u.s ** 2), body.R.to_value(u.m), body.J2.value
+        BODY_CONSTANTS[body.name] = constants
+        return constants
+
+
+def orbit_elements_si(orbit):
+    """Returns the elements of an orbit needed by the float engine.
+
+    Args:
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit
+
+    Return:
+        (float): semi-major axis in m
+        (float): eccentricity
+        (float): inclination in rad
+    """
+    if isinstance(orbit, OrbitElements):
+        return orbit.a_si, orbit.ecc_si, orbit.inc_si
+    return orbit.a.to_value(u.m), orbit.ecc.value, orbit.inc.to_value(u.rad)
+
+
+def nodal_precession_speed_si(k, body_radius, j2, a, ecc, inc):
+    """Returns the J2 nodal precession speed in rad/s. Positive is eastward.
+
+    Args:
+        k (float): gravitational parameter of the attractor in m3/s2
+        body_radius (float): equatorial radius of the attractor in m
+        j2 (float): J2 coefficient of the attractor
+        a (float): semi-major axis in m
+        ecc (float): eccentricity
+        inc (float): inclination in rad
+
+    Return:
+        (float): precession speed in rad/s
+    """
+    mean_motion = np.sqrt(k / a ** 3)
+    return -1.5 * mean_motion * body_radius ** 2 / (a * (1 - ecc ** 2)) ** 2 * j2 * np.cos(inc)
+
+
+def orbital_velocity_si(k, a, radius):
+    """Returns the orbital velocity in m/s at a given radius (vis-viva).
+
+    Args:
+        k (float): gravitational parameter of the attractor in m3/s2
+        a (float): semi-major axis in m
+        radius (float): distance to the center of the attractor in m
+
+    Return:
+        (float): orbital speed in m/s
+    """
+    return np.sqrt(k * (2. / radius - 1. / a))
+
+
+def propellant_mass_si(initial_mass, delta_v, isp):
+    """Returns the propellant mass in kg consumed to produce a delta v (rocket equation).
+
+    Args:
+        initial_mass (float): mass before the burn in kg
+        delta_v (float): delta v in m/s
+        isp (float): specific impulse in s
+
+    Return:
+        (float): propellant mass in kg
+    """
+    temp = np.exp(delta_v / STANDARD_GRAVITY / isp)
+    return initial_mass * (temp - 1) / temp
+
+
+@lru_cache(maxsize=NODAL_PRECESSION_CACHE_SIZE)
+def cached_nodal_precession_speed_si(k, body_radius, j2, a, ecc, inc):
+    """Returns the J2 nodal precession speed in rad/s, cached on its arguments (see nodal_precession_speed_si). """
+    return nodal_precession_speed_si(k, body_radius, j2, a, ecc, inc)
+
+
+def orbit_nodal_precession_speed_si(orbit):
+    """Returns the J2 nodal precession speed of an orbit in rad/s. Positive is eastward.
+
+    Args:
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit
+
+    Return:
+        (float): precession speed in rad/s
+    """
+    return cached_nodal_precession_speed_si(*body_constants_si(orbit.attractor), *orbit_elements_si(orbit))
+
+
+@lru_cache(maxsize=UPDATE_ORBIT_CACHE_SIZE)
+def drift_elements_si(k, body_radius, j2, a, ecc, inc, raan, nu, time_since_epoch, precession):
+    """Returns the raan and true anomaly of an orbit propagated by a duration, with the J2 raan drift if requested.
+    Only depends on the elements and the duration, cached on its arguments.
+
+    Args:
+        k (float): gravitational parameter of the attractor in m3/s2
+        body_radius (float): equatorial radius of the attractor in m
+        j2 (float): J2 coefficient of the attractor
+        a (float): semi-major axis in m
+        ecc (float): eccentricity
+        inc (float): inclination in rad
+        raan (float): right ascension of the ascending node in rad
+        nu (float): true anomaly in rad
+        time_since_epoch (float): propagation duration in s
+        precession (bool): if True, the raan drifts with the J2 nodal precession
+
+    Return:
+        (float): raan in rad, wrapped into ]-pi, pi]
+        (float): true anomaly in rad
+    """
+    if precession:
+        raan = raan + cached_nodal_precession_speed_si(k, body_radius, j2, a, ecc, inc) * time_since_epoch
+    raan = np.deg2rad(wrap_angle_deg(np.rad2deg(raan)))
+    return raan, propagate_true_anomaly_si(k, a, ecc, nu, time_since_epoch)
+
+
+def clear_orbit_caches():
+    """Removes all entries of the orbit caches of this module and resets their counters. """
+    cached_nodal_precession_speed_si.cache_clear()
+    drift_elements_si.cache_clear()
+
+
+def get_orbit_caches_info():
+    """Returns the counters of the orbit caches of this module.
+
+    Return:
+        (dict): hits, misses, maximum number of entries and current number of entries of the nodal precession and
+                drift caches
+    """
+    return dict(nodal_precession=cached_nodal_precession_speed_si.cache_info()._asdict(),
+                update_orbit=drift_elements_si.cache_info()._asdict())
+
+
+def epoch_key(epoch):
+    """Returns a hashable key identifying an epoch.
+
+    Args:
+        epoch (astropy.time.Time): epoch
+
+    Return:
+        (tuple): time scale and epoch as two part julian day
+    """
+    return epoch.scale, float(epoch.jd1), float(epoch.jd2)
+
+
+def wrap_angle_deg(angle):
+    """Returns an angle in degrees wrapped into ]-180, 180].
+
+    Args:
+        angle (float): angle in degrees
+
+    Return:
+        (float): wrapped angle in degrees
+    """
+    angle = angle % 360.
+    if angle > 180.:
+        angle = angle - 360.
+    return angle
+
+
+def orbit_summary(orbit):
+    """Returns the elements of an orbit as reported in the results, with altitudes over ground and angles in [0, 360[.
+
+    Args:
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit
+
+    Return:
+        (dict): perigee and apogee altitudes, semi-major axis, eccentricity, inc, raan, argp, nu and ltan
+    """
+    return dict(perigee_altitude=orbit.a * (1 - orbit.ecc) - Earth.R,
+                apogee_altitude=orbit.a * (1 + orbit.ecc) - Earth.R,
+                a=orbit.a,
+                ecc=orbit.ecc,
+                inc=orbit.inc,
+                raan=orbit.raan % (360 * u.deg),
+                argp=orbit.argp % (360 * u.deg),
+                nu=orbit.nu % (360 * u.deg),
+                ltan=(orbit.raan-mean_sun_long(julian_day(orbit.epoch.to_datetime()))) % (360 * u.deg))
+
+
+def orbit_summary_string(summary):
+    """Custom function to display orbit altitudes over ground, from the summary of the orbit (see orbit_summary). """
+    return ("{0:.0f}".format(summary["perigee_altitude"]) + " x " + "{0:.0f}".format(summary["apogee_altitude"])
+            + ", inc: {0:.1f}".format(summary["inc"])
+            + ", raan: {0:.0f}".format(summary["raan"])
+            + ", nu: {0:.0f}".format(summary["nu"])
+            + ", ltan {0:.0f}".format(summary["ltan"])
+            )
+
 
 def orbit_string(orbit):
     """Custom function to display orbit altitudes over ground. """
-    orbit_apogee_alt = orbit.a * (1 + orbit.ecc) - Earth.R
-    orbit_perigee_alt = orbit.a * (1 - orbit.ecc) - Earth.R
-    return ("{0:.0f}".format(orbit_perigee_alt) + " x " + "{0:.0f}".format(orbit_apogee_alt)
-            + ", inc: {0:.1f}".format(orbit.inc)
-            + ", raan: {0:.0f}".format(orbit.raan % (360 * u.deg))
-            + ", nu: {0:.0f}".format(orbit.nu % (360 * u.deg))
-            + ", ltan {0:.0f}".format((orbit.raan-mean_sun_long(julian_day(orbit.epoch.to_datetime()))) % (360 * u.deg))
-            )
+    return orbit_summary_string(orbit_summary(orbit))
+
+def orbit_key(orbit):
+    """Returns a hashable key identifying the elements and epoch of an orbit. Used to compare plans between runs.
+
+    Args:
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit, can be None
+
+    Return:
+        (tuple): attractor name, elements in SI units and epoch as two part julian day
+    """
+    if orbit is None:
+        return None
+    elements = OrbitElements.from_orbit(orbit)
+    return ((str(elements.attractor), elements.a_si, elements.ecc_si, elements.inc_si, elements.raan_si,
+             elements.argp_si, elements.nu_si) + epoch_key(elements.epoch))
 
 def nodal_precession(orbit):
     """Returns the nodal precession period and speed of an object orbiting a body.
@@ -28,11 +253,8 @@ def nodal_precession(orbit):
         (u.day): period of precession
         (u.deg / u.day): angular speed of precession
     """
-    body = orbit.attractor
-    nodal_precession_period = orbit.period / (-1.5 * body.R**2 /
-                                              (orbit.a * (1 - orbit.ecc**2))**2 * body.J2 * np.cos(orbit.inc.to(u.rad)))
-    nodal_precession_speed = 360 * u.deg / nodal_precession_period
-    return nodal_precession_period.to(u.day), nodal_precession_speed.to(u.deg / u.day)
+    speed = orbit_nodal_precession_speed_si(orbit)
+    return (2 * np.pi / speed / SECONDS_PER_DAY) * u.day, np.rad2deg(speed * SECONDS_PER_DAY) * u.deg / u.day
 
 
 def mean_sun_long(jde):  # Mean sun longitude at JDE (from algo [1]p.183)
@@ -99,9 +321,9 @@ def instant_orbital_velocity(orbit, radius):
     if radius > orbit.r_a + 1 * u.m:
         raise Exception('Unattainable radius specified.', radius, orbit)
     # compute speed
-    body = orbit.attractor
-    speed = np.sqrt(body.k * (2./radius - 1/orbit.a)).to(u.m / u.s)
-    return speed.to(u.m/u.s)
+    speed = orbital_velocity_si(orbit.attractor.k.to_value(u.m ** 3 / u.s ** 2), orbit.a.to_value(u.m),
+                                radius.to_value(u.m))
+    return speed * u.m / u.s
 
 
 def inclination_change_delta_v(initial_orbit, final_orbit):
@@ -171,8 +393,8 @@ def high_thrust_delta_v(initial_orbit, final_orbit, initial_mass, mean_thrust, i
     # find transfer orbit, neglecting argument of periapsis change
     a = (first_burn_radius + second_burn_radius) / 2.
     ecc = abs(first_burn_radius - second_burn_radius) / (first_burn_radius + second_burn_radius)
-    transfer_orbit = Orbit.from_classical(final_orbit.attractor, a, ecc, final_orbit.inc, final_orbit.raan,
-                                          final_orbit.argp, final_orbit.nu, final_orbit.epoch)
+    transfer_orbit = OrbitElements.from_classical(final_orbit.attractor, a, ecc, final_orbit.inc, final_orbit.raan,
+                                                  final_orbit.argp, final_orbit.nu, final_orbit.epoch)
 
     if final_orbit.attractor != initial_orbit.attractor:
         raise ValueError("Initial and final orbits have different attractors.")
@@ -257,9 +479,8 @@ def compute_altitude_maintenance_delta_v(duration, orbit):
         (u.m / u.s): required delta v
     """
     if orbit.attractor == Earth:
-        altitude = orbit.a - orbit.attractor.R
-        delta_v_per_year = 9.0e18 * altitude.to(u.km).value**(-6.746) * u.m / u.s / u.year
-        delta_v = (delta_v_per_year * duration.to(u.year)).to(u.m / u.s)
+        altitude = (orbit.a.to_value(u.m) - orbit.attractor.R.to_value(u.m)) / 1000.
+        delta_v = 9.0e18 * altitude ** (-6.746) * duration.to_value(u.year) * u.m / u.s
         manoeuvre = Manoeuvre(delta_v,id="altitude maintenance")
         manoeuvre.burn_duration = duration
         return manoeuvre
@@ -272,18 +493,27 @@ def compute_altitude_maintenance_delta_v(duration, orbit):
     else:
         raise ValueError(f"{orbit.attractor} is not yet included in this model. Please wait for updates.")
 
+def raan_change_delta_v_si(delta_raan, initial_orbit, final_orbit):
+    """ Returns the delta v in m/s of a small direct raan change, used by the high and low thrust models.
+
+    Args:
+        delta_raan (u.<angle unit>): raan change to perform
+        initial_orbit (poliastro.twobody.Orbit): initial orbit
+        final_orbit (poliastro.twobody.Orbit): final orbit
+
+    Return:
+        (float): delta v in m/s
+    """
+    delta_raan = wrap_angle_deg(delta_raan.to_value(u.deg))
+    mean_a = (final_orbit.a.to_value(u.m) + initial_orbit.a.to_value(u.m)) / 2
+    mean_inc = (final_orbit.inc.to_value(u.rad) + initial_orbit.inc.to_value(u.rad)) / 2
+    vel = np.sqrt(initial_orbit.attractor.k.to_value(u.m ** 3 / u.s ** 2) / mean_a)
+    return np.pi / 2 * vel * np.sin(mean_inc) * abs(np.deg2rad(delta_raan))
+
 def high_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit, initial_mass, mean_thrust, isp):
     """ Returns a rough estimation of delta_v needed to perform a small change in raan.
     This is not valid for large maneuvers, only maintenance or corrections."""
-    delta_raan = delta_raan % (360 * u.deg)
-    if delta_raan > 180. * u.deg:
-        delta_raan -= 360. * u.deg
-
-    mean_a = (final_orbit.a + initial_orbit.a) / 2
-    mean_inc = (final_orbit.inc + initial_orbit.inc) / 2
-    vel = np.sqrt(initial_orbit.attractor.k / mean_a.to(u.m))
-    d_inc_ratio = np.sin(mean_inc.to(u.rad))
-    delta_v = np.pi / 2 * vel * d_inc_ratio * abs(delta_raan.to(u.rad).value)
+    delta_v = raan_change_delta_v_si(delta_raan, initial_orbit, final_orbit) * u.m / u.s
 
     manoeuvre = Manoeuvre(delta_v,id="high trust direct raan change")
     burned_mass = manoeuvre.compute_burn_mass_and_duration(initial_mass, mean_thrust, isp)
@@ -294,13 +524,7 @@ def high_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit, init
 def low_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit, initial_mass, mean_thrust, isp):
     """ Returns a rough estimation of delta_v needed to perform a small change in raan.
     This is not valid for large maneuvers, only maintenance or corrections."""
-    delta_raan = delta_raan % (360 * u.deg)
-    if delta_raan > 180. * u.deg:
-        delta_raan -= 360. * u.deg
-    mean_a = (final_orbit.a + initial_orbit.a) / 2
-    mean_inc = (final_orbit.inc + initial_orbit.inc) / 2
-    delta_v = np.pi / 2 * (np.sqrt(initial_orbit.attractor.k / mean_a) * np.sin(mean_inc.to(u.rad).value)
-                           * abs(delta_raan.to(u.rad).value))
+    delta_v = raan_change_delta_v_si(delta_raan, initial_orbit, final_orbit) * u.m / u.s
 
     manoeuvre = Manoeuvre(delta_v,id="low trust direct raan change")
     burned_mass = manoeuvre.compute_burn_mass_and_duration(initial_mass, mean_thrust, isp)
@@ -311,42 +535,31 @@ def low_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit, initi
 def update_orbit(orbit, reference_epoch,starting_epoch=None):
     """ Update an orbit to a further reference epoch by adding raan drift, only if the main body is Earth.
 
+    The propagation only depends on the orbit elements and the time since their epoch, and is cached on those values
+    (see drift_elements_si): identical propagations from different epochs are only computed once.
+
     Args:
-        orbit (poliastro.twobody.Orbit): orbit to be updated
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit to be updated
         reference_epoch (astropy.time.Time): epoch to which the orbit needs to be updated
+        starting_epoch (astropy.time.Time): (optional) epoch replacing the orbit epoch before the update
 
     Return:
-        (poliastro.twobody.Orbit): orbit at reference epoch
+        (OrbitElements): orbit at reference epoch
 
     TODO: implement more complex things like altitude loses or lack of orbit maintenance
     """
-    if starting_epoch is not None:
-        orbit = Orbit.from_classical(orbit.attractor, orbit.a, orbit.ecc,
-                                     orbit.inc, orbit.raan,
-                                     orbit.argp, orbit.nu,
-                                     starting_epoch)
-                                     
-    time_since_epoch = reference_epoch - orbit.epoch
-    if time_since_epoch < 0:
+    epoch = orbit.epoch if starting_epoch is None else starting_epoch
+    time_since_epoch = reference_epoch - epoch
+    if time_since_epoch.to_value(u.s) < 0:
         raise Exception('Error in timing propagation in Orbit Change.'
-                        + str(time_since_epoch) + str(reference_epoch) + str(orbit.epoch))
-
-    if orbit.attractor == Earth:
-        raan_drift_since_epoch = nodal_precession(orbit)[1] * time_since_epoch
-    else:
-        raan_drift_since_epoch = 0.*u.deg
-    current_raan = (orbit.raan + raan_drift_since_epoch).to(u.deg) % (360 * u.deg)
-    if current_raan > 180. * u.deg:
-        current_raan = current_raan - 360. * u.deg
-    if current_raan <= -180. * u.deg:
-        current_raan = current_raan + 360. * u.deg
-
-    new_orbit = Orbit.from_classical(orbit.attractor, orbit.a, orbit.ecc,
-                                     orbit.inc, current_raan,
-                                     orbit.argp, orbit.nu,
-                                     orbit.epoch)
-    new_orbit = new_orbit.propagate(time_since_epoch)
-    return new_orbit
+                        + str(time_since_epoch) + str(reference_epoch) + str(epoch))
+
+    elements = OrbitElements.from_orbit(orbit)
+    raan, nu = drift_elements_si(*body_constants_si(elements.attractor), elements.a_si, elements.ecc_si,
+                                 elements.inc_si, elements.raan_si, elements.nu_si, time_since_epoch.to_value(u.s),
+                                 elements.attractor == Earth)
+    return OrbitElements(elements.attractor, elements.a_si, elements.ecc_si, elements.inc_si, raan, elements.argp_si,
+                         nu, epoch + time_since_epoch)
 
 def get_reentry_parameters(orbit, altitude=100. * u.km):
     """
@@ -22,6 +22,8 @@ class GenericPhase:
         duration (u.second): duration of the phase
         spacecraft_snapshot (Scenario.Fleet_module.Servicer): copy of the servicer, in its state at the completion of the phase
                                                  (for reference and post-processing purposes)
+        result (dict): structured results of the phase and state of the servicer at its completion, from which
+                       spacecraft_snapshot is rendered (see build_result)
         starting_date (astropy.time.Time): beginning date of the phase (computed during simulation)
         end_date (astropy.time.Time): finish date of the phase (computed during simulation)
     """
@@ -32,6 +34,7 @@ class GenericPhase:
         plan.add_phase(self)
         self.duration = 0. * u.second
         self.spacecraft_snapshot = None
+        self.result = None
         self.starting_date = Time("2000-01-01 12:00:00")
         self.end_date = Time("2000-01-01 12:00:00")
         self.manoeuvres = []
@@ -40,7 +43,37 @@ class GenericPhase:
         """ Change the servicer and clients impacted by the phase when called during simulation. """
         # In inheriting phases, this method holds the method to perform the phase, then calls the update_servicer method
         self.update_spacecraft()
-        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string()
+        self.take_spacecraft_snapshot()
+
+    def get_checkpoint_key(self):
+        """ Returns a key identifying everything the phase depends on besides the state of the spacecrafts.
+        Two phases with the same key, applied to spacecrafts in the same state, give the same results, which lets the
+        plan reuse the phases of a previous run (see Plan.apply).
+
+        By default a phase cannot be reused and None is returned. This method is redefined within inheriting phases.
+
+        Return:
+            (tuple): phase key or None
+        """
+        return None
+
+    def build_checkpoint_key(self, *items):
+        """ Returns the key shared by all phases (type, id and module) extended with specific items.
+        The items must not depend on values computed when the phase is applied.
+
+        Args:
+            items: hashable items specific to the inheriting phase
+
+        Return:
+            (tuple): phase key
+        """
+        return (type(self).__name__, self.ID, self.get_assigned_module().get_id()) + items
+
+    def restore(self):
+        """ Restore the effects of the phase on objects outside of the plan spacecrafts when the phase is reused from
+        a previous run. This function may be redefined within inheriting phases.
+        """
+        pass
 
     def assign_module(self, assigned_module):
         """ Assigns a module of a servicer to the phase.
@@ -97,16 +130,42 @@ class GenericPhase:
         new_orbit = update_orbit(spacecraft.current_orbit, self.end_date)
         spacecraft.change_orbit(new_orbit)
 
-    def build_spacecraft_snapshot_string(self):
-        """ Save current assigned servicer as a snapshot for future references and post-processing. """
+    def take_spacecraft_snapshot(self):
+        """ Save the results of the phase and the current assigned servicer for future references and post-processing. """
+        self.result = self.build_result()
+        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string(self.result)
+
+    def build_result(self):
+        """ Returns the structured results of the phase, with the state of the assigned servicer at its completion.
+        This function may be extended within inheriting phases.
+
+        Return:
+            (dict): results of the phase
+        """
+        return dict(phase_id=str(self.ID),
+                    phase_type=type(self).__name__,
+                    module_id=str(self.get_assigned_module().id),
+                    starting_epoch=self.starting_date,
+                    ending_epoch=self.end_date,
+                    duration=self.duration,
+                    delta_v=self.get_delta_v(),
+                    nb_manoeuvres=self.get_nb_manoeuvers(),
+                    spacecraft=self.get_assigned_spacecraft().get_snapshot())
+
+    def build_spacecraft_snapshot_string(self, result):
+        """ Renders the results of the phase (see build_result) as the snapshot string of the report.
+
+        Args:
+            result (dict): results of the phase
+        """
         # format duration
-        duration_print = convert_time_for_print(self.duration)
+        duration_print = convert_time_for_print(result["duration"])
 
         # Build snapshot string
-        return (str(self.ID)
-        + "\n\tAssociated Module: " + str(self.get_assigned_module().id)
+        return (result["phase_id"]
+        + "\n\tAssociated Module: " + result["module_id"]
         + "\n\tTotal Duration: " + "{0:.1f}".format(duration_print)
-        + self.get_assigned_spacecraft().generate_snapshot_string())
+        + self.get_assigned_spacecraft().generate_snapshot_string(result["spacecraft"]))
 
     def get_operational_cost(self):
         """ Returns the operational cost of the phase based on operation labour.
@@ -129,6 +188,7 @@ class GenericPhase:
     def reset(self):
         """ Resets the phase to its pre-simulation state. This function may be redefined within inheriting phases. """
         self.spacecraft_snapshot = None
+        self.result = None
         self.starting_date = Time("2000-01-01 12:00:00")
         self.end_date = Time("2000-01-01 12:00:00")
 
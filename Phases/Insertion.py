@@ -1,5 +1,6 @@
 from Modules.PropulsionModule import *
 from Phases.GenericPhase import GenericPhase
+from Phases.Common_functions import orbit_key
 
 
 class Insertion(GenericPhase):
@@ -48,7 +49,12 @@ class Insertion(GenericPhase):
         self.get_assigned_spacecraft().change_orbit(self.orbit)
         self.get_assigned_module().consume_propellant(self.propellant * (1 + self.contingency), 'rcs_thrusters')
         self.update_spacecraft()
-        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string()
+        self.take_spacecraft_snapshot()
+
+    def get_checkpoint_key(self):
+        """ Returns a key identifying the insertion orbit, propellant and duration of the phase (see GenericPhase). """
+        return self.build_checkpoint_key(orbit_key(self.orbit), self.propellant.to_value(u.kg), self.contingency,
+                                         self.duration.to_value(u.s))
 
     def get_operational_cost(self):
         """ Returns the operational cost of the phase based on assumed FTE and associated costs. 
@@ -60,6 +66,10 @@ class Insertion(GenericPhase):
         cost_fte_operation = 100 * 1000 / u.year  # Euros per year
         return (fte_operation * cost_fte_operation * self.duration).decompose()
     
-    def build_spacecraft_snapshot_string(self):
-        """ Save current assigned servicer as a snapshot for future references and post-processing. """
-        return '--- \nInsertion: ' + super().build_spacecraft_snapshot_string()
\ No newline at end of file
+    def build_result(self):
+        """ Adds the propellant used for the insertion to the results of the phase (see GenericPhase). """
+        return dict(super().build_result(), propellant_used=self.propellant * (1 + self.contingency))
+
+    def build_spacecraft_snapshot_string(self, result):
+        """ Renders the results of the phase as the snapshot string of the report (see GenericPhase). """
+        return '--- \nInsertion: ' + super().build_spacecraft_snapshot_string(result)
\ No newline at end of file
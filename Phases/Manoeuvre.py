@@ -23,11 +23,13 @@ class Manoeuvre:
         return self.delta_v
 
     def compute_burn_mass_and_duration(self, initial_mass, mean_thrust, isp):
-        final_mass = initial_mass / np.exp((self.delta_v.to(u.meter / u.second) / const.g0 / isp.to(u.second)).value)
+        # computed on floats in SI units, units are attached to the returned values only
+        delta_v = self.delta_v.to_value(u.m / u.s)
+        initial_mass = initial_mass.to_value(u.kg)
+        final_mass = initial_mass / np.exp(delta_v / const.g0.value / isp.to_value(u.s))
         mean_mass = (final_mass + initial_mass) / 2
-        self.burn_duration = mean_mass / mean_thrust * self.delta_v
-        self.burn_duration = self.burn_duration.to(u.s)
-        return initial_mass - final_mass
+        self.burn_duration = mean_mass / mean_thrust.to_value(u.N) * delta_v * u.s
+        return (initial_mass - final_mass) * u.kg
 
     def get_burn_duration(self, duty_cycle=1.):
         """
@@ -68,7 +68,7 @@ class OrbitChange(GenericPhase):
 
         # if both initial and final orbit are available, get first estimate of manoeuvres
         # (helps convergence as propulsion module is sized based on thrust and delta_v required for orbit changes)
-        if not isinstance(self.final_orbit, Orbit):
+        if not isinstance(self.final_orbit, (Orbit, OrbitElements)):
             self.final_orbit = self.final_orbit.current_orbit
         if self.initial_orbit:
             self.compute_main_manoeuvres(initial_orbit=self.initial_orbit, final_orbit=self.final_orbit)
@@ -92,7 +92,7 @@ class OrbitChange(GenericPhase):
         Calls generic function to update orbit raan and epoch.
         """
         # In case the final orbit is given as a servicer or target, retrieve the object's orbit
-        if not isinstance(self.final_orbit, Orbit):
+        if not isinstance(self.final_orbit, (Orbit, OrbitElements)):
             self.final_orbit = self.final_orbit.current_orbit
 
         # update the final orbit by adding raan drift to match servicer epoch
@@ -106,8 +106,21 @@ class OrbitChange(GenericPhase):
 
         # update servicer according to computed orbits and duration
         self.update_spacecraft()
-        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string()
-    
+        self.take_spacecraft_snapshot()
+
+    def get_checkpoint_key(self):
+        """ Returns a key identifying the planned orbits, phasing options and propulsion parameters (see GenericPhase).
+        Phases targeting the current orbit of another object cannot be reused and None is returned.
+        """
+        if not isinstance(self.planned_final_orbit, (Orbit, OrbitElements)):
+            return None
+        module = self.get_assigned_module()
+        return self.build_checkpoint_key(orbit_key(self.planned_final_orbit), orbit_key(self.planned_initial_orbit),
+                                         self.raan_specified, self.raan_phasing_absolute,
+                                         self.raan_cutoff.to_value(u.deg), self.delta_v_contingency,
+                                         module.prop_type, module.reference_thrust.to_value(u.N),
+                                         module.isp.to_value(u.s))
+
     # def apply_delta_v(self):
     #     """ Compute the delta v for the maneuver and possible orbit maintenance during phasing.
     #     Apply this delta v according to assigned module.
@@ -145,15 +158,12 @@ class OrbitChange(GenericPhase):
         self.end_date = self.starting_date + self.duration
 
         # format raan
-        current_raan = (self.initial_orbit.raan + self.raan_drift) % (360. * u.deg)
-        if current_raan > 180. * u.deg:
-            current_raan = current_raan - 360. * u.deg
-            
+        current_raan = wrap_angle_deg(self.initial_orbit.raan.to_value(u.deg) + self.raan_drift.to_value(u.deg)) * u.deg
+
         # compute new orbit
-        new_orbit = Orbit.from_classical(self.final_orbit.attractor, self.final_orbit.a, self.final_orbit.ecc,
-                                         self.final_orbit.inc, current_raan,
-                                         self.final_orbit.argp, self.final_orbit.nu,
-                                         self.end_date)
+        new_orbit = OrbitElements.from_orbit(self.final_orbit)
+        new_orbit.raan = current_raan
+        new_orbit.epoch = self.end_date
         self.final_orbit = new_orbit
 
         if spacecraft is None:
@@ -320,9 +330,16 @@ class OrbitChange(GenericPhase):
             isp = self.get_assigned_module().isp
 
         # compute mean nodal precession during manoeuvre (significant for low thrust manoeuvres)
-        _, initial_nodal_precession_speed = nodal_precession(initial_orbit)
-        _, final_nodal_precession_speed = nodal_precession(final_orbit)
+        # the computation is done on floats, in degrees and days, and units are attached to the returned values
+        body_constants = body_constants_si(initial_orbit.attractor)
+        initial_nodal_precession_speed = np.rad2deg(nodal_precession_speed_si(*body_constants,
+                                                                              *orbit_elements_si(initial_orbit))
+                                                    * SECONDS_PER_DAY)
+        final_nodal_precession_speed = np.rad2deg(nodal_precession_speed_si(*body_constants,
+                                                                            *orbit_elements_si(final_orbit))
+                                                  * SECONDS_PER_DAY)
         transfer_mean_nodal_precession_speed = (initial_nodal_precession_speed + final_nodal_precession_speed) / 2
+        manoeuvre_duration = manoeuvre_duration.to_value(u.day)
 
         # finalorbit.raan != initialorbit.raan
         if raan_phasing:
@@ -330,25 +347,20 @@ class OrbitChange(GenericPhase):
             maneuver_delta_precession = transfer_mean_nodal_precession_speed - final_nodal_precession_speed
             maneuver_delta_raan = manoeuvre_duration * maneuver_delta_precession
 
-            # Compute remainign raan to be covered by phasing
-            delta_raan = (final_orbit.raan - initial_orbit.raan - maneuver_delta_raan).to(u.deg) % (360 * u.deg)
-
-            # Correct raan loop
-            if delta_raan > 180. * u.deg:
-                delta_raan = delta_raan - 360. * u.deg
-            if delta_raan < -180. * u.deg:
-                delta_raan = delta_raan + 360. * u.deg
+            # Compute remainign raan to be covered by phasing and correct raan loop
+            delta_raan = wrap_angle_deg(final_orbit.raan.to_value(u.deg) - initial_orbit.raan.to_value(u.deg)
+                                        - maneuver_delta_raan)
  
             # Check if phasing can be avoided to the benefit of direct raan change manoeuvre
-            if abs(delta_raan) < self.raan_cutoff:
-                phasing_duration = 0. * u.day
+            if abs(delta_raan) < self.raan_cutoff.to_value(u.deg):
+                phasing_duration = 0.
                 if self.assigned_module.prop_type == 'electrical':
-                    raan_change_manoeuvre, raan_change_duration = low_thrust_raan_change_delta_v(delta_raan,
+                    raan_change_manoeuvre, raan_change_duration = low_thrust_raan_change_delta_v(delta_raan * u.deg,
                                                                                                  initial_orbit,
                                                                                                  final_orbit,
                                                                                                  mass, thrust, isp)
                 else:
-                    raan_change_manoeuvre, raan_change_duration = high_thrust_raan_change_delta_v(delta_raan,
+                    raan_change_manoeuvre, raan_change_duration = high_thrust_raan_change_delta_v(delta_raan * u.deg,
                                                                                                   initial_orbit,
                                                                                                   final_orbit,
                                                                                                   mass, thrust, isp)
@@ -378,11 +390,11 @@ class OrbitChange(GenericPhase):
         else:
             # No manoeuvre needed
             raan_change_manoeuvre = None
-            phasing_duration = 0. * u.day
+            phasing_duration = 0.
 
             raan_drift = transfer_mean_nodal_precession_speed * manoeuvre_duration
 
-        return phasing_duration.to(u.day), raan_drift.to(u.deg), raan_change_manoeuvre
+        return phasing_duration * u.day, raan_drift * u.deg, raan_change_manoeuvre
 
     def get_operational_cost(self):
         """ Returns the operational cost of the phase based on assumed FTE and associated costs.
@@ -399,6 +411,7 @@ class OrbitChange(GenericPhase):
         # reset main parameters
         self.duration = 0. * u.second
         self.spacecraft_snapshot = None
+        self.result = None
         self.starting_date = Time("2000-01-01 12:00:00")
         self.end_date = Time("2000-01-01 12:00:00")
         self.raan_drift = 0. * u.deg
@@ -410,15 +423,22 @@ class OrbitChange(GenericPhase):
         # reset the initial orbit
         self.initial_orbit = self.planned_initial_orbit
 
-    def build_spacecraft_snapshot_string(self):
-        """ Save current assigned servicer as a snapshot for future references and post-processing. """
+    def build_result(self):
+        """ Adds the delta v with contingency, the propellant used and the manoeuvres to the results of the phase (see GenericPhase). """
+        return dict(super().build_result(),
+                    delta_v=self.get_delta_v() * (1 + self.delta_v_contingency),
+                    propellant_used=self.get_assigned_spacecraft().get_main_propulsion_module().delta_mass,
+                    manoeuvres=[str(manoeuvre) for manoeuvre in self.manoeuvres])
+
+    def build_spacecraft_snapshot_string(self, result):
+        """ Renders the results of the phase as the snapshot string of the report (see GenericPhase). """
         # Combine all manoeuvres into a single string
         manoeuvres_string = ""
-        for manoeuvre in self.manoeuvres:
-            manoeuvres_string += ("\t\t" + str(manoeuvre) + " \n")
+        for manoeuvre in result["manoeuvres"]:
+            manoeuvres_string += ("\t\t" + manoeuvre + " \n")
 
-        return('--- \nOrbit change: ' + super().build_spacecraft_snapshot_string()
-        + '\n\t\u0394V: ' + "{0:.1f}".format(self.get_delta_v() * (1 + self.delta_v_contingency))
-        + "\n\t\u0394m: " + "{0:.1f}".format(self.get_assigned_spacecraft().get_main_propulsion_module().delta_mass)
+        return('--- \nOrbit change: ' + super().build_spacecraft_snapshot_string(result)
+        + '\n\t\u0394V: ' + "{0:.1f}".format(result["delta_v"])
+        + "\n\t\u0394m: " + "{0:.1f}".format(result["propellant_used"])
         + "\n\tManoeuvres: \n " + manoeuvres_string[:-2])
 
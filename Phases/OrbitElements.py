@@ -0,0 +1,421 @@
+import numpy as np
+from astropy import units as u
+
+
+def propagate_true_anomaly_si(k, a, ecc, nu, time_of_flight):
+    """ Returns the true anomaly of an elliptical orbit after a time of flight (two-body problem).
+
+    Args:
+        k (float): gravitational parameter of the attractor in m3/s2
+        a (float): semi-major axis in m
+        ecc (float): eccentricity (0 <= ecc < 1)
+        nu (float): initial true anomaly in rad
+        time_of_flight (float): propagation duration in s
+
+    Return:
+        (float): true anomaly in rad, wrapped into [-pi, pi[
+    """
+    mean_motion = np.sqrt(k / a ** 3)
+    if ecc < 1e-12:
+        new_nu = nu + mean_motion * time_of_flight
+    else:
+        # mean anomaly at epoch
+        eccentric_anomaly = 2 * np.arctan(np.sqrt((1 - ecc) / (1 + ecc)) * np.tan(nu / 2))
+        mean_anomaly = eccentric_anomaly - ecc * np.sin(eccentric_anomaly)
+
+        # mean anomaly after the time of flight, solve Kepler's equation with Newton iterations
+        mean_anomaly = (mean_anomaly + mean_motion * time_of_flight + np.pi) % (2 * np.pi) - np.pi
+        eccentric_anomaly = mean_anomaly if ecc < 0.8 else np.pi
+        for _ in range(50):
+            step = ((eccentric_anomaly - ecc * np.sin(eccentric_anomaly) - mean_anomaly)
+                    / (1 - ecc * np.cos(eccentric_anomaly)))
+            eccentric_anomaly = eccentric_anomaly - step
+            if abs(step) < 1e-14:
+                break
+        new_nu = 2 * np.arctan(np.sqrt((1 + ecc) / (1 - ecc)) * np.tan(eccentric_anomaly / 2))
+    return (new_nu + np.pi) % (2 * np.pi) - np.pi
+
+
+class OrbitElements:
+    """ Lightweight classical orbital elements record used inside plans, phases and spacecrafts.
+
+    The elements are stored as floats in SI units and exposed as astropy Quantities through the same attribute names
+    as poliastro.twobody.Orbit (a, ecc, inc, raan, argp, nu, epoch, attractor, period, r_a, r_p, t_p), so that both can be
+    used interchangeably by the rest of the code. The poliastro object is only built when needed (plotting, export)
+    through to_orbit.
+
+    Args:
+        attractor (poliastro.bodies.Body): main attractor
+        a (float): semi-major axis in m
+        ecc (float): eccentricity
+        inc (float): inclination in rad
+        raan (float): right ascension of the ascending node in rad
+        argp (float): argument of periapsis in rad
+        nu (float): true anomaly in rad
+        epoch (astropy.time.Time): epoch of the elements
+
+    Attributes:
+        attractor (poliastro.bodies.Body): main attractor
+        a_si (float): semi-major axis in m
+        ecc_si (float): eccentricity
+        inc_si (float): inclination in rad
+        raan_si (float): right ascension of the ascending node in rad
+        argp_si (float): argument of periapsis in rad
+        nu_si (float): true anomaly in rad
+        epoch (astropy.time.Time): epoch of the elements, shared by reference as Time objects are immutable
+    """
+    __slots__ = ("attractor", "a_si", "ecc_si", "inc_si", "raan_si", "argp_si", "nu_si", "epoch")
+
+    def __init__(self, attractor, a, ecc, inc, raan, argp, nu, epoch):
+        self.attractor = attractor
+        self.a_si = float(a)
+        self.ecc_si = float(ecc)
+        self.inc_si = float(inc)
+        self.raan_si = float(raan)
+        self.argp_si = float(argp)
+        self.nu_si = (float(nu) + np.pi) % (2 * np.pi) - np.pi
+        self.epoch = epoch
+
+    @classmethod
+    def from_classical(cls, attractor, a, ecc, inc, raan, argp, nu, epoch):
+        """ Builds the record from Quantities, with the same signature as poliastro.twobody.Orbit.from_classical.
+
+        Args:
+            attractor (poliastro.bodies.Body): main attractor
+            a (u.<distance unit>): semi-major axis
+            ecc (u.one): eccentricity
+            inc (u.<angle unit>): inclination
+            raan (u.<angle unit>): right ascension of the ascending node
+            argp (u.<angle unit>): argument of periapsis
+            nu (u.<angle unit>): true anomaly
+            epoch (astropy.time.Time): epoch of the elements
+
+        Return:
+            (OrbitElements): new record
+        """
+        inc = inc.to_value(u.rad)
+        if not 0. <= inc <= np.pi:
+            raise ValueError("Inclination must be between 0 and 180 degrees")
+        ecc = u.Quantity(ecc, u.one).value
+        if ecc >= 1.:
+            raise ValueError("Only elliptical orbits are supported by OrbitElements")
+        return cls(attractor, a.to_value(u.m), ecc, inc, raan.to_value(u.rad), argp.to_value(u.rad),
+                   nu.to_value(u.rad), epoch)
+
+    @classmethod
+    def from_orbit(cls, orbit):
+        """ Builds the record from a poliastro orbit or from another record.
+
+        Args:
+            orbit (poliastro.twobody.Orbit or OrbitElements): orbit to convert
+
+        Return:
+            (OrbitElements): new record
+        """
+        if isinstance(orbit, OrbitElements):
+            return orbit.copy()
+        return cls(orbit.attractor, orbit.a.to_value(u.m), orbit.ecc.value, orbit.inc.to_value(u.rad),
+                   orbit.raan.to_value(u.rad), orbit.argp.to_value(u.rad), orbit.nu.to_value(u.rad), orbit.epoch)
+
+    def to_orbit(self):
+        """ Returns the equivalent poliastro orbit. Only used for plotting and export.
+
+        Return:
+            (poliastro.twobody.Orbit): equivalent orbit
+        """
+        from poliastro.twobody import Orbit
+        return Orbit.from_classical(self.attractor, self.a, self.ecc, self.inc, self.raan, self.argp, self.nu,
+                                    self.epoch)
+
+    def copy(self):
+        """ Returns a copy of the record. The attractor and epoch are shared as they are not modified in place.
+
+        Return:
+            (OrbitElements): copied record
+        """
+        return OrbitElements(self.attractor, self.a_si, self.ecc_si, self.inc_si, self.raan_si, self.argp_si,
+                             self.nu_si, self.epoch)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def propagate(self, time_of_flight):
+        """ Returns the record propagated by a time of flight on a keplerian orbit (only the true anomaly changes).
+
+        Args:
+            time_of_flight (u.<time unit> or astropy.time.TimeDelta): propagation duration
+
+        Return:
+            (OrbitElements): propagated record
+        """
+        new_orbit = self.copy()
+        new_orbit.nu_si = propagate_true_anomaly_si(self.attractor.k.to_value(u.m ** 3 / u.s ** 2), self.a_si,
+                                                    self.ecc_si, self.nu_si, time_of_flight.to_value(u.s))
+        new_orbit.epoch = self.epoch + time_of_flight
+        return new_orbit
+
+    @property
+    def epoch_jd(self):
+        """ (float): epoch as julian day in the epoch time scale """
+        return self.epoch.jd
+
+    @property
+    def a(self):
+        """ (u.km): semi-major axis """
+        return self.a_si / 1000. * u.km
+
+    @a.setter
+    def a(self, value):
+        self.a_si = value.to_value(u.m)
+
+    @property
+    def ecc(self):
+        """ (u.one): eccentricity """
+        return self.ecc_si * u.one
+
+    @ecc.setter
+    def ecc(self, value):
+        self.ecc_si = u.Quantity(value, u.one).value
+
+    @property
+    def inc(self):
+        """ (u.deg): inclination """
+        return np.rad2deg(self.inc_si) * u.deg
+
+    @inc.setter
+    def inc(self, value):
+        self.inc_si = value.to_value(u.rad)
+
+    @property
+    def raan(self):
+        """ (u.deg): right ascension of the ascending node """
+        return np.rad2deg(self.raan_si) * u.deg
+
+    @raan.setter
+    def raan(self, value):
+        self.raan_si = value.to_value(u.rad)
+
+    @property
+    def argp(self):
+        """ (u.deg): argument of periapsis """
+        return np.rad2deg(self.argp_si) * u.deg
+
+    @argp.setter
+    def argp(self, value):
+        self.argp_si = value.to_value(u.rad)
+
+    @property
+    def nu(self):
+        """ (u.deg): true anomaly """
+        return np.rad2deg(self.nu_si) * u.deg
+
+    @nu.setter
+    def nu(self, value):
+        self.nu_si = (value.to_value(u.rad) + np.pi) % (2 * np.pi) - np.pi
+
+    @property
+    def period(self):
+        """ (u.s): orbital period """
+        return 2 * np.pi * np.sqrt(self.a_si ** 3 / self.attractor.k.to_value(u.m ** 3 / u.s ** 2)) * u.s
+
+    @property
+    def t_p(self):
+        """ (u.s): elapsed time since the latest periapsis passage, as used by poliastro time_to_anomaly """
+        eccentric_anomaly = 2 * np.arctan(np.sqrt((1 - self.ecc_si) / (1 + self.ecc_si)) * np.tan(self.nu_si / 2))
+        mean_anomaly = eccentric_anomaly - self.ecc_si * np.sin(eccentric_anomaly)
+        return mean_anomaly / np.sqrt(self.attractor.k.to_value(u.m ** 3 / u.s ** 2) / self.a_si ** 3) * u.s
+
+    @property
+    def r_a(self):
+        """ (u.km): radius of apoapsis """
+        return self.a_si * (1 + self.ecc_si) / 1000. * u.km
+
+    @property
+    def r_p(self):
+        """ (u.km): radius of periapsis """
+        return self.a_si * (1 - self.ecc_si) / 1000. * u.km
+
+    def __str__(self):
+        return (f"{self.r_p - self.attractor.R:.0f} x {self.r_a - self.attractor.R:.0f} x {self.inc:.1f} orbit "
+                f"around {self.attractor} at epoch {self.epoch} ({self.epoch.scale})")
+
+
+def copy_orbit(orbit):
+    """ Returns a copy of an orbit that can be kept while the original is modified.
+    OrbitElements records are mutable and copied, poliastro orbits are immutable and returned as is.
+
+    Args:
+        orbit (poliastro.twobody.Orbit or OrbitElements): orbit, can be None
+
+    Return:
+        (poliastro.twobody.Orbit or OrbitElements): copied orbit
+    """
+    if isinstance(orbit, OrbitElements):
+        return orbit.copy()
+    return orbit
+
+
+class OrbitElementsBatch:
+    """ Classical orbital elements of several orbits stored as arrays of floats in SI units.
+
+    Used to generate the orbits of large constellations in a single vectorised call. The elements are exposed as
+    Quantity arrays through the same attribute names as OrbitElements. The OrbitElements record of a single orbit is only
+    built when it is accessed, either directly through indexing or lazily through the reference returned by lazy.
+
+    Args:
+        attractor (poliastro.bodies.Body): main attractor, shared by all orbits
+        a (numpy.ndarray): semi-major axis in m
+        ecc (numpy.ndarray): eccentricity
+        inc (numpy.ndarray): inclination in rad
+        raan (numpy.ndarray): right ascension of the ascending node in rad
+        argp (numpy.ndarray): argument of periapsis in rad
+        nu (numpy.ndarray): true anomaly in rad
+        epoch (astropy.time.Time): epoch of the elements, shared by all orbits
+
+    Attributes:
+        attractor (poliastro.bodies.Body): main attractor
+        a_si, ecc_si, inc_si, raan_si, argp_si, nu_si (numpy.ndarray): elements in SI units, broadcast to the same shape
+        epoch (astropy.time.Time): epoch of the elements
+    """
+    __slots__ = ("attractor", "a_si", "ecc_si", "inc_si", "raan_si", "argp_si", "nu_si", "epoch")
+
+    def __init__(self, attractor, a, ecc, inc, raan, argp, nu, epoch):
+        self.attractor = attractor
+        (self.a_si, self.ecc_si, self.inc_si, self.raan_si, self.argp_si,
+         nu) = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (a, ecc, inc, raan, argp, nu)])
+        self.nu_si = (nu + np.pi) % (2 * np.pi) - np.pi
+        self.epoch = epoch
+
+    @classmethod
+    def from_classical(cls, attractor, a, ecc, inc, raan, argp, nu, epoch):
+        """ Builds the batch from Quantities or Quantity arrays, with the same signature and checks as
+        OrbitElements.from_classical. The elements are broadcast against each other.
+
+        Args:
+            attractor (poliastro.bodies.Body): main attractor
+            a (u.<distance unit>): semi-major axis
+            ecc (u.one): eccentricity
+            inc (u.<angle unit>): inclination
+            raan (u.<angle unit>): right ascension of the ascending node
+            argp (u.<angle unit>): argument of periapsis
+            nu (u.<angle unit>): true anomaly
+            epoch (astropy.time.Time): epoch of the elements
+
+        Return:
+            (OrbitElementsBatch): new batch
+        """
+        inc = inc.to_value(u.rad)
+        if np.any((inc < 0.) | (inc > np.pi)):
+            raise ValueError("Inclination must be between 0 and 180 degrees")
+        ecc = u.Quantity(ecc, u.one).value
+        if np.any(ecc >= 1.):
+            raise ValueError("Only elliptical orbits are supported by OrbitElements")
+        return cls(attractor, a.to_value(u.m), ecc, inc, raan.to_value(u.rad), argp.to_value(u.rad),
+                   nu.to_value(u.rad), epoch)
+
+    @property
+    def shape(self):
+        """ (tuple): shape of the batch """
+        return self.a_si.shape
+
+    def __len__(self):
+        return len(self.a_si)
+
+    def __getitem__(self, index):
+        """ Returns the record of one orbit of the batch.
+
+        Args:
+            index (int or tuple): index of the orbit in the batch
+
+        Return:
+            (OrbitElements): new record
+        """
+        return OrbitElements(self.attractor, self.a_si[index], self.ecc_si[index], self.inc_si[index],
+                             self.raan_si[index], self.argp_si[index], self.nu_si[index], self.epoch)
+
+    def lazy(self, index):
+        """ Returns a reference to one orbit of the batch, materialised when first accessed (see LazyOrbitElements).
+
+        Args:
+            index (int or tuple): index of the orbit in the batch
+
+        Return:
+            (LazyOrbitElements): reference to the orbit
+        """
+        return LazyOrbitElements(self, index)
+
+    @property
+    def a(self):
+        """ (u.km): semi-major axis """
+        return self.a_si / 1000. * u.km
+
+    @property
+    def ecc(self):
+        """ (u.one): eccentricity """
+        return self.ecc_si * u.one
+
+    @property
+    def inc(self):
+        """ (u.deg): inclination """
+        return np.rad2deg(self.inc_si) * u.deg
+
+    @property
+    def raan(self):
+        """ (u.deg): right ascension of the ascending node """
+        return np.rad2deg(self.raan_si) * u.deg
+
+    @property
+    def argp(self):
+        """ (u.deg): argument of periapsis """
+        return np.rad2deg(self.argp_si) * u.deg
+
+    @property
+    def nu(self):
+        """ (u.deg): true anomaly """
+        return np.rad2deg(self.nu_si) * u.deg
+
+
+class LazyOrbitElements:
+    """ Reference to one orbit of an OrbitElementsBatch, stored instead of the orbit until it is needed.
+
+    Args:
+        batch (OrbitElementsBatch): batch holding the orbit
+        index (int or tuple): index of the orbit in the batch
+    """
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+
+    def materialise(self):
+        """ Returns the record of the referenced orbit.
+
+        Return:
+            (OrbitElements): new record
+        """
+        return self.batch[self.index]
+
+
+class LazyOrbitAttribute:
+    """ Descriptor of an orbit attribute that may hold a LazyOrbitElements reference.
+    The reference is replaced by the materialised orbit the first time the attribute is read.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        orbit = getattr(instance, self.name)
+        if isinstance(orbit, LazyOrbitElements):
+            orbit = orbit.materialise()
+            setattr(instance, self.name, orbit)
+        return orbit
+
+    def __set__(self, instance, orbit):
+        setattr(instance, self.name, orbit)
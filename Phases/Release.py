@@ -44,11 +44,19 @@ class Release(GenericPhase):
             self.get_assigned_spacecraft().separate_spacecraft(self.target)
 
         self.update_spacecraft()
-        self.spacecraft_snapshot = self.build_spacecraft_snapshot_string()
+        self.take_spacecraft_snapshot()
 
         # Update target insertion orbit
         self.target.set_insertion_epoch(self.get_assigned_spacecraft().get_current_orbit().epoch)
 
+    def get_checkpoint_key(self):
+        """ Returns a key identifying the released target and duration (see GenericPhase). """
+        return self.build_checkpoint_key(self.target.get_id(), self.duration.to_value(u.s))
+
+    def restore(self):
+        """ Update the target insertion epoch, as done when the phase is applied. """
+        self.target.set_insertion_epoch(self.end_date)
+
     def get_operational_cost(self):
         """ Returns the operational cost of the phase based on assumed FTE and associated costs. 
 
@@ -61,7 +69,11 @@ class Release(GenericPhase):
         passes_cost = number_of_additional_gnd_station_passes * 100.
         return (fte_operation * cost_fte_operation * self.duration + passes_cost).decompose()
 
-    def build_spacecraft_snapshot_string(self):
-        """ Save current assigned servicer as a snapshot for future references and post-processing. """
-        return ('--- \nRelease: ' + super().build_spacecraft_snapshot_string()
-                + '\n\tReleased Object: ' + str(self.target))
+    def build_result(self):
+        """ Adds the released object to the results of the phase (see GenericPhase). """
+        return dict(super().build_result(), released_object=str(self.target))
+
+    def build_spacecraft_snapshot_string(self, result):
+        """ Renders the results of the phase as the snapshot string of the report (see GenericPhase). """
+        return ('--- \nRelease: ' + super().build_spacecraft_snapshot_string(result)
+                + '\n\tReleased Object: ' + result["released_object"])
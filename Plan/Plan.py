@@ -21,20 +21,28 @@ class Plan:
     Args:
         plan_id (str): Standard id. Needs to be unique.
         starting_epoch (astropy.Time): reference epoch corresponding to first launch
+        checkpointing (boolean): if True, the spacecrafts state is saved after each phase and reused by the next
+                                 application of the plan when its first phases are unchanged
 
     Attributes:
         id (str): Standard id. Needs to be unique.
         starting_epoch (astropy.Time): reference epoch corresponding to first launch
         phases (list): List of phases (Ordered)
+        checkpointing (boolean): if True, the spacecrafts state is saved after each phase
+        checkpoint_key (tuple): key of the spacecrafts state before the first phase of the checkpointed run
+        checkpoints (list): for each applied phase, the phase key, the applied phase and the spacecrafts state after it
     """
 
     """
     Init
     """
-    def __init__(self, plan_id, starting_epoch):
+    def __init__(self, plan_id, starting_epoch, checkpointing=False):
         self.id = plan_id
         self.starting_epoch = starting_epoch
         self.phases = []
+        self.checkpointing = checkpointing
+        self.checkpoint_key = None
+        self.checkpoints = []
     
     """
     Methods
@@ -50,17 +58,90 @@ class Plan:
     def apply(self, verbose=False):
         """Calls the apply function of each phase of the plan in their respective order.
             This function is used to execute the plan. The phases are reset at the start.
+            If checkpointing is enabled, the first phases identical to the previous run are not applied again:
+            the applied phases of the previous run are reused and the spacecrafts state is restored after them.
 
         Args:
             verbose (boolean): if True, print message during phase execution
-        """       
-        self.reset()
-        for phase in self.phases:
-            phase.apply()
+        """
+        first_phase_index = 0
+        if self.checkpointing:
+            first_phase_index = self.restore_checkpoints()
+
+        for phase in self.phases[first_phase_index:]:
+            phase.reset()
+
+        for index, phase in enumerate(self.phases):
+            if index >= first_phase_index:
+                phase_key = phase.get_checkpoint_key() if self.checkpointing else None
+                phase.apply()
+                if self.checkpointing:
+                    self.save_checkpoint(phase_key, phase)
             logging.info(phase.__str__())
             if verbose:
                 print(phase)
 
+    def get_spacecrafts(self):
+        """ Returns the spacecrafts assigned to the phases of the plan, in order of first appearance.
+
+        Return:
+            (list): spacecrafts
+        """
+        spacecrafts = []
+        for phase in self.phases:
+            spacecraft = phase.get_assigned_spacecraft()
+            if spacecraft not in spacecrafts:
+                spacecrafts.append(spacecraft)
+        return spacecrafts
+
+    def save_checkpoint(self, phase_key, phase):
+        """ Saves the state of the spacecrafts after a phase has been applied.
+
+        Args:
+            phase_key (tuple): key of the phase computed before it was applied (see GenericPhase.get_checkpoint_key)
+            phase (GenericPhase): applied phase
+        """
+        spacecrafts_state = {spacecraft.get_id(): spacecraft.get_checkpoint() for spacecraft in self.get_spacecrafts()}
+        self.checkpoints.append((phase_key, phase, spacecrafts_state))
+
+    def restore_checkpoints(self):
+        """ Finds the first phases identical to the previous run, puts the applied phases of the previous run in their
+            place and restores the spacecrafts state after the last of them.
+            Phases are identical if the spacecrafts were in the same state before the first phase and the phases have
+            the same keys. Checkpoints after the first difference are discarded.
+
+        Return:
+            (int): number of reused phases, which is also the index of the first phase to apply
+        """
+        spacecrafts = self.get_spacecrafts()
+        checkpoint_key = tuple(spacecraft.get_checkpoint_key() for spacecraft in spacecrafts)
+        if checkpoint_key != self.checkpoint_key:
+            self.checkpoint_key = checkpoint_key
+            self.checkpoints = []
+
+        nb_reused_phases = 0
+        for phase, (phase_key, _, _) in zip(self.phases, self.checkpoints):
+            if phase_key is None or phase.get_checkpoint_key() != phase_key:
+                break
+            nb_reused_phases += 1
+        del self.checkpoints[nb_reused_phases:]
+
+        for index, (_, applied_phase, _) in enumerate(self.checkpoints):
+            self.phases[index] = applied_phase
+            applied_phase.restore()
+        if self.checkpoints:
+            _, _, spacecrafts_state = self.checkpoints[-1]
+            for spacecraft in spacecrafts:
+                spacecraft.restore_checkpoint(spacecrafts_state[spacecraft.get_id()])
+
+        logging.debug(f"{self.id}: {nb_reused_phases} of {len(self.phases)} phases reused from checkpoints")
+        return nb_reused_phases
+
+    def clear_checkpoints(self):
+        """ Discards all checkpoints, the next application of the plan will apply every phase. """
+        self.checkpoint_key = None
+        self.checkpoints = []
+
     def get_starting_epoch(self):
         return min([phase.starting_date for phase in self.phases])
 
@@ -0,0 +1,320 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Python script to run a tradespace sweep of TCAT scenarios over a process pool
+
+# Import methods
+from RunTCAT import create_scenario, run_scenario, create_results_dir
+from Phases.Common_functions import clear_orbit_caches
+from SpacecraftDatabase.CompiledDatabase import compile_database_if_needed
+
+# Import libraries
+import argparse
+import contextlib
+import copy
+import csv
+import io
+import itertools
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+import warnings
+from json import load as load_json
+from json import dumps as dumps_json
+
+import numpy as np
+from astropy import units as u
+
+warnings.filterwarnings("ignore")
+
+# Columns of the result file, the swept parameters are inserted after the point identification
+POINT_COLUMNS = ["point_id", "seed"]
+KPI_COLUMNS = ["success", "error", "nb_launches", "mission_duration_day", "launched_mass_kg", "payload_mass_kg",
+               "remaining_fuel_kg", "computation_time_s"]
+
+# Methods definition
+
+def main():
+    """ Script main static function
+    """
+    parser = argparse.ArgumentParser(description="Run a tradespace sweep of TCAT scenarios")
+    parser.add_argument("sweep_file", help="input sweep .json file: PATH/FILENAME.json")
+    parser.add_argument("--retry-failed", action="store_true", help="run again the points that failed in a previous run")
+    arguments = parser.parse_args()
+
+    with open(arguments.sweep_file) as file:
+        sweep = load_json(file)
+
+    logging.basicConfig(format='%(levelname)s: %(message)s', level=logging.INFO)
+    run_sweep(sweep, retry_failed=arguments.retry_failed)
+
+def run_sweep(sweep, retry_failed=False):
+    """ Run all points of a sweep and collect their KPI in a csv file (one row per point, one column per parameter or KPI).
+        Points already present in the result file are skipped, so that an interrupted sweep can be resumed. Failed points
+        are skipped too, unless retry_failed is set: their new row is then appended, the last row of a point is its result.
+
+    The sweep structure contains:
+        - "base": base scenario, either as a path to a json file or as a json structure
+        - "grid": dictionary of parameters and the list of their values (full factorial), and/or
+        - "lhs": latin hypercube, dictionary with "samples" (int), "ranges" (parameters and their [min, max], rounded if
+                 both bounds are integers) and "choices" (parameters and the list of their values)
+        - "seed": sweep seed, used for the latin hypercube and to derive the seed of each point (default 0)
+        - "output_dir": directory for the result file and the output files of each point (default "./Results/sweep")
+        - "processes": number of workers (default is the number of cpus)
+
+    :param sweep: sweep structure
+    :type sweep: dict
+    :param retry_failed: if True, the points that failed in a previous run are run again, defaults to False
+    :type retry_failed: bool, optional
+    :return: path to the result file
+    :rtype: str
+    """
+    # Read base scenario
+    base_json = sweep["base"]
+    if isinstance(base_json, str):
+        with open(base_json) as file:
+            base_json = load_json(file)
+
+    # Generate points and their seeds
+    sweep_seed = sweep.get("seed", 0)
+    points = generate_sweep_points(sweep.get("grid", dict()), sweep.get("lhs", None), sweep_seed)
+    parameters = sorted({parameter for point in points for parameter in point})
+    seeds = [get_point_seed(sweep_seed, point_id) for point_id in range(len(points))]
+
+    # Prepare output
+    output_dir = sweep.get("output_dir", "./Results/sweep")
+    create_results_dir(output_dir)
+    result_path = os.path.join(output_dir, "sweep_results.csv")
+    columns = POINT_COLUMNS + parameters + KPI_COLUMNS
+    done_point_ids, complete_size = read_done_point_ids(result_path, columns, len(points), retry_failed)
+    tasks = [(point_id, seeds[point_id], points[point_id], base_json, output_dir)
+             for point_id in range(len(points)) if point_id not in done_point_ids]
+    logging.info(f"Sweep: {len(points)} points, {len(done_point_ids)} already done, {len(tasks)} to run")
+
+    # Compile the databases once, so that workers memory-map them instead of parsing the .csv files
+    compile_database_if_needed()
+
+    # Remove the partially written last row of an interrupted sweep, then append each result as soon as it is available
+    if os.path.exists(result_path) and os.path.getsize(result_path) > complete_size:
+        os.truncate(result_path, complete_size)
+    with open(result_path, "a", newline="", encoding="utf-8") as result_file:
+        writer = csv.DictWriter(result_file, fieldnames=columns)
+        if result_file.tell() == 0:
+            writer.writeheader()
+        with multiprocessing.Pool(processes=sweep.get("processes", None), initializer=init_sweep_worker) as pool:
+            for row in pool.imap_unordered(run_sweep_point, tasks):
+                writer.writerow(row)
+                result_file.flush()
+                logging.info(f"Sweep: point {row['point_id']} done (success: {row['success']})")
+    return result_path
+
+def generate_sweep_points(grid, lhs=None, seed=0):
+    """ Generate the points of a sweep: the full factorial of the grid, combined with each latin hypercube sample.
+
+    :param grid: parameters and the list of their values
+    :type grid: dict
+    :param lhs: latin hypercube definition (see :func:`run_sweep`), defaults to None
+    :type lhs: dict, optional
+    :param seed: seed of the latin hypercube, defaults to 0
+    :type seed: int, optional
+    :return: points, each one being a dictionary of parameters and values
+    :rtype: list(dict)
+    """
+    grid_parameters = sorted(grid)
+    grid_points = [dict(zip(grid_parameters, values))
+                   for values in itertools.product(*[grid[parameter] for parameter in grid_parameters])]
+    if not lhs:
+        return grid_points
+
+    lhs_points = generate_latin_hypercube(lhs.get("samples", 1), lhs.get("ranges", dict()), lhs.get("choices", dict()), seed)
+    return [dict(grid_point, **lhs_point) for grid_point in grid_points for lhs_point in lhs_points]
+
+def generate_latin_hypercube(nb_samples, ranges, choices, seed=0):
+    """ Generate a latin hypercube: each parameter range is divided in nb_samples strata, each stratum being sampled once.
+
+    :param nb_samples: number of samples
+    :type nb_samples: int
+    :param ranges: numerical parameters and their [min, max], values are rounded if both bounds are integers
+    :type ranges: dict
+    :param choices: categorical parameters and the list of their values, spread evenly over the samples
+    :type choices: dict
+    :param seed: seed of the random generator, defaults to 0
+    :type seed: int, optional
+    :return: samples, each one being a dictionary of parameters and values
+    :rtype: list(dict)
+    """
+    rng = np.random.default_rng(seed)
+    samples = [dict() for _ in range(nb_samples)]
+    for parameter in sorted(ranges):
+        low, high = ranges[parameter]
+        unit_samples = (rng.permutation(nb_samples) + rng.random(nb_samples)) / nb_samples
+        values = low + unit_samples * (high - low)
+        for sample, value in zip(samples, values):
+            sample[parameter] = int(round(value)) if isinstance(low, int) and isinstance(high, int) else float(value)
+    for parameter in sorted(choices):
+        indices = rng.permutation(nb_samples) * len(choices[parameter]) // nb_samples
+        for sample, index in zip(samples, indices):
+            sample[parameter] = choices[parameter][index]
+    return samples
+
+def get_point_seed(sweep_seed, point_id):
+    """ Derive a deterministic seed for a point, independent of the worker running it.
+
+    :param sweep_seed: sweep seed
+    :type sweep_seed: int
+    :param point_id: point index
+    :type point_id: int
+    :return: point seed
+    :rtype: int
+    """
+    return int(np.random.SeedSequence([sweep_seed, point_id]).generate_state(1)[0])
+
+def read_result_rows(result_path, columns):
+    """ Read the complete rows of a result file. A row is complete if it ends with a line break: the last row of an
+        interrupted sweep can be partially written.
+
+    :param result_path: path to the result file
+    :type result_path: str
+    :param columns: expected columns of the result file
+    :type columns: list(str)
+    :return: complete rows without the header, and size in bytes of the complete part of the file
+    :rtype: tuple(list(list(str)), int)
+    """
+    if not os.path.exists(result_path):
+        return [], 0
+    with open(result_path, newline="", encoding="utf-8") as result_file:
+        content = result_file.read()
+
+    # Lines are read one by one to know where the last complete row ends (a quoted field can span several lines)
+    complete_length = 0
+    length = 0
+    rows = []
+    def read_lines():
+        nonlocal length
+        for line in io.StringIO(content, newline=""):
+            length += len(line)
+            yield line
+    try:
+        for row in csv.reader(read_lines(), strict=True):
+            # the rows are written with a \r\n terminator
+            if content[length - 1] != "\n":
+                break
+            rows.append(row)
+            complete_length = length
+    except csv.Error:
+        # unterminated quoted field of a partially written row
+        pass
+
+    if rows and rows[0] != columns:
+        raise ValueError(f"{result_path} was produced by a different sweep, remove it or change the output directory.")
+    return rows[1:], len(content[:complete_length].encode("utf-8"))
+
+def read_done_point_ids(result_path, columns, nb_points, retry_failed=False):
+    """ Read the points already done in a result file. Rows that do not have all the columns or the point id of a point
+        of the sweep are ignored, and their point is run again.
+
+    :param result_path: path to the result file
+    :type result_path: str
+    :param columns: expected columns of the result file
+    :type columns: list(str)
+    :param nb_points: number of points of the sweep
+    :type nb_points: int
+    :param retry_failed: if True, failed points are not done, defaults to False
+    :type retry_failed: bool, optional
+    :return: point ids already done, and size in bytes of the complete part of the file
+    :rtype: tuple(set(int), int)
+    """
+    rows, complete_size = read_result_rows(result_path, columns)
+    success_index = columns.index("success")
+    point_success = dict()
+    for row in rows:
+        if len(row) != len(columns) or not row[0].isdigit() or int(row[0]) >= nb_points \
+                or row[success_index] not in ("True", "False"):
+            logging.warning(f"Sweep: invalid row in {result_path} ignored: {row}")
+            continue
+        point_success[int(row[0])] = row[success_index] == "True"
+    done_point_ids = {point_id for point_id, success in point_success.items() if success or not retry_failed}
+    return done_point_ids, complete_size
+
+def init_sweep_worker():
+    """ Initialise a worker: logs are sent to the file of the point being run (see :func:`run_sweep_point`).
+    """
+    logging.basicConfig(handlers=[logging.NullHandler()], level=logging.INFO, force=True)
+
+def run_sweep_point(task):
+    """ Run a sweep point in the current worker and return its KPI.
+        The standard output and logs of the point are written in the result.txt and log.txt files of its own directory.
+
+    :param task: point id, point seed, point parameters, base scenario json and sweep output directory
+    :type task: tuple
+    :return: result row
+    :rtype: dict
+    """
+    point_id, seed, point, base_json, output_dir = task
+
+    # Build point scenario json
+    point_json = copy.deepcopy(base_json)
+    point_json.update(point)
+    point_json["dir_path_for_output_files"] = os.path.join(output_dir, f"point_{point_id:06d}")
+    if "seed_random_sats_failure" not in point:
+        point_json["seed_random_sats_failure"] = seed
+    create_results_dir(point_json["dir_path_for_output_files"])
+    with open(os.path.join(point_json["dir_path_for_output_files"], "configuration.json"), "w") as file:
+        file.write(dumps_json(point_json, indent=2))
+
+    # Seed random generators, so that results do not depend on the worker history
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+    row = dict(point_id=point_id, seed=seed, **point)
+    row.update({column: None for column in KPI_COLUMNS})
+    start = time.time()
+    log_handler = logging.FileHandler(os.path.join(point_json["dir_path_for_output_files"], "log.txt"), "w", encoding="utf-8")
+    log_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    logging.getLogger().addHandler(log_handler)
+    try:
+        with open(os.path.join(point_json["dir_path_for_output_files"], "result.txt"), "w", encoding="utf-8") as result, \
+                contextlib.redirect_stdout(result):
+            clear_orbit_caches()
+            scenario = create_scenario(point_json, f"sweep_{point_id:06d}")
+            sim_message = run_scenario(scenario)
+        row["success"] = sim_message is True
+        if sim_message is not True:
+            row["error"] = str(sim_message)
+        row.update(get_scenario_kpi(scenario))
+    except Exception as exception:
+        logging.exception(f"Sweep point {point_id} failed")
+        row["success"] = False
+        row["error"] = f"{type(exception).__name__}: {exception}"
+    finally:
+        logging.getLogger().removeHandler(log_handler)
+        log_handler.close()
+    row["computation_time_s"] = time.time() - start
+    return row
+
+def get_scenario_kpi(scenario):
+    """ Extract the sweep KPI from an executed scenario, as printed by :meth:`~Fleets.Fleet.Fleet.print_KPI`.
+
+    :param scenario: executed scenario
+    :type scenario: :class:`~Scenarios.Scenario.Scenario`
+    :return: KPI
+    :rtype: dict
+    """
+    fleet = scenario.fleet
+    kickstages = list(fleet.kickstages.values())
+    duration = fleet.get_ending_epoch() - fleet.get_starting_epoch()
+    return dict(nb_launches=len(kickstages),
+                mission_duration_day=duration.to_value(u.day),
+                launched_mass_kg=sum(kickstage.get_initial_wet_mass().to_value(u.kg) for kickstage in kickstages),
+                payload_mass_kg=sum(kickstage.get_initial_payload_mass().to_value(u.kg) for kickstage in kickstages),
+                remaining_fuel_kg=sum(kickstage.get_main_propulsion_module().get_current_prop_mass().to_value(u.kg)
+                                      for kickstage in kickstages))
+
+"""
+Main script
+"""
+
+if __name__ == "__main__":
+    main()
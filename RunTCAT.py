@@ -7,6 +7,8 @@
 # Import class
 from Scenarios.ScenarioConstellation import ScenarioConstellation
 from Scenarios.ScenarioADR import ScenarioADR
+from Phases.Common_functions import clear_orbit_caches
+from SpacecraftDatabase.CompiledDatabase import compile_database_if_needed
 
 # Import libraries
 import warnings
@@ -39,6 +41,9 @@ def main():
 
     set_sys_std_dir(PRINT_IN_FILES,results_dir_path)
 
+    # the databases are compiled by the first run (or after they changed), the next runs memory-map them
+    compile_database_if_needed()
+
     create_and_run_scenario(json,"test_from_file")    
 
     reset_sys_std_dir()
@@ -83,6 +88,8 @@ def create_and_run_scenario(input_json, scenario_id="test_scenario"):
     :return: execution flag
     :rtype: bool or Warning
     """
+    # Each run starts with empty orbit caches, their counters are those of the run
+    clear_orbit_caches()
     scenario = create_scenario(input_json, scenario_id)
     sim_message = run_scenario(scenario)
     return sim_message
@@ -106,6 +113,9 @@ def run_scenario(scenario):
     # Print scenario reports
     scenario.print_results()
 
+    # Render or wait for the plots recorded during the simulation
+    scenario.render_artifacts()
+
     return results
 
 def create_scenario(input_json,scenario_id="test_scenario"):
@@ -0,0 +1,205 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Python script to run TCAT scenarios from a long-lived worker server: the scenarios and databases are imported once,
+#                   each scenario is run in a process forked from the server and its output is streamed back to the client
+
+# Import methods
+from RunTCAT import create_and_run_scenario, create_results_dir
+from SpacecraftDatabase.CompiledDatabase import compile_database_if_needed, get_compiled_database
+from tcat_app.result_cache import compute_versions
+
+# Import libraries
+import fcntl
+import json
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import traceback
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings("ignore")
+
+# Output files, written as by RunTCAT.py
+RESULT_FILENAME = "result.txt"
+LOG_FILENAME = "log.txt"
+
+# Time given to a stopped server to release the socket lock, when a new server is started in its place
+LOCK_TIMEOUT_IN_SEC = 10
+
+# Methods definition
+
+def main():
+    """ Script main static function
+    """
+    try:
+        socket_path = sys.argv[1]
+    except IndexError:
+        print("Please specify the path of the server socket in the argv: PATH/FILENAME.sock")
+        return
+    serve(socket_path)
+
+def serve(socket_path):
+    """ Accepts scenario runs on a unix socket until the server is stopped. A single server runs per socket, a second one exits at once.
+
+    Protocol (one json message per line): the client sends {"configuration": <scenario json>, "versions": [<code version>, <database version>]},
+    the server answers {"pid": <pid of the run>}, then {"result": <text>} and {"log": <text>} as the scenario prints, and {"exit_code": <int>}
+    at the end of the run. The run is stopped by sending SIGTERM to its pid, or when the client closes the connection.
+    The server only runs the scenarios of clients with the versions of the tree it was started from (see tcat_app/result_cache.py). Otherwise
+    it answers {"versions": <versions of the server>, "server_pid": <pid of the server>}, and the client stops it if the tree was updated.
+
+    :param socket_path: path of the server socket
+    :type socket_path: str
+    """
+    lock = open(socket_path + ".lock", "w")
+    deadline = time.monotonic() + LOCK_TIMEOUT_IN_SEC
+    while True:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            if time.monotonic() > deadline:
+                print(f"A server is already running on {socket_path}")
+                return
+            time.sleep(0.1)
+
+    versions = list(compute_versions(os.path.dirname(os.path.abspath(__file__))))
+    preload()
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+
+    # the runs are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    while True:
+        connection, _ = server.accept()
+        if os.fork() == 0:
+            exit_code = 1
+            try:
+                server.close()
+                lock.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                exit_code = run_connection(connection, versions)
+            finally:
+                # the forked process never returns to the server loop
+                os._exit(exit_code)
+        connection.close()
+
+def preload():
+    """ Loads once what every run needs, before the runs are forked (the memory is then shared between the runs).
+    """
+    compile_database_if_needed()
+    get_compiled_database()
+
+def run_connection(connection, versions):
+    """ Runs the scenario sent on a connection, in the process forked for it.
+
+    :param connection: connection of the client
+    :type connection: socket.socket
+    :param versions: code and database versions of the server
+    :type versions: list
+    :return: exit code of the run
+    :rtype: int
+    """
+    with connection.makefile("rb") as requests:
+        line = requests.readline()
+    if not line:
+        # connection only checking that the server is running
+        return 0
+    request = json.loads(line)
+    if request.get("versions") != versions:
+        # the server or the client runs outdated code
+        send_message(connection, {"versions": versions, "server_pid": os.getppid()})
+        connection.close()
+        return 1
+    send_message(connection, {"pid": os.getpid()})
+
+    # a forked process shares the random state of the server, it is drawn again as for a new process
+    random.seed()
+    np.random.seed()
+
+    input_json = request["configuration"]
+    results_dir_path = input_json["dir_path_for_output_files"]
+    create_results_dir(results_dir_path)
+
+    result = StreamedFile(os.path.join(results_dir_path, RESULT_FILENAME), "result", connection)
+    log = StreamedFile(os.path.join(results_dir_path, LOG_FILENAME), "log", connection)
+    sys.stdout = result
+    sys.stderr = log
+
+    try:
+        create_and_run_scenario(input_json, "test_from_file")
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+
+    result.close()
+    log.close()
+    send_message(connection, {"exit_code": exit_code})
+    connection.close()
+    return exit_code
+
+def send_message(connection, message):
+    """ Sends a message to the client. If the client is gone (e.g. restart of the app, that queues the run again), the run is stopped.
+
+    :param connection: connection of the client
+    :type connection: socket.socket
+    :param message: message
+    :type message: dict
+    """
+    try:
+        connection.sendall(json.dumps(message).encode() + b"\n")
+    except OSError:
+        os._exit(1)
+
+class StreamedFile:
+    """ Output file of a run (line-buffered, as in RunTCAT.py), of which each write is also sent to the client.
+
+    :param path: file path
+    :type path: str
+    :param stream: name of the stream in the messages ("result" or "log")
+    :type stream: str
+    :param connection: connection of the client
+    :type connection: socket.socket
+    """
+    def __init__(self, path, stream, connection):
+        self.file = open(path, "w", 1, encoding="utf-8")
+        self.stream = stream
+        self.connection = connection
+
+    def write(self, text):
+        count = self.file.write(text)
+        if text:
+            send_message(self.connection, {self.stream: text})
+        return count
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def isatty(self):
+        return False
+
+    @property
+    def encoding(self):
+        return self.file.encoding
+
+"""
+Main script
+"""
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ class ScenarioInputBase:
     verbose: bool = False
     starting_epoch: str = "2025-01-01 12:00:00"
     dir_path_for_output_files: str = "./Results"
+    artifacts_rendering: str = "parallel" # "parallel", "after" or "none"
     tradeoff_mission_price_vs_duration: float = 0.1 # [0.0-1.0]
 
     # Constellation parameters
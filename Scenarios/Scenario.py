@@ -5,12 +5,18 @@
 # Description:      Parent class for the different implemented scenarios
 
 # Import Class
-from Scenarios.ScenarioParameters import KICKSTAGE_DATABASE, PATH_DB_KICKSTAGE
+from Scenarios.ScenarioParameters import KICKSTAGE_DATABASE, PATH_DB_KICKSTAGE, ARTIFACTS_RENDERING
+from Commons.artifacts import ArtifactPipeline
+from Commons.results import write_results, RESULTS_FILENAME, SCENARIO_RECORD, SPACECRAFT_RECORD, PHASE_RECORD
 from SpacecraftDatabase.KickstageDatabaseReader import KickstageDatabaseReader
 from Spacecrafts.Satellite import Satellite
 from Plan.Plan import *
+from Phases.Common_functions import get_orbit_caches_info
 from Constellations.Constellation import Constellation
 
+# Import libraries
+import os
+
 # Set logging
 logging.getLogger('numba').setLevel(logging.WARNING)
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
@@ -30,6 +36,7 @@ class Scenario:
                       'verbose',
                       'starting_epoch',
                       'dir_path_for_output_files',
+                      'artifacts_rendering',
                       'tradeoff_mission_price_vs_duration',
 
                       'constellation_name',
@@ -95,7 +102,11 @@ class Scenario:
 
         self.reference_satellite = None
 
+        # Plots are recorded during the simulation and rendered according to artifacts_rendering
+        self.artifacts_rendering = ARTIFACTS_RENDERING
+
         self.create_attributes_from_input_json(json)
+        self.artifacts = ArtifactPipeline(self.dir_path_for_output_files, self.artifacts_rendering)
 
         # Instanciate epoch
         self.starting_epoch = Time(self.starting_epoch, scale="tdb")
@@ -164,6 +175,7 @@ class Scenario:
         try:
             self.fleet.execute(clients=self.constellation)
             logging.info("Finish executing...")
+            logging.info(f"Orbit caches: {get_orbit_caches_info()}")
             self.execution_success = True
             return True
         except RuntimeWarning as warning:
@@ -171,6 +183,17 @@ class Scenario:
             self.execution_success = False
             return warning
 
+    def render_artifacts(self):
+        """ Render the plots recorded during the simulation, or wait for their rendering if done in parallel.
+
+        :return: paths to the rendered files
+        :rtype: list(str)
+        """
+        rendered = self.artifacts.finish()
+        if rendered:
+            logging.info(f"Rendered artifacts: {rendered}")
+        return rendered
+
     def define_constellation(self):
         """ Based on input json, creates the orbits, 
         the :class:`~Constellations.Constellation.Constellation` 
@@ -306,103 +329,128 @@ class Scenario:
         # Compute precession direction based on knowledge from Launcher and Servicers
         relative_precession_direction = np.sign(launchers_J2_speed-targets_J2_speed)
 
-        # Order targets by their current raan following precession direction, then by true anomaly
-        ordered_satellites_id = sorted(self.constellation.get_standby_satellites(), key=lambda satellite_id: (relative_precession_direction *
-                                    self.constellation.get_standby_satellites()[satellite_id].get_default_orbit().raan.value,
-                                    self.constellation.get_standby_satellites()[satellite_id].get_default_orbit().nu.value))
+        # Extract the default orbits raan [deg], true anomaly [deg] and semi-major axis [km] once
+        standby_satellites = list(self.constellation.get_standby_satellites().values())
+        number_satellites = len(standby_satellites)
+        if number_satellites == 0:
+            self.constellation.set_optimized_ordered_satellites([])
+            return
+        default_orbits = [satellite.get_default_orbit() for satellite in standby_satellites]
+        raans = np.array([orbit.raan.to_value(u.deg) for orbit in default_orbits])
+        nus = np.array([orbit.nu.to_value(u.deg) for orbit in default_orbits])
+        altitudes = np.array([orbit.a.to_value(u.km) for orbit in default_orbits])
+
+        # Order targets by their current raan following precession direction, then by true anomaly (stable sort)
+        order = np.lexsort((nus, relative_precession_direction * raans))
+        standby_satellites = [standby_satellites[index] for index in order]
+        raans = raans[order]
+        altitudes = altitudes[order]
 
         logging.info("Computing 'optimal' deployement sequence ...")
-        # For each launcher, find optimal sequence of targets' deployment
-        # Extract number of satellites
-        number_satellites = self.constellation.get_number_satellites()
-
-        # Instanciate ideal sequence numpy array
-        sequence_list = np.full((number_satellites,number_satellites),-1)
-
-        # Built the ideal sequence array
-        for sequence_row in range(0,number_satellites):
-            sequence_list[sequence_row,:] = np.mod(np.arange(sequence_row,sequence_row+number_satellites,1),number_satellites)
-
-        # After establishing feasible options, compute criterium to prioritize between them
-        criteria_raan_spread = []
-        criteria_altitude = []
-        for i in range(0, len(ordered_satellites_id)):
-            # Get targets id
-            satellite_id_list = [ordered_satellites_id[i] for i in sequence_list[i, :]]
-
-            # Instanciate raan spread over current sequence
-            sequence_raan_spread = 0 * u.deg
-
-            # Iterate through sequence's satellites
-            for j in range(1, len(satellite_id_list)):
-                # Extract initial target RAAN
-                initial_RAAN = self.constellation.satellites[satellite_id_list[j]].get_default_orbit().raan
-
-                # Extract next target RAAN
-                final_RAAN = self.constellation.satellites[satellite_id_list[j-1]].get_default_orbit().raan
-
-                # Check for opposite precession movement (Has a larger cost)
-                delta_RAAN = final_RAAN-initial_RAAN
-                if np.sign(delta_RAAN) != np.sign(global_precession_direction):
-                    # Need to circle around globe to reach final RAAN
-                    delta_RAAN = -np.sign(delta_RAAN)*(360*u.deg-abs(delta_RAAN))
-                
-                # Add RAAN spread to sequence's total RAAN spread
-                sequence_raan_spread += delta_RAAN
-
-
-            # Append sequence_raan_spread to global array
-            criteria_raan_spread.append(abs(sequence_raan_spread.value))
-
-            # Compute sum of altitudes of all targets, this is used to prioritize sequences with lower targets
-            satellites_altitude = sum([self.constellation.satellites[sat_id].get_default_orbit().a.to(u.km).value for sat_id in satellite_id_list])
-            criteria_altitude.append(satellites_altitude)
-
-        # Find ideal sequence by merging RAAN and altitude in a table
-        ranking = [list(range(0, len(ordered_satellites_id))), criteria_raan_spread, criteria_altitude]
-        ranking = np.array(ranking).T.tolist()
-
-        # Sort by RAAN spread (primary) and alitude (secondary)
-        ranking = sorted(ranking, key=lambda element: (element[1], element[2]))
-
-        # Extract best sequence
-        best_sequence = int(ranking[0][0])
+        # Each candidate sequence is a rotation of the ordered satellites, starting at a different satellite.
+
+        # RAAN spread between each satellite and the next one, going around the globe for opposite precession movement
+        delta_raans = raans - np.roll(raans, -1)
+        opposite_movement = np.sign(delta_raans) != np.sign(global_precession_direction)
+        delta_raans = np.where(opposite_movement, -np.sign(delta_raans) * (360. - np.abs(delta_raans)), delta_raans)
+
+        # The sequence starting at satellite i covers all spreads except the one from satellite i-1 to satellite i
+        estimated_raan_spreads = np.abs(delta_raans.sum() - np.roll(delta_raans, 1))
+
+        # Sequences with the lowest RAAN spread (primary) and altitude sum (secondary) are kept. As the altitude sum
+        # is the same for all sequences, ties are decided by rounding errors: the criteria of the sequences within
+        # rounding errors of the best one are computed again by summing over the sequence in order.
+        rounding_tolerance = 8 * number_satellites * np.finfo(float).eps * np.abs(delta_raans).sum()
+        candidates = np.flatnonzero(estimated_raan_spreads <= estimated_raan_spreads.min() + rounding_tolerance)
+        criteria_raan_spread = np.zeros(len(candidates))
+        criteria_altitude = np.zeros(len(candidates))
+        for position in range(0, number_satellites):
+            if position > 0:
+                criteria_raan_spread += delta_raans[(candidates + position - 1) % number_satellites]
+            criteria_altitude += altitudes[(candidates + position) % number_satellites]
+
+        # Sort by RAAN spread (primary), alitude (secondary) and order of the sequence
+        best_sequence = candidates[np.lexsort((criteria_altitude, np.abs(criteria_raan_spread)))[0]]
 
         # Extract and assign satellite to this launcher
-        self.constellation.set_optimized_ordered_satellites([self.constellation.satellites[ordered_satellites_id[int(sat_id_in_list)]] for sat_id_in_list in sequence_list[best_sequence, :]])
+        self.constellation.set_optimized_ordered_satellites([standby_satellites[(best_sequence + position) % number_satellites]
+                                                             for position in range(0, number_satellites)])
     
     def print_results(self):
-        """ Print results summary in results medium.
+        """ Write the structured results in the results folder, and print their summary in results medium.
         """
+        kpi = self.get_KPI()
+        report = self.fleet.get_report()
+        write_results(os.path.join(self.dir_path_for_output_files, RESULTS_FILENAME), self.get_result_records(kpi, report))
+
         # Print general KPI
-        self.print_KPI()
+        self.print_KPI(kpi)
         print("\n")
         # Print general report
-        self.print_report()
+        self.print_report(report)
+
+    def get_result_records(self, kpi, report):
+        """ Returns the structured results as records: the scenario KPI, then each spacecraft report followed by its phases.
 
-    def print_report(self):
+        :param kpi: scenario KPI (see get_KPI)
+        :type kpi: dict
+        :param report: reports of the fleet spacecrafts (see :meth:`~Fleets.Fleet.Fleet.get_report`)
+        :type report: list
+        :return: records
+        :rtype: list
+        """
+        records = [dict(record=SCENARIO_RECORD, **kpi)]
+        for spacecraft_report in report:
+            records.append(dict(record=SPACECRAFT_RECORD, **{key: value for key, value in spacecraft_report.items() if key != "phases"}))
+            for phase_index, phase_result in enumerate(spacecraft_report["phases"]):
+                if phase_result is not None:
+                    records.append(dict(record=PHASE_RECORD, plan_spacecraft_id=spacecraft_report["spacecraft_id"], phase_index=phase_index,
+                                        **phase_result))
+        return records
+
+    def print_report(self, report=None):
         # Print flag
         """ Print report.
+
+        :param report: reports of the fleet spacecrafts, defaults to the current reports
+        :type report: list, optional
         """
         print("="*72)
         print("REPORT")
         print("="*72)
 
         # Print Fleet related report
-        self.fleet.print_report()
-    
-    def print_KPI(self):
+        self.fleet.print_report(report)
+
+    def get_KPI(self):
+        """ Returns mission KPI: scenario, launcher and kick stage (None if custom), execution success and fleet KPI.
+
+        :return: mission KPI
+        :rtype: dict
+        """
+        return dict(scenario=self.scenario,
+                    launcher_name=self.launcher_name if self.launcher_use_database else None,
+                    kickstage_name=self.kickstage_name if self.kickstage_use_database else None,
+                    execution_success=self.execution_success,
+                    fleet=self.fleet.get_KPI())
+
+    def print_KPI(self, kpi=None):
         """ Print mission KPI.
+
+        :param kpi: mission KPI, defaults to the current KPI (see get_KPI)
+        :type kpi: dict, optional
         """
+        if kpi is None:
+            kpi = self.get_KPI()
         # Print title
-        if self.kickstage_use_database and self.launcher_use_database:
-            print("Scenario:", self.scenario, "using", self.launcher_name, "launcher(s) and", self.kickstage_name, "kick stage(s).")
-        elif self.launcher_use_database:
-            print("Scenario:", self.scenario, "using", self.launcher_name, "launcher(s) and custom kick stage(s).")
-        elif self.kickstage_use_database:
-            print("Scenario:", self.scenario, "using custom launcher(s) and", self.kickstage_name, "kick stage(s).")
+        if kpi['kickstage_name'] is not None and kpi['launcher_name'] is not None:
+            print("Scenario:", kpi['scenario'], "using", kpi['launcher_name'], "launcher(s) and", kpi['kickstage_name'], "kick stage(s).")
+        elif kpi['launcher_name'] is not None:
+            print("Scenario:", kpi['scenario'], "using", kpi['launcher_name'], "launcher(s) and custom kick stage(s).")
+        elif kpi['kickstage_name'] is not None:
+            print("Scenario:", kpi['scenario'], "using custom launcher(s) and", kpi['kickstage_name'], "kick stage(s).")
         else:
-            print("Scenario:", self.scenario, "using custom launcher(s) and custom kick stage(s).")
+            print("Scenario:", kpi['scenario'], "using custom launcher(s) and custom kick stage(s).")
 
         # Print flag
         print("="*72)
@@ -410,10 +458,10 @@ class Scenario:
         print("="*72)
 
         # Print execution success
-        if self.execution_success:
+        if kpi['execution_success']:
             print("Script successfully executed: Yes")
         else:
             print("Script successfully executed: No")
 
         # Print Fleet related KPI
-        self.fleet.print_KPI()
+        self.fleet.print_KPI(kpi['fleet'])
@@ -122,9 +122,16 @@ class ScenarioADR(Scenario):
         self.constellation.set_default_orbit_to_operational()
         self.plot_constellation()
 
-    def print_KPI(self):
+    def get_KPI(self):
         """ Adds KPIs specific to ADR scenario.
         """
-        super().print_KPI()
+        return dict(super().get_KPI(), debris_mass_removed=self.constellation.get_sum_of_sats_mass())
 
-        print(f"Total debris mass removed: {self.constellation.get_sum_of_sats_mass():.1f}")
\ No newline at end of file
+    def print_KPI(self, kpi=None):
+        """ Adds KPIs specific to ADR scenario.
+        """
+        if kpi is None:
+            kpi = self.get_KPI()
+        super().print_KPI(kpi)
+
+        print(f"Total debris mass removed: {kpi['debris_mass_removed']:.1f}")
\ No newline at end of file
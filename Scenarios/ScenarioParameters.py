@@ -12,10 +12,28 @@ from astropy import units as u
 PATH_DB_LAUNCHERS = "SpacecraftDatabase/LauncherDatabase/"
 PATH_DB_KICKSTAGE = "SpacecraftDatabase/"
 KICKSTAGE_DATABASE = "kickstage_db.csv"
+# Binary copy of the databases above, see SpacecraftDatabase/CompiledDatabase.py
+PATH_DB_COMPILED = "SpacecraftDatabase/CompiledDatabase/"
+
+# Plots (e.g. launcher performance map) are recorded during the simulation and rendered by a worker in parallel
+# ("parallel"), once the simulation is over ("after") or not at all ("none"), in which case they can be rendered later
+# with: python -m Commons.artifacts PATH_TO_RESULTS_FOLDER. Can be overridden by the "artifacts_rendering" json field.
+ARTIFACTS_RENDERING = "parallel"
 
 # limit for the number of loops for convergence
 EXECUTION_LIMIT = 100
 
+# The spacecraft state is checkpointed after each phase of a plan. When a plan is executed again with the same starting
+# state and the same first phases (e.g. while optimising the phasing inclination), only the phases after the first
+# difference are re-evaluated. Set to False to re-evaluate complete plans.
+PLAN_CHECKPOINTING = True
+
+# Maximum number of entries kept in the orbit caches (nodal precession speeds and orbit propagations, see
+# Phases/Common_functions.py). The least recently used entries are discarded first, the caches are cleared at the
+# start of each scenario run.
+NODAL_PRECESSION_CACHE_SIZE = 1024
+UPDATE_ORBIT_CACHE_SIZE = 4096
+
 # The launcher reaches its orbit with a certain precision that can be defined here:
 INSERTION_RAAN_MARGIN = 0 * u.deg # Defines the raan error.
 INSERTION_A_MARGIN = 0 * u.km # Defines the semi-major axis error
@@ -0,0 +1,202 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Binary store of the launcher and kickstage databases, compiled with:
+#                   python -m SpacecraftDatabase.CompiledDatabase
+
+# Import libraries
+import csv
+import glob
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from Scenarios.ScenarioParameters import PATH_DB_LAUNCHERS, PATH_DB_KICKSTAGE, KICKSTAGE_DATABASE, PATH_DB_COMPILED
+
+# Files of the binary store
+LAUNCHER_TABLES_FILE = "launcher_tables.npy"
+KICKSTAGES_FILE = "kickstages.npy"
+INDEX_FILE = "index.json"
+
+# Store loaded in the process, by directory
+COMPILED_DATABASES = dict()
+COMPILED_DATABASES_LOCK = threading.Lock()
+
+
+def get_database_sources():
+    """ Returns the .csv files compiled into the binary store.
+
+    :return: launcher tables and kickstage database paths
+    :rtype: list(str), str
+    """
+    return sorted(glob.glob(f"{PATH_DB_LAUNCHERS}*.csv")), PATH_DB_KICKSTAGE + KICKSTAGE_DATABASE
+
+
+def get_source_signature(path):
+    """ Returns the modification time and size of a source file, used to detect a stale store.
+
+    :param path: source file path
+    :type path: str
+    :return: modification time in ns and size in bytes
+    :rtype: list(int)
+    """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def compile_database(directory=PATH_DB_COMPILED):
+    """ Compiles the launcher tables and the kickstage database into a binary store:
+        - launcher_tables.npy: rows of all launcher tables, as read by numpy.genfromtxt
+        - kickstages.npy: structured array with the text fields of the kickstage database
+        - index.json: slice of each launcher table, kickstage fields and signature of each source file
+    The arrays are memory-mapped by the readers. The index is written last, so that a store is only used once complete.
+
+    :param directory: store directory, defaults to PATH_DB_COMPILED
+    :type directory: str, optional
+    :return: store directory
+    :rtype: str
+    """
+    launcher_paths, kickstage_path = get_database_sources()
+    os.makedirs(directory, exist_ok=True)
+    index = dict(sources=dict(), launcher_tables=dict(), kickstages=dict())
+
+    # Launcher tables, concatenated
+    tables = []
+    start = 0
+    for path in launcher_paths:
+        table = np.genfromtxt(path, delimiter=";", skip_header=2)
+        tables.append(table)
+        index["launcher_tables"][path] = [start, start + len(table)]
+        index["sources"][path] = get_source_signature(path)
+        start += len(table)
+    launcher_tables = np.concatenate(tables) if tables else np.empty((0, 3))
+
+    # Kickstage database, as read by csv.DictReader
+    with open(kickstage_path, 'r') as data:
+        kickstage_list = list(csv.DictReader(data))
+    fields = list(kickstage_list[0].keys()) if kickstage_list else []
+    kickstages = np.array([tuple(kickstage_dict[field] for field in fields) for kickstage_dict in kickstage_list],
+                          dtype=[(field, f"U{max([1] + [len(kickstage_dict[field]) for kickstage_dict in kickstage_list])}")
+                                 for field in fields])
+    index["kickstages"] = dict(path=kickstage_path, fields=fields)
+    index["sources"][kickstage_path] = get_source_signature(kickstage_path)
+
+    # Write arrays then index, each one replacing the previous file at once
+    for file_name, array in ((LAUNCHER_TABLES_FILE, launcher_tables), (KICKSTAGES_FILE, kickstages)):
+        temp_path = os.path.join(directory, f"{file_name}.{os.getpid()}.tmp.npy")
+        np.save(temp_path, array)
+        os.replace(temp_path, os.path.join(directory, file_name))
+    temp_path = os.path.join(directory, f"{INDEX_FILE}.{os.getpid()}.tmp")
+    with open(temp_path, "w") as file:
+        json.dump(index, file, indent=1)
+    os.replace(temp_path, os.path.join(directory, INDEX_FILE))
+
+    with COMPILED_DATABASES_LOCK:
+        COMPILED_DATABASES.pop(directory, None)
+    logging.info(f"Compiled {len(launcher_paths)} launcher tables and {len(kickstage_list)} kickstages into {directory}")
+    return directory
+
+
+def is_database_compiled(directory=PATH_DB_COMPILED):
+    """ Checks that the store exists and is up to date with all source files.
+
+    :param directory: store directory, defaults to PATH_DB_COMPILED
+    :type directory: str, optional
+    :return: True if the store can be used
+    :rtype: bool
+    """
+    try:
+        with open(os.path.join(directory, INDEX_FILE)) as file:
+            index = json.load(file)
+        launcher_paths, kickstage_path = get_database_sources()
+        sources = launcher_paths + [kickstage_path]
+        return (sorted(index["sources"]) == sorted(sources)
+                and all(index["sources"][path] == get_source_signature(path) for path in sources))
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def compile_database_if_needed(directory=PATH_DB_COMPILED):
+    """ Compiles the store if it is missing or stale. If the store cannot be written (e.g. read-only deployment), a warning
+    is logged and the readers parse the .csv files.
+
+    :param directory: store directory, defaults to PATH_DB_COMPILED
+    :type directory: str, optional
+    :return: True if the store can be used
+    :rtype: bool
+    """
+    if is_database_compiled(directory):
+        return True
+    try:
+        compile_database(directory)
+    except OSError:
+        logging.warning(f"Could not compile the databases into {directory}, the .csv files are parsed", exc_info=True)
+        return False
+    return True
+
+
+def get_compiled_database(directory=PATH_DB_COMPILED):
+    """ Returns the store loaded in the process, or None if it is missing or stale (readers then parse the .csv files).
+    The store is loaded once per process, its arrays are memory-mapped and read-only. A missing store is looked for again
+    at the next call, so that a store compiled later is used.
+
+    :param directory: store directory, defaults to PATH_DB_COMPILED
+    :type directory: str, optional
+    :return: store
+    :rtype: :class:`~SpacecraftDatabase.CompiledDatabase.CompiledDatabase` or None
+    """
+    with COMPILED_DATABASES_LOCK:
+        if directory not in COMPILED_DATABASES:
+            if not is_database_compiled(directory):
+                return None
+            COMPILED_DATABASES[directory] = CompiledDatabase(directory)
+        return COMPILED_DATABASES[directory]
+
+
+class CompiledDatabase:
+    """ Binary store of the launcher and kickstage databases (see :func:`compile_database`).
+
+    :param directory: store directory
+    :type directory: str
+    """
+    def __init__(self, directory):
+        with open(os.path.join(directory, INDEX_FILE)) as file:
+            self.index = json.load(file)
+        self.launcher_tables = np.load(os.path.join(directory, LAUNCHER_TABLES_FILE), mmap_mode='r')
+        self.kickstages = np.load(os.path.join(directory, KICKSTAGES_FILE), mmap_mode='r')
+
+    def get_launcher_table(self, table_path):
+        """ Returns a launcher table, as read by numpy.genfromtxt from its .csv file.
+
+        :param table_path: path of the .csv file
+        :type table_path: str
+        :return: read-only view of the table, None if the table is not in the store
+        :rtype: numpy.ndarray
+        """
+        table_slice = self.index["launcher_tables"].get(table_path, None)
+        if table_slice is None:
+            return None
+        return self.launcher_tables[table_slice[0]:table_slice[1]]
+
+    def get_kickstage_list(self, kickstage_db_csv_file):
+        """ Returns the rows of the kickstage database, as read by csv.DictReader from its .csv file.
+
+        :param kickstage_db_csv_file: path of the .csv file
+        :type kickstage_db_csv_file: str
+        :return: rows, None if the file is not in the store
+        :rtype: list(dict)
+        """
+        if self.index["kickstages"]["path"] != kickstage_db_csv_file:
+            return None
+        fields = self.index["kickstages"]["fields"]
+        return [{field: str(row[field]) for field in fields} for row in self.kickstages]
+
+"""
+Main script
+"""
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(levelname)s: %(message)s', level=logging.INFO)
+    compile_database()
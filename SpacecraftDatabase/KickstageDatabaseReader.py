@@ -4,6 +4,9 @@
 # Emails:           malo.goury@tcdc.ch
 # Description:      Class for reading Kickstage dataabse
 
+# Import methods
+from SpacecraftDatabase.CompiledDatabase import get_compiled_database
+
 # Import libraries
 from astropy import units as u
 import csv
@@ -13,10 +16,20 @@ class KickstageDatabaseReader:
     """ Helper for reading .csv Kickstage database.
     Create an object by providing .csv file and then call the diffferent getters providing a kicktage name.
     If the Kickstage doesn't exist, return values of getters are None.
+    The rows are taken from the compiled database if it is up to date, the .csv file is parsed otherwise.
     """
     def __init__(self,kickstage_db_csv_file):
         self.kickstage_list = []
-        self.read_csv_db_to_list(kickstage_db_csv_file)
+        compiled_database = get_compiled_database()
+        if compiled_database is not None:
+            self.kickstage_list = compiled_database.get_kickstage_list(kickstage_db_csv_file)
+        if not self.kickstage_list:
+            self.read_csv_db_to_list(kickstage_db_csv_file)
+
+        # Index rows by name, the first row of a name is kept
+        self.kickstage_index = dict()
+        for kickstage_dict in self.kickstage_list:
+            self.kickstage_index.setdefault(kickstage_dict["name"], kickstage_dict)
 
     def read_csv_db_to_list(self,kickstage_db_csv_file):
         """ Opens the .csv file of the .db, reads it and stores it into a dict.
@@ -35,10 +48,7 @@ class KickstageDatabaseReader:
         :return: dictionnary with all data of the specified kickstage
         :rtype: dict
         """
-        for kickstage_dict in self.kickstage_list:
-            if kickstage_dict["name"] == kickstage_name:
-                return kickstage_dict
-        return None
+        return self.kickstage_index.get(kickstage_name, None)
 
     def get_kickstage_height(self, kickstage_name):
         """
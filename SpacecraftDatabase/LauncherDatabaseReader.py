@@ -1,13 +1,18 @@
 from scipy.interpolate import griddata
 from scipy.interpolate import interp2d
+from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator, CloughTocher2DInterpolator
 from scipy import interpolate
 import numpy as np
+import threading
 import time
 import astropy.units as u
-from matplotlib import pyplot, animation
+from matplotlib import pyplot
 import logging
+import os
 
 from Scenarios.ScenarioParameters import PATH_DB_LAUNCHERS
+from SpacecraftDatabase.CompiledDatabase import get_compiled_database
+from Commons.artifacts import build_performance_map_figure, record_artifact, render_artifact
 
 """Input data"""
 
@@ -70,9 +75,10 @@ def get_launcher_fairing_dimensions(launcher):
     return fairing_diameter,fairing_cylinder_height,fairing_total_height
     
 
-def get_launcher_data(launcher, launch_site, orbit_type):
+def get_launcher_table_path(launcher, launch_site, orbit_type):
     """
-    This function extracts data from the "Launchers" folder and select the correct file.
+    This function checks the launcher, launch site and orbit type and returns the path to the matching file of the
+    "Launchers" folder.
 
     Args:
         launcher: Name of the launcher (Ariane_64, Ariane_62)
@@ -80,8 +86,7 @@ def get_launcher_data(launcher, launch_site, orbit_type):
         orbit_type: Orbit type (LEO, SSO, LPEO, Polar, MTO, GTO, GTO+)
 
     Returns:
-        launcher_data: Data from the .csv files. It can be in the form of [Perigee (km), Apogee (km),
-                       Performance (kg)] or [Altitude (km), Inclination (deg), Performance (kg)]
+        table_path: path to the .csv file
         min_inc: minimum inclination available in the current dataset
     """
     supported_launchers = get_supported_launchers()
@@ -96,21 +101,186 @@ def get_launcher_data(launcher, launch_site, orbit_type):
             f"The launch site {launch_site} is not valid for {launcher}. The only available launch site is {supported_launchers[launcher][0]}")
 
     elif orbit_type in ["LEO", "SSO", "LPEO", "Polar"]:
-        launcher_data = np.genfromtxt(f'{PATH_DB_LAUNCHERS}{launcher}_LEO.csv', delimiter=";", skip_header=2)
-        return launcher_data, min_inc
+        return f'{PATH_DB_LAUNCHERS}{launcher}_LEO.csv', min_inc
 
     elif orbit_type == "MTO":
-        launcher_data = np.genfromtxt(f'{PATH_DB_LAUNCHERS}{launcher}_MTO.csv', delimiter=";", skip_header=2)
-        return launcher_data, min_inc
+        return f'{PATH_DB_LAUNCHERS}{launcher}_MTO.csv', min_inc
     elif orbit_type in ["GTO", "GTO+"]:
-        launcher_data = np.genfromtxt(f'{PATH_DB_LAUNCHERS}{launcher}_GTO.csv', delimiter=";", skip_header=2)
-        return launcher_data, min_inc
+        return f'{PATH_DB_LAUNCHERS}{launcher}_GTO.csv', min_inc
     else:
         raise ValueError(f"The orbit type {orbit_type} is not valid.")
 
 
+def get_launcher_data(launcher, launch_site, orbit_type):
+    """
+    This function extracts data from the "Launchers" folder and select the correct file.
+    The file is only read once per process (see get_launcher_performance_model).
+
+    Args:
+        launcher: Name of the launcher (Ariane_64, Ariane_62)
+        launch_site: Name of the lunch site (Kourou)
+        orbit_type: Orbit type (LEO, SSO, LPEO, Polar, MTO, GTO, GTO+)
+
+    Returns:
+        launcher_data: Data from the .csv files (read-only). It can be in the form of [Perigee (km), Apogee (km),
+                       Performance (kg)] or [Altitude (km), Inclination (deg), Performance (kg)]
+        min_inc: minimum inclination available in the current dataset
+    """
+    model = get_launcher_performance_model(launcher, launch_site, orbit_type)
+    return model.launcher_data, model.min_inc
+
+
+# Performance models already loaded in the process, by table path
+LAUNCHER_PERFORMANCE_MODELS = dict()
+LAUNCHER_PERFORMANCE_MODELS_LOCK = threading.Lock()
+
+
+def get_launcher_performance_model(launcher, launch_site, orbit_type):
+    """
+    This function returns the performance model of a launcher for an orbit type. Each table is read and each
+    interpolant is built once per process, the models are then shared by all kickstages and scenarios of the process
+    (including the scenarios run by a same sweep worker).
+
+    Args:
+        launcher: Name of the launcher (Ariane_64, Ariane_62)
+        launch_site: Name of the lunch site (Kourou)
+        orbit_type: Orbit type (LEO, SSO, LPEO, Polar, MTO, GTO, GTO+)
+
+    Returns:
+        model: LauncherPerformanceModel
+    """
+    table_path, min_inc = get_launcher_table_path(launcher, launch_site, orbit_type)
+    with LAUNCHER_PERFORMANCE_MODELS_LOCK:
+        if table_path not in LAUNCHER_PERFORMANCE_MODELS:
+            LAUNCHER_PERFORMANCE_MODELS[table_path] = LauncherPerformanceModel(table_path, min_inc)
+        return LAUNCHER_PERFORMANCE_MODELS[table_path]
+
+
+class LauncherPerformanceModel:
+    """ Performance table of a launcher for an orbit type, read once, with the interpolants built on first use.
+
+    The table rows are [Altitude (km), Inclination (deg), Performance (kg)] for circular orbits or
+    [Perigee (km), Apogee (km), Performance (kg)] for transfer orbits. Interpolants give the same values as
+    scipy.interpolate.griddata with the same method, without triangulating the table again for each query.
+    The table is taken from the compiled database if it is up to date (memory-mapped), the .csv file is parsed otherwise.
+    The table is read-only and interpolants are built under a lock, so that a model can be shared between threads.
+
+    Args:
+        table_path: path to the .csv file
+        min_inc: minimum inclination available in the dataset
+
+    Attributes:
+        launcher_data: table as a read-only array
+        min_inc: minimum inclination available in the dataset
+        interpolants: interpolants already built, by interpolation method
+        performances: performance of each (1st parameter, 2nd parameter) pair of the table
+    """
+    def __init__(self, table_path, min_inc):
+        compiled_database = get_compiled_database()
+        self.launcher_data = None
+        if compiled_database is not None:
+            self.launcher_data = compiled_database.get_launcher_table(table_path)
+        if self.launcher_data is None:
+            self.launcher_data = np.genfromtxt(table_path, delimiter=";", skip_header=2)
+            self.launcher_data.setflags(write=False)
+        self.min_inc = min_inc
+        self.interpolants = dict()
+        self.interpolants_lock = threading.Lock()
+        self.performances = dict()
+        for param_one, param_two, performance in self.launcher_data[::-1, 0:3]:
+            self.performances[(param_one, param_two)] = performance
+
+    def get_interpolant(self, interpolation_method):
+        """
+        Returns the interpolant of the table for an interpolation method, building it on first use.
+        If the table points cannot be triangulated (for instance when they are aligned), the performance is
+        interpolated along the 2nd parameter only, with extrapolation.
+
+        Args:
+            interpolation_method: interopolation method ('linear', 'nearest', 'cubic', or for aligned points 'nearest-up',
+                                  'zero', 'slinear', 'quadratic', 'previous', 'next')
+
+        Returns:
+            interpolant: function of an array of (1st parameter, 2nd parameter) pairs, or of an array of 2nd parameter
+            is_1d: True if the interpolant only depends on the 2nd parameter
+        """
+        with self.interpolants_lock:
+            if interpolation_method not in self.interpolants:
+                points = self.launcher_data[:, 0:2]
+                values = self.launcher_data[:, 2]
+                try:
+                    if interpolation_method == "nearest":
+                        interpolant = NearestNDInterpolator(points, values)
+                    elif interpolation_method == "linear":
+                        interpolant = LinearNDInterpolator(points, values)
+                    elif interpolation_method == "cubic":
+                        interpolant = CloughTocher2DInterpolator(points, values)
+                    else:
+                        raise ValueError(f"Unknown interpolation method {interpolation_method!r} for 2 dimensional data")
+                    self.interpolants[interpolation_method] = (interpolant, False)
+                except RuntimeError:
+                    interpolant = interpolate.interp1d(self.launcher_data[:, 1], values, kind=interpolation_method,
+                                                       fill_value="extrapolate")
+                    self.interpolants[interpolation_method] = (interpolant, True)
+            return self.interpolants[interpolation_method]
+
+    def interpolate(self, param_one, param_two, interpolation_method="linear"):
+        """
+        Interpolates the performance for arrays of parameters. Points outside of the table are NaN.
+
+        Args:
+            param_one: first parameter(s) for interpolation. Can be either altitude or perigee (km)
+            param_two: second parameter(s) for interpolation. Can be either inclination (deg) or apogee (km)
+            interpolation_method: interopolation method (c.f. get_interpolant)
+
+        Returns:
+            l_performance: Launcher's performance in kg, broadcast to the shape of the parameters
+        """
+        param_one, param_two = np.broadcast_arrays(np.asarray(param_one, dtype=float), np.asarray(param_two, dtype=float))
+        interpolant, is_1d = self.get_interpolant(interpolation_method)
+        if is_1d:
+            return np.asarray(interpolant(param_two)) * u.kg
+        points = np.stack((param_one.ravel(), param_two.ravel()), axis=-1)
+        return interpolant(points).reshape(param_one.shape) * u.kg
+
+    def lookup(self, param_one, param_two):
+        """
+        Returns the performance of the table row matching exactly the parameters, None if there is no such row.
+
+        Args:
+            param_one: first parameter. Can be either altitude or perigee (km)
+            param_two: second parameter. Can be either inclination (deg) or apogee (km)
+
+        Returns:
+            l_performance: Launcher's performance in kg, or None
+        """
+        performance = self.performances.get((param_one, param_two), None)
+        return None if performance is None else performance * u.kg
+
+    def get_performance(self, param_one, param_two, interpolation_method="linear"):
+        """
+        Returns the performance for arrays of parameters: the table value for pairs present in the table, the
+        interpolated value otherwise. Points outside of the table are NaN.
+
+        Args:
+            param_one: first parameter(s). Can be either altitude or perigee (km)
+            param_two: second parameter(s). Can be either inclination (deg) or apogee (km)
+            interpolation_method: interopolation method (c.f. get_interpolant)
+
+        Returns:
+            l_performance: Launcher's performance in kg, broadcast to the shape of the parameters
+        """
+        param_one, param_two = np.broadcast_arrays(np.asarray(param_one, dtype=float), np.asarray(param_two, dtype=float))
+        performance = self.interpolate(param_one, param_two, interpolation_method).to_value(u.kg)
+        for index in np.ndindex(performance.shape):
+            table_performance = self.performances.get((param_one[index], param_two[index]), None)
+            if table_performance is not None:
+                performance[index] = table_performance
+        return performance * u.kg
+
+
 def get_launcher_performance(fleet, launcher, launch_site, inclination, apogee, perigee, orbit_type, method="linear",
-                             verbose=False, save=None, save_folder=None):
+                             verbose=False, save=None, save_folder=None, artifacts=None):
     """
     This function directly take the queried data from the Launchers database in order to return the performance of
     the launcher for several combination of orbit's apogee, perigee and inclination. If the data queried do not match
@@ -124,11 +294,13 @@ def get_launcher_performance(fleet, launcher, launch_site, inclination, apogee,
         method: interpolation method ('linear', 'nearest', 'cubic', 'nearest-up', 'zero',
                               'slinear', 'quadratic', 'previous', 'next')
         verbose: set to True to plot the interpolated dataset
+        artifacts: ArtifactPipeline recording the plot, if None the plot is rendered immediately
 
     Returns:
         l_performance: Launcher's performance in kg
     """
-    launcher_data, min_inc = get_launcher_data(launcher, launch_site, orbit_type)
+    model = get_launcher_performance_model(launcher, launch_site, orbit_type)
+    min_inc = model.min_inc
 
     # First check on consistency of the inputs
     if float(inclination) < min_inc:
@@ -136,123 +308,74 @@ def get_launcher_performance(fleet, launcher, launch_site, inclination, apogee,
                     f"inclination change maneuvre needs to be performed.")
 
     # Check if the data is already present in the database, for circular orbits only
-    elif perigee == apogee and apogee in launcher_data[:, 0] and inclination in launcher_data[:, 1]:
-        try:
-            i = np.where((launcher_data[:, 0] == apogee) & (launcher_data[:, 1] == inclination))
-            l_performance = launcher_data[i, 2][0][0] * u.kg
-        # If data are not found in the database, the code proceed with interpolation
-        except IndexError:
-            l_performance = interpolate_launcher_data(fleet, launcher_data, apogee, inclination, method, verbose, save=save, save_folder=save_folder)
-        return l_performance
+    elif perigee == apogee and model.lookup(apogee, inclination) is not None:
+        return model.lookup(apogee, inclination)
+    # If data are not found in the database, the code proceed with interpolation
     elif perigee == apogee:
-        l_performance = interpolate_launcher_data(fleet, launcher_data, apogee, inclination, method, verbose, save=save, save_folder=save_folder)
+        l_performance = interpolate_launcher_data(fleet, model, apogee, inclination, method, verbose, save=save, save_folder=save_folder, artifacts=artifacts)
         return l_performance
 
     elif inclination != 6:
         raise ValueError("MTO and GTO inclination is 6 deg only. Please consider changing the inclination.")
 
     # Check if the data is already present in the database, for elliptical transfer orbits only
-    elif perigee in launcher_data[:, 0] and apogee in launcher_data[:, 1]:
-        try:
-            i = np.where((launcher_data[:, 0] == perigee) & (launcher_data[:, 1] == apogee))
-            l_performance = launcher_data[i, 2][0][0] * u.kg
-        # If data are not found in the database, the code proceed with interpolation
-        except IndexError:
-            l_performance = interpolate_launcher_data(fleet, launcher_data, apogee, perigee, method, verbose, save=save, save_folder=save_folder)
-        return l_performance
+    elif model.lookup(perigee, apogee) is not None:
+        return model.lookup(perigee, apogee)
+    # If data are not found in the database, the code proceed with interpolation
     else:
-        l_performance = interpolate_launcher_data(fleet, launcher_data, perigee, apogee, method, verbose, save=save, save_folder=save_folder)
+        l_performance = interpolate_launcher_data(fleet, model, perigee, apogee, method, verbose, save=save, save_folder=save_folder, artifacts=artifacts)
         return l_performance.to(u.kg)
 
 
-def interpolate_launcher_data(fleet, launcher_data, param_one, param_two, interpolation_method, verbose=False, save=None, save_folder=None, create_gif=True):
+def interpolate_launcher_data(fleet, model, param_one, param_two, interpolation_method, verbose=False, save=None, save_folder=None, create_gif=True, artifacts=None):
     """
     This function interpolates the performance data of the launcher and returns the performance of
     the launcher for several combination of orbit's apogee, perigee and inclination.
     Args:
-        launcher_data:
+        model: LauncherPerformanceModel of the launcher
         param_one: first parameter for interpolation. Can be either altitude or perigee
         param_two: second parameter for interpolation. Can be either inclination or apogee
         interpolation_method: interopolation method ('linear', 'nearest', 'cubic', 'nearest-up', 'zero',
                               'slinear', 'quadratic', 'previous', 'next')
         verbose: set to True to plot the interpolated dataset
+        artifacts: ArtifactPipeline recording the plot, if None the plot is rendered immediately
 
     Returns:
         l_performance: Launcher's performance in kg
     """
-    # plot interpolated dataset
-    if verbose:
-        logging.info(f"Plotting interpolated databases for selected Launch Vehicle...") #TODO: put the LV actual name
-        try:
-            xx = launcher_data[:, 0]
-            yy = launcher_data[:, 1]
-            xx, yy = np.meshgrid(xx, yy)
-            z = interpolate.griddata(launcher_data[:, 0:2], launcher_data[:, 2], (xx.ravel(), yy.ravel()),
-                                     method=interpolation_method)
-            fig = pyplot.figure("Performance map")
-            ax = fig.add_subplot(111, projection='3d')
-            ax.set_title("Performance map")
-
-            if param_two < 180:
-                ax.set_xlabel("Altitude [km]")
-                ax.set_ylabel("Inclination [deg]")
+    launcher_data = model.launcher_data
+
+    # record interpolated dataset, plotted by the artifact pipeline
+    if verbose and not fleet.get_graph_status():
+        if param_two < 180:
+            x_label, y_label = "Altitude [km]", "Inclination [deg]"
+        else:
+            x_label, y_label = "Perigee [km]", "Apogee [km]"
+
+        if save_folder and save:
+            logging.info(f"Recording interpolated databases for selected Launch Vehicle...") #TODO: put the LV actual name
+            artifact_data = dict(launcher_data=launcher_data, interpolation_method=interpolation_method,
+                                 x_label=x_label, y_label=y_label, create_gif=create_gif)
+            if artifacts is not None:
+                artifacts.record(save, "performance_map", **artifact_data)
             else:
-                ax.set_xlabel("Perigee [km]")
-                ax.set_ylabel("Apogee [km]")
-
-            ax.set_zlabel("Performance [kg]")
-            ax.plot_trisurf(xx.ravel(), yy.ravel(), z)
-            ax.scatter(launcher_data[:, 0], launcher_data[:, 1], launcher_data[:, 2], s=20, c="red")
-
-        except RuntimeError:
-            xx = np.linspace(np.min(launcher_data[:, 1]), np.max(launcher_data[:, 1]), num=25)
-            z = interpolate.interp1d(launcher_data[:, 1], launcher_data[:, 2], kind=interpolation_method,
-                                     fill_value="extrapolate")
-            # z = np.polyfit(launcher_data[:, 1], launcher_data[:, 2], 1)
-            # f = np.poly1d(z)
-            fig = pyplot.figure("Performance map")
-            xnew = np.linspace(np.min(launcher_data[:, 1]) * 0.8, np.max(launcher_data[:, 1]) * 1.1, num=27)
-            ynew = z(xnew)  # use interpolation function returned by `interp1d`
-            ax = fig.add_subplot(111)
-            ax.set_title("Performance map")
-            ax.plot(launcher_data[:, 1], launcher_data[:, 2], "o", xnew, ynew, '-')
-            ax.set_xlabel("Apogee [km]")
-            ax.set_ylabel("Performance [kg]")
-
-        if not fleet.get_graph_status():
-            if save_folder and save:
-
-                fig.savefig(save_folder + '/' + save + '.png', bbox_inches='tight', dpi=100, engine="kaleido")
-
-                if create_gif:
-                    def rotate(angle):
-                        ax.view_init(azim=angle)
-
-                    logging.info("Making animation...")
-                    rot_animation = animation.FuncAnimation(fig, rotate, frames=np.arange(0, 359, 5), interval=150)
-                    rot_animation.save(save_folder + '/' + save + '.gif', dpi=100, bitrate=1)
-                    fleet.set_graph_status(True)
-
-                logging.info("Interpolating...")
-            else:
-                print("Close the window to continue.")
-                pyplot.show()
-                print("Interpolating...")
-    try:
-        l_performance = \
-        griddata(launcher_data[:, 0:2], launcher_data[:, 2], [param_one, param_two], method=interpolation_method)[
-            0] * u.kg
+                render_artifact(record_artifact(os.path.join(save_folder, save), "performance_map", **artifact_data))
+            fleet.set_graph_status(True)
+            logging.info("Interpolating...")
+        else:
+            build_performance_map_figure(launcher_data, interpolation_method, x_label, y_label)
+            print("Close the window to continue.")
+            pyplot.show()
+            print("Interpolating...")
+    l_performance = model.interpolate(param_one, param_two, interpolation_method)
+    if not model.get_interpolant(interpolation_method)[1]:
+        l_performance = l_performance[()]
         if np.isnan(l_performance):
             raise ValueError(f"The orbital parameters inserted exceed the dataset.\n"
                              f"Dataset min/max are:\n"
                              f"{np.min(launcher_data[:, 0])} / {np.max(launcher_data[:, 0])} for 1st parameter\n"
                              f"{np.min(launcher_data[:, 1])} / {np.max(launcher_data[:, 1])} for 2nd parameter\n"
                              f"your 1st and 2nd parameter are {param_one} and {param_two}.")
-    except RuntimeError:
-
-        z = interpolate.interp1d(launcher_data[:, 1], launcher_data[:, 2], kind=interpolation_method,
-                                 fill_value="extrapolate")
-        l_performance = z(param_two) * u.kg
 
     return l_performance
 
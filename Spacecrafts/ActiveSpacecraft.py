@@ -6,7 +6,7 @@ Description:    Parent class for all active spacecrafts
 """
 # Import class
 from numpy import isin
-from Phases.Common_functions import orbit_string, update_orbit
+from Phases.Common_functions import orbit_key, orbit_summary, orbit_summary_string, update_orbit
 from Spacecrafts.Spacecraft import Spacecraft
 from Plan.Plan import Plan
 from Phases.Approach import Approach
@@ -64,7 +64,7 @@ class ActiveSpacecraft(Spacecraft):
         self.ratio_inc_raan_from_opti = 0.
 
         # Instanciate Plan
-        self.plan = Plan(f"Plan_{self.id}",scenario.starting_epoch)
+        self.plan = Plan(f"Plan_{self.id}",scenario.starting_epoch,checkpointing=PLAN_CHECKPOINTING)
 
     """
     Methods
@@ -153,6 +153,46 @@ class ActiveSpacecraft(Spacecraft):
         """
         self.reset_modules()
 
+    def get_checkpoint(self):
+        """ Get the part of the spacecraft state modified by phases, including modules and assigned targets
+
+        :return: spacecraft state
+        :rtype: dict
+        """
+        checkpoint = super().get_checkpoint()
+        checkpoint["current_spacecraft"] = dict(self.current_spacecraft)
+        checkpoint["modules"] = {module_id: module.get_checkpoint() for module_id, module in self.modules.items()}
+        checkpoint["targets"] = {target_id: target.get_checkpoint()
+                                 for target_id, target in self.initial_spacecraft.items()}
+        return checkpoint
+
+    def restore_checkpoint(self, checkpoint):
+        """ Restore a state previously returned by get_checkpoint
+
+        :param checkpoint: spacecraft state
+        :type checkpoint: dict
+        """
+        super().restore_checkpoint(checkpoint)
+        self.current_spacecraft = dict(checkpoint["current_spacecraft"])
+        for module_id, module_checkpoint in checkpoint["modules"].items():
+            self.modules[module_id].restore_checkpoint(module_checkpoint)
+        for target_id, target_checkpoint in checkpoint["targets"].items():
+            self.initial_spacecraft[target_id].restore_checkpoint(target_checkpoint)
+
+    def get_checkpoint_key(self):
+        """ Get a key identifying the spacecraft state before its plan is applied.
+        The phases of a previous run can only be reused if this key is unchanged (see Plan.apply).
+
+        :return: spacecraft key
+        :rtype: tuple
+        """
+        return (self.get_id(),
+                self.get_current_mass().to_value(u.kg),
+                orbit_key(self.current_orbit),
+                orbit_key(self.get_insertion_orbit()),
+                tuple(self.current_spacecraft),
+                tuple(self.get_capture_module().get_captured_spacecrafts()) if self.get_capture_module() else ())
+
     def change_orbit(self, orbit):
         """ Change current orbit to supplied orbit
 
@@ -310,26 +350,56 @@ class ActiveSpacecraft(Spacecraft):
                     rcs_prop_mass += phase.propellant
         return reference_delta_v.to(u.m / u.s), rcs_prop_mass
 
-    def generate_snapshot_string(self,spacecraft_type_str="Spacecraft"):
-        """ Adds all elements specific to an active spacecraft to the super() method.
+    def get_snapshot(self,spacecraft_type_str="Spacecraft"):
+        """ Returns the current state of the active spacecraft, as reported after each phase.
 
         :param spacecraft_type_str: for nomenclature of certain parameters, defaults to "Spacecraft"
         :type spacecraft_type_str: str, optional
+        :return: epochs, orbits, mass and fuel mass of the spacecraft
+        :rtype: dict
+        """
+        return dict(spacecraft_type=spacecraft_type_str,
+                    spacecraft_id=str(self.get_id()),
+                    starting_epoch=self.previous_orbit.epoch,
+                    ending_epoch=self.current_orbit.epoch,
+                    initial_orbit=orbit_summary(self.previous_orbit),
+                    final_orbit=orbit_summary(self.current_orbit),
+                    reference_orbit=orbit_summary(update_orbit(self.constellation_reference_spacecraft.get_default_orbit(),self.current_orbit.epoch)),
+                    mass=self.get_current_mass(),
+                    propellant_mass=self.get_main_propulsion_module().current_propellant_mass)
+
+    def generate_snapshot_string(self,snapshot):
+        """ Renders a state of the spacecraft (see get_snapshot) as written in the report.
+
+        :param snapshot: state of the spacecraft
+        :type snapshot: dict
         :return: state of the spacecraft written in a string
         :rtype: str
         """
+        spacecraft_type_str = snapshot["spacecraft_type"]
         return (str("")
-        + "\n\tStarting Epoch: " + str(self.previous_orbit.epoch)
-        + "\n\tEnding Epoch: " + str(self.current_orbit.epoch)
-        + "\n\t" + spacecraft_type_str + ": " + str(self.get_id())
-        + "\n\tInitial Orbit: " + orbit_string(self.previous_orbit)
-        + "\n\tFinal Orbit: " + orbit_string(self.current_orbit)
-        + "\n\tReference Satellite Orbit: " + orbit_string(update_orbit(self.constellation_reference_spacecraft.get_default_orbit(),self.current_orbit.epoch))
-        + "\n\t" + spacecraft_type_str + " Mass After Phase: {0:.1f}".format(self.get_current_mass())
-        + "\n\tFuel Mass After Phase: " + "{0:.1f}".format(self.get_main_propulsion_module().current_propellant_mass))
-
-    def print_spacecraft_specific_data(self):
+        + "\n\tStarting Epoch: " + str(snapshot["starting_epoch"])
+        + "\n\tEnding Epoch: " + str(snapshot["ending_epoch"])
+        + "\n\t" + spacecraft_type_str + ": " + snapshot["spacecraft_id"]
+        + "\n\tInitial Orbit: " + orbit_summary_string(snapshot["initial_orbit"])
+        + "\n\tFinal Orbit: " + orbit_summary_string(snapshot["final_orbit"])
+        + "\n\tReference Satellite Orbit: " + orbit_summary_string(snapshot["reference_orbit"])
+        + "\n\t" + spacecraft_type_str + " Mass After Phase: {0:.1f}".format(snapshot["mass"])
+        + "\n\tFuel Mass After Phase: " + "{0:.1f}".format(snapshot["propellant_mass"]))
+
+    def get_spacecraft_specific_data(self):
+        """ No specific data.
+
+        :return: data specific to the type of spacecraft
+        :rtype: dict
+        """
+        return dict()
+
+    def print_spacecraft_specific_data(self, report):
         """ No specific data.
+
+        :param report: report of the spacecraft (see get_report)
+        :type report: dict
         """
         pass
 
@@ -344,35 +414,62 @@ class ActiveSpacecraft(Spacecraft):
             nominal_power_draw = nominal_power_draw + module.get_reference_power()
         return nominal_power_draw
 
-    def print_metadata(self):
+    def get_report(self):
+        """ Returns the report of the spacecraft: metadata, assigned spacecrafts, modules and results of each phase of its plan.
+
+        :return: report of the spacecraft
+        :rtype: dict
+        """
+        return dict(spacecraft_id=str(self.get_id()),
+                    dry_mass=self.get_dry_mass(),
+                    initial_wet_mass=self.get_initial_wet_mass(),
+                    fuel_mass_margin=self.get_main_propulsion_module().current_propellant_mass,
+                    nb_phases=self.plan.get_nb_phases(),
+                    nb_manoeuvres=self.plan.get_nb_manoeuvers(),
+                    **self.get_spacecraft_specific_data(),
+                    assigned_spacecrafts=[str(target) for target in self.ordered_target_spacecraft],
+                    modules=[dict(module_id=str(module.id), description=str(module)) for _, module in self.modules.items()],
+                    plan_id=str(self.plan.id),
+                    plan_starting_epoch=self.plan.starting_epoch,
+                    phases=[phase.result for phase in self.plan.phases])
+
+    def print_metadata(self, report):
         """ Prints all meta elements specific to this spacecraft.
+
+        :param report: report of the spacecraft (see get_report)
+        :type report: dict
         """
         print(f""
         + f"Metadata:"
-        + f"\n\tSpacecraft id: {self.get_id()}"
-        + f"\n\tDry mass: {self.get_dry_mass():.01f}"
-        + f"\n\tInitial wet mass: {self.get_initial_wet_mass():.01f}"
-        + f"\n\tFuel mass margin: {self.get_main_propulsion_module().current_propellant_mass:.1f}"
-        + f"\n\tNb of phases: {self.plan.get_nb_phases()}"
-        + f"\n\tNb of manoeuveres: {self.plan.get_nb_manoeuvers()}")
-        self.print_spacecraft_specific_data()
+        + f"\n\tSpacecraft id: {report['spacecraft_id']}"
+        + f"\n\tDry mass: {report['dry_mass']:.01f}"
+        + f"\n\tInitial wet mass: {report['initial_wet_mass']:.01f}"
+        + f"\n\tFuel mass margin: {report['fuel_mass_margin']:.1f}"
+        + f"\n\tNb of phases: {report['nb_phases']}"
+        + f"\n\tNb of manoeuveres: {report['nb_manoeuvres']}")
+        self.print_spacecraft_specific_data(report)
         print(f"\tAssigned Spacecrafts:")
 
-    def print_report(self):
+    def print_report(self, report=None):
         """ Print the report
+
+        :param report: report of the spacecraft, defaults to the current report (see get_report)
+        :type report: dict, optional
         """
+        if report is None:
+            report = self.get_report()
         print("")
-        print(self.get_id())
+        print(report["spacecraft_id"])
         print("="*72)
-        self.print_metadata()
+        self.print_metadata(report)
 
-        for target in self.ordered_target_spacecraft:
+        for target in report["assigned_spacecrafts"]:
             print(f"\t\t{target}")
 
         print(f"-"*72)
         print('Modules:')
-        for _, module in self.modules.items():
-            print(f"\tModule ID: {module}")
+        for module in report["modules"]:
+            print(f"\tModule ID: {module['description']}")
 
         print(f"-"*72)
         self.plan.print_report()
\ No newline at end of file
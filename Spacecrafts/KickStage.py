@@ -13,7 +13,8 @@ from Scenarios.ScenarioParameters import *
 from Spacecrafts.ActiveSpacecraft import ActiveSpacecraft
 from astropy import units as u
 from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
+from Phases.OrbitElements import OrbitElements
+from Phases.Common_functions import STANDARD_GRAVITY
 
 
 class KickStage(ActiveSpacecraft):
@@ -150,6 +151,77 @@ class KickStage(ActiveSpacecraft):
         # Execute kickstage (Apply owned plan)
         self.execute_plan()
 
+    def estimate_remaining_propellant(self,satellites,constellation_precession=0):
+        """ Estimate the remaining propellant for every allowance, i.e. when only the first satellites of the list are assigned.
+            The plan is executed once with all satellites. The delta v of its phases, the released masses and the disposal
+            delta v from the orbit of each release are then combined with the rocket equation for all allowances at once.
+            The mass dependency of the manoeuvres durations is neglected, the estimation must be confirmed by an execution.
+
+        :param satellites: Ordered spacecraft, the largest assignment considered
+        :type satellites: list(:class:`~Spacecrafts.Spacecraft.Spacecraft`)
+        :param constellation_precession: Reference satellite precession speed
+        :type constellation_precession: float
+        :return: estimated remaining propellant in kg, element i corresponds to the first i satellites (element 0 is nan)
+        :rtype: numpy.ndarray
+        """
+        # Execute the plan with all satellites
+        self.execute(satellites,constellation_precession=constellation_precession)
+        main_propulsion_module = self.get_main_propulsion_module()
+        isp = main_propulsion_module.isp.to_value(u.s)
+        initial_prop_mass = main_propulsion_module.get_initial_prop_mass().to_value(u.kg)
+
+        # Mass before the plan with all satellites (all satellites are released at the end of the plan)
+        satellite_masses = np.array([satellite.get_current_mass().to_value(u.kg) for satellite in satellites])
+        full_initial_mass = ((self.get_current_mass() - self.get_capture_module().get_captured_mass()
+                              - main_propulsion_module.get_current_prop_mass()).to_value(u.kg)
+                             + initial_prop_mass + satellite_masses.sum())
+
+        # Mass ratio (burns), mass drop (propellant and releases) of each phase and disposal delta v after each release
+        disposal = self.plan.phases[-1]
+        mass_ratios = np.ones(self.plan.get_nb_phases())
+        mass_drops = np.zeros(self.plan.get_nb_phases())
+        propellant_drops = np.zeros(self.plan.get_nb_phases())
+        release_indices = []
+        disposal_delta_v = []
+        disposal_delta_v_cache = dict()
+        current_orbit = None
+        for index, phase in enumerate(self.plan.phases):
+            if isinstance(phase, OrbitChange):
+                mass_ratios[index] = np.exp(-phase.get_delta_v(contingency=True).to_value(u.m / u.s) / STANDARD_GRAVITY / isp)
+                current_orbit = phase.final_orbit
+            elif isinstance(phase, Insertion):
+                propellant_drops[index] = (phase.propellant * (1 + phase.contingency)).to_value(u.kg)
+                mass_drops[index] = propellant_drops[index]
+                current_orbit = phase.orbit
+            elif isinstance(phase, Release):
+                mass_drops[index] = phase.target.get_current_mass().to_value(u.kg)
+                release_indices.append(index + 1)
+
+                # Disposal delta v only depends on the shape and inclination of the orbit
+                orbit_shape = (current_orbit.a.to_value(u.m), current_orbit.ecc.value, current_orbit.inc.to_value(u.rad), current_orbit.argp.to_value(u.rad))
+                if orbit_shape not in disposal_delta_v_cache:
+                    manoeuvres, _ = disposal.compute_main_manoeuvres(initial_orbit=current_orbit, final_orbit=disposal.final_orbit)
+                    delta_v = sum(manoeuvre.get_delta_v().to_value(u.m / u.s) for manoeuvre in manoeuvres)
+                    disposal_delta_v_cache[orbit_shape] = delta_v * (1 + disposal.delta_v_contingency)
+                disposal_delta_v.append(disposal_delta_v_cache[orbit_shape])
+
+        # Mass before each phase is linear in the initial mass: cumulated_ratios * initial_mass - cumulated_drops
+        cumulated_ratios = np.concatenate(([1.], np.cumprod(mass_ratios)))
+        cumulated_drops = cumulated_ratios * np.concatenate(([0.], np.cumsum(mass_drops / cumulated_ratios[1:])))
+
+        # So is the propellant consumed before each phase: consumed_factors * initial_mass - consumed_offsets
+        burn_fractions = 1. - mass_ratios
+        consumed_factors = np.concatenate(([0.], np.cumsum(burn_fractions * cumulated_ratios[:-1])))
+        consumed_offsets = np.concatenate(([0.], np.cumsum(burn_fractions * cumulated_drops[:-1] - propellant_drops)))
+
+        # Evaluate the budget after each release, for the corresponding allowance, then add the disposal
+        release_indices = np.array(release_indices, dtype=int)
+        initial_masses = full_initial_mass - (satellite_masses.sum() - np.cumsum(satellite_masses))
+        final_masses = cumulated_ratios[release_indices] * initial_masses - cumulated_drops[release_indices]
+        consumed_prop_masses = (consumed_factors[release_indices] * initial_masses - consumed_offsets[release_indices]
+                                + final_masses * (1. - np.exp(-np.array(disposal_delta_v) / STANDARD_GRAVITY / isp)))
+        return np.concatenate(([np.nan], initial_prop_mass - consumed_prop_masses))
+
 
     def reset(self):
         """ Reset the object to inital parameters. Empty the plan
@@ -224,7 +296,8 @@ class KickStage(ActiveSpacecraft):
                                                             method=scenario.launcher_perf_interpolation_method,
                                                             verbose=scenario.verbose,
                                                             save="InterpolationGraph",
-                                                            save_folder=scenario.dir_path_for_output_files)
+                                                            save_folder=scenario.dir_path_for_output_files,
+                                                            artifacts=scenario.artifacts)
 
             if scenario.launcher_name in ["Soyuz_2.1a_Fregat", "Soyuz_2.1b_Fregat"] and scenario.kickstage_use_database and scenario.kickstage_name in ["Fregat", "Fregat_M"]:
                 self.mass_available = launcher_performance
@@ -340,14 +413,14 @@ class KickStage(ActiveSpacecraft):
         # Step 1: Insertion Phase
         ##########      
         # Compute insertion orbit
-        insertion_orbit = Orbit.from_classical(Earth,
-                                               self.insertion_orbit.a - insertion_a_margin,
-                                               self.insertion_orbit.ecc,
-                                               self.insertion_orbit.inc,
-                                               first_target.insertion_orbit.raan - precession_direction * insertion_raan_margin,
-                                               self.insertion_orbit.argp,
-                                               self.insertion_orbit.nu,
-                                               self.insertion_orbit.epoch)
+        insertion_orbit = OrbitElements.from_classical(Earth,
+                                                       self.insertion_orbit.a - insertion_a_margin,
+                                                       self.insertion_orbit.ecc,
+                                                       self.insertion_orbit.inc,
+                                                       first_target.insertion_orbit.raan - precession_direction * insertion_raan_margin,
+                                                       self.insertion_orbit.argp,
+                                                       self.insertion_orbit.nu,
+                                                       self.insertion_orbit.epoch)
 
         # Add Insertion phase to the plan
         insertion = Insertion(f"({self.id}) Goes to insertion orbit",self.plan, insertion_orbit, duration=1 * u.h)
@@ -457,19 +530,34 @@ class KickStage(ActiveSpacecraft):
         str_mass += f"\n\t\tInitial payload = {self.get_initial_payload_mass():.2f}"
         return str_mass
 
-    def generate_snapshot_string(self):
+    def get_snapshot(self):
         """ Call the super() method with "kickstage" as parameter
 
-        :return: string generated by the super() method
-        :rtype: str
+        :return: state returned by the super() method
+        :rtype: dict
         """
-        return super().generate_snapshot_string("KickStage")
+        return super().get_snapshot("KickStage")
+
+    def get_spacecraft_specific_data(self):
+        """ Returns values of some specific attributes.
 
-    def print_spacecraft_specific_data(self):
+        :return: payload mass available and onboard, filling ratios and number of spacecrafts onboard
+        :rtype: dict
+        """
+        return dict(payload_mass_available=self.mass_available,
+                    initial_payload_mass=self.get_initial_payload_mass(),
+                    mass_filling_ratio=self.mass_filling_ratio,
+                    volume_filling_ratio=self.volume_filling_ratio,
+                    nb_spacecrafts_onboard=len(self.ordered_target_spacecraft))
+
+    def print_spacecraft_specific_data(self, report):
         """ Prints values of some speicif attributes.
+
+        :param report: report of the kickstage (see get_report)
+        :type report: dict
         """
-        print(f"\tTotal payload mass available: {self.mass_available:.1f}"
-        + f"\n\tTotal initial payload = {self.get_initial_payload_mass():.1f}"
-        + f"\n\tLauncher mass filling ratio: {self.mass_filling_ratio * 100:.1f}%"
-        + f"\n\tLauncher volume filling ratio: {self.volume_filling_ratio * 100:.1f}%"
-        + f"\n\tNumber of spacecrafts onboard: {len(self.ordered_target_spacecraft)}")
+        print(f"\tTotal payload mass available: {report['payload_mass_available']:.1f}"
+        + f"\n\tTotal initial payload = {report['initial_payload_mass']:.1f}"
+        + f"\n\tLauncher mass filling ratio: {report['mass_filling_ratio'] * 100:.1f}%"
+        + f"\n\tLauncher volume filling ratio: {report['volume_filling_ratio'] * 100:.1f}%"
+        + f"\n\tNumber of spacecrafts onboard: {report['nb_spacecrafts_onboard']}")
@@ -1,5 +1,8 @@
 from Spacecrafts.Spacecraft import Spacecraft
 from Phases.Common_functions import nodal_precession
+from Phases.OrbitElements import LazyOrbitAttribute
+
+import copy
 
 
 class Satellite(Spacecraft):
@@ -12,25 +15,64 @@ class Satellite(Spacecraft):
     :param volume: Satellite volume
     :type volume: u*m**3
     :param insertion_orbit: Insertion orbit
-    :type insertion_orbit: poliastro.twobody.Orbit
+    :type insertion_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param operational_orbit: Operational orbit
-    :type operational_orbit: poliastro.twobody.Orbit
+    :type operational_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param disposal_orbit: Disposal orbit
-    :type disposal_orbit: poliastro.twobody.Orbit
+    :type disposal_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param state: Spacecraft actual state
     :type state: str
     :param default_orbit: Initial orbit
-    :type default_orbit: poliastro.twobody.Orbit
+    :type default_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
+
+    The insertion, operational and disposal orbits may be given as :class:`~Phases.OrbitElements.LazyOrbitElements`
+    references to an :class:`~Phases.OrbitElements.OrbitElementsBatch`, they are then built when first accessed.
     """
+    insertion_orbit = LazyOrbitAttribute()
+    operational_orbit = LazyOrbitAttribute()
+    disposal_orbit = LazyOrbitAttribute()
+
     def __init__(self, satellite_id, initial_mass, volume, insertion_orbit=None, operational_orbit=None, disposal_orbit=None, state="standby", default_orbit=None):
+        self.constellation = None
+        self._default_orbit = None
         super().__init__(satellite_id,initial_mass, volume,insertion_orbit=insertion_orbit,operational_orbit=operational_orbit, disposal_orbit=disposal_orbit,state=state)
         self.default_orbit = default_orbit
 
+    @property
+    def state(self):
+        """ (str): satellite state, changes are reported to the constellation the satellite belongs to """
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        self._state = state
+        if self.constellation is not None:
+            self.constellation.update_satellite_index(self)
+
+    @property
+    def default_orbit(self):
+        """ (poliastro.twobody.Orbit or OrbitElements): default orbit, changes are reported to the constellation """
+        return self._default_orbit
+
+    @default_orbit.setter
+    def default_orbit(self, orbit):
+        self._default_orbit = orbit
+        if self.constellation is not None:
+            self.constellation.update_satellite_index(self, default_orbit_changed=True)
+
+    def set_constellation(self, constellation):
+        """ Set the constellation the satellite belongs to
+
+        :param constellation: constellation keeping an index of its satellites
+        :type constellation: :class:`~Constellations.Constellation.Constellation`
+        """
+        self.constellation = constellation
+
     def get_default_orbit(self):
         """ Get the satellite default orbit
 
         :return: default orbit
-        :rtype: poliastro.twobody.Orbit
+        :rtype: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         return self.default_orbit
 
@@ -38,6 +80,34 @@ class Satellite(Spacecraft):
         """ Set the default orbit
 
         :param orbit: new default orbit
-        :type orbit: poliastro.twobody.Orbit
+        :type orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
+        """
+        self.default_orbit = orbit
+
+    def clone(self, satellite_id, insertion_orbit=None, operational_orbit=None, disposal_orbit=None):
+        """ Create a satellite sharing the reference data of this one (modules, masses and volumes).
+        The new satellite only owns its id, orbits and state. The shared data is never modified for passive satellites,
+        which avoids a deep copy of the modules for each member of a constellation.
+
+        :param satellite_id: new satellite identification name
+        :type satellite_id: str
+        :param insertion_orbit: Insertion orbit, defaults to None
+        :type insertion_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`, optional
+        :param operational_orbit: Operational orbit, defaults to None
+        :type operational_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`, optional
+        :param disposal_orbit: Disposal orbit, defaults to None
+        :type disposal_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`, optional
+        :return: new satellite
+        :rtype: :class:`~Spacecrafts.Satellite.Satellite`
         """
-        self.default_orbit = orbit
\ No newline at end of file
+        satellite = copy.copy(self)
+        satellite.constellation = None
+        satellite.id = satellite_id
+        satellite.insertion_orbit = insertion_orbit
+        satellite.operational_orbit = operational_orbit
+        satellite.disposal_orbit = disposal_orbit
+        satellite.current_orbit = None
+        satellite.previous_orbit = None
+        satellite.insertion_epoch = None
+        satellite.mothership = None
+        return satellite
@@ -14,7 +14,7 @@ from Scenarios.ScenarioParameters import *
 from Spacecrafts.ActiveSpacecraft import ActiveSpacecraft
 from astropy import units as u
 from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
+from Phases.OrbitElements import OrbitElements
 
 class Servicer(ActiveSpacecraft):
     """ KickStage acts ase a child Class implementing all necessary attributes relative kickstages.
@@ -101,14 +101,14 @@ class Servicer(ActiveSpacecraft):
         # Step 1: Insertion Phase
         ##########      
         # Compute insertion orbit
-        insertion_orbit = Orbit.from_classical(Earth,
-                                               self.insertion_orbit.a - insertion_a_margin,
-                                               self.insertion_orbit.ecc,
-                                               self.insertion_orbit.inc,
-                                               self.insertion_orbit.raan,
-                                               self.insertion_orbit.argp,
-                                               self.insertion_orbit.nu,
-                                               self.insertion_orbit.epoch)
+        insertion_orbit = OrbitElements.from_classical(Earth,
+                                                       self.insertion_orbit.a - insertion_a_margin,
+                                                       self.insertion_orbit.ecc,
+                                                       self.insertion_orbit.inc,
+                                                       self.insertion_orbit.raan,
+                                                       self.insertion_orbit.argp,
+                                                       self.insertion_orbit.nu,
+                                                       self.insertion_orbit.epoch)
 
         insertion_orbit = update_orbit(insertion_orbit,self.get_insertion_epoch())
 
@@ -237,10 +237,10 @@ class Servicer(ActiveSpacecraft):
         super().assign_spacecraft(spacecraft_to_assign)
         self.set_insertion_orbit(spacecraft_to_assign.get_operational_orbit())
 
-    def generate_snapshot_string(self):
+    def get_snapshot(self):
         """ Call the super() method with "servicer" as parameter
 
-        :return: string generated by the super() method
-        :rtype: str
+        :return: state returned by the super() method
+        :rtype: dict
         """
-        return super().generate_snapshot_string("Servicer")
\ No newline at end of file
+        return super().get_snapshot("Servicer")
\ No newline at end of file
@@ -7,11 +7,11 @@
 # Import methods
 from Modules.StructureModule import StructureModule
 from Phases.Common_functions import nodal_precession
+from Phases.OrbitElements import OrbitElements, copy_orbit
 
 # Import libraries
 from astropy import units as u
 from poliastro.bodies import Earth
-from poliastro.twobody import Orbit
 import warnings
 
 from Scenarios.ScenarioParameters import *
@@ -27,11 +27,11 @@ class Spacecraft:
     :param volume: Spacecraft volume
     :type volume: u*m**3
     :param insertion_orbit: Insertion orbit
-    :type insertion_orbit: poliastro.twobody.Orbit
+    :type insertion_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param operational_orbit: Operational orbit
-    :type operational_orbit: poliastro.twobody.Orbit
+    :type operational_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param disposal_orbit: Disposal orbit
-    :type disposal_orbit: poliastro.twobody.Orbit
+    :type disposal_orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
     :param state: Spacecraft actual state
     :type state: str
     """
@@ -80,14 +80,14 @@ class Spacecraft:
         """ Update current orbit. Save previous orbit
 
         :param orbit: new orbit
-        :type orbit: poliastro.twobody.Orbit
+        :type orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         # Update kickstage own orbit
         self.previous_orbit = self.current_orbit
         self.current_orbit = orbit
 
     def set_insertion_orbit(self,new_orbit):
-        self.insertion_orbit = Orbit.from_classical(Earth,
+        self.insertion_orbit = OrbitElements.from_classical(Earth,
                                     new_orbit.a,
                                     new_orbit.ecc,
                                     new_orbit.inc,
@@ -109,7 +109,7 @@ class Spacecraft:
         :type new_epoch: Orbit.epoch
         """
         if self.insertion_orbit is not None:
-            self.insertion_orbit = Orbit.from_classical(Earth,
+            self.insertion_orbit = OrbitElements.from_classical(Earth,
                                         self.insertion_orbit.a,
                                         self.insertion_orbit.ecc,
                                         self.insertion_orbit.inc,
@@ -129,6 +129,31 @@ class Spacecraft:
         self.mothership = None
         self.state = "standby"
 
+    def get_checkpoint(self):
+        """ Get the part of the spacecraft state modified by phases. Used by the plan to resume a simulation.
+        Orbits are copied, the checkpoint is not changed by later modifications of the spacecraft orbits
+
+        :return: spacecraft state
+        :rtype: dict
+        """
+        return dict(current_orbit=copy_orbit(self.current_orbit),
+                    previous_orbit=copy_orbit(self.previous_orbit),
+                    insertion_epoch=self.insertion_epoch,
+                    state=self.state,
+                    mothership=self.mothership)
+
+    def restore_checkpoint(self, checkpoint):
+        """ Restore a state previously returned by get_checkpoint. Orbits are copied, the checkpoint can be restored again
+
+        :param checkpoint: spacecraft state
+        :type checkpoint: dict
+        """
+        self.current_orbit = copy_orbit(checkpoint["current_orbit"])
+        self.previous_orbit = copy_orbit(checkpoint["previous_orbit"])
+        self.insertion_epoch = checkpoint["insertion_epoch"]
+        self.state = checkpoint["state"]
+        self.mothership = checkpoint["mothership"]
+
     def get_id(self):
         """Get the Spacecraft's id
 
@@ -212,7 +237,7 @@ class Spacecraft:
         """ Get the current orbit
 
         :return: current orbit
-        :rtype orbit: poliastro.twobody.Orbit
+        :rtype orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         return self.current_orbit
 
@@ -220,7 +245,7 @@ class Spacecraft:
         """ Set the current orbit
 
         :param orbit: new orbit
-        :type orbit: poliastro.twobody.Orbit
+        :type orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         self.current_orbit = orbit
 
@@ -228,7 +253,7 @@ class Spacecraft:
         """ Get the insertion orbit
 
         :return: insertion orbit
-        :rtype orbit: poliastro.twobody.Orbit
+        :rtype orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         return self.insertion_orbit
 
@@ -236,7 +261,7 @@ class Spacecraft:
         """ Get the operational orbit
 
         :return:  operational orbit
-        :rtype orbit: poliastro.twobody.Orbit
+        :rtype orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         return self.operational_orbit
 
@@ -244,7 +269,7 @@ class Spacecraft:
         """ Get the disposal orbit
 
         :return: disposal orbit
-        :rtype orbit: poliastro.twobody.Orbit
+        :rtype orbit: poliastro.twobody.Orbit or :class:`~Phases.OrbitElements.OrbitElements`
         """
         return self.disposal_orbit
 
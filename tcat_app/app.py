@@ -1,31 +1,31 @@
-import base64
-import io
 import json
 import mimetypes
 import os
 import re
-import subprocess
 import sys
-import threading
-import time
 import uuid
-import zipfile
 from datetime import datetime
 from operator import and_, or_
-from time import sleep
+from urllib.parse import urlencode
 
 from astropy.time import Time
 from dotenv import load_dotenv
-from flask import Flask, request, render_template, flash, make_response, send_file, redirect, url_for, jsonify
+from flask import Flask, request, render_template, flash, make_response, send_file, redirect, url_for, jsonify, stream_with_context
 from flask_oidc import OpenIDConnect
 from sqlalchemy import desc
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import sessionmaker
 
 from tcat_app import inputparams
-from ACT_Space_Debris_Index.sdi_run_code import sdi_main
+from ACT_Space_Debris_Index.sdi_run_code import sdi_main, sdi_main_batch
 from ACT_atmospheric_emissions.atm_run_code import atm_main
-from tcat_app.models import db, Configuration, ConfigurationRun
+from tcat_app.models import db, Configuration, ConfigurationRun, RunResult
+from tcat_app.job_queue import JobQueue, QUEUED, FINISHED, FINAL_STATUSES
+from tcat_app.run_archive import generate_archive, get_cached_archive
+from tcat_app.result_cache import get_result_key, restore_result
+from Commons.artifacts import get_thumbnail_path
+from Commons.results import RESULTS_FILENAME
+from tcat_app.stream_server import create_token, start_stream_server
 from ScenarioDatabase.ScenariosSetupFromACT.ScenarioADRSetupFromACT import ScenarioADRSetupFromACT
 from logging.config import dictConfig
 from astropy import units as astro_units
@@ -53,6 +53,8 @@ BASE_FOLDER = os.getenv('BASE_FOLDER')
 UPLOAD_FOLDER = os.path.join(BASE_FOLDER, 'uploads/')
 CONFIG_FOLDER = os.path.join(BASE_FOLDER, 'configs/')
 TCAT_DATA = os.path.join(BASE_FOLDER, 'tcat-data/')
+ARCHIVE_FOLDER = os.path.join(BASE_FOLDER, 'archives/')
+RESULT_CACHE_FOLDER = os.path.join(BASE_FOLDER, 'results/')
 TCAT_DIR = os.getenv('TCAT_DIR')
 TCAT_PYTHON_EXE = os.getenv('TCAT_PYTHON_EXE')
 TCAT_RUN_FILE = os.path.join(TCAT_DIR, os.getenv('TCAT_RUN_FILE'))
@@ -60,7 +62,15 @@ ALLOWED_EXTENSIONS = os.getenv('ALLOWED_EXTENSIONS').split(',')
 PLOT_IMAGE_NAMES = os.getenv('PLOT_IMAGE_NAMES').split(',')
 LOG_FILENAME = os.getenv('LOG_FILENAME')
 RESULT_FILENAME = os.getenv('RESULT_FILENAME')
-MAX_FILE_LOAD_DURATION_IN_SEC = int(os.getenv('MAX_FILE_LOAD_DURATION_IN_SEC'))
+MAX_CONCURRENT_RUNS = int(os.getenv('MAX_CONCURRENT_RUNS', '2'))
+MAX_RUN_ATTEMPTS = int(os.getenv('MAX_RUN_ATTEMPTS', '2'))
+WARM_WORKERS = os.getenv('WARM_WORKERS', 'true').lower() == 'true'
+RESULT_CACHE = os.getenv('RESULT_CACHE', 'true').lower() == 'true'
+TCAT_SERVER_FILE = os.path.join(TCAT_DIR, os.getenv('TCAT_SERVER_FILE', 'RunTCATServer.py'))
+TCAT_SERVER_SOCKET = os.getenv('TCAT_SERVER_SOCKET') or os.path.join(BASE_FOLDER, 'tcat-worker.sock')
+STREAM_SERVER_HOST = os.getenv('STREAM_SERVER_HOST', '127.0.0.1')
+STREAM_SERVER_PORT = int(os.getenv('STREAM_SERVER_PORT', '5001'))
+STREAM_SERVER_URL = os.getenv('STREAM_SERVER_URL', f'http://localhost:{STREAM_SERVER_PORT}/events')
 
 
 def create_app():
@@ -92,45 +102,28 @@ def create_app():
 
 
 app, Session, oidc = create_app()
+job_queue = JobQueue(Session.session_factory, TCAT_DIR, TCAT_PYTHON_EXE, TCAT_RUN_FILE, max_running=MAX_CONCURRENT_RUNS,
+                     max_attempts=MAX_RUN_ATTEMPTS, server_file=TCAT_SERVER_FILE if WARM_WORKERS else None,
+                     server_socket=TCAT_SERVER_SOCKET, result_cache_folder=RESULT_CACHE_FOLDER if RESULT_CACHE else None)
 
 
-def get_data_path(scenario_id, config_run_id):
-    return os.path.join(TCAT_DATA, scenario_id, str(config_run_id))
-
-
-def popen_and_call(on_exit, on_error, config_run_id, wd, popen_args):
-    def run_in_thread(on_exit, on_error, config_run_id, wd, popen_args):
-        try:
-            subprocess.check_output(popen_args, cwd=wd)
-        except subprocess.CalledProcessError:
-            return on_error(config_run_id)
-        else:
-            return on_exit(config_run_id)
-
-    thread = threading.Thread(target=run_in_thread, args=(on_exit, on_error, config_run_id, wd, popen_args))
-    thread.start()
-    # returns immediately after the thread starts
-    return thread
+def start_services():
+    """ Starts the run queue of this process, and the warm worker server and the stream server shared by the app processes if
+    they are not running. Called by the entry points of the app (wsgi.py, or app.py run as a script), not on import.
+    """
+    job_queue.start()
+    with app.app_context():
+        start_stream_server(TCAT_PYTHON_EXE, TCAT_DIR, STREAM_SERVER_HOST, STREAM_SERVER_PORT, db.engine.url.render_as_string(hide_password=False))
 
 
-def finished_config_run(config_run_id):
-    db_session = Session()
-    config_run = db_session.query(ConfigurationRun).filter_by(id=config_run_id).first()
-    config_run.finished_date = datetime.utcnow()
-    config_run.status = 'FINISHED'
-    db_session.commit()
-    Session.remove()
-    return
+@app.before_request
+def start_job_queue():
+    # the app can be imported before the processes of the server are forked, the threads of the queue are started per process
+    job_queue.start()
 
 
-def failed_config_run(config_run_id):
-    db_session = Session()
-    config_run = db_session.query(ConfigurationRun).filter_by(id=config_run_id).first()
-    config_run.failed_date = datetime.utcnow()
-    config_run.status = 'FAILED'
-    db_session.commit()
-    Session.remove()
-    return
+def get_data_path(scenario_id, config_run_id):
+    return os.path.join(TCAT_DATA, scenario_id, str(config_run_id))
 
 
 def allowed_file(filename):
@@ -265,53 +258,73 @@ def status(config_run_id=None):
     return render_template('status.html', config_run=config_run)
 
 
-def get_status(config_run_id):
-    db_session = Session()
-    config_run = db_session.query(ConfigurationRun).filter_by(id=config_run_id).first()
-    Session.remove()
-    if config_run.status == 'FAILED':
-        return False
-    elif config_run.status == 'FINISHED':
-        return False
+@app.route('/status/queue/<int:config_run_id>')
+@oidc.require_login
+def queue_status(config_run_id):
+    config_run = ConfigurationRun.query.filter_by(id=config_run_id).first()
+    if config_run is None:
+        return make_response(jsonify({'error': 'Configuration run not found'}), 404)
+
+    response = dict()
+    response['config_run_id'] = config_run_id
+    response['status'] = config_run.status
+    response['queue_position'] = job_queue.position(config_run_id)
+    response['attempts'] = config_run.job.attempts if config_run.job is not None else None
+    response['cached'] = config_run.result is not None and config_run.result.cached
+
+    return jsonify(response)
 
-    return True
 
+def stream(config_run_id, file):
+    # the stream is served by the stream server, so that a watcher does not hold an app process during the whole run
+    config_run = ConfigurationRun.query.filter_by(id=config_run_id).first()
+    if config_run is None:
+        return make_response(jsonify({'error': 'Configuration run not found'}), 404)
 
-def generate(config_run_id, file):
-    db_session = Session()
-    config_run = db_session.query(ConfigurationRun).filter_by(id=config_run_id).first()
-    scenario_id = config_run.configuration.scenario_id
-    Session.remove()
-    path = os.path.join(get_data_path(scenario_id, config_run_id), file)
+    path = os.path.join(get_data_path(config_run.configuration.scenario_id, config_run_id), file)
+    arguments = {'token': create_token(app.secret_key, config_run_id, path)}
+    if 'offset' in request.args:
+        arguments['offset'] = request.args.get('offset', default=0, type=int)
 
-    in_progress = True
+    return redirect(STREAM_SERVER_URL + '?' + urlencode(arguments), code=307)
 
-    while not os.path.isfile(path):
-        sleep(0.1)
 
-    with open(path, 'rb', 1) as f:
-        count = 0
-        while in_progress:
-            yield f.read()
-            sleep(0.1)
-            count = count + 1
-            if count == 30:
-                count = 0
-                in_progress = get_status(config_run_id)
-                if not in_progress:
-                    yield f.read()
+@app.route('/status/stream/plots/<int:config_run_id>')
+@oidc.require_login
+def plots_stream(config_run_id):
+    config_run = ConfigurationRun.query.filter_by(id=config_run_id).first()
+    if config_run is None:
+        return make_response(jsonify({'error': 'Configuration run not found'}), 404)
+
+    path = get_data_path(config_run.configuration.scenario_id, config_run_id)
+    token = create_token(app.secret_key, config_run_id, path, plots=PLOT_IMAGE_NAMES)
+    return redirect(STREAM_SERVER_URL + '?' + urlencode({'token': token}), code=307)
 
 
 @app.route('/status/stream/log/<int:config_run_id>')
 @oidc.require_login
 def log_stream(config_run_id):
-    return app.response_class(generate(config_run_id, LOG_FILENAME), mimetype='text/plain')
+    return stream(config_run_id, LOG_FILENAME)
 
 
 @app.route('/status/stream/result/<int:config_run_id>')
 @oidc.require_login
 def result_stream(config_run_id):
-    return app.response_class(generate(config_run_id, RESULT_FILENAME), mimetype='text/plain')
+    return stream(config_run_id, RESULT_FILENAME)
+
+
+@app.route('/status/results/<int:config_run_id>')
+@oidc.require_login
+def get_run_results(config_run_id):
+    # structured results of the run (one JSON record per line), written once the scenario is executed
+    config_run = ConfigurationRun.query.filter_by(id=config_run_id).first()
+    if config_run is None:
+        return make_response(jsonify({'error': 'Configuration run not found'}), 404)
+    path = os.path.join(get_data_path(config_run.configuration.scenario_id, config_run_id), RESULTS_FILENAME)
+    if not os.path.isfile(path):
+        return make_response(jsonify({'error': 'Results not written yet'}), 404)
+
+    return send_file(path, mimetype='application/x-ndjson', max_age=0)
 
 
 def configure(current_scenario, template, params):
@@ -551,6 +564,7 @@ def run_configuration(conf_scenario):
         desc(Configuration.created_date)).first()
     scenario_id = None
     config_run_id = None
+    cached = False
 
     if last_config_item is not None:
         scenario_id = last_config_item.scenario_id
@@ -563,10 +577,10 @@ def run_configuration(conf_scenario):
         config_run.configuration_id = last_config_item.id
         config_run.executor_email = current_user_email
         config_run.configuration_file_path = filename
-        config_run.status = 'STARTED'
+        config_run.status = QUEUED
 
         db.session.add(config_run)
-        db.session.commit()
+        db.session.flush()
         config_run_id = config_run.id
 
         config = json.loads(last_config_item.configuration)
@@ -577,16 +591,49 @@ def run_configuration(conf_scenario):
 
         os.makedirs(get_data_path(scenario_id, config_run_id), exist_ok=True)
 
-        args = [TCAT_PYTHON_EXE, TCAT_RUN_FILE, filename]
-        popen_and_call(finished_config_run, failed_config_run, config_run.id, TCAT_DIR, args)
+        # a configuration already run with the same code and databases is not run again, unless forced
+        result_key = get_result_key(config, TCAT_DIR)
+        force = request.args.get('force', default='false').lower() == 'true'
+        if RESULT_CACHE and not force:
+            try:
+                cached = restore_result(RESULT_CACHE_FOLDER, result_key, get_data_path(scenario_id, config_run_id))
+            except OSError:
+                app.logger.exception(f'Could not restore the cached results {result_key}, the configuration is run')
+        db.session.add(RunResult(configuration_run=config_run, result_key=result_key, cached=cached))
+
+        if cached:
+            config_run.status = FINISHED
+            config_run.finished_date = datetime.utcnow()
+            db.session.commit()
+        else:
+            # the run is queued in the same transaction as its creation, once its configuration file is written
+            job_queue.submit(db.session, config_run, request.args.get('priority', default=0, type=int))
+            db.session.commit()
+            job_queue.notify()
 
     response = dict()
     response['scenario_id'] = scenario_id
     response['config_run_id'] = config_run_id
+    response['queue_position'] = job_queue.position(config_run_id) if config_run_id is not None else None
+    response['cached'] = cached
 
     return response
 
 
+@app.route('/configure/run/cancel/<int:config_run_id>', methods=['GET'])
+@oidc.require_login
+def cancel_run(config_run_id):
+    config_run = ConfigurationRun.query.filter_by(id=config_run_id, executor_email=get_user_info()).first()
+    if config_run is None:
+        return make_response(jsonify({'error': 'Configuration run not found'}), 404)
+
+    response = dict()
+    response['config_run_id'] = config_run_id
+    response['status'] = job_queue.cancel(config_run_id) or config_run.status
+
+    return jsonify(response)
+
+
 @app.route('/configure/run/adr', methods=['GET'])
 @oidc.require_login
 def run_adr():
@@ -626,19 +673,20 @@ def get_plot_images(scenario_id='', config_run_id=-1):
 @app.route('/configure/run/plot/<string:scenario_id>/<int:config_run_id>/<string:filename>', methods=['GET'])
 @oidc.require_login
 def get_plot_image(scenario_id, config_run_id=-1, filename=''):
-    filename = os.path.join(get_data_path(scenario_id, config_run_id), filename)
-    loading_time = 0
-    while os.stat(filename).st_size == 0 and loading_time < MAX_FILE_LOAD_DURATION_IN_SEC:
-        loading_time += 0.1
-        sleep(0.1)
-
-    with open(filename, "r+b") as f:
-        image_binary = f.read()
-
-        response = make_response(base64.b64encode(image_binary))
-        response.headers.set('Content-Type', mimetypes.types_map[os.path.splitext(filename)[1]])
-        response.headers.set('Content-Disposition', 'attachment', filename=os.path.basename(filename))
-        return response
+    # the plots are published atomically with their thumbnail by the runs, a plot is complete once it exists
+    if filename not in PLOT_IMAGE_NAMES:
+        return make_response(jsonify({'error': 'Unknown plot'}), 404)
+    path = os.path.join(get_data_path(scenario_id, config_run_id), filename)
+    if not os.path.isfile(path):
+        return make_response(jsonify({'error': 'Plot not published yet'}), 404)
+
+    mimetype = mimetypes.types_map[os.path.splitext(filename)[1]]
+    if 'thumbnail' in request.args and os.path.isfile(get_thumbnail_path(path)):
+        path = get_thumbnail_path(path)
+        mimetype = 'image/png'
+
+    # sent with ETag and Last-Modified, the browser revalidates it with a conditional request
+    return send_file(path, mimetype=mimetype, download_name=filename, max_age=0)
 
 
 @app.route('/download/run/<string:scenario_id>/<int:config_run_id>', methods=['GET'])
@@ -651,26 +699,61 @@ def download_run_data(scenario_id, config_run_id):
         return 'No configuration run found with the provided scenario_id and config_run_id'
 
     files_path = get_data_path(scenario_id, config_run_id)
+    extra_entries = [(f'{scenario_id}-configuration.json', config.configuration, config.created_date)]
 
-    f = open(os.path.join(files_path, f'{scenario_id}-configuration.json'), "w")
-    f.write(config.configuration)
-    f.close()
+    if config_run.status in FINAL_STATUSES:
+        # the archive of a finished run is built once, and sent with range requests and conditional headers
+        archive_path = get_cached_archive(files_path, extra_entries, ARCHIVE_FOLDER, f'{scenario_id}-{config_run_id}')
+        response = send_file(archive_path, mimetype='application/zip', download_name=f'{scenario_id}.zip', as_attachment=True)
+        response.headers.set('Accept-Ranges', 'bytes')
+        return response
 
-    files = os.listdir(files_path)
-    file_obj = io.BytesIO()
+    # the files of a running run are still written, the archive is streamed as it is built
+    response = app.response_class(stream_with_context(generate_archive(files_path, extra_entries)), mimetype='application/zip')
+    response.headers.set('Content-Disposition', 'attachment', filename=f'{scenario_id}.zip')
+    response.headers.set('Accept-Ranges', 'none')
+    return response
 
-    with zipfile.ZipFile(file_obj, 'w') as zip_file:
-        for f in files:
-            filename = os.path.basename(f)
-            data = zipfile.ZipInfo(filename)
-            data.date_time = time.localtime(time.time())[:6]
-            data.compress_type = zipfile.ZIP_DEFLATED
-            file_data = open(os.path.join(files_path, filename), 'rb')
-            zip_file.writestr(data, file_data.read())
-            file_data.close()
 
-    file_obj.seek(0)
-    return send_file(file_obj, download_name=f'{scenario_id}.zip', as_attachment=True)
+def sdi_arguments(data):
+    """ Converts the JSON inputs of an SDI calculation to the arguments of sdi_main (without the .csv file paths). """
+    def quantity(key, unit):
+        return data[key] * unit if data[key] is not None else None
+
+    return {'starting_epoch': Time(data['startingEpoch'], scale="tdb"),
+            'op_duration': quantity('opDuration', astro_units.year),
+            'mass': quantity('mass', astro_units.kg),
+            'cross_section': quantity('crossSection', astro_units.m ** 2),
+            'mean_thrust': quantity('meanThrust', astro_units.N),
+            'Isp': quantity('isp', astro_units.s),
+            'number_of_launch_es': data['numberOfLaunches'],
+            'apogee_object_op': quantity('apogeeObjectOp', astro_units.km),
+            'perigee_object_op': quantity('perigeeObjectOp', astro_units.km),
+            'inc_object_op': quantity('incObjectOp', astro_units.deg),
+            'EOL_manoeuvre': data['eolManoeuvre'],
+            'PMD_success': data['pmdSuccess'],
+            'apogee_object_disp': quantity('apogeeObjectDisp', astro_units.km),
+            'perigee_object_disp': quantity('perigeeObjectDisp', astro_units.km),
+            'inc_object_disp': quantity('incObjectDisp', astro_units.deg),
+            'ADR_stage': data['adrStage'],
+            'm_ADR': quantity('mAdr', astro_units.kg),
+            'ADR_cross_section': quantity('adrCrossSection', astro_units.m ** 2),
+            'ADR_mean_thrust': quantity('adrMeanThrust', astro_units.N),
+            'ADR_Isp': quantity('adrIsp', astro_units.s),
+            'ADR_manoeuvre_success': data['adrManoeuvreSuccess'],
+            'ADR_capture_success': data['adrCaptureSuccess'],
+            'm_debris': quantity('mDebris', astro_units.kg),
+            'debris_cross_section': quantity('debrisCrossSection', astro_units.m ** 2),
+            'apogee_debris': quantity('apogeeDebris', astro_units.km),
+            'perigee_debris': quantity('perigeeDebris', astro_units.km),
+            'inc_debris': quantity('incDebris', astro_units.deg),
+            'apogee_debris_removal': quantity('apogeeDebrisRemoval', astro_units.km),
+            'perigee_debris_removal': quantity('perigeeDebrisRemoval', astro_units.km),
+            'inc_debris_removal': quantity('incDebrisRemoval', astro_units.deg)}
+
+
+def sdi_response(result):
+    return {'LCS3': result['LCS3'].value, 'LCS4': result['LCS4'].value, 'BB_orbital_stage': result['BB_orbital_stage'].value, 'BB_ADR_stage': result['BB_ADR_stage'].value, 'BB_ADR_strategy': result['BB_ADR_strategy'].value}
 
 
 @app.route('/api/v1/calculations/sdi', methods=['POST'])
@@ -681,41 +764,43 @@ def get_sdi():
     if data is None:
         return '{"error": "No data provided"}'
 
-    result = sdi_main(Time(data['startingEpoch'], scale="tdb"),
-                      data['opDuration'] * astro_units.year if data['opDuration'] is not None else None,
-                      data['mass'] * astro_units.kg if data['mass'] is not None else None,
-                      data['crossSection'] * astro_units.m ** 2 if data['crossSection'] is not None else None,
-                      data['meanThrust'] * astro_units.N if data['meanThrust'] is not None else None,
-                      data['isp'] * astro_units.s if data['isp'] is not None else None,
-                      data['numberOfLaunches'],
-                      data['apogeeObjectOp'] * astro_units.km if data['apogeeObjectOp'] is not None else None,
-                      data['perigeeObjectOp'] * astro_units.km if data['perigeeObjectOp'] is not None else None,
-                      data['incObjectOp'] * astro_units.deg if data['incObjectOp'] is not None else None,
-                      data['eolManoeuvre'],
-                      data['pmdSuccess'],
-                      data['apogeeObjectDisp'] * astro_units.km if data['apogeeObjectDisp'] is not None else None,
-                      data['perigeeObjectDisp'] * astro_units.km if data['perigeeObjectDisp'] is not None else None,
-                      data['incObjectDisp'] * astro_units.deg if data['incObjectDisp'] is not None else None,
-                      data['adrStage'],
-                      data['mAdr'] * astro_units.kg if data['mAdr'] is not None else None,
-                      data['adrCrossSection'] * astro_units.m ** 2 if data['adrCrossSection'] is not None else None,
-                      data['adrMeanThrust'] * astro_units.N if data['adrMeanThrust'] is not None else None,
-                      data['adrIsp'] * astro_units.s if data['adrIsp'] is not None else None,
-                      data['adrManoeuvreSuccess'],
-                      data['adrCaptureSuccess'],
-                      data['mDebris'] * astro_units.kg if data['mDebris'] is not None else None,
-                      data['debrisCrossSection'] * astro_units.m ** 2 if data['debrisCrossSection'] is not None else None,
-                      data['apogeeDebris'] * astro_units.km if data['apogeeDebris'] is not None else None,
-                      data['perigeeDebris'] * astro_units.km if data['perigeeDebris'] is not None else None,
-                      data['incDebris'] * astro_units.deg if data['incDebris'] is not None else None,
-                      data['apogeeDebrisRemoval'] * astro_units.km if data['apogeeDebrisRemoval'] is not None else None,
-                      data['perigeeDebrisRemoval'] * astro_units.km if data['perigeeDebrisRemoval'] is not None else None,
-                      data['incDebrisRemoval'] * astro_units.deg if data['incDebrisRemoval'] is not None else None,
-                      os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_space_debris_CF_for_code.csv'),
-                      os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_reduced_lifetime.csv'))
-
-    response = {'LCS3': result['LCS3'].value, 'LCS4': result['LCS4'].value, 'BB_orbital_stage': result['BB_orbital_stage'].value, 'BB_ADR_stage': result['BB_ADR_stage'].value, 'BB_ADR_strategy': result['BB_ADR_strategy'].value}
-    return jsonify(response)
+    result = sdi_main(**sdi_arguments(data),
+                      CF_file_path=os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_space_debris_CF_for_code.csv'),
+                      reduced_lifetime_file_path=os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_reduced_lifetime.csv'))
+
+    return jsonify(sdi_response(result))
+
+
+@app.route('/api/v1/calculations/sdi/batch', methods=['POST'])
+@oidc.accept_token(require_token=True)
+def get_sdi_batch():
+    """ SDI calculations of a list of inputs (same inputs as /api/v1/calculations/sdi), computed in one pass.
+    Returns the results in the same order, an input that fails gets {"error": message} without failing the others.
+    """
+    data = request.get_json()
+
+    if data is None:
+        return '{"error": "No data provided"}'
+    if not isinstance(data, list):
+        return '{"error": "A list of SDI inputs is expected"}'
+
+    responses = [None] * len(data)
+    arguments = []
+    indices = []
+    for index, item in enumerate(data):
+        try:
+            arguments.append(sdi_arguments(item))
+            indices.append(index)
+        except (KeyError, TypeError, ValueError) as error:
+            responses[index] = {'error': f"Invalid input: {error}"}
+
+    results, errors = sdi_main_batch(arguments,
+                                     CF_file_path=os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_space_debris_CF_for_code.csv'),
+                                     reduced_lifetime_file_path=os.path.join(TCAT_DIR, 'ACT_Space_Debris_Index/sdi_reduced_lifetime.csv'))
+    for index, result, error in zip(indices, results, errors):
+        responses[index] = sdi_response(result) if error is None else {'error': error}
+
+    return jsonify(responses)
 
 
 @app.route('/api/v1/calculations/atm', methods=['POST'])
@@ -742,8 +827,9 @@ def get_atm():
     return jsonify(result)
 
 
-app.jinja_env.globals.update(inputparams=inputparams)
+app.jinja_env.globals.update(inputparams=inputparams, queue_position=job_queue.position)
 
 if __name__ == '__main__':
+    start_services()
     app.run()
     app.logger.info('Starting application')
@@ -0,0 +1,411 @@
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from time import sleep
+
+from sqlalchemy import and_, func, or_, select, update
+
+from tcat_app.models import ConfigurationRun, RunJob, RunResult
+from tcat_app.result_cache import compute_versions, get_result_key, get_versions, store_result
+
+QUEUED = 'QUEUED'
+RUNNING = 'RUNNING'
+FINISHED = 'FINISHED'
+FAILED = 'FAILED'
+CANCELLED = 'CANCELLED'
+FINAL_STATUSES = [FINISHED, FAILED, CANCELLED]
+
+# range of the priorities that can be requested for a run (higher runs first)
+MIN_PRIORITY = -10
+MAX_PRIORITY = 10
+
+logger = logging.getLogger(__name__)
+
+
+class OutdatedServerError(Exception):
+    """ The warm worker server refused a run, as it was started from other versions of the code or databases than the client. """
+
+    def __init__(self, versions, server_pid):
+        super().__init__(f'Warm worker server {server_pid} runs the versions {versions}')
+        self.versions = tuple(versions)
+        self.server_pid = server_pid
+
+
+class WorkerServerRun:
+    """ Scenario run by the warm worker server (RunTCATServer.py), with the interface of subprocess.Popen used by the queue.
+
+    The run is only started if the server has the given code and database versions (OutdatedServerError otherwise). The output
+    of the run is streamed back by the server, the end of the log is kept to report failed runs.
+    """
+
+    LOG_TAIL_LINES = 20
+    # time for the server to start the run and report its pid
+    START_TIMEOUT_IN_SEC = 30
+
+    def __init__(self, socket_path, config_file_path, versions):
+        with open(config_file_path) as f:
+            configuration = json.load(f)
+        self.exit_code = None
+        self.log_tail = deque(maxlen=self.LOG_TAIL_LINES)
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.connection.settimeout(self.START_TIMEOUT_IN_SEC)
+            self.connection.connect(socket_path)
+            self.connection.sendall(json.dumps({'configuration': configuration, 'versions': list(versions)}).encode() + b'\n')
+            self.messages = self.connection.makefile('rb')
+            message = json.loads(self.messages.readline() or '{}')
+            if 'pid' not in message:
+                if 'server_pid' in message:
+                    raise OutdatedServerError(message['versions'], message['server_pid'])
+                raise ConnectionError(f'Warm worker server on {socket_path} closed the connection')
+            self.pid = message['pid']
+            self.connection.settimeout(None)
+        except BaseException:
+            # the run is stopped by the server when the connection is closed
+            self.connection.close()
+            raise
+        self.reader = threading.Thread(target=self.read, daemon=True)
+        self.reader.start()
+
+    def read(self):
+        log = ''
+        with self.messages:
+            for line in self.messages:
+                message = json.loads(line)
+                if 'log' in message:
+                    *lines, log = (log + message['log']).split('\n')
+                    self.log_tail.extend(lines)
+                elif 'exit_code' in message:
+                    self.exit_code = message['exit_code']
+        self.log_tail.append(log)
+        self.connection.close()
+        if self.exit_code is None:
+            # the run stopped without reporting its end (killed, or server stopped)
+            self.exit_code = 1
+
+    def poll(self):
+        return None if self.reader.is_alive() else self.exit_code
+
+    def terminate(self):
+        try:
+            os.kill(self.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def wait(self):
+        self.reader.join()
+        return self.exit_code
+
+
+class JobQueue:
+    """ Queue of the configuration runs, stored in the database (RunJob) so that queued runs survive an app restart.
+
+    Each app process has a pool of worker threads that claim the queued runs by priority, then by submission order. A claim
+    only succeeds while less than max_running runs are running in all the app processes. The runs are executed by the warm
+    worker server (RunTCATServer.py, started by the first app process and shared by all of them), or with the python
+    executable and RunTCAT.py if the server is disabled or not reachable yet. Failed runs are retried up to max_attempts, and
+    runs of a worker that stopped sending heartbeats (e.g. app restart) are queued again.
+
+    Args:
+        session_factory: sessionmaker bound to the app database
+        tcat_dir: directory of TCAT, working directory of the runs
+        python_exe: python executable for the runs (and the warm worker server)
+        run_file: script that runs a configuration file (RunTCAT.py)
+        max_running: maximum number of runs executed at the same time by all the app processes
+        max_attempts: number of attempts of a run before it is failed
+        server_file: script of the warm worker server (RunTCATServer.py), None to always use run_file
+        server_socket: path of the socket of the warm worker server
+        result_cache_folder: directory where the outputs of the finished runs are cached by result key, None to not cache them
+    """
+
+    POLL_INTERVAL_IN_SEC = 2
+    RUN_POLL_INTERVAL_IN_SEC = 0.2
+    HEARTBEAT_INTERVAL_IN_SEC = 10
+    # consecutive heartbeat failures after which the run is stopped, before it is claimed again as stale by another worker
+    MAX_HEARTBEAT_FAILURES = 3
+    STALE_AFTER_IN_SEC = 60
+    RETRY_DELAY_IN_SEC = 30
+
+    def __init__(self, session_factory, tcat_dir, python_exe, run_file, max_running=2, max_attempts=2, server_file=None, server_socket=None,
+                 result_cache_folder=None):
+        self.session_factory = session_factory
+        self.tcat_dir = tcat_dir
+        self.python_exe = python_exe
+        self.run_file = run_file
+        self.max_running = max_running
+        self.max_attempts = max_attempts
+        self.server_file = server_file
+        self.server_socket = server_socket
+        self.result_cache_folder = result_cache_folder
+        self.wake_up = threading.Event()
+        self.lock = threading.Lock()
+        self.started_pid = None
+        self.last_recovery = datetime.min
+
+    @property
+    def worker_id(self):
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def start(self):
+        """ Starts the worker threads of this process (once per process, as app processes can be forked after import). """
+        with self.lock:
+            if self.started_pid == os.getpid():
+                return
+            self.started_pid = os.getpid()
+            self.wake_up = threading.Event()
+            if self.server_file is not None:
+                self.start_server()
+            for _ in range(self.max_running):
+                threading.Thread(target=self.work, daemon=True).start()
+
+    def start_server(self):
+        """ Starts the warm worker server in its own session, so that it is kept warm across app restarts.
+        If a server is already running on the socket, the new one exits.
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.connect(self.server_socket)
+            return
+        except OSError:
+            pass
+        self.spawn_server()
+
+    def restart_server(self, server_pid):
+        """ Stops a warm worker server started from outdated versions of the tree (its running scenarios are not stopped), and
+        starts a new one, that takes the socket once the old one is stopped.
+        """
+        try:
+            os.kill(server_pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        self.spawn_server()
+
+    def spawn_server(self):
+        subprocess.Popen([self.python_exe, self.server_file, self.server_socket], cwd=self.tcat_dir, stdout=subprocess.DEVNULL,
+                         start_new_session=True)
+
+    def submit(self, session, config_run, priority=0):
+        """ Queues a configuration run, in the transaction of the caller (committed with the configuration run). """
+        config_run.status = QUEUED
+        priority = min(max(priority, MIN_PRIORITY), MAX_PRIORITY)
+        session.add(RunJob(configuration_run=config_run, priority=priority, max_attempts=self.max_attempts, status=QUEUED))
+
+    def notify(self):
+        self.wake_up.set()
+
+    def cancel(self, config_run_id):
+        """ Cancels a run: a queued run is cancelled at once, a running run is stopped by its worker.
+
+        Returns:
+            (str): status of the run after the request, None if the run is not queued
+        """
+        with self.session_factory.begin() as session:
+            job = session.query(RunJob).filter_by(configuration_run_id=config_run_id).with_for_update().first()
+            if job is None:
+                return None
+            if job.status == QUEUED:
+                self.set_status(job, CANCELLED)
+            elif job.status == RUNNING:
+                job.cancel_requested = True
+            return job.status
+
+    def position(self, config_run_id):
+        """ Position of a queued run in the queue (1 for the next run to start), None if the run is not queued. """
+        with self.session_factory() as session:
+            job = session.query(RunJob).filter_by(configuration_run_id=config_run_id).first()
+            if job is None or job.status != QUEUED:
+                return None
+            ahead = session.query(func.count(RunJob.id)).filter(RunJob.status == QUEUED, or_(
+                RunJob.priority > job.priority, and_(RunJob.priority == job.priority, RunJob.id < job.id))).scalar()
+            return ahead + 1
+
+    def work(self):
+        while True:
+            try:
+                self.recover_stale_jobs()
+                job_id = self.claim()
+            except Exception:
+                logger.exception('Could not claim a job')
+                job_id = None
+            if job_id is None:
+                self.wake_up.wait(self.POLL_INTERVAL_IN_SEC)
+                self.wake_up.clear()
+                continue
+            try:
+                self.run(job_id)
+            except Exception:
+                # the run is queued again by recover_stale_jobs once its heartbeat is too old
+                logger.exception(f'Run of job {job_id} stopped unexpectedly')
+
+    def claim(self):
+        """ Claims the next queued run if less than max_running runs are running.
+
+        Returns:
+            (int): id of the claimed RunJob, None if there is nothing to run
+        """
+        now = datetime.utcnow()
+        with self.session_factory.begin() as session:
+            job = session.query(RunJob.id, RunJob.configuration_run_id).filter(RunJob.status == QUEUED, RunJob.not_before_date <= now).order_by(
+                RunJob.priority.desc(), RunJob.id).first()
+            if job is None:
+                return None
+            job_id, config_run_id = job
+            # the count of running jobs is part of the update, so that concurrent claims cannot exceed max_running
+            running = select(func.count(RunJob.id)).where(RunJob.status == RUNNING).scalar_subquery()
+            claimed = session.execute(update(RunJob).where(RunJob.id == job_id, RunJob.status == QUEUED, running < self.max_running).values(
+                status=RUNNING, attempts=RunJob.attempts + 1, worker=self.worker_id, heartbeat_date=now).execution_options(synchronize_session=False))
+            if claimed.rowcount != 1:
+                return None
+            session.query(ConfigurationRun).filter_by(id=config_run_id).update({'status': RUNNING}, synchronize_session=False)
+        return job_id
+
+    def run(self, job_id):
+        with self.session_factory() as session:
+            config_file_path = session.query(ConfigurationRun.configuration_file_path).join(RunJob).filter(RunJob.id == job_id).scalar()
+
+        try:
+            process, versions = self.execute(config_file_path)
+        except Exception:
+            return self.finish(job_id, 1, False)
+
+        cancelled = False
+        heartbeat_failures = 0
+        last_heartbeat = datetime.utcnow()
+        while process.poll() is None:
+            sleep(self.RUN_POLL_INTERVAL_IN_SEC)
+            if datetime.utcnow() - last_heartbeat >= timedelta(seconds=self.HEARTBEAT_INTERVAL_IN_SEC):
+                last_heartbeat = datetime.utcnow()
+                try:
+                    alive = self.heartbeat(job_id)
+                except Exception:
+                    heartbeat_failures += 1
+                    logger.exception(f'Heartbeat of job {job_id} failed ({heartbeat_failures}/{self.MAX_HEARTBEAT_FAILURES})')
+                    if heartbeat_failures == self.MAX_HEARTBEAT_FAILURES:
+                        logger.error(f'Stopping the run of job {job_id}, it would be queued again as stale')
+                        process.terminate()
+                    continue
+                heartbeat_failures = 0
+                if not alive and not cancelled:
+                    cancelled = True
+                    process.terminate()
+        exit_code = process.wait()
+        if exit_code != 0 and not cancelled and isinstance(process, WorkerServerRun):
+            logger.warning(f'Run of job {job_id} failed:\n' + '\n'.join(process.log_tail))
+        return self.finish(job_id, exit_code, cancelled, versions)
+
+    def execute(self, config_file_path):
+        """ Starts a run, on the warm worker server if possible.
+
+        Returns:
+            (WorkerServerRun or subprocess.Popen, tuple): run, and code and database versions it runs
+        """
+        if self.server_file is not None:
+            versions = get_versions(self.tcat_dir)
+            try:
+                return WorkerServerRun(self.server_socket, config_file_path, versions), versions
+            except OutdatedServerError as e:
+                # the tree is hashed again, as the versions of this process are computed once (outdated after an update of tcat
+                # until the app is restarted): only a server with outdated versions is restarted
+                if e.versions != compute_versions(self.tcat_dir):
+                    logger.info(f'Warm worker server {e.server_pid} runs outdated versions of TCAT, starting a new server')
+                    self.restart_server(e.server_pid)
+                else:
+                    logger.warning(f'App process {os.getpid()} runs outdated versions of TCAT, restart the app')
+            except OSError:
+                # the server is starting, or was stopped: the run is cold
+                logger.info(f'Warm worker server not reachable on {self.server_socket}, running {config_file_path} in a new process')
+        # a new process runs the tree as it is when the run starts
+        versions = compute_versions(self.tcat_dir)
+        return subprocess.Popen([self.python_exe, self.run_file, config_file_path], cwd=self.tcat_dir, stdout=subprocess.DEVNULL), versions
+
+    def heartbeat(self, job_id):
+        """ Records that the run is alive.
+
+        Returns:
+            (bool): False if the run must be stopped (cancelled, or claimed again by another worker)
+        """
+        with self.session_factory.begin() as session:
+            job = session.query(RunJob).filter_by(id=job_id).with_for_update().first()
+            if job.status != RUNNING or job.worker != self.worker_id or job.cancel_requested:
+                return False
+            job.heartbeat_date = datetime.utcnow()
+            return True
+
+    def finish(self, job_id, exit_code, cancelled, versions=None):
+        with self.session_factory.begin() as session:
+            job = session.query(RunJob).filter_by(id=job_id).with_for_update().first()
+            if job.status != RUNNING or job.worker != self.worker_id:
+                return
+            if cancelled or job.cancel_requested:
+                self.set_status(job, CANCELLED)
+            elif exit_code == 0:
+                self.set_status(job, FINISHED)
+            else:
+                self.retry_or_fail(job)
+            finished = job.status == FINISHED
+            config_run_id = job.configuration_run_id
+        self.notify()
+        if finished:
+            self.cache_result(config_run_id, versions)
+
+    def cache_result(self, config_run_id, versions):
+        """ Stores the outputs of a finished run under its result key, so that the same configuration is not run again.
+        The outputs are only stored if the key matches the code and database versions that the run used.
+        """
+        if self.result_cache_folder is None:
+            return
+        with self.session_factory() as session:
+            run_result = session.query(RunResult.result_key, ConfigurationRun.configuration_file_path).join(
+                ConfigurationRun).filter(RunResult.configuration_run_id == config_run_id).first()
+        if run_result is None:
+            return
+        result_key, config_file_path = run_result
+        try:
+            with open(config_file_path) as f:
+                configuration = json.load(f)
+            if get_result_key(configuration, self.tcat_dir, versions) != result_key:
+                logger.warning(f'Configuration run {config_run_id} used other versions of TCAT than its result key, its results are not cached')
+                return
+            files_path = configuration['dir_path_for_output_files']
+            store_result(self.result_cache_folder, result_key, files_path)
+        except Exception:
+            logger.exception(f'Could not cache the results of configuration run {config_run_id}')
+
+    def recover_stale_jobs(self):
+        """ Queues again (or fails) the runs of workers that stopped sending heartbeats, e.g. after an app restart. """
+        now = datetime.utcnow()
+        if now - self.last_recovery < timedelta(seconds=self.STALE_AFTER_IN_SEC):
+            return
+        self.last_recovery = now
+        with self.session_factory.begin() as session:
+            stale_jobs = session.query(RunJob).filter(RunJob.status == RUNNING, RunJob.heartbeat_date < now - timedelta(
+                seconds=self.STALE_AFTER_IN_SEC)).with_for_update().all()
+            for job in stale_jobs:
+                if job.cancel_requested:
+                    self.set_status(job, CANCELLED)
+                else:
+                    self.retry_or_fail(job)
+
+    def retry_or_fail(self, job):
+        if job.attempts < job.max_attempts:
+            job.not_before_date = datetime.utcnow() + timedelta(seconds=self.RETRY_DELAY_IN_SEC * job.attempts)
+            job.worker = None
+            self.set_status(job, QUEUED)
+        else:
+            self.set_status(job, FAILED)
+
+    @staticmethod
+    def set_status(job, status):
+        now = datetime.utcnow()
+        job.status = status
+        job.configuration_run.status = status
+        if status == FINISHED:
+            job.configuration_run.finished_date = now
+        elif status in [FAILED, CANCELLED]:
+            job.configuration_run.failed_date = now
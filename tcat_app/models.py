@@ -29,6 +29,36 @@ class ConfigurationRun(db.Model):
     failed_date = db.Column(db.DateTime, nullable=True)
     status = db.Column(db.String(128), nullable=False)
     configuration = db.relationship('Configuration', back_populates='configuration_runs')
+    job = db.relationship('RunJob', back_populates='configuration_run', uselist=False)
+    result = db.relationship('RunResult', back_populates='configuration_run', uselist=False)
 
     def __repr__(self):
         return '<ConfigurationRun %r>' % self.id
+
+
+class RunJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    configuration_run_id = db.Column(db.Integer, db.ForeignKey('configuration_run.id'), nullable=False, unique=True)
+    status = db.Column(db.String(128), nullable=False, index=True)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=1)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    not_before_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    worker = db.Column(db.String(256), nullable=True)
+    heartbeat_date = db.Column(db.DateTime, nullable=True)
+    configuration_run = db.relationship('ConfigurationRun', back_populates='job')
+
+    def __repr__(self):
+        return '<RunJob %r>' % self.id
+
+
+class RunResult(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    configuration_run_id = db.Column(db.Integer, db.ForeignKey('configuration_run.id'), nullable=False, unique=True)
+    result_key = db.Column(db.String(64), nullable=False, index=True)
+    cached = db.Column(db.Boolean, nullable=False, default=False)
+    configuration_run = db.relationship('ConfigurationRun', back_populates='result')
+
+    def __repr__(self):
+        return '<RunResult %r>' % self.id
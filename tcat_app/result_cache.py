@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+# directories of the tcat tree that do not change the results of the runs (the compiled database is derived from the .csv files)
+EXCLUDED_DIRECTORIES = ['.git', '__pycache__', 'Old', 'Doc', 'tcat_app', 'CompiledDatabase']
+CODE_EXTENSIONS = ['.py']
+DATABASE_EXTENSIONS = ['.csv', '.json']
+
+# configuration entries that are specific to a run and do not change its results
+RUN_ENTRIES = ['dir_path_for_output_files']
+
+# versions of the tcat trees, computed once per process
+VERSIONS = dict()
+VERSIONS_LOCK = threading.Lock()
+
+
+def get_versions(tcat_dir):
+    """ Versions of the code and of the databases of a tcat tree, computed once per process (see compute_versions).
+
+    Args:
+        tcat_dir: tcat directory
+
+    Returns:
+        (str, str): code version and database version
+    """
+    with VERSIONS_LOCK:
+        if tcat_dir not in VERSIONS:
+            VERSIONS[tcat_dir] = compute_versions(tcat_dir)
+        return VERSIONS[tcat_dir]
+
+
+def compute_versions(tcat_dir):
+    """ Versions of the code and of the databases of a tcat tree, as the hashes of their files at the time of the call.
+
+    Args:
+        tcat_dir: tcat directory
+
+    Returns:
+        (str, str): code version and database version
+    """
+    code, database = hashlib.sha256(), hashlib.sha256()
+    for root, directories, files in os.walk(tcat_dir):
+        directories[:] = sorted(directory for directory in directories if directory not in EXCLUDED_DIRECTORIES)
+        for name in sorted(files):
+            extension = os.path.splitext(name)[1].lower()
+            # the .json files of the top directory are example configurations
+            if extension in CODE_EXTENSIONS:
+                signature = code
+            elif extension in DATABASE_EXTENSIONS and root != tcat_dir:
+                signature = database
+            else:
+                continue
+            path = os.path.join(root, name)
+            signature.update(f'{os.path.relpath(path, tcat_dir)}\0'.encode())
+            with open(path, 'rb') as f:
+                signature.update(hashlib.sha256(f.read()).digest())
+    return code.hexdigest(), database.hexdigest()
+
+
+def canonicalize(value):
+    """ Canonical form of a configuration value: integral floats as integers (1.0 and 1 give the same results). """
+    if isinstance(value, dict):
+        return {key: canonicalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def get_result_key(configuration, tcat_dir, versions=None):
+    """ Key of the results of a scenario configuration: hash of the canonical configuration, code version and database version.
+
+    Args:
+        configuration: scenario configuration, as given to RunTCAT.py
+        tcat_dir: tcat directory
+        versions: code and database versions, None for the versions of tcat_dir computed by this process
+
+    Returns:
+        (str): key of the results
+    """
+    configuration = {key: value for key, value in configuration.items() if key not in RUN_ENTRIES}
+    text = json.dumps(canonicalize(configuration), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    code_version, database_version = versions or get_versions(tcat_dir)
+    return hashlib.sha256(f'{code_version}\0{database_version}\0{text}'.encode()).hexdigest()
+
+
+def link_or_copy(source, destination):
+    # the cached files are never written again (plots are replaced, not rewritten), they are shared by hard links
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def get_cached_result(cache_folder, result_key):
+    """ Returns the directory of the cached results of a key, None if they are not cached. """
+    path = os.path.join(cache_folder, result_key)
+    return path if os.path.isdir(path) else None
+
+
+def store_result(cache_folder, result_key, files_path):
+    """ Stores the outputs (KPIs in result.txt, log, plots) of a finished run under its key, unless already stored.
+
+    Args:
+        cache_folder: directory of the cached results
+        result_key: key of the results
+        files_path: run directory
+    """
+    path = os.path.join(cache_folder, result_key)
+    if os.path.isdir(path):
+        return
+    os.makedirs(cache_folder, exist_ok=True)
+    temporary_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        shutil.copytree(files_path, temporary_path, copy_function=link_or_copy)
+        # the results are published at once, the first run of the key is kept if several finished at the same time
+        os.rename(temporary_path, path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+    finally:
+        if os.path.exists(temporary_path):
+            shutil.rmtree(temporary_path)
+
+
+def restore_result(cache_folder, result_key, files_path):
+    """ Copies the cached outputs of a key into a run directory.
+
+    Returns:
+        (bool): False if the results are not cached
+    """
+    path = get_cached_result(cache_folder, result_key)
+    if path is None:
+        return False
+    shutil.copytree(path, files_path, copy_function=link_or_copy, dirs_exist_ok=True)
+    return True
@@ -0,0 +1,114 @@
+import glob
+import hashlib
+import os
+import time
+import uuid
+import zipfile
+
+# formats that are already compressed, stored as they are in the archives
+STORED_EXTENSIONS = ['.png', '.gif', '.jpg', '.jpeg', '.zip', '.gz']
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ChunkStream:
+    """ Unseekable output of a zip file, of which the written bytes are taken out chunk by chunk. """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def list_run_files(files_path):
+    """ Files of a run directory, by name. """
+    return sorted(name for name in os.listdir(files_path) if os.path.isfile(os.path.join(files_path, name)))
+
+
+def generate_archive(files_path, extra_entries):
+    """ Generates a zip archive of the files of a run directory chunk by chunk, with a bounded memory.
+
+    Args:
+        files_path: run directory
+        extra_entries: (name, text, date) of the entries added to the files, e.g. the configuration
+
+    Returns:
+        (generator): bytes of the archive
+    """
+    stream = ChunkStream()
+    with zipfile.ZipFile(stream, 'w') as zip_file:
+        for name, text, date in extra_entries:
+            entry = zipfile.ZipInfo(name, date.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            zip_file.writestr(entry, text)
+            yield stream.take()
+
+        for name in list_run_files(files_path):
+            path = os.path.join(files_path, name)
+            entry = zipfile.ZipInfo.from_file(path, name, strict_timestamps=False)
+            if os.path.splitext(name)[1].lower() in STORED_EXTENSIONS:
+                entry.compress_type = zipfile.ZIP_STORED
+            else:
+                entry.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, 'rb') as f, zip_file.open(entry, 'w') as zip_entry:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    zip_entry.write(chunk)
+                    yield stream.take()
+    yield stream.take()
+
+
+def get_cached_archive(files_path, extra_entries, archive_folder, archive_name):
+    """ Returns the archive of a finished run, built once in archive_folder and built again if the run directory changed.
+
+    Args:
+        files_path: run directory
+        extra_entries: (name, text, date) of the entries added to the files
+        archive_folder: directory of the cached archives
+        archive_name: name of the archives of the run, without extension
+
+    Returns:
+        (str): path of the archive
+    """
+    signature = hashlib.sha256()
+    for name, text, date in extra_entries:
+        signature.update(f'{name}\0{date.isoformat()}\0'.encode())
+        signature.update(text.encode())
+    for name in list_run_files(files_path):
+        stat = os.stat(os.path.join(files_path, name))
+        signature.update(f'\0{name}\0{stat.st_size}\0{stat.st_mtime_ns}'.encode())
+    archive_path = os.path.join(archive_folder, f'{archive_name}-{signature.hexdigest()[:16]}.zip')
+    if os.path.isfile(archive_path):
+        return archive_path
+
+    os.makedirs(archive_folder, exist_ok=True)
+    temporary_path = f'{archive_path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(temporary_path, 'wb') as f:
+            for chunk in generate_archive(files_path, extra_entries):
+                f.write(chunk)
+        os.replace(temporary_path, archive_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    # the archives of older contents are removed (the signatures have the same length, unlike the names of other runs),
+    # unless just replaced as they may still be about to be sent
+    for path in glob.glob(os.path.join(glob.escape(archive_folder), f'{glob.escape(archive_name)}-*.zip')):
+        if path != archive_path and len(path) == len(archive_path) and os.path.getmtime(path) < time.time() - 60:
+            os.remove(path)
+    return archive_path
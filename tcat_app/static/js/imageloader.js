@@ -1,49 +1,48 @@
 const imageContainer = document.querySelector('#image-container');
 
-let checkForPlotImagesInterval;
+let plotImagesSource;
 let addedPlotImages = [];
 
-function failedRunningConfig() {
+function failedRunningConfig(status) {
     let txt = document.createElement('p');
-    txt.innerText = 'FAILED to run configuration'
+    txt.innerText = status === 'CANCELLED' ? 'Configuration run CANCELLED' : 'FAILED to run configuration'
     txt.classList.add('text-red-600', 'dark:text-red-300');
     imageContainer.appendChild(txt);
 }
 
-function addPlotImage(scenarioId, config_run_id, file) {
-    let r = new XMLHttpRequest();
-    r.addEventListener('load', (e) => {
-        let img = document.createElement('img');
-        img.src = 'data:image/png;base64,' + e.currentTarget.response;
-        imageContainer.appendChild(img);
-        addedPlotImages.push(file);
-    });
-    r.open('GET', `/configure/run/plot/${scenarioId}/${config_run_id}/${file}`);
-    r.send();
+function addPlotImage(scenarioId, configRunId, file) {
+    // the thumbnail is shown first, then replaced by the plot once loaded
+    let url = `/configure/run/plot/${scenarioId}/${configRunId}/${file}`;
+    let img = document.createElement('img');
+    img.src = url + '?thumbnail=1';
+    let plot = new Image();
+    plot.addEventListener('load', () => img.src = url);
+    plot.src = url;
+    imageContainer.appendChild(img);
+    addedPlotImages.push(file);
 }
 
-function checkForPlotImages(scenarioId, configRunId, finishedOrFailed) {
-    let request = new XMLHttpRequest();
-    request.addEventListener('load', (e) => {
-        let response = JSON.parse(e.currentTarget.response);
-        if (response.failed || response.finished || response.plot_files.length > 0) {
-            imageContainer.classList.remove('hidden');
-            if (response.failed || response.finished) {
-                clearInterval(checkForPlotImagesInterval);
-                if (finishedOrFailed) finishedOrFailed();
-            }
-
-            for (let i = 0; i < response.plot_files.length; i++) {
-                let file = response.plot_files[i];
-                if (addedPlotImages.indexOf(file) > -1) continue;
-                addPlotImage(scenarioId, configRunId, file);
-            }
+function stopWatchingPlotImages() {
+    if (plotImagesSource) plotImagesSource.close();
+    plotImagesSource = undefined;
+}
 
-            if (response.failed) {
-                failedRunningConfig();
-            }
+function watchPlotImages(scenarioId, configRunId, finishedOrFailed) {
+    // the server sends an event for each plot once published, and an end event with the status of the finished run
+    stopWatchingPlotImages();
+    addedPlotImages = [];
+    plotImagesSource = new EventSource(`/status/stream/plots/${configRunId}`);
+    plotImagesSource.addEventListener('plot', (e) => {
+        imageContainer.classList.remove('hidden');
+        if (addedPlotImages.indexOf(e.data) > -1) return;
+        addPlotImage(scenarioId, configRunId, e.data);
+    });
+    plotImagesSource.addEventListener('end', (e) => {
+        stopWatchingPlotImages();
+        imageContainer.classList.remove('hidden');
+        if (e.data !== 'FINISHED') {
+            failedRunningConfig(e.data);
         }
+        if (finishedOrFailed) finishedOrFailed();
     });
-    request.open('GET', `/configure/run/plot/${scenarioId}/${configRunId}`);
-    request.send();
-}
\ No newline at end of file
+}
@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import socket
+import struct
+import subprocess
+import sys
+from urllib.parse import urlsplit, parse_qs
+
+from dotenv import load_dotenv
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tcat_app.job_queue import FINAL_STATUSES
+from tcat_app.models import ConfigurationRun
+
+# tokens of the streams, signed by the app for the configuration runs the user can see
+TOKEN_SALT = 'tcat-stream'
+TOKEN_MAX_AGE_IN_SEC = 24 * 3600
+
+# environment variable with the database of the app, as resolved by the app (relative sqlite paths)
+DATABASE_URI_VARIABLE = 'TCAT_STREAM_DATABASE_URI'
+
+# inotify events of a results directory that can change an output file
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+IN_EVENT_HEADER = struct.Struct('iIII')
+
+logger = logging.getLogger(__name__)
+
+
+def create_token(secret_key, config_run_id, path, plots=None):
+    """ Signs the access of a user to an output file of a configuration run, or to the plots published in its results
+    directory (path) if plots gives their names, checked by the stream server. """
+    stream = {'config_run_id': config_run_id, 'path': path}
+    if plots is not None:
+        stream['plots'] = list(plots)
+    return URLSafeTimedSerializer(secret_key, salt=TOKEN_SALT).dumps(stream)
+
+
+def start_stream_server(python_exe, tcat_dir, host, port, database_uri):
+    """ Starts the stream server in its own session, unless it is already running (it is shared by the app processes). """
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return
+    except OSError:
+        pass
+    env = dict(os.environ)
+    env[DATABASE_URI_VARIABLE] = database_uri
+    subprocess.Popen([python_exe, '-m', 'tcat_app.stream_server', '--host', host, '--port', str(port)], cwd=tcat_dir, env=env,
+                     stdout=subprocess.DEVNULL, start_new_session=True)
+
+
+class Inotify:
+    """ Notifications of the changes in directories (Linux inotify), read by the event loop. """
+
+    def __init__(self, loop, on_change):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.add_watch = libc.inotify_add_watch
+        self.rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.on_change = on_change
+        self.directories = dict()
+        loop.add_reader(self.fd, self.read)
+
+    def watch(self, directory):
+        wd = self.add_watch(self.fd, os.fsencode(directory), IN_EVENTS)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed on {directory}')
+        self.directories[wd] = directory
+        return wd
+
+    def unwatch(self, wd):
+        self.directories.pop(wd, None)
+        self.rm_watch(self.fd, wd)
+
+    def read(self):
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + IN_EVENT_HEADER.size:offset + IN_EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += IN_EVENT_HEADER.size + length
+            if wd in self.directories:
+                self.on_change(os.path.join(self.directories[wd], os.fsdecode(name)))
+
+
+class FileWatch:
+    """ Output file (or results directory) of a configuration run, shared by all its readers.
+
+    The readers wait for a change of the file (notified by inotify on its directory, or by polling its size and
+    modification time) or for the end of the run (polled in the database once for all the readers).
+    """
+
+    def __init__(self, path, config_run_id, directory):
+        self.path = path
+        self.config_run_id = config_run_id
+        self.directory = directory
+        self.readers = 0
+        self.final_status = None
+        self.stat = None
+        self.changed = asyncio.Event()
+        self.task = None
+        self.wd = None
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class StreamServer:
+    """ Server-Sent Events of the output files (log, result) of the configuration runs, for many readers in a single process.
+
+    A stream is opened with GET <any path>?token=<token>, the token being signed by the app (see create_token). Each event
+    holds complete lines of the file from the byte offset given by the Last-Event-ID header or the offset argument, and has
+    the offset of its end as id, so that a reader resumes where it stopped. The event reset is sent if the file was written
+    again from its start (retry of the run), and the event end with the status of the run once it is finished and read.
+
+    A stream of plots sends the event plot with the name of each plot once it is published in the results directory (the
+    plots already there first), and the event end with the status of the run.
+
+    Args:
+        secret_key: key used by the app to sign the tokens
+        session_factory: sessionmaker bound to the app database
+    """
+
+    MAX_EVENT_BYTES = 65536
+    KEEPALIVE_INTERVAL_IN_SEC = 15
+    STATUS_INTERVAL_IN_SEC = 2
+    POLL_INTERVAL_IN_SEC = 0.5
+    RETRY_IN_MS = 3000
+
+    def __init__(self, secret_key, session_factory):
+        self.serializer = URLSafeTimedSerializer(secret_key, salt=TOKEN_SALT)
+        self.session_factory = session_factory
+        self.watches = dict()
+        self.directories = dict()
+        self.inotify = None
+
+    async def serve(self, host, port):
+        try:
+            self.inotify = Inotify(asyncio.get_running_loop(), self.file_changed)
+        except (OSError, AttributeError, TypeError):
+            logger.info('inotify is not available, the output files are polled')
+        server = await asyncio.start_server(self.handle, host, port, reuse_address=True)
+        logger.info(f'Streaming the outputs of the runs on {host}:{port}')
+        async with server:
+            await server.serve_forever()
+
+    def file_changed(self, path):
+        for watched_path in [path, os.path.dirname(path)]:
+            watch = self.watches.get(watched_path)
+            if watch is not None:
+                watch.notify()
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.KEEPALIVE_INTERVAL_IN_SEC)
+            headers = dict()
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.KEEPALIVE_INTERVAL_IN_SEC)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            if method != 'GET':
+                return await self.respond(writer, '405 Method Not Allowed')
+            arguments = parse_qs(urlsplit(target).query)
+            try:
+                stream = self.serializer.loads(arguments.get('token', [''])[0], max_age=TOKEN_MAX_AGE_IN_SEC)
+                offset = int(headers.get('last-event-id') or arguments.get('offset', ['0'])[0])
+            except (BadSignature, ValueError):
+                return await self.respond(writer, '403 Forbidden')
+
+            if 'plots' in stream:
+                await self.stream_plots(writer, stream['path'], stream['config_run_id'], stream['plots'])
+            else:
+                await self.stream(writer, stream['path'], stream['config_run_id'], max(offset, 0))
+        except (ConnectionError, asyncio.TimeoutError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status):
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+
+    async def start_events(self, writer):
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\nX-Accel-Buffering: no\r\n'
+                     b'Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n')
+        writer.write(f'retry: {self.RETRY_IN_MS}\n\n'.encode())
+        await writer.drain()
+
+    async def wait_change(self, writer, changed):
+        try:
+            await asyncio.wait_for(changed.wait(), self.KEEPALIVE_INTERVAL_IN_SEC)
+        except asyncio.TimeoutError:
+            writer.write(b': keepalive\n\n')
+
+    async def stream(self, writer, path, config_run_id, offset):
+        await self.start_events(writer)
+        watch = self.open_watch(path, config_run_id, os.path.dirname(path))
+        try:
+            while True:
+                # the status is read before the file, so that all the output written before the end of the run is sent,
+                # and the change event too, so that a change during the read is not missed
+                final_status = watch.final_status
+                changed = watch.changed
+                data, end = self.read(path, offset, final_status is not None)
+                if end < offset:
+                    writer.write(b'event: reset\ndata: \n\n')
+                    offset = 0
+                elif data:
+                    writer.write(self.event(data, end))
+                    offset = end
+                elif final_status is not None:
+                    writer.write(f'event: end\ndata: {final_status}\n\n'.encode())
+                    await writer.drain()
+                    return
+                else:
+                    await self.wait_change(writer, changed)
+                await writer.drain()
+        finally:
+            self.close_watch(watch)
+
+    async def stream_plots(self, writer, directory, config_run_id, names):
+        await self.start_events(writer)
+        watch = self.open_watch(directory, config_run_id, directory)
+        sent = set()
+        try:
+            while True:
+                final_status = watch.final_status
+                changed = watch.changed
+                # the plots are published atomically, a plot file is complete once it exists
+                for name in names:
+                    if name not in sent and os.path.isfile(os.path.join(directory, name)):
+                        sent.add(name)
+                        writer.write(f'event: plot\ndata: {name}\n\n'.encode())
+                if final_status is not None:
+                    writer.write(f'event: end\ndata: {final_status}\n\n'.encode())
+                    await writer.drain()
+                    return
+                await writer.drain()
+                await self.wait_change(writer, changed)
+                await writer.drain()
+        finally:
+            self.close_watch(watch)
+
+    def read(self, path, offset, final):
+        """ Reads the complete lines of a file from offset (and the last line once the run is finished).
+
+        Returns:
+            (bytes, int): lines and offset of their end, an offset below the given one if the file was written again
+        """
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < offset:
+                    return b'', size
+                f.seek(offset)
+                data = f.read(self.MAX_EVENT_BYTES)
+        except FileNotFoundError:
+            return b'', offset
+        if not final:
+            end_of_line = data.rfind(b'\n')
+            if end_of_line >= 0:
+                data = data[:end_of_line + 1]
+            elif len(data) < self.MAX_EVENT_BYTES:
+                # the line is not complete yet (longer lines are cut)
+                return b'', offset
+        return data, offset + len(data)
+
+    @staticmethod
+    def event(data, end):
+        # each line of the data is a data field, the reader joins them with \n
+        lines = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        return (f'id: {end}\n' + ''.join(f'data: {line}\n' for line in lines) + '\n').encode()
+
+    def open_watch(self, path, config_run_id, directory):
+        watch = self.watches.get(path)
+        if watch is None:
+            watch = self.watches[path] = FileWatch(path, config_run_id, directory)
+            if self.inotify is not None:
+                try:
+                    if directory not in self.directories:
+                        self.directories[directory] = [self.inotify.watch(directory), 0]
+                    self.directories[directory][1] += 1
+                    watch.wd = self.directories[directory][0]
+                except OSError:
+                    pass
+            watch.task = asyncio.create_task(self.follow(watch))
+        watch.readers += 1
+        return watch
+
+    def close_watch(self, watch):
+        watch.readers -= 1
+        if watch.readers > 0:
+            return
+        del self.watches[watch.path]
+        watch.task.cancel()
+        if watch.wd is not None:
+            self.directories[watch.directory][1] -= 1
+            if self.directories[watch.directory][1] == 0:
+                self.inotify.unwatch(self.directories.pop(watch.directory)[0])
+
+    async def follow(self, watch):
+        """ Polls the status of the run, and the file if it is not watched by inotify, for all the readers of the file. """
+        loop = asyncio.get_running_loop()
+        interval = self.POLL_INTERVAL_IN_SEC if watch.wd is None else self.STATUS_INTERVAL_IN_SEC
+        waited = self.STATUS_INTERVAL_IN_SEC
+        while watch.final_status is None:
+            if waited >= self.STATUS_INTERVAL_IN_SEC:
+                waited = 0
+                try:
+                    status = await loop.run_in_executor(None, self.get_status, watch.config_run_id)
+                except Exception:
+                    logger.exception(f'Could not read the status of the configuration run {watch.config_run_id}')
+                    status = None
+                if status in FINAL_STATUSES or status is False:
+                    watch.final_status = status or 'NOT_FOUND'
+                    watch.notify()
+                    return
+            if watch.wd is None:
+                try:
+                    stat = os.stat(watch.path)
+                    stat = (stat.st_size, stat.st_mtime_ns)
+                except FileNotFoundError:
+                    stat = None
+                if stat != watch.stat:
+                    watch.stat = stat
+                    watch.notify()
+            await asyncio.sleep(interval)
+            waited += interval
+
+    def get_status(self, config_run_id):
+        """ Status of a configuration run, False if it does not exist. """
+        with self.session_factory() as session:
+            status = session.query(ConfigurationRun.status).filter_by(id=config_run_id).scalar()
+        return False if status is None else status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streams the outputs of the configuration runs as Server-Sent Events.')
+    parser.add_argument('--host', default=os.getenv('STREAM_SERVER_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('STREAM_SERVER_PORT', '5001')))
+    arguments = parser.parse_args()
+
+    logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s', level=logging.INFO)
+    engine = create_engine(os.getenv(DATABASE_URI_VARIABLE) or os.getenv('DATABASE_URI'))
+    server = StreamServer(os.getenv('APP_SECRET'), sessionmaker(bind=engine))
+    try:
+        asyncio.run(server.serve(arguments.host, arguments.port))
+    except OSError as e:
+        # e.g. the server is already running on the port
+        logger.error(f'Could not stream on {arguments.host}:{arguments.port}: {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    main()
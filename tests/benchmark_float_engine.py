@@ -0,0 +1,81 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Benchmark of the float64 engine of Phases/Common_functions.py. Times the engine against the former
+#                   astropy Quantity arithmetic (see test_float_engine.py) on sampled orbits, then the full scenario of
+#                   constellation_mission.json. Run from the root of the repository with:
+#                   python tests/benchmark_float_engine.py [PATH_TO_SCENARIO_JSON]
+
+# Import libraries
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import timeit
+import warnings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT_DIR, os.path.dirname(os.path.abspath(__file__))]
+warnings.filterwarnings("ignore")
+
+from astropy import units as u
+
+from Phases import Common_functions
+from RunTCAT import create_and_run_scenario
+import test_float_engine as reference
+
+# User defines
+N_CALLS = 2000
+DEFAULT_SCENARIO = os.path.join(ROOT_DIR, "constellation_mission.json")
+
+
+def time_calls(function):
+    """ Returns the mean duration in microseconds of a function without argument. """
+    return timeit.timeit(function, number=N_CALLS) / N_CALLS * 1e6
+
+
+def benchmark_functions():
+    """ Prints the mean duration of the engine and reference functions on a sampled orbit. """
+    initial_orbit, final_orbit, _ = reference.sample_orbits()[0]
+    delta_raan = 10 * u.deg
+    cases = [("nodal_precession",
+              lambda: Common_functions.nodal_precession(initial_orbit),
+              lambda: reference.reference_nodal_precession(initial_orbit)),
+             ("instant_orbital_velocity",
+              lambda: Common_functions.instant_orbital_velocity(initial_orbit, initial_orbit.a),
+              lambda: reference.reference_instant_orbital_velocity(initial_orbit, initial_orbit.a)),
+             ("raan_change_delta_v",
+              lambda: Common_functions.raan_change_delta_v_si(delta_raan, initial_orbit, final_orbit),
+              lambda: reference.reference_raan_change_delta_v(delta_raan, initial_orbit, final_orbit)),
+             ("propellant_mass",
+              lambda: Common_functions.propellant_mass_si(1000., 100., 300.),
+              lambda: reference.reference_propellant_mass(1000. * u.kg, 100. * u.m / u.s, 300. * u.s))]
+    print(f"{'function':<28}{'engine [us]':>14}{'reference [us]':>16}{'speedup':>10}")
+    for name, engine, quantity in cases:
+        engine_duration, quantity_duration = time_calls(engine), time_calls(quantity)
+        print(f"{name:<28}{engine_duration:>14.1f}{quantity_duration:>16.1f}{quantity_duration / engine_duration:>10.1f}")
+
+
+def benchmark_scenario(scenario_path):
+    """ Prints the duration of a full scenario run and the counters of the orbit caches.
+
+    :param scenario_path: path to the scenario json
+    :type scenario_path: str
+    """
+    with open(scenario_path) as file:
+        configuration = json.load(file)
+    with tempfile.TemporaryDirectory() as results_dir_path:
+        configuration["dir_path_for_output_files"] = results_dir_path
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_and_run_scenario(configuration, "benchmark")
+        duration = time.perf_counter() - start
+    print(f"{os.path.basename(scenario_path)}: {duration:.2f} s")
+    print(f"orbit caches: {Common_functions.get_orbit_caches_info()}")
+
+
+if __name__ == "__main__":
+    benchmark_functions()
+    benchmark_scenario(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SCENARIO)
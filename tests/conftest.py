@@ -0,0 +1,16 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Pytest configuration, the tests import the tcat modules from the root of the repository, as the scripts
+#                   do. Run from the root of the repository with:
+#                   python -m pytest tests
+
+# Import libraries
+import os
+import sys
+import warnings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+warnings.filterwarnings("ignore")
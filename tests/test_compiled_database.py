@@ -0,0 +1,37 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Tests of the binary store of the launcher and kickstage databases: a store compiled after a first
+#                   lookup is used by the process, and the store gives the tables read from the .csv files.
+
+# Import libraries
+import os
+
+import numpy as np
+
+from SpacecraftDatabase import CompiledDatabase
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_store_compiled_later_is_used(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT_DIR)
+    directory = str(tmp_path / "store")
+    assert CompiledDatabase.get_compiled_database(directory) is None
+    assert CompiledDatabase.compile_database_if_needed(directory)
+    compiled_database = CompiledDatabase.get_compiled_database(directory)
+    assert compiled_database is not None
+    assert CompiledDatabase.get_compiled_database(directory) is compiled_database
+
+    launcher_paths, _ = CompiledDatabase.get_database_sources()
+    for path in launcher_paths:
+        np.testing.assert_array_equal(compiled_database.get_launcher_table(path),
+                                      np.genfromtxt(path, delimiter=";", skip_header=2))
+
+
+def test_store_not_writable(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT_DIR)
+    # a file in place of the store directory cannot be written
+    directory = tmp_path / "store"
+    directory.write_text("")
+    assert not CompiledDatabase.compile_database_if_needed(str(directory))
+    assert CompiledDatabase.get_compiled_database(str(directory)) is None
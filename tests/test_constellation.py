@@ -0,0 +1,65 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Tests of the indexes of the Constellation class: planes and standby satellites after satellite
+#                   removals and state changes.
+
+# Import libraries
+import pytest
+from astropy import units as u
+from astropy.time import Time
+from poliastro.bodies import Earth
+
+from Constellations.Constellation import Constellation
+from Phases.OrbitElements import OrbitElements
+from Spacecrafts.Satellite import Satellite
+
+NB_PLANES = 3
+SAT_PER_PLANE = 4
+
+
+@pytest.fixture
+def constellation():
+    orbit = OrbitElements.from_classical(Earth, 7000 * u.km, 0 * u.one, 87 * u.deg, 0 * u.deg, 0 * u.deg, 0 * u.deg,
+                                         Time("2025-01-01 12:00:00", scale="tdb"))
+    reference_satellite = Satellite("reference", 150 * u.kg, 1 * u.m ** 3, insertion_orbit=orbit,
+                                    operational_orbit=orbit, disposal_orbit=orbit)
+    constellation = Constellation("constellation")
+    constellation.populate_standard_constellation("constellation", reference_satellite, number_of_planes=NB_PLANES,
+                                                  sat_per_plane=SAT_PER_PLANE)
+    constellation.set_default_orbit_to_insertion()
+    return constellation
+
+
+def get_plane_ids(constellation, plane_id):
+    return [satellite.get_id() for satellite in constellation.get_plane_satellites(plane_id)]
+
+
+def test_remove_satellite(constellation):
+    plane_id = "constellation_plane0001"
+    assert get_plane_ids(constellation, plane_id) == [f"{plane_id}_sat{i:04d}" for i in range(SAT_PER_PLANE)]
+    constellation.remove_satellite(f"{plane_id}_sat0002")
+    assert get_plane_ids(constellation, plane_id) == [f"{plane_id}_sat{i:04d}" for i in (0, 1, 3)]
+    assert f"{plane_id}_sat0002" not in constellation.get_standby_satellites()
+    assert f"{plane_id}_sat0002" in constellation.get_initial_satellites()
+    assert constellation.get_number_satellites() == NB_PLANES * SAT_PER_PLANE - 1
+
+
+def test_random_sat_failure(constellation):
+    constellation.set_sats_reliability(0.5)
+    constellation.perform_random_sat_failure()
+    remaining = set(constellation.satellites)
+    assert len(remaining) == NB_PLANES * SAT_PER_PLANE // 2
+    assert set(constellation.get_standby_satellites()) == remaining
+    plane_satellites = {satellite_id for i in range(NB_PLANES)
+                        for satellite_id in get_plane_ids(constellation, f"constellation_plane{i:04d}")}
+    assert plane_satellites == remaining
+
+
+def test_standby_satellites_are_read_only(constellation):
+    standby_satellites = constellation.get_standby_satellites()
+    with pytest.raises(TypeError):
+        standby_satellites["satellite"] = None
+    satellite = constellation.satellites["constellation_plane0000_sat0000"]
+    satellite.state = "Captured"
+    assert satellite.get_id() not in constellation.get_standby_satellites()
+    assert len(constellation.get_standby_satellites()) == NB_PLANES * SAT_PER_PLANE - 1
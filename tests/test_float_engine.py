@@ -0,0 +1,164 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Compares the float64 engine of Phases/Common_functions.py with the former astropy Quantity
+#                   arithmetic, kept below as reference, on sampled orbits. The results must agree within 1e-12 relative.
+
+# Import libraries
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy import constants as const
+from astropy.time import Time
+from poliastro.bodies import Earth
+from poliastro.twobody import Orbit
+
+from Phases import Common_functions
+from Phases.Manoeuvre import Manoeuvre
+
+RELATIVE_TOLERANCE = 1e-12
+N_SAMPLES = 200
+EPOCH = Time("2025-01-01 12:00:00", scale="tdb")
+
+
+# Reference Quantity implementations
+
+def reference_nodal_precession(orbit):
+    body = orbit.attractor
+    nodal_precession_period = orbit.period / (-1.5 * body.R**2 /
+                                              (orbit.a * (1 - orbit.ecc**2))**2 * body.J2 * np.cos(orbit.inc.to(u.rad)))
+    nodal_precession_speed = 360 * u.deg / nodal_precession_period
+    return nodal_precession_period.to(u.day), nodal_precession_speed.to(u.deg / u.day)
+
+
+def reference_instant_orbital_velocity(orbit, radius):
+    return np.sqrt(orbit.attractor.k * (2. / radius - 1 / orbit.a)).to(u.m / u.s)
+
+
+def reference_raan_change_delta_v(delta_raan, initial_orbit, final_orbit):
+    delta_raan = delta_raan % (360 * u.deg)
+    if delta_raan > 180. * u.deg:
+        delta_raan -= 360. * u.deg
+    mean_a = (final_orbit.a + initial_orbit.a) / 2
+    mean_inc = (final_orbit.inc + initial_orbit.inc) / 2
+    vel = np.sqrt(initial_orbit.attractor.k / mean_a.to(u.m))
+    return (np.pi / 2 * vel * np.sin(mean_inc.to(u.rad)) * abs(delta_raan.to(u.rad).value)).to(u.m / u.s)
+
+
+def reference_burn_mass_and_duration(delta_v, initial_mass, mean_thrust, isp):
+    final_mass = initial_mass / np.exp((delta_v.to(u.meter / u.second) / const.g0 / isp.to(u.second)).value)
+    mean_mass = (final_mass + initial_mass) / 2
+    return initial_mass - final_mass, (mean_mass / mean_thrust * delta_v).to(u.s)
+
+
+def reference_propellant_mass(initial_mass, delta_v, isp):
+    temp = np.exp((delta_v.to(u.meter / u.second) / const.g0 / isp.to(u.second)).value)
+    return initial_mass * (temp - 1) / temp
+
+
+def reference_raan_drift(orbit, reference_epoch):
+    raan_drift_since_epoch = reference_nodal_precession(orbit)[1] * (reference_epoch - orbit.epoch)
+    current_raan = (orbit.raan + raan_drift_since_epoch).to(u.deg) % (360 * u.deg)
+    if current_raan > 180. * u.deg:
+        current_raan = current_raan - 360. * u.deg
+    return current_raan
+
+
+# Helpers
+
+def sample_orbits(seed=0):
+    """Returns pairs of random Earth orbits from 400 to 2400 km with their random parameters. """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(N_SAMPLES):
+        orbits = [Orbit.from_classical(Earth, (6800 + rng.uniform(0, 2000)) * u.km, rng.uniform(0, 0.05) * u.one,
+                                       rng.uniform(0, 180) * u.deg, rng.uniform(-180, 180) * u.deg, 0 * u.deg,
+                                       0 * u.deg, EPOCH) for _ in range(2)]
+        samples.append((orbits[0], orbits[1], rng))
+    return samples
+
+
+def assert_close(actual, expected):
+    assert actual.unit.is_equivalent(expected.unit)
+    assert actual.to_value(expected.unit) == pytest.approx(expected.value, rel=RELATIVE_TOLERANCE, abs=0.)
+
+
+# Tests
+
+@pytest.fixture(scope="module")
+def orbits():
+    return sample_orbits()
+
+
+def test_nodal_precession(orbits):
+    for orbit, _, _ in orbits:
+        for actual, expected in zip(Common_functions.nodal_precession(orbit), reference_nodal_precession(orbit)):
+            assert_close(actual, expected)
+
+
+def test_instant_orbital_velocity(orbits):
+    for orbit, _, rng in orbits:
+        radius = orbit.r_p + rng.uniform(0, 1) * (orbit.r_a - orbit.r_p)
+        assert_close(Common_functions.instant_orbital_velocity(orbit, radius),
+                     reference_instant_orbital_velocity(orbit, radius))
+
+
+def test_raan_change_delta_v(orbits):
+    for initial_orbit, final_orbit, rng in orbits:
+        delta_raan = rng.uniform(-400, 400) * u.deg
+        expected = reference_raan_change_delta_v(delta_raan, initial_orbit, final_orbit)
+        manoeuvre, _ = Common_functions.high_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit,
+                                                                        1000 * u.kg, 100 * u.N, 300 * u.s)
+        assert_close(manoeuvre.delta_v, expected)
+        manoeuvre, _ = Common_functions.low_thrust_raan_change_delta_v(delta_raan, initial_orbit, final_orbit,
+                                                                       1000 * u.kg, 0.1 * u.N, 1500 * u.s)
+        assert_close(manoeuvre.delta_v, expected)
+
+
+def test_burn_mass_and_duration(orbits):
+    for _, _, rng in orbits:
+        delta_v = rng.uniform(0.1, 3000) * u.m / u.s
+        initial_mass = rng.uniform(10, 5000) * u.kg
+        isp = rng.uniform(200, 3000) * u.s
+        mean_thrust = rng.uniform(0.01, 500) * u.N
+        expected_mass, expected_duration = reference_burn_mass_and_duration(delta_v, initial_mass, mean_thrust, isp)
+        manoeuvre = Manoeuvre(delta_v)
+        assert_close(manoeuvre.compute_burn_mass_and_duration(initial_mass, mean_thrust, isp), expected_mass)
+        assert_close(manoeuvre.burn_duration, expected_duration)
+        expected_mass = reference_propellant_mass(initial_mass, delta_v, isp)
+        assert Common_functions.propellant_mass_si(initial_mass.value, delta_v.value, isp.value) == pytest.approx(
+            expected_mass.value, rel=RELATIVE_TOLERANCE, abs=0.)
+
+
+def test_update_orbit(orbits):
+    for orbit, _, rng in orbits:
+        reference_epoch = EPOCH + rng.uniform(0, 100) * u.day
+        expected = reference_raan_drift(orbit, reference_epoch)
+        actual = Common_functions.update_orbit(orbit, reference_epoch)
+        # angles are compared on a full turn, the raan can be close to zero
+        difference = (actual.raan - expected + 180 * u.deg) % (360 * u.deg) - 180 * u.deg
+        assert abs(difference.to_value(u.deg)) <= RELATIVE_TOLERANCE * 360.
+        assert actual.epoch == reference_epoch
+
+
+def test_update_orbit_cache():
+    Common_functions.clear_orbit_caches()
+    assert Common_functions.get_orbit_caches_info()["update_orbit"]["currsize"] == 0
+    orbit = Orbit.from_classical(Earth, 7000 * u.km, 0.01 * u.one, 98 * u.deg, 10 * u.deg, 0 * u.deg, 0 * u.deg, EPOCH)
+    later_orbit = Orbit.from_classical(Earth, 7000 * u.km, 0.01 * u.one, 98 * u.deg, 10 * u.deg, 0 * u.deg, 0 * u.deg,
+                                       EPOCH + 10 * u.day)
+
+    # identical propagations from different epochs are computed once
+    first = Common_functions.update_orbit(orbit, EPOCH + 1 * u.day)
+    second = Common_functions.update_orbit(later_orbit, EPOCH + 11 * u.day)
+    info = Common_functions.get_orbit_caches_info()["update_orbit"]
+    assert (info["hits"], info["misses"]) == (1, 1)
+    assert (second.raan_si, second.nu_si) == (first.raan_si, first.nu_si)
+    assert second.epoch == EPOCH + 11 * u.day
+
+    # returned orbits are independent records
+    first.raan = 0 * u.deg
+    assert Common_functions.update_orbit(orbit, EPOCH + 1 * u.day).raan_si == second.raan_si
+
+    Common_functions.clear_orbit_caches()
+    info = Common_functions.get_orbit_caches_info()["update_orbit"]
+    assert (info["hits"], info["misses"], info["currsize"]) == (0, 0, 0)
@@ -0,0 +1,117 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Compares the vectorised Scenario.organise_satellites with the former nested loop implementation,
+#                   kept below as reference, on the example missions: release order and plane of each released satellite,
+#                   including sequences tied within rounding errors (equally spaced planes over 360 deg).
+
+# Import libraries
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from Phases.Common_functions import nodal_precession
+from RunTCAT import create_scenario
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [("constellation_mission.json", dict()),
+         ("adr_mission.json", dict())]
+for n_planes, n_sats_per_plane, plane_distribution_angle in [(6, 10, 360), (4, 5, 180), (7, 13, 180), (12, 8, 360),
+                                                            (3, 1, 360), (1, 9, 360)]:
+    for scenario_file in ("constellation_mission.json", "adr_mission.json"):
+        CASES.append((scenario_file, dict(n_planes=n_planes, n_sats_per_plane=n_sats_per_plane,
+                                          plane_distribution_angle=plane_distribution_angle)))
+
+
+def reference_organise_satellites(scenario):
+    """ Former implementation of Scenario.organise_satellites: every rotation of the ordered satellites is evaluated with
+        nested loops over Quantity values.
+
+    Return:
+        (list(Satellite)): ordered satellites
+        (list(float)): RAAN spread of each sequence
+    """
+    global_precession_direction = scenario.constellation.get_global_precession_rotation()
+    targets_J2_speed = nodal_precession(scenario.launcher_insertion_orbit)[1]
+    launchers_J2_speed = nodal_precession(scenario.sat_default_orbit)[1]
+    relative_precession_direction = np.sign(launchers_J2_speed-targets_J2_speed)
+
+    standby_satellites = scenario.constellation.get_standby_satellites()
+    ordered_satellites_id = sorted(standby_satellites, key=lambda satellite_id: (
+        relative_precession_direction * standby_satellites[satellite_id].get_default_orbit().raan.value,
+        standby_satellites[satellite_id].get_default_orbit().nu.value))
+
+    number_satellites = scenario.constellation.get_number_satellites()
+    sequence_list = np.full((number_satellites, number_satellites), -1)
+    for sequence_row in range(0, number_satellites):
+        sequence_list[sequence_row, :] = np.mod(np.arange(sequence_row, sequence_row+number_satellites, 1),
+                                                number_satellites)
+
+    criteria_raan_spread = []
+    criteria_altitude = []
+    for i in range(0, len(ordered_satellites_id)):
+        satellite_id_list = [ordered_satellites_id[i] for i in sequence_list[i, :]]
+        sequence_raan_spread = 0 * u.deg
+        for j in range(1, len(satellite_id_list)):
+            initial_RAAN = scenario.constellation.satellites[satellite_id_list[j]].get_default_orbit().raan
+            final_RAAN = scenario.constellation.satellites[satellite_id_list[j-1]].get_default_orbit().raan
+            delta_RAAN = final_RAAN-initial_RAAN
+            if np.sign(delta_RAAN) != np.sign(global_precession_direction):
+                delta_RAAN = -np.sign(delta_RAAN)*(360*u.deg-abs(delta_RAAN))
+            sequence_raan_spread += delta_RAAN
+        criteria_raan_spread.append(abs(sequence_raan_spread.value))
+        satellites_altitude = sum([scenario.constellation.satellites[sat_id].get_default_orbit().a.to(u.km).value
+                                   for sat_id in satellite_id_list])
+        criteria_altitude.append(satellites_altitude)
+
+    ranking = [list(range(0, len(ordered_satellites_id))), criteria_raan_spread, criteria_altitude]
+    ranking = np.array(ranking).T.tolist()
+    ranking = sorted(ranking, key=lambda element: (element[1], element[2]))
+    best_sequence = int(ranking[0][0])
+    return ([scenario.constellation.satellites[ordered_satellites_id[int(sat_id_in_list)]]
+             for sat_id_in_list in sequence_list[best_sequence, :]], criteria_raan_spread)
+
+
+def setup_scenario(scenario_file, parameters, results_dir_path):
+    with open(os.path.join(ROOT_DIR, scenario_file)) as file:
+        configuration = json.load(file)
+    configuration.update(parameters)
+    configuration["dir_path_for_output_files"] = str(results_dir_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        scenario = create_scenario(configuration, "test_organise_satellites")
+        scenario.setup()
+    return scenario
+
+
+def get_release_order(satellites):
+    """ Returns the id and the plane of each satellite, in release order. """
+    return [(satellite.get_id(), satellite.get_id().rsplit("_sat", 1)[0]) for satellite in satellites]
+
+
+@pytest.mark.parametrize("scenario_file, parameters", CASES)
+def test_organise_satellites_matches_reference(scenario_file, parameters, tmp_path):
+    scenario = setup_scenario(scenario_file, parameters, tmp_path)
+    scenario.organise_satellites()
+    ordered_satellites = scenario.constellation.get_optimized_ordered_satellites()
+    reference_satellites, _ = reference_organise_satellites(scenario)
+    assert len(ordered_satellites) == scenario.constellation.get_number_satellites()
+    assert get_release_order(ordered_satellites) == get_release_order(reference_satellites)
+
+
+def test_organise_satellites_ties(tmp_path):
+    # equally spaced planes over 360 deg: the RAAN spreads of the sequences starting on each plane are tied within
+    # rounding errors, the tie must be decided as the reference does
+    scenario = setup_scenario("constellation_mission.json",
+                              dict(n_planes=12, n_sats_per_plane=8, plane_distribution_angle=360), tmp_path)
+    reference_satellites, criteria_raan_spread = reference_organise_satellites(scenario)
+    criteria_raan_spread = np.array(criteria_raan_spread)
+    tolerance = 1e-9 * np.abs(criteria_raan_spread).max()
+    assert np.count_nonzero(criteria_raan_spread <= criteria_raan_spread.min() + tolerance) > 1
+    scenario.organise_satellites()
+    assert (get_release_order(scenario.constellation.get_optimized_ordered_satellites())
+            == get_release_order(reference_satellites))
@@ -0,0 +1,64 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Checks that plan checkpointing (PLAN_CHECKPOINTING) does not change the results of a scenario: the
+#                   structured results of the example missions are compared with and without checkpointing.
+
+# Import libraries
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+import Spacecrafts.ActiveSpacecraft
+from Commons.results import RESULTS_FILENAME, load_results
+from Phases.OrbitElements import OrbitElements
+from RunTCAT import create_and_run_scenario
+from Spacecrafts.Spacecraft import Spacecraft
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_scenario(scenario_file, results_dir_path, checkpointing, monkeypatch):
+    """ Runs an example scenario and returns its structured results. """
+    monkeypatch.setattr(Spacecrafts.ActiveSpacecraft, "PLAN_CHECKPOINTING", checkpointing)
+    with open(os.path.join(ROOT_DIR, scenario_file)) as file:
+        configuration = json.load(file)
+    configuration["dir_path_for_output_files"] = str(results_dir_path)
+    os.makedirs(results_dir_path, exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_and_run_scenario(configuration, "test_plan_checkpointing")
+    return load_results(os.path.join(results_dir_path, RESULTS_FILENAME))
+
+
+@pytest.mark.parametrize("scenario_file", ["constellation_mission.json", "adr_mission.json"])
+def test_checkpointed_plan_matches_full_run(scenario_file, tmp_path, monkeypatch):
+    checkpointed = run_scenario(scenario_file, tmp_path / "checkpointed", True, monkeypatch)
+    full = run_scenario(scenario_file, tmp_path / "full", False, monkeypatch)
+    assert checkpointed == full
+
+
+def test_checkpoint_is_not_modified_by_the_spacecraft(monkeypatch):
+    from astropy import units as u
+    from astropy.time import Time
+    from poliastro.bodies import Earth
+
+    spacecraft = Spacecraft("spacecraft")
+    spacecraft.current_orbit = OrbitElements.from_classical(Earth, 7000 * u.km, 0 * u.one, 98 * u.deg, 0 * u.deg,
+                                                            0 * u.deg, 0 * u.deg, Time("2025-01-01", scale="tdb"))
+    mothership = Spacecraft("mothership")
+    spacecraft.mothership = mothership
+    spacecraft.state = "Captured"
+    checkpoint = spacecraft.get_checkpoint()
+
+    spacecraft.current_orbit.raan = 90 * u.deg
+    spacecraft.reset()
+    spacecraft.restore_checkpoint(checkpoint)
+    assert spacecraft.current_orbit.raan.to_value(u.deg) == pytest.approx(0.)
+    assert spacecraft.state == "Captured"
+    assert spacecraft.mothership is mothership
+
+    spacecraft.current_orbit.raan = 90 * u.deg
+    spacecraft.restore_checkpoint(checkpoint)
+    assert spacecraft.current_orbit.raan.to_value(u.deg) == pytest.approx(0.)
@@ -0,0 +1,77 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Tests of the resume of an interrupted sweep by RunSweep.py: failed, invalid and partially written
+#                   rows of the result file.
+
+# Import libraries
+import csv
+
+import pytest
+
+from RunSweep import KPI_COLUMNS, POINT_COLUMNS, read_done_point_ids
+
+COLUMNS = POINT_COLUMNS + ["n_planes"] + KPI_COLUMNS
+NB_POINTS = 4
+
+
+def write_rows(result_path, rows, partial_row=""):
+    with open(result_path, "w", newline="", encoding="utf-8") as result_file:
+        writer = csv.DictWriter(result_file, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+        result_file.write(partial_row)
+
+
+def make_row(point_id, success=True, error=""):
+    row = {column: "" for column in COLUMNS}
+    row.update(point_id=point_id, seed=point_id, n_planes=2, success=success, error=error)
+    return row
+
+
+def test_missing_file(tmp_path):
+    assert read_done_point_ids(tmp_path / "sweep_results.csv", COLUMNS, NB_POINTS) == (set(), 0)
+
+
+def test_failed_points_are_retried_on_request(tmp_path):
+    result_path = tmp_path / "sweep_results.csv"
+    write_rows(result_path, [make_row(0), make_row(1, False, "ValueError: line 1\nline 2"), make_row(2, False)])
+    size = result_path.stat().st_size
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS) == ({0, 1, 2}, size)
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS, retry_failed=True) == ({0}, size)
+
+    # the last row of a point is its result
+    with open(result_path, "a", newline="", encoding="utf-8") as result_file:
+        csv.DictWriter(result_file, fieldnames=COLUMNS).writerow(make_row(1))
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS, retry_failed=True)[0] == {0, 1}
+
+
+def test_invalid_rows_are_ignored(tmp_path):
+    result_path = tmp_path / "sweep_results.csv"
+    write_rows(result_path, [make_row(0), make_row(NB_POINTS), make_row("x"), make_row(1, "maybe")])
+    with open(result_path, "a", newline="", encoding="utf-8") as result_file:
+        result_file.write("3,3\r\n")
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS) == ({0}, result_path.stat().st_size)
+
+
+@pytest.mark.parametrize("partial_row", ["2,2,2,Tr", '2,2,2,False,"ValueError: line 1\nline', "\r"])
+def test_partial_last_row(tmp_path, partial_row):
+    result_path = tmp_path / "sweep_results.csv"
+    write_rows(result_path, [make_row(0), make_row(1)])
+    size = result_path.stat().st_size
+    with open(result_path, "a", newline="", encoding="utf-8") as result_file:
+        result_file.write(partial_row)
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS) == ({0, 1}, size)
+
+
+def test_partial_header(tmp_path):
+    result_path = tmp_path / "sweep_results.csv"
+    result_path.write_text("point_id,se", encoding="utf-8")
+    assert read_done_point_ids(result_path, COLUMNS, NB_POINTS) == (set(), 0)
+
+
+def test_other_sweep(tmp_path):
+    result_path = tmp_path / "sweep_results.csv"
+    result_path.write_text("point_id,seed,other\r\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_done_point_ids(result_path, COLUMNS, NB_POINTS)
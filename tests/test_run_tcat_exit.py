@@ -0,0 +1,34 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Runs a verbose scenario with RunTCAT.py in a new process, as the job queue of the app does, and checks
+#                   that the process exits once the artifacts are rendered in parallel.
+
+# Import libraries
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXIT_TIMEOUT_IN_SEC = 600
+
+
+def test_verbose_run_exits(tmp_path):
+    # the verbose plots are written with plotly and kaleido
+    pytest.importorskip("plotly")
+    pytest.importorskip("kaleido")
+    with open(os.path.join(ROOT_DIR, "constellation_mission.json")) as file:
+        configuration = json.load(file)
+    configuration.update(verbose=True, artifacts_rendering="parallel", dir_path_for_output_files=str(tmp_path / "results"))
+    configuration_path = tmp_path / "configuration.json"
+    configuration_path.write_text(json.dumps(configuration))
+
+    try:
+        process = subprocess.run([sys.executable, "RunTCAT.py", str(configuration_path)], cwd=ROOT_DIR,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=EXIT_TIMEOUT_IN_SEC)
+    except subprocess.TimeoutExpired:
+        pytest.fail(f"RunTCAT.py did not exit within {EXIT_TIMEOUT_IN_SEC} s")
+    assert process.returncode == 0
+    assert (tmp_path / "results" / "InterpolationGraph.gif").exists()
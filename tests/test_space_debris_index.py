@@ -0,0 +1,216 @@
+# Created:          17.10.2026
+# Last Revision:    17.10.2026
+# Description:      Compares the closed form decomposition of elliptical orbits (elliptical_orbit_decomposition_si and
+#                   DecompositionTable) with the former step-by-step decomposition, kept below as reference, and the
+#                   vectorised SDIEngine with SDI_compute on sampled objects. Results must agree within 1e-9 relative.
+
+# Import libraries
+import contextlib
+import io
+import os
+
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.time import Time
+from poliastro.bodies import Earth
+from poliastro.twobody import Orbit
+
+from ACT_Space_Debris_Index import sdi_space_debris_index as sdi
+from ACT_Space_Debris_Index.sdi_engine import get_sdi_engine
+from ACT_Space_Debris_Index.sdi_run_code import SDI_compute
+
+RELATIVE_TOLERANCE = 1e-9
+SDI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ACT_Space_Debris_Index")
+CF_FILE_PATH = os.path.join(SDI_DIR, "sdi_space_debris_CF_for_code.csv")
+REDUCED_LIFETIME_FILE_PATH = os.path.join(SDI_DIR, "sdi_reduced_lifetime.csv")
+EARTH_RADIUS_KM = Earth.R.to_value(u.km)
+
+
+# Reference step-by-step decomposition
+
+def reference_elliptical_orbit_decomposition(CF_file, transfer_orbit, mass):
+    """ Former elliptical_orbit_decomposition: steps down through the cells from apogee or LEO limit. """
+    apogee_transfer = (transfer_orbit.r_a - Earth.R)
+    perigee_transfer = (transfer_orbit.r_p - Earth.R)
+
+    if apogee_transfer > sdi.ALTITUDE_LEO_LIMIT + sdi.ALTITUDE_INCREMENT:
+        altitude_temp = sdi.ALTITUDE_LEO_LIMIT
+        nu_1 = sdi.get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp + Earth.R)
+    else:
+        altitude_temp = apogee_transfer
+        nu_1 = 179.99*np.pi/180 * u.rad
+
+    t_temp = Orbit.time_to_anomaly(transfer_orbit, nu_1)
+    impact_score_temp = 0 * u.year * u.m ** (-2) * u.pot_fragments
+
+    while altitude_temp - sdi.ALTITUDE_INCREMENT >= max(sdi.ALTITUDE_ATMOSPHERE_LIMIT, perigee_transfer):
+        nu_next = sdi.get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp - sdi.ALTITUDE_INCREMENT + Earth.R)
+        t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
+        Delta_t = (t_temp - t_next).to(u.year)
+        impact_score_temp = impact_score_temp + Delta_t*sdi.get_characterization_factor(CF_file, altitude_temp,
+                                                                                        transfer_orbit.inc)
+        t_temp = t_next
+        altitude_temp = altitude_temp - sdi.ALTITUDE_INCREMENT
+
+    nu_next = sdi.get_nu(transfer_orbit.a, transfer_orbit.ecc,
+                         max(sdi.ALTITUDE_ATMOSPHERE_LIMIT, perigee_transfer) + Earth.R)
+    t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
+    Delta_t = (t_temp - t_next).to(u.year)
+    impact_score_temp = impact_score_temp + Delta_t*sdi.get_characterization_factor(CF_file, altitude_temp,
+                                                                                    transfer_orbit.inc)
+    return impact_score_temp*sdi.alpha_param(mass)
+
+
+def reference_elliptical_orbit_decomposition_up(CF_file, transfer_orbit, mass):
+    """ Former elliptical_orbit_decomposition_up: steps up through the cells from perigee. """
+    apogee_transfer = (transfer_orbit.r_a - Earth.R)
+    perigee_transfer = (transfer_orbit.r_p - Earth.R)
+
+    altitude_temp = perigee_transfer
+    t_temp = Orbit.time_to_anomaly(transfer_orbit, 0 * u.rad)
+    impact_score_temp = 0 * u.year * u.m ** (-2) * u.pot_fragments
+
+    while altitude_temp + sdi.ALTITUDE_INCREMENT < min(sdi.ALTITUDE_LEO_LIMIT, apogee_transfer):
+        nu_next = sdi.get_nu(transfer_orbit.a, transfer_orbit.ecc, altitude_temp + sdi.ALTITUDE_INCREMENT + Earth.R)
+        t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
+        Delta_t = (t_next - t_temp).to(u.year)
+        impact_score_temp = impact_score_temp + Delta_t*sdi.get_characterization_factor(CF_file, altitude_temp,
+                                                                                        transfer_orbit.inc)
+        t_temp = t_next
+        altitude_temp = altitude_temp + sdi.ALTITUDE_INCREMENT
+
+    if apogee_transfer > sdi.ALTITUDE_LEO_LIMIT:
+        nu_next = sdi.get_nu(transfer_orbit.a, transfer_orbit.ecc, sdi.ALTITUDE_LEO_LIMIT + Earth.R)
+    else:
+        nu_next = 179.99*np.pi/180 * u.rad
+    t_next = Orbit.time_to_anomaly(transfer_orbit, nu_next)
+    Delta_t = (t_next - t_temp).to(u.year)
+    impact_score_temp = impact_score_temp + Delta_t*sdi.get_characterization_factor(CF_file, altitude_temp,
+                                                                                    transfer_orbit.inc)
+    return impact_score_temp*sdi.alpha_param(mass)
+
+
+def reference_decomposition(CF_file, a, ecc, inc, mass, up):
+    """ Reference decompositions of sampled orbits, nan if a cell is outside of the characterization factors table. """
+    function = reference_elliptical_orbit_decomposition_up if up else reference_elliptical_orbit_decomposition
+    scores = []
+    for a_i, ecc_i, inc_i, mass_i in zip(a, ecc, inc, mass):
+        orbit = Orbit.from_classical(Earth, a_i * u.km, ecc_i * u.one, inc_i * u.deg, 0 * u.deg, 90 * u.deg, 0 * u.deg)
+        try:
+            scores.append(function(CF_file, orbit, mass_i * u.kg).value)
+        except IndexError:
+            scores.append(np.nan)
+    return np.array(scores)
+
+
+# Tests
+
+@pytest.fixture(scope="module")
+def CF_file():
+    return get_sdi_engine(CF_FILE_PATH, REDUCED_LIFETIME_FILE_PATH).CF_file
+
+
+def sample_elliptical_orbits(nb_orbits, seed=7):
+    """ Returns random elliptical orbits with their perigee in LEO: semi-major axis in km, eccentricity, inclination in
+    deg and mass in kg. """
+    rng = np.random.default_rng(seed)
+    perigee = rng.uniform(150, 1990, nb_orbits)
+    apogee = perigee + rng.uniform(1, 4000, nb_orbits)
+    a = (apogee + perigee) / 2 + EARTH_RADIUS_KM
+    ecc = (apogee + EARTH_RADIUS_KM - a) / a
+    return a, ecc, rng.uniform(0, 178, nb_orbits), rng.uniform(10, 3000, nb_orbits)
+
+
+@pytest.mark.parametrize("up", [False, True])
+def test_elliptical_orbit_decomposition(CF_file, up):
+    a, ecc, inc, mass = sample_elliptical_orbits(300, seed=7 + up)
+    expected = reference_decomposition(CF_file, a, ecc, inc, mass, up)
+    assert np.isfinite(expected).sum() > len(expected) // 2
+
+    actual = sdi.elliptical_orbit_decomposition_si(CF_file, a, ecc, inc, mass, up=up)
+    finite = np.isfinite(expected)
+    np.testing.assert_allclose(actual[finite], expected[finite], rtol=RELATIVE_TOLERANCE, atol=0.)
+
+    # decompositions looked up in a table, built over part of the orbits and completed on lookup
+    table = sdi.DecompositionTable(a[::2], ecc[::2], up=up)
+    from_table = sdi.elliptical_orbit_decomposition_si(CF_file, a, ecc, inc, mass, up=up, table=table)
+    np.testing.assert_array_equal(from_table, actual)
+    assert len(table) == len(a)
+
+    # scalar functions, raising an IndexError for cells outside of the table as the reference
+    function = sdi.elliptical_orbit_decomposition_up if up else sdi.elliptical_orbit_decomposition
+    for a_i, ecc_i, inc_i, mass_i, expected_i in list(zip(a, ecc, inc, mass, expected))[:50]:
+        orbit = Orbit.from_classical(Earth, a_i * u.km, ecc_i * u.one, inc_i * u.deg, 0 * u.deg, 90 * u.deg, 0 * u.deg)
+        if np.isnan(expected_i):
+            with pytest.raises(IndexError):
+                function(CF_file, orbit, mass_i * u.kg)
+        else:
+            assert function(CF_file, orbit, mass_i * u.kg).value == pytest.approx(expected_i, rel=RELATIVE_TOLERANCE)
+
+
+def sample_objects(nb_objects, seed=0):
+    """ Returns the inputs of SDI_compute for random objects, with operational and disposal orbits from below the
+    atmosphere limit to above LEO. """
+    rng = np.random.default_rng(seed)
+
+    def apogee_perigee():
+        kind = rng.integers(0, 4, nb_objects)
+        perigee = np.where(kind == 0, rng.uniform(100, 199, nb_objects),
+                           np.where(kind == 3, rng.uniform(2001, 3000, nb_objects), rng.uniform(200, 1990, nb_objects)))
+        apogee = np.where(rng.random(nb_objects) < 0.5, perigee, perigee + rng.uniform(0, 3000, nb_objects))
+        apogee = np.round(apogee)
+        return apogee, np.round(np.minimum(perigee, apogee))
+
+    def a_ecc(apogee, perigee):
+        a = (apogee + perigee) / 2 + EARTH_RADIUS_KM
+        return a, (apogee + EARTH_RADIUS_KM - a) / a
+
+    a_op, ecc_op = a_ecc(*apogee_perigee())
+    a_disp, ecc_disp = a_ecc(*apogee_perigee())
+    inc_op = np.round(rng.uniform(0, 179, nb_objects))
+    inc_disp = np.where(rng.random(nb_objects) < 0.5, inc_op, np.round(rng.uniform(0, 179, nb_objects)))
+    mass, cross_section, op_duration = (rng.uniform(50, 3000, nb_objects), rng.uniform(1, 20, nb_objects),
+                                        rng.uniform(0, 15, nb_objects))
+    isp, eol = rng.uniform(200, 350, nb_objects), rng.random(nb_objects) < 0.7
+    pmd, thrust = rng.uniform(0.5, 1, nb_objects), rng.uniform(1, 30, nb_objects)
+
+    # without end-of-life manoeuvre, the disposal orbit is the operational orbit
+    a_disp, ecc_disp, inc_disp = np.where(eol, a_disp, a_op), np.where(eol, ecc_disp, ecc_op), np.where(eol, inc_disp, inc_op)
+    return dict(mass=mass * u.kg, cross_section=cross_section * u.m ** 2, op_duration=op_duration * u.year,
+                mean_thrust=thrust * u.N, Isp=isp * u.s, EOL_manoeuvre=eol, PMD_success=pmd, a_op=a_op * u.km,
+                ecc_op=ecc_op * u.one, inc_object_op=inc_op * u.deg, a_disp=a_disp * u.km, ecc_disp=ecc_disp * u.one,
+                inc_object_disp=inc_disp * u.deg)
+
+
+def test_engine_matches_sdi_compute():
+    objects = sample_objects(120)
+    results = get_sdi_engine(CF_FILE_PATH, REDUCED_LIFETIME_FILE_PATH).compute(**objects)
+
+    expected_results = []
+    for index in range(len(objects["mass"])):
+        inputs = {key: value[index] for key, value in objects.items()}
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected_results.append(SDI_compute(Time("2018-01-01 12:00:00", scale="tdb"), **inputs,
+                                                    CF_file_path=CF_FILE_PATH,
+                                                    reduced_lifetime_file_path=REDUCED_LIFETIME_FILE_PATH))
+        except Exception:
+            expected_results.append(None)
+    assert sum(result is not None for result in expected_results) > len(expected_results) // 2
+
+    for key in next(result for result in expected_results if result is not None):
+        expected = np.array([np.nan if result is None else u.Quantity(result[key]).value
+                             for result in expected_results])
+        actual = u.Quantity(results[key]).value
+        computed = np.array([result is not None for result in expected_results])
+        # values are compared relative to the scale of the result over the objects, some of them are rounding noise
+        # around zero
+        scale = np.nanmax(np.abs(expected[computed]), initial=0.)
+        np.testing.assert_allclose(actual[computed], expected[computed],
+                                   rtol=RELATIVE_TOLERANCE, atol=RELATIVE_TOLERANCE * scale, equal_nan=True,
+                                   err_msg=key)
+
+    # objects that SDI_compute cannot compute get an error message and nan results from the engine
+    for index, result in enumerate(expected_results):
+        assert (results["Error"][index] is None) == (result is not None)
@@ -1,9 +1,12 @@
 import os
 
-from tcat_app.app import app as application
+from tcat_app.app import app as application, start_services
 
 HOST = os.getenv('HOST')
 PORT = os.getenv('PORT')
 
+# uWSGI imports this module in each app process (lazy-apps)
+start_services()
+
 if __name__ == "__main__":
     application.run(host=HOST, port=PORT)